@@ -5,7 +5,8 @@ import path from "path";
 import { fileURLToPath } from "url";
 import { errorHandler, notFound } from "./middleware/errorMiddleware.js";
 import routes from "./routes/index.js";
-import { Server } from "socket.io";
+import { initRealtime } from "./utils/realtime.js";
+import { registerCounterEvents } from "./utils/liveCounters.js";
 import http from "http";
 import vapiRoutes from "./routes/VAPIRoutes/index.js";
 import bodyParser from "body-parser";
@@ -14,33 +15,7 @@ const app = express();
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 const server = http.createServer(app);
-const io = new Server(server, {
-  cors: {
-    origin: process.env.FRONTEND_URL,
-    methods: ["GET", "POST"],
-    credentials: true,
-  },
-});
-io.on("connection", (socket) => {
-  console.log("User connected:", socket.id);
-
-  // join conversation room
-  socket.on("join_conversation", (conversationId) => {
-    socket.join(conversationId);
-    console.log(`User joined room: ${conversationId}`);
-    io.emit("joined", conversationId);
-  });
-
-  // send message
-  socket.on("send_message", async (conversationId) => {
-    console.log(conversationId, "send message received");
-    io.to(conversationId).emit("messages_update", conversationId);
-  });
-
-  socket.on("disconnect", () => {
-    console.log("User disconnected:", socket.id);
-  });
-});
+initRealtime(server, { handlers: [registerCounterEvents] });
 
 // middlewares
 app.use(express.json());
@@ -72,6 +47,10 @@ app.use(
       }
       // Allow CORS so frontend (5173) can load HLS segments
       res.setHeader("Access-Control-Allow-Origin", "*");
+      // Chat attachments are stored by content hash and never change
+      if (filePath.includes(`${path.sep}messages${path.sep}`)) {
+        res.setHeader("Cache-Control", "public, max-age=31536000, immutable");
+      }
     },
   })
 );
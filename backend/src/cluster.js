@@ -0,0 +1,82 @@
+import dotenv from "dotenv";
+import path from "path";
+import os from "os";
+import http from "http";
+import cluster from "cluster";
+import { fileURLToPath } from "url";
+import { setupMaster } from "@socket.io/sticky";
+import { setupPrimary } from "@socket.io/cluster-adapter";
+import { setupPubSubPrimary } from "./utils/pubsub.js";
+
+// Clustered mode: one API + Socket.IO worker (server.js) per core.
+// The primary owns the port and routes connections with sticky sessions, so
+// a Socket.IO client's polling requests and upgrade reach the same worker;
+// plain API requests go to the least busy one. The cluster adapter and the
+// pub/sub relay forward room broadcasts and cache invalidations between
+// workers over IPC. Crashed workers are replaced; SIGTERM/SIGINT stop them
+// gracefully.
+
+// load env
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+dotenv.config({ path: path.resolve(__dirname, "../../.env") });
+
+const PORT = process.env.PORT || 5000;
+const WORKERS =
+  Number(process.env.WEB_CONCURRENCY) || os.availableParallelism();
+const SHUTDOWN_TIMEOUT_MS = Number(process.env.SHUTDOWN_TIMEOUT_MS) || 10000;
+
+// The cluster adapter sends binary packets, which need advanced serialization
+cluster.setupPrimary({
+  exec: path.join(__dirname, "server.js"),
+  serialization: "advanced",
+});
+
+let shuttingDown = false;
+let cronWorker = null;
+
+// Exactly one worker runs the cron jobs
+const fork = (runCronJobs) => {
+  const worker = cluster.fork({ RUN_CRON_JOBS: String(runCronJobs) });
+  if (runCronJobs) cronWorker = worker;
+  return worker;
+};
+
+const httpServer = http.createServer();
+setupMaster(httpServer, { loadBalancingMethod: "least-connection" });
+setupPrimary();
+setupPubSubPrimary();
+
+for (let i = 0; i < WORKERS; i += 1) fork(i === 0);
+
+cluster.on("exit", (worker, code, signal) => {
+  if (shuttingDown) return;
+  console.error(
+    `❌ Worker ${worker.process.pid} exited (${signal || code}), restarting`
+  );
+  fork(worker === cronWorker);
+});
+
+httpServer.listen(PORT, () =>
+  console.log(`🚀 Server running on port ${PORT} with ${WORKERS} workers`)
+);
+
+const shutdown = (signal) => {
+  if (shuttingDown) return;
+  shuttingDown = true;
+  console.log(`🛑 ${signal}: stopping ${WORKERS} workers`);
+
+  httpServer.close();
+  const workers = Object.values(cluster.workers);
+  workers.forEach((worker) => worker.process.kill("SIGTERM"));
+
+  // Workers still busy after the grace period are killed
+  setTimeout(() => {
+    workers
+      .filter((worker) => !worker.isDead())
+      .forEach((worker) => worker.process.kill("SIGKILL"));
+  }, SHUTDOWN_TIMEOUT_MS).unref();
+};
+
+process.once("SIGTERM", () => shutdown("SIGTERM"));
+process.once("SIGINT", () => shutdown("SIGINT"));
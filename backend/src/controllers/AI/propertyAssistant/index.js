@@ -2,6 +2,8 @@ import { Property } from "../../../models/Agent/PropertyModel.js";
 import { PropertyFeedback } from "../../../models/Common/PropertyFeedbackModel.js";
 import { createNotification } from "../../../utils/apiFunctions/Notifications/index.js";
 import { sendPushNotification } from "../../../utils/pushService.js";
+import { normalizeAreaUnit, parseAreaText } from "../../../utils/propertyArea.js";
+import { refreshRecommendationsInBackground } from "../../../utils/recommendations.js";
 import { VapiClient } from "@vapi-ai/server-sdk";
 const vapi = new VapiClient({ token: process.env.VAPI_SERVER_API_KEY });
 
@@ -151,6 +153,7 @@ export const createPropertyRecord = async (req, res) => {
       price,
       built_up_area,
       carpet_area,
+      unit_area_type,
       bedrooms,
       bathrooms,
       balconies,
@@ -186,6 +189,12 @@ export const createPropertyRecord = async (req, res) => {
         ? title.trim()
         : `${capitalize(normalize(type))} ${capitalize(normalize(category))}`;
 
+    // 📐 Areas arrive as "1200 square feet" / "5 marla"; split value and unit
+    const builtUp = parseAreaText(built_up_area);
+    const carpet = parseAreaText(carpet_area);
+    const areaUnit =
+      builtUp.unit || carpet.unit || normalizeAreaUnit(unit_area_type);
+
     // 🏗️ Build property data safely
     const propertyData = {
       title: generatedTitle,
@@ -194,8 +203,9 @@ export const createPropertyRecord = async (req, res) => {
       description: isNullish(description) ? "" : description,
       location: isNullish(location) ? "" : location,
       price: toNumber(price),
-      built_up_area: toNumber(built_up_area),
-      carpet_area: toNumber(carpet_area),
+      built_up_area: toNumber(builtUp.value),
+      carpet_area: toNumber(carpet.value),
+      unit_area_type: areaUnit || "square feet",
       bedrooms: toNumber(bedrooms),
       bathrooms: toNumber(bathrooms),
       balconies: toNumber(balconies),
@@ -360,6 +370,7 @@ export const createPropertyFeedback = async (req, res) => {
     // Save feedback
     const savedFeedback = await new PropertyFeedback(feedbackData).save();
     console.log("✅ Feedback saved:", savedFeedback._id);
+    refreshRecommendationsInBackground(savedFeedback.userId);
 
     // Notify agent
     await createNotification({
@@ -1,6 +1,6 @@
 import {AdminSettings} from "../../models/Admin/AdminSettingsModel.js";
 import { User } from "../../models/Common/UserModel.js";
-import bcrypt from "bcryptjs";
+import { hashPassword } from "../../utils/passwordHasher.js";
 
 // Save or update admin settings
 export const saveAdminSettings = async (req, res) => {
@@ -23,7 +23,7 @@ export const saveAdminSettings = async (req, res) => {
                 return res.json({ status: false, message: "New password and confirm password do not match!" });
             }
             // Assuming you have req.user.id for the currently logged-in admin
-            const hashedPassword = await bcrypt.hash(newPassword, 10);
+            const hashedPassword = await hashPassword(newPassword);
             await User.findByIdAndUpdate(userId, { password: hashedPassword });
         }
 
@@ -4,6 +4,9 @@ import { Customer } from "../../models/Agent/CustomerModel.js";
 import { Property } from "../../models/Agent/PropertyModel.js";
 import { Meetings } from "../../models/Agent/MeetingModel.js";
 import { PropertyShare } from "../../models/Agent/PropertyShareModel.js";
+import { getPropertyCatalogStats } from "../../utils/propertyCatalogCache.js";
+import { getPrincipalCacheStats } from "../../utils/authPrincipalCache.js";
+import { getNotificationOutboxStats } from "../../utils/notificationOutbox.js";
 
 export const getAnalyticsData = async (req, res) => {
   try {
@@ -146,6 +149,36 @@ export const getAnalyticsData = async (req, res) => {
   }
 };
 
+// 📈 Hit/miss counters and memory use of the property catalog cache
+export const getPropertyCacheStats = (req, res) =>
+  res.status(200).json({
+    success: true,
+    message: "Property cache stats fetched successfully",
+    data: getPropertyCatalogStats(),
+  });
+
+// 🔐 Hit/miss counters of the auth principal cache
+export const getAuthCacheStats = (req, res) =>
+  res.status(200).json({
+    success: true,
+    message: "Auth cache stats fetched successfully",
+    data: getPrincipalCacheStats(),
+  });
+
+// 📬 Throughput, retries and backlog of the notification outbox
+export const getNotificationOutboxMetrics = async (req, res) => {
+  try {
+    return res.status(200).json({
+      success: true,
+      message: "Notification outbox stats fetched successfully",
+      data: await getNotificationOutboxStats(),
+    });
+  } catch (error) {
+    console.error(error);
+    return res.status(500).json({ success: false, message: error.message });
+  }
+};
+
 // 🕒 Utility to show “x time ago”
 function timeAgo(date) {
   const seconds = Math.floor((new Date() - new Date(date)) / 1000);
@@ -3,6 +3,7 @@ import { Agency } from "../../models/Agent/AgencyModel.js";
 import { Meetings } from "../../models/Agent/MeetingModel.js";
 import { createNotification } from "../../utils/apiFunctions/Notifications/index.js";
 import { sendPushNotification } from "../../utils/pushService.js";
+import { findCursorPage, readPagination } from "../../utils/pagination.js";
 
 // Get all properties
 export const getCustomers = async (req, res) => {
@@ -41,6 +42,19 @@ export const getCustomers = async (req, res) => {
       }
     }
 
+    // 🔹 Cursor mode (opt-in via ?cursor=), stats counts are skipped
+    const paging = readPagination(req.query);
+    if (paging.cursorMode) {
+      const result = await findCursorPage(Customer, searchQuery, {
+        sort: { _id: -1 },
+        limit: paging.limit,
+        cursor: paging.cursor,
+        includeTotal: paging.includeTotal,
+        decorate: (query) => query.populate("agencyId"),
+      });
+      return res.json({ success: true, ...result });
+    }
+
     const totalSearchedCustomers = await Customer.countDocuments(searchQuery);
 
     const totalCustomers = await Customer.countDocuments({});
@@ -83,7 +97,9 @@ export const getCustomers = async (req, res) => {
       },
     });
   } catch (error) {
-    return res.status(500).json({ success: false, message: error.message });
+    return res
+      .status(error.statusCode || 500)
+      .json({ success: false, message: error.message });
   }
 };
 
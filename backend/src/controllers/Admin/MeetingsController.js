@@ -1,4 +1,5 @@
 import { Meetings } from "../../models/Agent/MeetingModel.js";
+import { readPagination, toCursorPage } from "../../utils/pagination.js";
 //import { Agency } from "../../models/Agent/AgencyModel.js";
 import { createNotification } from "../../utils/apiFunctions/Notifications/index.js";
 import { sendPushNotification } from "../../utils/pushService.js";
@@ -10,6 +11,7 @@ export const getMeetings = async (req, res) => {
 
     const pageNumber = parseInt(page);
     const limitNumber = parseInt(limit);
+    const paging = readPagination(req.query);
 
     const matchQuery = {};
 
@@ -21,23 +23,20 @@ export const getMeetings = async (req, res) => {
       matchQuery.status = { $regex: status, $options: "i" };
     }
 
-    // ✅ NEW: Get total unfiltered count (only agencyId filter)
-
+    // ✅ NEW: Get total unfiltered count (only agencyId filter) and
+    // scheduled + rescheduled count
     const totalUnfilteredQuery = agencyId ? { agencyId } : {};
-    const totalUnfiltered = await Meetings.countDocuments(totalUnfilteredQuery);
-
-
-    // ✅ NEW: Get scheduled + rescheduled count
-    const scheduledQuery = agencyId
-      ? { agencyId, status: { $in: ["scheduled", "rescheduled","confirmed"] } }
-      : { status: { $in: ["scheduled", "rescheduled","confirmed"] } };
-
-    const scheduledCount = await Meetings.countDocuments(scheduledQuery);
-
-
-    const pipeline = [
-      { $match: matchQuery },
-
+    const scheduledQuery = {
+      ...totalUnfilteredQuery,
+      status: { $in: ["scheduled", "rescheduled", "confirmed"] },
+    };
+    const countSummary = () =>
+      Promise.all([
+        Meetings.countDocuments(totalUnfilteredQuery),
+        Meetings.countDocuments(scheduledQuery),
+      ]);
+
+    const lookups = [
       // Agency
       {
         $lookup: {
@@ -73,18 +72,59 @@ export const getMeetings = async (req, res) => {
     ];
 
     // 🔍 Search Logic (supports all 4 columns)
-    if (search) {
-      pipeline.push({
-        $match: {
-          $or: [
-            { "customerData.fullName": { $regex: search, $options: "i" } }, // Customer Name
-            { "propertyData.title": { $regex: search, $options: "i" } }, // Property Name
-            { "agencyData.name": { $regex: search, $options: "i" } }, // Agency Name
-          ],
-        },
-      });
+    const searchStages = search
+      ? [
+          {
+            $match: {
+              $or: [
+                { "customerData.fullName": { $regex: search, $options: "i" } }, // Customer Name
+                { "propertyData.title": { $regex: search, $options: "i" } }, // Property Name
+                { "agencyData.name": { $regex: search, $options: "i" } }, // Agency Name
+              ],
+            },
+          },
+        ]
+      : [];
+
+    const pipeline = [{ $match: matchQuery }, ...lookups, ...searchStages];
+
+    // 🔹 Cursor mode (opt-in via ?cursor=): keyset on _id, totals optional.
+    // Without a search the page is cut before the lookups, so only its own
+    // rows are joined.
+    if (paging.cursorMode) {
+      const sort = { _id: -1 };
+      const pageMatch = {
+        $match: paging.cursor?.id
+          ? { ...matchQuery, _id: { $lt: paging.cursor.id } }
+          : matchQuery,
+      };
+      const pageCut = [{ $sort: sort }, { $limit: paging.limit + 1 }];
+      const pagePipeline = search
+        ? [pageMatch, ...lookups, ...searchStages, ...pageCut]
+        : [pageMatch, ...pageCut, ...lookups];
+
+      const [rows, counted, summary] = await Promise.all([
+        Meetings.aggregate(pagePipeline),
+        paging.includeTotal
+          ? Meetings.aggregate(
+              search
+                ? [...pipeline, { $count: "count" }]
+                : [{ $match: matchQuery }, { $count: "count" }]
+            )
+          : undefined,
+        paging.includeTotal ? countSummary() : undefined,
+      ]);
+      const result = toCursorPage(rows, paging.limit, sort);
+      if (counted) {
+        result.pagination.total = counted[0]?.count || 0;
+        [result.pagination.totalUnfiltered, result.pagination.scheduledCount] =
+          summary;
+      }
+      return res.json({ success: true, ...result });
     }
 
+    const [totalUnfiltered, scheduledCount] = await countSummary();
+
     const total = await Meetings.aggregate([...pipeline, { $count: "count" }]);
     const totalCount = total[0]?.count || 0;
 
@@ -107,7 +147,9 @@ export const getMeetings = async (req, res) => {
       },
     });
   } catch (error) {
-    return res.status(500).json({ success: false, message: error.message });
+    return res
+      .status(error.statusCode || 500)
+      .json({ success: false, message: error.message });
   }
 };
 
@@ -4,8 +4,26 @@ import { Agency } from "../../models/Agent/AgencyModel.js";
 import { PropertyShare } from "../../models/Agent/PropertyShareModel.js";
 import { Meetings } from "../../models/Agent/MeetingModel.js";
 import { PreferenceFeedbacks } from "../../models/Agent/PreferenceFeedbackModel.js";
+import { PropertyMatch } from "../../models/Agent/PropertyMatchModel.js";
 import { createNotification } from "../../utils/apiFunctions/Notifications/index.js";
 import { sendPushNotification } from "../../utils/pushService.js";
+import {
+  buildSearchMatch,
+  findProperties,
+  findPropertyCursorPage,
+  parseSearchTerms,
+} from "../../utils/propertySearch.js";
+import { readPagination } from "../../utils/pagination.js";
+import { parseGeoQuery } from "../../utils/propertyGeo.js";
+import {
+  populateProperty,
+  resolvePropertyProjection,
+} from "../../utils/propertyProjections.js";
+import { matchPropertyInBackground } from "../../utils/propertyMatches.js";
+import {
+  removePropertyRecommendationsInBackground,
+  updatePropertyRecommendationsInBackground,
+} from "../../utils/recommendations.js";
 
 // Get all properties
 
@@ -15,6 +33,8 @@ export const getProperties = async (req, res) => {
 
     const pageNumber = parseInt(page);
     const limitNumber = parseInt(limit);
+    const paging = readPagination(req.query);
+    const select = resolvePropertyProjection(Property, req.query.fields, "admin");
 
     const searchQuery = {};
 
@@ -22,27 +42,22 @@ export const getProperties = async (req, res) => {
       searchQuery.agencyId = agencyId;
     }
 
-    // Calculate totalUnfiltered FIRST (before any search logic)
-    const totalUnfilteredQuery = agencyId ? { agencyId } : {};
-    const totalUnfiltered = await Property.countDocuments(totalUnfilteredQuery);
+    const searchTerms = parseSearchTerms(search);
 
-    if (search || status) {
+    if (searchTerms.length || status) {
       searchQuery.$or = [];
 
-      if (search && typeof search === "string") {
+      if (searchTerms.length) {
         const agencies = await Agency.find({
           $or: [{ name: { $regex: search, $options: "i" } }],
         }).select("_id");
 
         const agencyIds = agencies.map((a) => a._id);
 
-        searchQuery.$or.push(
-          { title: { $regex: search, $options: "i" } },
-          { type: { $regex: search, $options: "i" } },
-          { category: { $regex: search, $options: "i" } },
-          { owner_name: { $regex: search, $options: "i" } },
-          { agencyId: { $in: agencyIds } }
-        );
+        // title, type, category and owner_name are covered by the token index
+        searchQuery.$or.push(buildSearchMatch(searchTerms), {
+          agencyId: { $in: agencyIds },
+        });
       }
 
       if (status && typeof status === "string") {
@@ -50,16 +65,46 @@ export const getProperties = async (req, res) => {
       }
     }
 
-    const totalFiltered = await Property.countDocuments(searchQuery);
+    // 🔹 Nearby / map viewport / drawn area, ordered by distance
+    const geo = parseGeoQuery(req.query);
+    if (geo) searchQuery.geo_location = geo.clause;
+    const near = geo?.near;
 
-    const property = await Property.find(searchQuery)
-      .sort({ _id: -1 })
-      .skip((pageNumber - 1) * limitNumber)
-      .limit(limitNumber)
-      .populate({
+    // 🔹 Cursor mode (opt-in via ?cursor=), stats counts are skipped
+    if (paging.cursorMode) {
+      const result = await findPropertyCursorPage(Property, {
+        filter: searchQuery,
+        terms: searchTerms,
+        sort: { _id: -1 },
+        paging,
+        select,
+        near,
+      });
+      await Property.populate(result.data, {
         path: "agencyId",
         select: "name email phone status logoUrl",
       });
+      return res.json({ success: true, ...result });
+    }
+
+    // Total before search/status filters
+    const totalUnfilteredQuery = agencyId ? { agencyId } : {};
+    const totalUnfiltered = await Property.countDocuments(totalUnfilteredQuery);
+
+    const [property, totalFiltered] = await findProperties(Property, {
+      filter: searchQuery,
+      terms: searchTerms,
+      sort: { _id: -1 },
+      skip: (pageNumber - 1) * limitNumber,
+      limit: limitNumber,
+      select,
+      near,
+    });
+
+    await Property.populate(property, {
+      path: "agencyId",
+      select: "name email phone status logoUrl",
+    });
 
       const totalAgencies = await Agency.countDocuments({ status : {$ne : "deleted"}});
 
@@ -93,7 +138,9 @@ export const getProperties = async (req, res) => {
       },
     });
   } catch (error) {
-    return res.status(500).json({ success: false, message: error.message });
+    return res
+      .status(error.statusCode || 500)
+      .json({ success: false, message: error.message });
   }
 };
 
@@ -113,6 +160,9 @@ export const updateProperty = async (req, res) => {
         .status(404)
         .json({ success: false, message: "Property not found" });
     }
+    updatePropertyRecommendationsInBackground(updatedProperty);
+    // No agent summary: the admin is not the listing's agent
+    matchPropertyInBackground(updatedProperty);
     await createNotification({
       userId: updatedProperty.owner,
       message: `Property (${updatedProperty.name}) has been updated successfully.`,
@@ -142,6 +192,8 @@ export const deleteProperty = async (req, res) => {
         .json({ success: false, message: "Property not found" });
     }
     await Property.deleteOne({ _id: deletedProperty._id });
+    await PropertyMatch.deleteMany({ propertyId: deletedProperty._id });
+    removePropertyRecommendationsInBackground(deletedProperty._id);
 
     return res.json({
       success: true,
@@ -211,7 +263,7 @@ export const getPropertyById = async (req, res) => {
       .skip(skip)
       .limit(limit)
       .populate("customerId")
-      .populate("propertyId")
+      .populate(populateProperty("card"))
       .lean();
 
     propertyMeetings = propertyMeetings.map((item) => ({
@@ -233,7 +285,7 @@ export const getPropertyById = async (req, res) => {
       .sort({ _id: -1 })
       .skip(skip)
       .limit(limit)
-      .populate("propertyId")
+      .populate(populateProperty("card"))
       .populate("sharedWithUserId")
       .populate("sharedByUserId")
       .lean();
@@ -249,7 +301,7 @@ export const getPropertyById = async (req, res) => {
       .sort({ _id: -1 })
       .skip(skip)
       .limit(limit)
-      .populate("propertyId")
+      .populate(populateProperty("card"))
       .populate("userId")
       .lean();
 
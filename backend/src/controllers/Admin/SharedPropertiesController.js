@@ -1,9 +1,11 @@
 import { PropertyShare } from "../../models/Agent/PropertyShareModel.js";
+import { readPagination, toCursorPage } from "../../utils/pagination.js";
 //import { Agency } from "../../models/Agent/AgencyModel.js";
 import { createNotification } from "../../utils/apiFunctions/Notifications/index.js";
 import { sendPushNotification } from "../../utils/pushService.js";
 import { PreferenceFeedbacks } from "../../models/Agent/PreferenceFeedbackModel.js";
 import { Property } from "../../models/Agent/PropertyModel.js";
+import { invalidateRecommendationsInBackground } from "../../utils/recommendations.js";
 
 // Get all shared Properties
 export const getSharedProperties = async (req, res) => {
@@ -12,6 +14,7 @@ export const getSharedProperties = async (req, res) => {
 
     const pageNumber = parseInt(page);
     const limitNumber = parseInt(limit);
+    const paging = readPagination(req.query);
 
     const matchQuery = {};
 
@@ -27,12 +30,9 @@ export const getSharedProperties = async (req, res) => {
     //Getting the total property shared
 
     const baseMatch = agencyId ? { agencyId }: {};
-    const totalWithoutFilter = await PropertyShare.countDocuments(baseMatch);
-
-    // Base aggregation
-    const pipeline = [
-      { $match: matchQuery },
 
+    // Joins of the listing
+    const lookups = [
       // Agency
       {
         $lookup: {
@@ -80,20 +80,63 @@ export const getSharedProperties = async (req, res) => {
 
 
     // 🔍 Search Logic (supports all 4 columns)
-    if (search) {
-      pipeline.push({
-        $match: {
-          $or: [
-            { "userData.name": { $regex: search, $options: "i" } }, // Shared By User
-            { "customerData.fullName": { $regex: search, $options: "i" } }, // Shared With Customer
-            { "propertyData.title": { $regex: search, $options: "i" } }, // Property Name
-            { "agencyData.name": { $regex: search, $options: "i" } }, // Agency Name
-          ]
-        }
-      });
-    }
+    const searchStages = search
+      ? [
+          {
+            $match: {
+              $or: [
+                { "userData.name": { $regex: search, $options: "i" } }, // Shared By User
+                { "customerData.fullName": { $regex: search, $options: "i" } }, // Shared With Customer
+                { "propertyData.title": { $regex: search, $options: "i" } }, // Property Name
+                { "agencyData.name": { $regex: search, $options: "i" } }, // Agency Name
+              ],
+            },
+          },
+        ]
+      : [];
+
+    // Base aggregation
+    const pipeline = [{ $match: matchQuery }, ...lookups, ...searchStages];
 
     // Pagination
+    // 🔹 Cursor mode (opt-in via ?cursor=): keyset on _id, total optional.
+    // Without a search the page is cut before the lookups, so only its own
+    // rows are joined.
+    if (paging.cursorMode) {
+      const sort = { _id: -1 };
+      const pageMatch = {
+        $match: paging.cursor?.id
+          ? { ...matchQuery, _id: { $lt: paging.cursor.id } }
+          : matchQuery,
+      };
+      const pageCut = [{ $sort: sort }, { $limit: paging.limit + 1 }];
+      const pagePipeline = search
+        ? [pageMatch, ...lookups, ...searchStages, ...pageCut]
+        : [pageMatch, ...pageCut, ...lookups];
+
+      const [rows, counted, totalWithoutFilter] = await Promise.all([
+        PropertyShare.aggregate(pagePipeline),
+        paging.includeTotal
+          ? PropertyShare.aggregate(
+              search
+                ? [...pipeline, { $count: "count" }]
+                : [{ $match: matchQuery }, { $count: "count" }]
+            )
+          : undefined,
+        paging.includeTotal
+          ? PropertyShare.countDocuments(baseMatch)
+          : undefined,
+      ]);
+      const result = toCursorPage(rows, paging.limit, sort);
+      if (counted) {
+        result.pagination.total = counted[0]?.count || 0;
+        result.pagination.totalWithoutFilter = totalWithoutFilter;
+      }
+      return res.json({ success: true, ...result });
+    }
+
+    const totalWithoutFilter = await PropertyShare.countDocuments(baseMatch);
+
     const total = await PropertyShare.aggregate([...pipeline, { $count: "count" }]);
     const totalCount = total[0]?.count || 0;
 
@@ -123,7 +166,9 @@ export const getSharedProperties = async (req, res) => {
     });
 
   } catch (error) {
-    return res.status(500).json({ success: false, message: error.message });
+    return res
+      .status(error.statusCode || 500)
+      .json({ success: false, message: error.message });
   }
 };
 
@@ -188,6 +233,7 @@ export const deleteSharedProperty = async (req, res) => {
 
     // 2. Delete
     await PropertyShare.deleteOne({ _id: sharedProperty._id });
+    invalidateRecommendationsInBackground({ customerId: sharedWith });
 
     // Detect if Admin deleted
     const deletedByAdmin = req.user?.role === "admin";
@@ -6,6 +6,17 @@ import { createNotification } from "../../utils/apiFunctions/Notifications/index
 import { sendPushNotification } from "../../utils/pushService.js";
 import { Meetings } from "../../models/Agent/MeetingModel.js";
 import PushNotificationSubscription from "../../models/Common/PushNotificationSubscription.js";
+import { findCursorPage, readPagination } from "../../utils/pagination.js";
+import {
+  invalidateRecommendationsInBackground,
+  refreshRecommendationsInBackground,
+} from "../../utils/recommendations.js";
+import {
+  exportCursor,
+  readExportFormat,
+  schemaColumns,
+  streamExport,
+} from "../../utils/exportStream.js";
 
 // Create a new customer
 export const createCustomer = async (req, res) => {
@@ -110,6 +121,26 @@ export const createCustomer = async (req, res) => {
   }
 };
 
+// Filter shared by getCustomers and exportCustomers
+const buildCustomerFilter = (agencyId, search) => {
+  const baseQuery = {
+    agencyId: agencyId,
+    isDeleted: false,
+  };
+
+  return search
+    ? {
+        ...baseQuery,
+        $or: [
+          { fullName: { $regex: search, $options: "i" } },
+          { email: { $regex: search, $options: "i" } },
+          { whatsAppNumber: { $regex: search, $options: "i" } },
+          { phoneNumber: { $regex: search, $options: "i" } },
+        ],
+      }
+    : baseQuery;
+};
+
 // Get all customers
 export const getCustomers = async (req, res) => {
   try {
@@ -126,22 +157,19 @@ export const getCustomers = async (req, res) => {
     const pageNumber = parseInt(page);
     const limitNumber = parseInt(limit);
 
-    const baseQuery = {
-      agencyId: agencyId,
-      isDeleted: false,
-    };
+    const searchQuery = buildCustomerFilter(agencyId, search);
 
-    const searchQuery = search
-      ? {
-          ...baseQuery,
-          $or: [
-            { fullName: { $regex: search, $options: "i" } },
-            { email: { $regex: search, $options: "i" } },
-            { whatsAppNumber: { $regex: search, $options: "i" } },
-            { phoneNumber: { $regex: search, $options: "i" } },
-          ],
-        }
-      : baseQuery;
+    // 🔹 Cursor mode (opt-in via ?cursor=)
+    const paging = readPagination(req.query);
+    if (paging.cursorMode) {
+      const result = await findCursorPage(Customer, searchQuery, {
+        sort: { _id: -1 },
+        limit: paging.limit,
+        cursor: paging.cursor,
+        includeTotal: paging.includeTotal,
+      });
+      return res.json({ success: true, ...result });
+    }
 
     const totalCustomers = await Customer.countDocuments(searchQuery);
 
@@ -175,7 +203,34 @@ export const getCustomers = async (req, res) => {
       },
     });
   } catch (error) {
-    return res.status(500).json({ success: false, message: error.message });
+    return res
+      .status(error.statusCode || 500)
+      .json({ success: false, message: error.message });
+  }
+};
+
+const CUSTOMER_EXPORT_COLUMNS = schemaColumns(Customer.schema, {
+  exclude: ["agencyId", "isDeleted", "role"],
+});
+
+// Stream every customer matching the getCustomers filters
+export const exportCustomers = async (req, res) => {
+  try {
+    const format = readExportFormat(req.query.format);
+    const filter = buildCustomerFilter(req.user.agencyId._id, req.query.search);
+
+    const cursor = exportCursor(
+      Customer.find(filter).select("-agencyId -isDeleted").sort({ _id: -1 })
+    );
+    return streamExport(req, res, cursor, {
+      format,
+      filename: "customers",
+      columns: CUSTOMER_EXPORT_COLUMNS,
+    });
+  } catch (error) {
+    return res
+      .status(error.statusCode || 500)
+      .json({ success: false, message: error.message });
   }
 };
 
@@ -226,6 +281,12 @@ export const updateCustomer = async (req, res) => {
         .status(404)
         .json({ success: false, message: "Customer not found" });
     }
+    // Catalog visibility decides which listings can be recommended
+    if (updateData.showAllProperty !== undefined) {
+      invalidateRecommendationsInBackground({
+        customerId: updatedCustomer._id,
+      });
+    }
     // const updatedUser = await User.findOneAndUpdate(
     //   { email: updatedCustomer.email },
     //   {
@@ -300,6 +361,8 @@ export const deleteCustomer = async (req, res) => {
     await Meetings.updateMany({ customerId }, { isDeleted: true });
 
     await PushNotificationSubscription.deleteMany({ userId: customerId});
+    // Drops the stored list of a deleted customer
+    refreshRecommendationsInBackground(customerId);
 
     return res.json({
       success: true,
@@ -1,6 +1,6 @@
 import { User } from "../../models/Common/UserModel.js";
 import { Agency } from "../../models/Agent/AgencyModel.js";
-import bcrypt from "bcryptjs";
+import { hashPassword } from "../../utils/passwordHasher.js";
 
 export const inviteAgent = async (req, res) => {
   try {
@@ -20,7 +20,7 @@ export const inviteAgent = async (req, res) => {
     }
 
     // Hash static password
-    const hashedPassword = await bcrypt.hash("Pa$$w0rd!", 10);
+    const hashedPassword = await hashPassword("Pa$$w0rd!");
 
     const newUser = await User.create({
       name,
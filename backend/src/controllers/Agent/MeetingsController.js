@@ -1,162 +1,205 @@
+import mongoose from "mongoose";
 import { Customer } from "../../models/Agent/CustomerModel.js";
 import { Meetings } from "../../models/Agent/MeetingModel.js";
-import { createNotification } from "../../utils/apiFunctions/Notifications/index.js";
-import generateToken from "../../utils/generateToken.js";
-import { sendPushNotification } from "../../utils/pushService.js";
-import AgencySettings from "../../models/Agent/settingsModel.js";
-import CustomerSettings from "../../models/Customer/SettingsModel.js";
-
+import { enqueueNotifications } from "../../utils/notificationOutbox.js";
+import {
+  findCursorPage,
+  keysetSort,
+  readPagination,
+} from "../../utils/pagination.js";
+import {
+  exportCursor,
+  readExportFormat,
+  streamExport,
+} from "../../utils/exportStream.js";
+
+
+const MEETING_PUSH_ACTIONS = [
+  { action: "confirm", title: "Confirm" },
+  { action: "cancel", title: "Close" },
+];
 
 // Create a new meeting
 export const createMeeting = async (req, res) => {
+  const session = await mongoose.startSession();
   try {
-    const meeting = new Meetings(req.body);
-    const savedMeeting = await meeting.save();
     const user = req.user;
-    const customer = await Customer.findById(req.body.customerId);
+    const customer = await Customer.findById(req.body.customerId)
+      .select("fullName role")
+      .lean();
     if (!customer) {
       return res
         .status(404)
         .json({ success: false, message: "Customer not found" });
     }
-    const agentToken = generateToken(req.user._id, req.user.role);
-    const customerToken = generateToken(customer._id, customer.role);
-    const agencySettings = await AgencySettings.findOne({
-      userId: req.user._id,
-    });
-    const customerSettings = await CustomerSettings.findOne({
-      userId: customer._id,
-    });
-    if (agencySettings?.notifications?.meetingReminders) {
-      await createNotification({
-        agencyId: req.body.agencyId,
-        userId: user._id,
-        message: `You have successfully scheduled a meeting with ${customer.fullName} on ${req.body.date} at ${req.body.time}.`,
-        type: "meeting_scheduled",
-      });
-    }
-
-    if (customerSettings?.notifications?.meetingReminders) {
-      await createNotification({
-        userId: customer._id,
-        message: `${user.agencyId.name} has scheduled a meeting with you on ${req.body.date} at ${req.body.time}.`,
-        type: "meeting_scheduled",
-      });
-    }
-    if (agencySettings?.notifications?.pushNotifications)
-      await sendPushNotification({
-        userId: user._id,
-        title: "Meeting Scheduled",
-        message: `You have successfully scheduled a meeting with ${customer.fullName} on ${req.body.date} at ${req.body.time}.`,
-        urlPath: "/agent/meetings",
-        data: { meetingId: savedMeeting._id, token: agentToken },
-        actions: [
-          { action: "confirm", title: "Confirm" },
-          { action: "cancel", title: "Close" },
-        ],
-      });
-
-    if (customerSettings?.notifications?.pushNotifications)
-      await sendPushNotification({
-        userId: customer._id,
-        title: "New Meeting Invitation",
-        message: `${user.agencyId.name} has scheduled a meeting with you on ${req.body.date} at ${req.body.time}.`,
-        urlPath: "/customer/meetings",
-        data: { meetingId: savedMeeting._id, token: customerToken },
-        actions: [
-          { action: "confirm", title: "Confirm" },
-          { action: "cancel", title: "Close" },
+    const agentMessage = `You have successfully scheduled a meeting with ${customer.fullName} on ${req.body.date} at ${req.body.time}.`;
+    const customerMessage = `${user.agencyId.name} has scheduled a meeting with you on ${req.body.date} at ${req.body.time}.`;
+
+    // The meeting and its notifications are committed together
+    let savedMeeting;
+    await session.withTransaction(async () => {
+      savedMeeting = await new Meetings(req.body).save({ session });
+      await enqueueNotifications(
+        "meeting_scheduled",
+        [
+          {
+            userId: user._id,
+            settings: "agency",
+            when: "meetingReminders",
+            notification: {
+              agencyId: req.body.agencyId,
+              message: agentMessage,
+              type: "meeting_scheduled",
+            },
+            push: {
+              title: "Meeting Scheduled",
+              message: agentMessage,
+              urlPath: "/agent/meetings",
+              data: { meetingId: savedMeeting._id },
+              actions: MEETING_PUSH_ACTIONS,
+              tokenRole: user.role,
+            },
+          },
+          {
+            userId: customer._id,
+            settings: "customer",
+            when: "meetingReminders",
+            notification: {
+              message: customerMessage,
+              type: "meeting_scheduled",
+            },
+            push: {
+              title: "New Meeting Invitation",
+              message: customerMessage,
+              urlPath: "/customer/meetings",
+              data: { meetingId: savedMeeting._id },
+              actions: MEETING_PUSH_ACTIONS,
+              tokenRole: customer.role,
+            },
+          },
         ],
-      });
+        { key: `meeting_scheduled:${savedMeeting._id}`, session }
+      );
+    });
 
     return res.status(201).json({ success: true, data: savedMeeting });
   } catch (error) {
     return res.status(400).json({ success: false, message: error.message });
+  } finally {
+    await session.endSession();
   }
 };
 
-export const getMeetingsByAgency = async (req, res) => {
-  try {
-    const id = req.user.agencyId._id;
-    const { status } = req.query;
-    const page = parseInt(req.query.page) || 1;
-    const limit = parseInt(req.query.limit) || 10;
-    const skip = (page - 1) * limit;
-
-    const now = new Date();
-    const query = { agencyId: id };
-
-    if (status === "upcoming") {
-      // Only scheduled/rescheduled meetings with future datetime
-      query.$and = [
-        { status: { $in: ["scheduled", "rescheduled"] } },
-        {
-          $expr: {
-            $gte: [
-              {
-                $dateFromString: {
-                  dateString: {
-                    $concat: [
-                      { $dateToString: { format: "%Y-%m-%d", date: "$date" } },
-                      "T",
-                      "$time",
-                      ":00",
-                    ],
-                  },
+// Filter shared by getMeetingsByAgency and exportMeetings
+// (status: upcoming | past | cancelled)
+const buildMeetingQuery = (id, status) => {
+  const now = new Date();
+  const query = { agencyId: id };
+
+  if (status === "upcoming") {
+    // Only scheduled/rescheduled meetings with future datetime
+    query.$and = [
+      { status: { $in: ["scheduled", "rescheduled"] } },
+      {
+        $expr: {
+          $gte: [
+            {
+              $dateFromString: {
+                dateString: {
+                  $concat: [
+                    { $dateToString: { format: "%Y-%m-%d", date: "$date" } },
+                    "T",
+                    "$time",
+                    ":00",
+                  ],
                 },
               },
-              now,
-            ],
-          },
+            },
+            now,
+          ],
         },
-      ];
-    } else if (status === "past") {
-      // Meetings with status="past" OR old meetings not cancelled
-      query.$or = [
-        { status: "past" },
-        {
-          $and: [
-            { status: { $in: ["scheduled", "rescheduled"] } },
-            {
-              $expr: {
-                $lt: [
-                  {
-                    $dateFromString: {
-                      dateString: {
-                        $concat: [
-                          {
-                            $dateToString: {
-                              format: "%Y-%m-%d",
-                              date: "$date",
-                            },
+      },
+    ];
+  } else if (status === "past") {
+    // Meetings with status="past" OR old meetings not cancelled
+    query.$or = [
+      { status: "past" },
+      {
+        $and: [
+          { status: { $in: ["scheduled", "rescheduled"] } },
+          {
+            $expr: {
+              $lt: [
+                {
+                  $dateFromString: {
+                    dateString: {
+                      $concat: [
+                        {
+                          $dateToString: {
+                            format: "%Y-%m-%d",
+                            date: "$date",
                           },
-                          "T",
-                          "$time",
-                          ":00",
-                        ],
-                      },
+                        },
+                        "T",
+                        "$time",
+                        ":00",
+                      ],
                     },
                   },
-                  now,
-                ],
-              },
+                },
+                now,
+              ],
             },
-          ],
-        },
-      ];
-    } else if (status === "cancelled") {
-      query.status = "cancelled";
-    }
+          },
+        ],
+      },
+    ];
+  } else if (status === "cancelled") {
+    query.status = "cancelled";
+  }
 
-    const total = await Meetings.countDocuments(query);
+  return query;
+};
 
-    const meetings = await Meetings.find(query)
-      .populate("customerId", "fullName isDeleted")
-      .populate("propertyId", "title")
-      .skip(skip)
-      .limit(limit)
-      .sort({ date: status === "past" ? -1 : 1 })
-      .lean();
+export const getMeetingsByAgency = async (req, res) => {
+  try {
+    const id = req.user.agencyId._id;
+    const { status } = req.query;
+    const page = parseInt(req.query.page) || 1;
+    const limit = parseInt(req.query.limit) || 10;
+    const skip = (page - 1) * limit;
+
+    const query = buildMeetingQuery(id, status);
+
+    const paging = readPagination(req.query);
+    const sortOrder = status === "past" ? -1 : 1;
+    let meetings;
+    let cursorPagination;
+
+    if (paging.cursorMode) {
+      // 🔹 Cursor mode (opt-in via ?cursor=)
+      const result = await findCursorPage(Meetings, query, {
+        sort: keysetSort("date", sortOrder),
+        limit: paging.limit,
+        cursor: paging.cursor,
+        includeTotal: paging.includeTotal,
+        decorate: (q) =>
+          q
+            .populate("customerId", "fullName isDeleted")
+            .populate("propertyId", "title")
+            .lean(),
+      });
+      meetings = result.data;
+      cursorPagination = result.pagination;
+    } else {
+      meetings = await Meetings.find(query)
+        .populate("customerId", "fullName isDeleted")
+        .populate("propertyId", "title")
+        .skip(skip)
+        .limit(limit)
+        .sort({ date: sortOrder })
+        .lean();
+    }
 
     const formattedMeetings = meetings
       .filter((m) => !m.customerId?.isDeleted)
@@ -175,9 +218,66 @@ export const getMeetingsByAgency = async (req, res) => {
       success: true,
       data: formattedMeetings,
       total: formattedMeetings.length,
+      ...(cursorPagination && { pagination: cursorPagination }),
     });
   } catch (error) {
-    res.status(500).json({ success: false, message: error.message });
+    res
+      .status(error.statusCode || 500)
+      .json({ success: false, message: error.message });
+  }
+};
+
+// Flattened meeting row for exports (rows of deleted customers are skipped)
+const toMeetingExportRow = (m) =>
+  m.customerId?.isDeleted
+    ? null
+    : {
+        _id: m._id,
+        date: m.date,
+        time: m.time,
+        status: m.status,
+        customerId: m.customerId?._id,
+        customer: m.customerId?.fullName,
+        propertyId: m.propertyId?._id,
+        property: m.propertyId?.title,
+        createdAt: m.createdAt,
+      };
+
+const MEETING_EXPORT_COLUMNS = [
+  "_id",
+  "date",
+  "time",
+  "status",
+  "customerId",
+  "customer",
+  "propertyId",
+  "property",
+  "createdAt",
+].map((key) => ({ header: key, value: (row) => row[key] }));
+
+// Stream every meeting matching the getMeetingsByAgency filters
+export const exportMeetings = async (req, res) => {
+  try {
+    const format = readExportFormat(req.query.format);
+    const { status } = req.query;
+    const query = buildMeetingQuery(req.user.agencyId._id, status);
+
+    const cursor = exportCursor(
+      Meetings.find(query)
+        .populate("customerId", "fullName isDeleted")
+        .populate("propertyId", "title")
+        .sort(keysetSort("date", status === "past" ? -1 : 1))
+    );
+    return streamExport(req, res, cursor, {
+      format,
+      filename: "meetings",
+      columns: MEETING_EXPORT_COLUMNS,
+      transform: toMeetingExportRow,
+    });
+  } catch (error) {
+    return res
+      .status(error.statusCode || 500)
+      .json({ success: false, message: error.message });
   }
 };
 
@@ -229,56 +329,44 @@ export const updateMeeting = async (req, res) => {
         .json({ success: false, message: "Meeting not found" });
     }
 
-    const agencySettings = await AgencySettings.findOne({
-      userId: req.user._id,
-    });
-    const customerSettings = await CustomerSettings.findOne({
-      userId: customerId,
-    });
-
-    const customer = await Customer.findById(customerId);
-
-    if (customerSettings?.notifications?.pushNotifications)
-      await sendPushNotification({
-        userId: customerId,
-        title: "Meeting Updation",
-        message: `${req.user.agencyId.name} has Updated your meeting to be on ${newBody.date} at ${newBody.time}.`,
-        urlPath: "/customer/meetings",
-        data: {},
-        actions: [
-          { action: "confirm", title: "Confirm" },
-          { action: "cancel", title: "Close" },
-        ],
-      });
-    if (agencySettings?.notifications?.pushNotifications)
-      await sendPushNotification({
-        userId: req.user._id,
-        title: "Meeting Updation",
-        message: `Your meeting with ${customer.fullName} has been updated to be on ${newBody.date} at ${newBody.time}.`,
-        urlPath: "/agent/meetings",
-        data: {},
-        actions: [
-          { action: "confirm", title: "Confirm" },
-          { action: "cancel", title: "Close" },
-        ],
-      });
+    const customer = await Customer.findById(customerId)
+      .select("fullName")
+      .lean();
+    const agentMessage = `Your meeting with ${customer.fullName} has been updated to be on ${newBody.date} at ${newBody.time}.`;
+    const customerMessage = `${req.user.agencyId.name} has Updated your meeting to be on ${newBody.date} at ${newBody.time}.`;
 
-      if (agencySettings?.notifications?.meetingReminders) {
-      await createNotification({
-        agencyId: agencyId,
+    await enqueueNotifications("meeting_updated", [
+      {
         userId: req.user._id,
-        message: `Your meeting with ${customer.fullName} has been updated to be on ${newBody.date} at ${newBody.time}.`,
-        type: "meeting_scheduled",
-      });
-    }
-
-    if (customerSettings?.notifications?.meetingReminders) {
-      await createNotification({
+        settings: "agency",
+        when: "meetingReminders",
+        notification: {
+          agencyId,
+          message: agentMessage,
+          type: "meeting_scheduled",
+        },
+        push: {
+          title: "Meeting Updation",
+          message: agentMessage,
+          urlPath: "/agent/meetings",
+          data: {},
+          actions: MEETING_PUSH_ACTIONS,
+        },
+      },
+      {
         userId: customerId,
-        message: `${req.user.agencyId.name} has Updated your meeting to be on ${newBody.date} at ${newBody.time}.`,
-        type: "meeting_scheduled",
-      });
-    }
+        settings: "customer",
+        when: "meetingReminders",
+        notification: { message: customerMessage, type: "meeting_scheduled" },
+        push: {
+          title: "Meeting Updation",
+          message: customerMessage,
+          urlPath: "/customer/meetings",
+          data: {},
+          actions: MEETING_PUSH_ACTIONS,
+        },
+      },
+    ]);
 
     return res.json({ success: true, data: updatedMeeting });
   } catch (error) {
@@ -308,56 +396,45 @@ export const updateMeetingStatus = async (req, res) => {
         .json({ success: false, message: "Meeting not found" });
     }
 
-    const agencySettings = await AgencySettings.findOne({
-      userId: req.user._id,
-    });
-    const customerSettings = await CustomerSettings.findOne({
-      userId: updatedMeeting.customerId,
-    });
-
-    const customer = await Customer.findById(updatedMeeting.customerId);
-
-    if (customerSettings?.notifications?.pushNotifications)
-      await sendPushNotification({
-        userId: updatedMeeting.customerId,
-        title: "Meeting Cancellation",
-        message: `Your meeting on ${updatedMeeting.date.toISOString().split("T")[0]} at ${updatedMeeting.time} has been ${status} by ${req.user.agencyId.name}.`,
-        urlPath: "/customer/meetings",
-        data: {},
-        actions: [
-          { action: "confirm", title: "Confirm" },
-          { action: "cancel", title: "Close" },
-        ],
-      });
-    if (agencySettings?.notifications?.pushNotifications)
-      await sendPushNotification({
-        userId: req.user._id,
-        title: "Meeting Cancellation",
-        message: `Your meeting with ${customer.fullName} has been successfully ${status}.`,
-        urlPath: "/agent/meetings",
-        data: {},
-        actions: [
-          { action: "confirm", title: "Confirm" },
-          { action: "cancel", title: "Close" },
-        ],
-      });
+    const customer = await Customer.findById(updatedMeeting.customerId)
+      .select("fullName")
+      .lean();
+    const meetingDate = updatedMeeting.date.toISOString().split("T")[0];
+    const agentMessage = `Your meeting with ${customer.fullName} has been successfully ${status}.`;
+    const customerMessage = `Your meeting on ${meetingDate} at ${updatedMeeting.time} has been ${status} by ${req.user.agencyId.name}.`;
 
-      if (agencySettings?.notifications?.meetingReminders) {
-      await createNotification({
-        agencyId: updatedMeeting.agencyId,
+    await enqueueNotifications("meeting_status", [
+      {
         userId: req.user._id,
-        message: `Your meeting with ${customer.fullName} has been successfully ${status}.`,
-        type: "meeting_scheduled",
-      });
-    }
-
-    if (customerSettings?.notifications?.meetingReminders) {
-      await createNotification({
+        settings: "agency",
+        when: "meetingReminders",
+        notification: {
+          agencyId: updatedMeeting.agencyId,
+          message: agentMessage,
+          type: "meeting_scheduled",
+        },
+        push: {
+          title: "Meeting Cancellation",
+          message: agentMessage,
+          urlPath: "/agent/meetings",
+          data: {},
+          actions: MEETING_PUSH_ACTIONS,
+        },
+      },
+      {
         userId: updatedMeeting.customerId,
-        message: `Your meeting on ${updatedMeeting.date.toISOString().split("T")[0]} at ${updatedMeeting.time} has been ${status} by ${req.user.agencyId.name}.`,
-        type: "meeting_scheduled",
-      });
-    }
+        settings: "customer",
+        when: "meetingReminders",
+        notification: { message: customerMessage, type: "meeting_scheduled" },
+        push: {
+          title: "Meeting Cancellation",
+          message: customerMessage,
+          urlPath: "/customer/meetings",
+          data: {},
+          actions: MEETING_PUSH_ACTIONS,
+        },
+      },
+    ]);
 
     return res.json({ success: true, data: updatedMeeting });
   } catch (error) {
@@ -1,50 +1,73 @@
+import fs from "fs";
 import { Property } from "../../models/Agent/PropertyModel.js";
-import { Notification } from "../../models/Common/NotificationModel.js"; // Assuming this is the correct path
-import { sendPushNotification } from "../../utils/pushService.js";
-import AgencySettings from "../../models/Agent/settingsModel.js";
+import {
+  buildSearchMatch,
+  findProperties,
+  findPropertyCursorPage,
+  parseSearchTerms,
+} from "../../utils/propertySearch.js";
+import { keysetSort, readPagination } from "../../utils/pagination.js";
+import { parseGeoQuery } from "../../utils/propertyGeo.js";
+import {
+  parseAreaRange,
+  readPropertySort,
+  requireSortField,
+} from "../../utils/propertyArea.js";
+import {
+  applyCoordinates,
+  cleanPayloadNumbers,
+  ensureArray,
+  newPropertyCode,
+} from "../../utils/propertyPayload.js";
+import {
+  detectImportFormat,
+  importProperties,
+} from "../../utils/propertyImport.js";
+import {
+  exportCursor,
+  readExportFormat,
+  schemaColumns,
+  streamExport,
+} from "../../utils/exportStream.js";
+import { findCachedProperty } from "../../utils/propertyCatalogCache.js";
+import { resolvePropertyProjection } from "../../utils/propertyProjections.js";
+import { findPropertiesWithFacets } from "../../utils/propertyFacets.js";
+import { PROPERTY_MATCH_FIELDS } from "../../utils/preferenceMatching.js";
+import { matchPropertyInBackground } from "../../utils/propertyMatches.js";
+import {
+  invalidateRecommendationsInBackground,
+  PROPERTY_RECOMMENDATION_FIELDS,
+  removePropertyRecommendationsInBackground,
+  updatePropertyRecommendationsInBackground,
+} from "../../utils/recommendations.js";
+import {
+  sendSerialized,
+  serializeProperties,
+} from "../../utils/serializers.js";
+import { enqueueNotifications } from "../../utils/notificationOutbox.js";
 import { PropertyShare } from "../../models/Agent/PropertyShareModel.js";
-import CustomerSettings from "../../models/Customer/SettingsModel.js";
-
-// Utility: Convert invalid numbers to null
-const cleanNumber = (value) => {
-  if (value === "" || value === null || value === undefined) return null;
-  if (value === "NaN") return null;
-  if (typeof value === "number" && Number.isNaN(value)) return null;
-  if (typeof value === "string" && isNaN(Number(value))) return null;
-  return Number(value);
-};
+import { PropertyMatch } from "../../models/Agent/PropertyMatchModel.js";
 
 const handlePostCreationNotifications = async (user, property) => {
   try {
-    const agencySettings = await AgencySettings.findOne({ userId: user._id });
-
-    if (!agencySettings) return;
-
-    const notificationPromises = [];
-
-    if (agencySettings.notifications?.propertyUpdates) {
-      notificationPromises.push(
-        Notification.create({
-          userId: user._id,
+    await enqueueNotifications("property_added", [
+      {
+        userId: user._id,
+        settings: "agency",
+        when: "propertyUpdates",
+        notification: {
           agencyId: property.agencyId,
           message: `New property "${property.title}" was added.`,
           type: "property_added",
           link: `/agent/properties/view/${property._id}`,
-        })
-      );
-    }
-
-    if (agencySettings.notifications?.pushNotifications) {
-      notificationPromises.push(
-        sendPushNotification({
-          userId: user._id,
+        },
+        push: {
           title: "New Property Added",
           message: `A new property "${property.title}" has been successfully added.`,
           urlPath: `/agent/properties/${property._id}`,
-        })
-      );
-    }
-    await Promise.all(notificationPromises);
+        },
+      },
+    ]);
   } catch (error) {
     console.error("Error handling post-creation notifications:", error);
   }
@@ -52,61 +75,52 @@ const handlePostCreationNotifications = async (user, property) => {
 
 const handlePostUpdateNotifications = async (user, property) => {
   try {
-    const agencySettings = await AgencySettings.findOne({ userId: user._id });
-
-    if (!agencySettings) return;
-
-    const notificationPromises = [];
-
-    if (agencySettings.notifications?.propertyUpdates) {
-      notificationPromises.push(
-        Notification.create({
-          userId: user._id,
+    await enqueueNotifications("property_updated", [
+      {
+        userId: user._id,
+        settings: "agency",
+        when: "propertyUpdates",
+        notification: {
           agencyId: property.agencyId,
           message: `Property "${property.title}" was updated.`,
           type: "property_updated",
           link: `/agent/properties/view/${property._id}`,
-        })
-      );
-    }
-
-    await Promise.all(notificationPromises);
+        },
+      },
+    ]);
   } catch (error) {
     console.error("Error handling post-update notifications:", error);
   }
 };
 
-// Clean payload numbers dynamically
-const cleanPayloadNumbers = (payload) => {
-  const numberFields = [
-    "price",
-    "built_up_area",
-    "carpet_area",
-    "plot_front_area",
-    "plot_depth_area",
-    "washrooms",
-    "cabins",
-    "conference_rooms",
-    "floor_number",
-    "total_floors",
-    "bedrooms",
-    "bathrooms",
-    "balconies",
-  ];
-
-  numberFields.forEach((field) => {
-    if (payload[field] !== undefined) {
-      payload[field] = cleanNumber(payload[field]);
-    }
-  });
-
-  return payload;
-};
-
-// Convert form-data arrays
-const ensureArray = (value) => {
-  if (!value) return [];
-  return Array.isArray(value) ? value : [value];
+// One summary notification per import instead of one per property
+const handlePostImportNotifications = async (user, summary) => {
+  try {
+    const message =
+      `Imported ${summary.inserted} of ${summary.total} properties` +
+      (summary.failed ? ` (${summary.failed} rows failed).` : ".");
+
+    await enqueueNotifications("property_import", [
+      {
+        userId: user._id,
+        settings: "agency",
+        when: "propertyUpdates",
+        notification: {
+          agencyId: user.agencyId?._id,
+          message,
+          type: "property_added",
+          link: "/agent/properties",
+        },
+        push: {
+          title: "Property Import Finished",
+          message,
+          urlPath: "/agent/properties",
+        },
+      },
+    ]);
+  } catch (error) {
+    console.error("Error handling post-import notifications:", error);
+  }
 };
 
 export const createProperty = async (req, res) => {
@@ -125,6 +139,7 @@ export const createProperty = async (req, res) => {
     payload.water_source = ensureArray(payload.water_source);
     payload.amenities = ensureArray(payload.amenities);
     payload.features = ensureArray(payload.features);
+    applyCoordinates(payload);
 
     // Use agencyId from authenticated user if not supplied
     if (Array.isArray(payload.agencyId)) {
@@ -145,12 +160,7 @@ export const createProperty = async (req, res) => {
     const propertyData = {
       ...payload,
       images: imageEntries,
-      property_code:
-        payload.property_code ||
-        `PROP-${Date.now()}-${Math.random()
-          .toString(36)
-          .substring(2, 7)
-          .toUpperCase()}`,
+      property_code: payload.property_code || newPropertyCode(),
     };
 
     const property = new Property(propertyData);
@@ -166,6 +176,8 @@ export const createProperty = async (req, res) => {
     // Handle notifications in the background
     // This is a "fire-and-forget" call
     handlePostCreationNotifications(req.user, savedProperty);
+    matchPropertyInBackground(savedProperty, req.user);
+    updatePropertyRecommendationsInBackground(savedProperty);
   } catch (error) {
     console.error("Error creating property:", error);
     if (error.name === "ValidationError") {
@@ -200,6 +212,7 @@ export const updateProperty = async (req, res) => {
     payload.water_source = ensureArray(payload.water_source);
     payload.amenities = ensureArray(payload.amenities);
     payload.features = ensureArray(payload.features);
+    applyCoordinates(payload);
 
     if (Array.isArray(payload.agencyId)) {
       payload.agencyId = payload.agencyId[0];
@@ -265,6 +278,18 @@ export const updateProperty = async (req, res) => {
     // Perform notification tasks in the background after responding
     // This is a "fire-and-forget" approach
     handlePostUpdateNotifications(req.user, updatedProperty);
+
+    // Re-match and re-rank only when a field they depend on has changed
+    const changed = (fields) =>
+      fields.some(
+        (field) => String(property[field]) !== String(updatedProperty?.[field])
+      );
+    if (updatedProperty && changed(PROPERTY_MATCH_FIELDS)) {
+      matchPropertyInBackground(updatedProperty, req.user);
+    }
+    if (updatedProperty && changed(PROPERTY_RECOMMENDATION_FIELDS)) {
+      updatePropertyRecommendationsInBackground(updatedProperty);
+    }
   } catch (error) {
     console.error("Error updating property:", error);
     if (error.name === "ValidationError") {
@@ -283,7 +308,12 @@ export const updateProperty = async (req, res) => {
 
 export const getSingleProperty = async (req, res) => {
   try {
-    const property = await Property.findById(req.params.id);
+    const property =
+      (await findCachedProperty(
+        Property,
+        req.user?.agencyId?._id,
+        req.params.id
+      )) || (await Property.findById(req.params.id));
     if (!property) {
       return res
         .status(404)
@@ -299,95 +329,242 @@ export const getSingleProperty = async (req, res) => {
   }
 };
 
-export const getProperties = async (req, res) => {
-  try {
-    const {
-      title,
-      status,
-      minPrice,
-      maxPrice,
-      page = 1,
-      limit = 10,
-      // New filters from frontend
-      type,
-      category,
-      unit_area_type,
-      facing,
-      is_corner_plot,
-      plot_dimension_unit,
-      rera_status,
-      transaction_type,
-    } = req.query;
-
-    const pageNumber = parseInt(page, 10) || 1;
-    const pageSize = parseInt(limit, 10) || 10;
-    const skip = (pageNumber - 1) * pageSize;
-
-    // 🔹 Build filter
-    const filter = { agencyId: req.user.agencyId._id };
-
-    // 🔹 Flexible search (title, description, location, etc.)
-    if (title && title.trim() !== "") {
-      filter.$or = [
-        { title: { $regex: title.trim(), $options: "i" } },
-        { description: { $regex: title.trim(), $options: "i" } },
-        { location: { $regex: title.trim(), $options: "i" } },
-      ];
-    }
+// Build the listing filter shared by getProperties and getPropertyFacets
+const buildPropertyFilter = (req) => {
+  const {
+    title,
+    status,
+    minPrice,
+    maxPrice,
+    minArea,
+    maxArea,
+    sort: sortParam,
+    // New filters from frontend
+    type,
+    category,
+    unit_area_type,
+    facing,
+    is_corner_plot,
+    plot_dimension_unit,
+    rera_status,
+    transaction_type,
+  } = req.query;
+
+  // 🔹 Build filter
+  const filter = { agencyId: req.user.agencyId._id };
+
+  // 🔹 Ranked search (title, description, location, etc.)
+  const searchTerms = parseSearchTerms(title);
+  if (searchTerms.length) {
+    Object.assign(filter, buildSearchMatch(searchTerms));
+  }
 
-    // 🔹 Status filter
-    if (status && status.trim() !== "") {
-      filter.status = status;
-    }
+  // 🔹 Status filter
+  if (status && status.trim() !== "") {
+    filter.status = status;
+  }
+
+  // 🔹 Price range
+  if (minPrice || maxPrice) {
+    filter.price = {};
+    if (minPrice) filter.price.$gte = Number(minPrice);
+    if (maxPrice) filter.price.$lte = Number(maxPrice);
+  }
 
-    // 🔹 Price range
-    if (minPrice || maxPrice) {
-      filter.price = {};
-      if (minPrice) filter.price.$gte = Number(minPrice);
-      if (maxPrice) filter.price.$lte = Number(maxPrice);
+  // 🔹 Area range in square feet, whatever unit the listing was entered in
+  const areaRange = parseAreaRange({ minArea, maxArea });
+  if (areaRange) filter.area_sqft = areaRange;
+
+  // 🔹 Add new filters (skip empty strings)
+  if (type && type !== "") filter.type = type;
+  if (category && category !== "") filter.category = category;
+  if (unit_area_type && unit_area_type !== "")
+    filter.unit_area_type = unit_area_type;
+  if (facing && facing !== "") filter.facing = facing;
+  if (plot_dimension_unit && plot_dimension_unit !== "")
+    filter.plot_dimension_unit = plot_dimension_unit;
+  if (rera_status && rera_status !== "") filter.rera_status = rera_status;
+  if (transaction_type && transaction_type !== "")
+    filter.transaction_type = transaction_type;
+
+  // Handle boolean filter (normalize to 'yes'/'no')
+  if (typeof is_corner_plot !== "undefined" && is_corner_plot !== "") {
+    if (is_corner_plot === "true" || is_corner_plot === "yes") {
+      filter.is_corner_plot = "yes";
+    } else if (is_corner_plot === "false" || is_corner_plot === "no") {
+      filter.is_corner_plot = "no";
     }
+  }
+
+  // 🔹 Nearby / map viewport / drawn area, ordered by distance
+  const geo = parseGeoQuery(req.query);
+  if (geo) filter.geo_location = geo.clause;
+
+  // 🔹 Ordering (?sort=price_per_sqft, -area_sqft, ...)
+  const sort = readPropertySort(sortParam);
+  requireSortField(filter, sort);
 
-    // 🔹 Add new filters (skip empty strings)
-    if (type && type !== "") filter.type = type;
-    if (category && category !== "") filter.category = category;
-    if (unit_area_type && unit_area_type !== "")
-      filter.unit_area_type = unit_area_type;
-    if (facing && facing !== "") filter.facing = facing;
-    if (plot_dimension_unit && plot_dimension_unit !== "")
-      filter.plot_dimension_unit = plot_dimension_unit;
-    if (rera_status && rera_status !== "") filter.rera_status = rera_status;
-    if (transaction_type && transaction_type !== "")
-      filter.transaction_type = transaction_type;
-
-    // Handle boolean filter (normalize to 'yes'/'no')
-    if (typeof is_corner_plot !== "undefined" && is_corner_plot !== "") {
-      if (is_corner_plot === "true" || is_corner_plot === "yes") {
-        filter.is_corner_plot = "yes";
-      } else if (is_corner_plot === "false" || is_corner_plot === "no") {
-        filter.is_corner_plot = "no";
-      }
+  return { filter, searchTerms, near: geo?.near, sort };
+};
+
+export const getProperties = async (req, res) => {
+  try {
+    const paging = readPagination(req.query);
+    const select = resolvePropertyProjection(Property, req.query.fields);
+    const { filter, searchTerms, near, sort } = buildPropertyFilter(req);
+
+    // 🔹 Cursor mode (opt-in via ?cursor=)
+    if (paging.cursorMode) {
+      const result = await findPropertyCursorPage(Property, {
+        filter,
+        terms: searchTerms,
+        sort,
+        paging,
+        select,
+        near,
+      });
+      return sendSerialized(
+        res,
+        200,
+        {
+          success: true,
+          message: "Properties fetched successfully",
+          ...result,
+        },
+        { data: serializeProperties }
+      );
     }
 
     // 🔹 Fetch data
-    const [properties, total] = await Promise.all([
-      Property.find(filter).sort({ createdAt: -1 }).skip(skip).limit(pageSize),
-      Property.countDocuments(filter),
+    const [properties, total] = await findProperties(Property, {
+      filter,
+      terms: searchTerms,
+      sort,
+      skip: paging.skip,
+      limit: paging.limit,
+      select,
+      near,
+    });
+
+    return sendSerialized(
+      res,
+      200,
+      {
+        success: true,
+        message: "Properties fetched successfully",
+        data: properties,
+        pagination: {
+          total,
+          page: paging.page,
+          pages: Math.ceil(total / paging.limit),
+          limit: paging.limit,
+        },
+      },
+      { data: serializeProperties }
+    );
+  } catch (error) {
+    console.error("Error fetching properties:", error);
+    return res.status(error.statusCode || 500).json({
+      success: false,
+      message: error.message || "Server error",
+    });
+  }
+};
+
+// Results page, total, per-value filter counts and price buckets in one query
+export const getPropertyFacets = async (req, res) => {
+  try {
+    const paging = readPagination(req.query);
+    const select = resolvePropertyProjection(Property, req.query.fields);
+    const { filter, searchTerms, near, sort } = buildPropertyFilter(req);
+
+    const result = await findPropertiesWithFacets(Property, {
+      filter,
+      terms: searchTerms,
+      sort,
+      paging,
+      select,
+      near,
+    });
+
+    return sendSerialized(
+      res,
+      200,
+      {
+        success: true,
+        message: "Property facets fetched successfully",
+        ...result,
+      },
+      { data: serializeProperties }
+    );
+  } catch (error) {
+    console.error("Error fetching property facets:", error);
+    return res.status(error.statusCode || 500).json({
+      success: false,
+      message: error.message || "Server error",
+    });
+  }
+};
+
+// CSV columns; the list and coordinate columns round-trip through the import
+const PROPERTY_EXPORT_COLUMNS = schemaColumns(Property.schema, {
+  exclude: ["geo_location", "images", "agencyId", "owner"],
+  extra: [
+    { header: "latitude", value: (doc) => doc.geo_location?.coordinates?.[1] },
+    { header: "longitude", value: (doc) => doc.geo_location?.coordinates?.[0] },
+    { header: "images", value: (doc) => doc.images?.map((img) => img.url) },
+  ],
+});
+
+// Stream every listing matching the getProperties filters (?format=csv|ndjson)
+export const exportProperties = async (req, res) => {
+  try {
+    const format = readExportFormat(req.query.format);
+    const { filter, sort } = buildPropertyFilter(req);
+    const [field] = Object.keys(sort);
+
+    const cursor = exportCursor(
+      Property.find(filter).sort(keysetSort(field, sort[field]))
+    );
+    return streamExport(req, res, cursor, {
+      format,
+      filename: "properties",
+      columns: PROPERTY_EXPORT_COLUMNS,
+    });
+  } catch (error) {
+    console.error("Error exporting properties:", error);
+    return res.status(error.statusCode || 500).json({
+      success: false,
+      message: error.message || "Server error",
+    });
+  }
+};
+
+// Customers whose preferences match a listing, best match first
+export const getPropertyMatches = async (req, res) => {
+  try {
+    const { limit, page, skip } = readPagination(req.query, 20);
+    const filter = { propertyId: req.params.id };
+    if (req.user?.agencyId?._id) filter.agencyId = req.user.agencyId._id;
+
+    const [matches, total] = await Promise.all([
+      PropertyMatch.find(filter)
+        .sort({ score: -1, _id: 1 })
+        .skip(skip)
+        .limit(limit)
+        .populate("customerId", "fullName email phoneNumber")
+        .lean(),
+      PropertyMatch.countDocuments(filter),
     ]);
 
-    res.status(200).json({
+    return res.status(200).json({
       success: true,
-      message: "Properties fetched successfully",
-      data: properties,
-      pagination: {
-        total,
-        page: pageNumber,
-        pages: Math.ceil(total / pageSize),
-        limit: pageSize,
-      },
+      data: matches,
+      pagination: { total, page, pages: Math.ceil(total / limit), limit },
     });
   } catch (error) {
-    console.error("Error fetching properties:", error);
-    res.status(500).json({
+    console.error("Error fetching property matches:", error);
+    return res.status(500).json({
       success: false,
       message: error.message || "Server error",
     });
@@ -396,14 +573,12 @@ export const getProperties = async (req, res) => {
 
 export const deleteProperty = async (req, res) => {
   try {
-    const sharedProperty = await PropertyShare.find({
+    const sharedWith = await PropertyShare.distinct("sharedWithUserId", {
+      propertyId: req.params.id,
+    });
+    await PropertyShare.deleteMany({
       propertyId: req.params.id,
     });
-    if (sharedProperty) {
-      await PropertyShare.deleteMany({
-        propertyId: req.params.id,
-      });
-    }
     const property = await Property.findByIdAndDelete(req.params.id);
     if (!property) {
       return res.status(404).json({
@@ -411,49 +586,48 @@ export const deleteProperty = async (req, res) => {
         message: "Property not found",
       });
     }
-    const agencySettings = await AgencySettings.findOne({
-      userId: req.user._id,
-    });
-    if (agencySettings?.notifications?.propertyUpdates)
-      await Notification.create({
-        userId: req.user._id,
-        agencyId: property.agencyId,
-        message: `Property "${property.title}" was deleted.`,
-        type: "property_deleted",
-        link: `/agent/properties/view/${property._id}`,
-      });
-
-    if (agencySettings?.notifications?.pushNotifications)
-      await sendPushNotification({
-        userId: req.user._id,
-        title: "Property Deleted",
-        message: `The property "${property.title}" has been successfully deleted.`,
-        urlPath: `/agent/properties/view/${property._id}`,
-      });
-
-    if (sharedProperty) {
-      const customerSettings = await CustomerSettings.findOne({
-            userId: sharedProperty[0] ?.sharedWithUserId,
-          });
-
-      if (customerSettings?.notifications?.pushNotifications) {
-        await sendPushNotification({
-          userId: sharedProperty[0]?.sharedWithUserId,
-          title: "Property Deleted",
-          message: `The property "${property.title}" shared with you has been deleted.`,
-          urlPath: `/customer/properties/${property._id}`,
-        });
-      }
-
-      if (customerSettings?.notifications?.propertyUpdates)
-      await Notification.create({
-        userId: sharedProperty[0]?.sharedWithUserId,
-        agencyId: property.agencyId,
-        message: `Property "${property.title}" has been deleted.`,
-        type: "property_deleted",
-        link: `/agent/properties/${property._id}`,
-      });
-    }
+    await PropertyMatch.deleteMany({ propertyId: property._id });
+    removePropertyRecommendationsInBackground(property._id);
+
+    // The agent and every customer the property was shared with
+    await enqueueNotifications(
+      "property_deleted",
+      [
+        {
+          userId: req.user._id,
+          settings: "agency",
+          when: "propertyUpdates",
+          notification: {
+            agencyId: property.agencyId,
+            message: `Property "${property.title}" was deleted.`,
+            type: "property_deleted",
+            link: `/agent/properties/view/${property._id}`,
+          },
+          push: {
+            title: "Property Deleted",
+            message: `The property "${property.title}" has been successfully deleted.`,
+            urlPath: `/agent/properties/view/${property._id}`,
+          },
+        },
+        ...sharedWith.map((customerId) => ({
+          userId: customerId,
+          settings: "customer",
+          when: "propertyUpdates",
+          notification: {
+            agencyId: property.agencyId,
+            message: `Property "${property.title}" has been deleted.`,
+            type: "property_deleted",
+            link: `/agent/properties/${property._id}`,
+          },
+          push: {
+            title: "Property Deleted",
+            message: `The property "${property.title}" shared with you has been deleted.`,
+            urlPath: `/customer/properties/${property._id}`,
+          },
+        })),
+      ],
+      { key: `property_deleted:${property._id}` }
+    );
 
     return res.status(200).json({
       success: true,
@@ -467,3 +641,53 @@ export const deleteProperty = async (req, res) => {
     });
   }
 };
+
+// Bulk import from an uploaded CSV/NDJSON file (field "file").
+// Rows are streamed and inserted in batches; images listed by URL are
+// attached in the background. Responds with per-row errors.
+export const importPropertiesFile = async (req, res) => {
+  const file = req.file;
+  try {
+    if (!file) {
+      return res
+        .status(400)
+        .json({ success: false, message: "No import file uploaded." });
+    }
+
+    const agencyId = req.user?.agencyId?._id;
+    if (!agencyId) {
+      return res.status(400).json({
+        success: false,
+        message: "Agency information is missing.",
+      });
+    }
+
+    const format = detectImportFormat(req.body.format, file.originalname);
+    const summary = await importProperties(
+      Property,
+      fs.createReadStream(file.path),
+      { format, agencyId }
+    );
+
+    // Background summary notification, the response does not wait for it
+    if (summary.inserted) {
+      handlePostImportNotifications(req.user, summary);
+      // Too many listings to re-score one by one: recompute lists on read
+      invalidateRecommendationsInBackground({ agencyId });
+    }
+
+    return res.status(summary.inserted ? 201 : 200).json({
+      success: true,
+      message: `Imported ${summary.inserted} of ${summary.total} properties.`,
+      data: summary,
+    });
+  } catch (error) {
+    console.error("Error importing properties:", error);
+    return res.status(error.statusCode || 500).json({
+      success: false,
+      message: error.message || "Server error",
+    });
+  } finally {
+    if (file) fs.promises.unlink(file.path).catch(() => {});
+  }
+};
@@ -1,10 +1,10 @@
 import { PropertyShare } from "../../models/Agent/PropertyShareModel.js";
 import mongoose from "mongoose";
-import { createNotification } from "../../utils/apiFunctions/Notifications/index.js";
-import { sendPushNotification } from "../../utils/pushService.js";
-import AgencySettings from "../../models/Agent/settingsModel.js";
-import CustomerSettings from "../../models/Customer/SettingsModel.js";
+import { enqueueNotifications } from "../../utils/notificationOutbox.js";
 import { Customer } from "../../models/Agent/CustomerModel.js";
+import { findCursorPage, readPagination } from "../../utils/pagination.js";
+import { populateProperty } from "../../utils/propertyProjections.js";
+import { invalidateRecommendationsInBackground } from "../../utils/recommendations.js";
 
 export const shareProperty = async (req, res) => {
   try {
@@ -17,27 +17,33 @@ export const shareProperty = async (req, res) => {
         .json({ error: "All required fields must be provided" });
     }
 
-    const agencySettings = await AgencySettings.findOne({
-      userId: req.user._id,
-    });
-
-    const alreadyExistingShare = await PropertyShare.findOne({
+    const alreadyExistingShare = await PropertyShare.exists({
       propertyId,
       sharedWithUserId,
       sharedByUserId,
     });
 
     const customer = await Customer.findById(sharedWithUserId)
-      .populate('agencyId','name');
+      .select("fullName agencyId")
+      .populate("agencyId", "name")
+      .lean();
+
+    // Agency notices go to the agency, gated by the sharing user's settings
+    const agencyRecipient = (pushTitle, message) => ({
+      userId: agencyId,
+      settings: "agency",
+      settingsUserId: req.user._id,
+      when: "propertyUpdates",
+      push: { title: pushTitle, message, urlPath: "/agent/shares" },
+    });
 
     if (alreadyExistingShare) {
-      if (agencySettings?.notifications?.pushNotifications)
- await sendPushNotification({
-        userId: agencyId,
-        title: "Property Already Shared",
-        message: `You have Already Shared This Property With Customer (${customer?.fullName}).`,
-        urlPath: "/agent/shares",
-      });
+      await enqueueNotifications("property_share_exists", [
+        agencyRecipient(
+          "Property Already Shared",
+          `You have Already Shared This Property With Customer (${customer?.fullName}).`
+        ),
+      ]);
       return res.status(200).json({message:"You Have Already Shared this Property with this Customer"});
     }
 
@@ -49,43 +55,46 @@ export const shareProperty = async (req, res) => {
       message,
     });
 
-    const savedShare = await newShare.save();
-
-    const customerSettings = await CustomerSettings.findOne({
-      userId: sharedWithUserId,
-    });
-
-    if (agencySettings?.notifications?.pushNotifications)
- await sendPushNotification({
-        userId: agencyId,
-        title: "Property Shared Successfully",
-        message: `You have shared a property with Customer (${customer.fullName}) successfully.`,
-        urlPath: "/agent/shares",
+    const agencyMessage = `You have shared a property with Customer (${customer?.fullName}) successfully.`;
+    const customerMessage = `A property has been shared with you By ${customer?.agencyId?.name}. Check it out!`;
+
+    // The share and its notifications are committed together
+    const session = await mongoose.startSession();
+    let savedShare;
+    try {
+      await session.withTransaction(async () => {
+        savedShare = await newShare.save({ session });
+        await enqueueNotifications(
+          "property_share",
+          [
+            {
+              ...agencyRecipient("Property Shared Successfully", agencyMessage),
+              notification: {
+                agencyId,
+                message: agencyMessage,
+                type: "property_share",
+              },
+            },
+            {
+              userId: sharedWithUserId,
+              settings: "customer",
+              when: "propertyUpdates",
+              notification: { message: customerMessage, type: "property_share" },
+              push: {
+                title: "New Property Shared",
+                message: customerMessage,
+                urlPath: "/customer/properties",
+              },
+            },
+          ],
+          { key: `property_share:${savedShare._id}`, session }
+        );
       });
-      if (agencySettings?.notifications?.propertyUpdates) {
-        await createNotification({
-      agencyId,
-      userId: agencyId,
-      message: `You have shared a property with Customer (${customer.fullName}) successfully.`,
-      type: "property_share",
-    });
-
+    } finally {
+      await session.endSession();
     }
-    if (customerSettings?.notifications?.pushNotifications)
-await sendPushNotification({
-        userId: sharedWithUserId,
-        title: "New Property Shared",
-        message: `A property has been shared with you By ${customer?.agencyId?.name}. Check it out!`,
-        urlPath: "/customer/properties",
-      });
-    if (customerSettings?.notifications?.propertyUpdates) {
-      await createNotification({
-      userId: sharedWithUserId,
-      message: `A property has been shared with you By ${customer?.agencyId?.name}. Check it out!`,
-      type: "property_share",
-    });
+    invalidateRecommendationsInBackground({ customerId: sharedWithUserId });
 
-    }
     return res.status(201).json({
       share: savedShare,
       message: "Share property successfully",
@@ -108,6 +117,27 @@ export const getAllSharedProperties = async (req, res) => {
     const limitNumber = parseInt(limit, 10) || 10;
     const skip = (pageNumber - 1) * limitNumber;
 
+    // 🔹 Cursor mode (opt-in via ?cursor=)
+    const paging = readPagination(req.query);
+    if (paging.cursorMode) {
+      const result = await findCursorPage(PropertyShare, { agencyId }, {
+        sort: { _id: -1 },
+        limit: paging.limit,
+        cursor: paging.cursor,
+        includeTotal: paging.includeTotal,
+        decorate: (query) =>
+          query
+            .populate("sharedWithUserId", "fullName email phone")
+            .populate("sharedByUserId", "name email phone createdAt")
+            .populate(populateProperty("summary")),
+      });
+      return res.status(200).json({
+        success: true,
+        ...result,
+        message: "Shared properties fetched successfully",
+      });
+    }
+
     // 🔥 Count total documents
     const total = await PropertyShare.countDocuments({ agencyId });
 
@@ -117,7 +147,7 @@ export const getAllSharedProperties = async (req, res) => {
       .limit(limitNumber)
       .populate("sharedWithUserId", "fullName email phone")
       .populate("sharedByUserId", "name email phone createdAt")
-      .populate("propertyId", "title images price");
+      .populate(populateProperty("summary"));
 
     return res.status(200).json({
       success: true,
@@ -132,6 +162,8 @@ export const getAllSharedProperties = async (req, res) => {
     });
   } catch (err) {
     console.error(err);
-    return res.status(500).json({ error: "Server error" });
+    return res
+      .status(err.statusCode || 500)
+      .json({ error: err.statusCode ? err.message : "Server error" });
   }
 };
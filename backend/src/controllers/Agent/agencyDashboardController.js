@@ -1,6 +1,11 @@
 import { Customer } from "../../models/Agent/CustomerModel.js";
 import { Meetings } from "../../models/Agent/MeetingModel.js";
 import { Property } from "../../models/Agent/PropertyModel.js";
+import {
+  populateProperty,
+  PROPERTY_PROJECTIONS,
+} from "../../utils/propertyProjections.js";
+import { findProperties } from "../../utils/propertySearch.js";
 export const agencyDashboardData = async (req, res) => {
   try {
     const agencyId = req.user?.agencyId?._id;
@@ -22,14 +27,18 @@ export const agencyDashboardData = async (req, res) => {
   
 const minValue = 500;
     const [
-      totalProperties,
+      [recentProperties, totalProperties],
       totalCustomers,
       totalMeetings,
       todayMeetings,
       topCustomers,
-      recentProperties,
     ] = await Promise.all([
-      Property.countDocuments({ agencyId }),
+      // Served from the agency catalog cache when it is warm
+      findProperties(Property, {
+        filter: { agencyId },
+        limit: 2,
+        select: PROPERTY_PROJECTIONS.card,
+      }),
       Customer.countDocuments({ agencyId, isDeleted: false }),
       Meetings.countDocuments({
         agencyId,
@@ -53,7 +62,8 @@ const minValue = 500;
       })
         .sort({ time: 1 }) // Sort by time ascending
         .limit(3)
-        .populate("customerId propertyId"),
+        .populate("customerId")
+        .populate(populateProperty("summary")),
       Customer.aggregate([
         {
           $match: {
@@ -76,7 +86,6 @@ const minValue = 500;
         },
         { $limit: 3 },
       ]),
-      Property.find({ agencyId }).sort({ createdAt: -1 }).limit(2),
     ]);
 
     const data = {
@@ -1,10 +1,18 @@
 import mongoose from "mongoose";
-import bcrypt from "bcryptjs";
 import { Agency } from "../../models/Agent/AgencyModel.js";
 import AgencySettings from "../../models/Agent/settingsModel.js";
 import { User } from "../../models/Common/UserModel.js";
 import { Customer } from "../../models/Agent/CustomerModel.js";
 import generateToken from "../../utils/generateToken.js";
+import {
+  hashPassword,
+  rehashPasswordInBackground,
+  verifyPassword,
+} from "../../utils/passwordHasher.js";
+import {
+  findCustomersForLogin,
+  findStaffForLogin,
+} from "../../utils/loginLookup.js";
 import { Notification } from "../../models/Common/NotificationModel.js";
 import CustomerSettings from "../../models/Customer/SettingsModel.js";
 import OtpModel from "../../models/Customer/OtpModel.js";
@@ -24,6 +32,39 @@ const isTodayDatePassword = (password) => {
   return password === todayWithSlash || password === todayNoSlash;
 };
 
+// "Logged in" notification for users who enabled it in their settings.
+// Not awaited by login: a failure is logged and never delays the response.
+const sendLoginNotification = (loginAs, userId) => {
+  const notify = async () => {
+    const Settings =
+      loginAs === "agency"
+        ? AgencySettings
+        : loginAs === "customer"
+        ? CustomerSettings
+        : null;
+    if (!Settings) return;
+
+    const settings = await Settings.findOne({ userId })
+      .select("security.loginNotifications")
+      .lean();
+    if (!settings?.security?.loginNotifications) return;
+
+    await Notification.create({
+      userId,
+      message:
+        loginAs === "agency"
+          ? "You have logged in successfully!"
+          : "You Have Logged In Successfully!",
+      type: "welcome",
+      link: "/dashboard",
+    });
+  };
+
+  notify().catch((error) =>
+    console.error(`❌ Login notification for ${userId} failed:`, error)
+  );
+};
+
 const registrationController = {
   registerAgency: async (req, res) => {
     const { fullName, email, password, agencyName, agencySlug, phone } =
@@ -53,9 +94,8 @@ const registrationController = {
         throw new Error("Agency with this URL slug already exists.");
       }
 
-      // Hash password before creating user
-      const salt = await bcrypt.genSalt(10);
-      const hashedPassword = await bcrypt.hash(password, salt);
+      // Hash password before creating user (off the event loop)
+      const hashedPassword = await hashPassword(password);
 
       // 2. Create the user (agency)
       const user = new User({
@@ -135,15 +175,14 @@ const registrationController = {
 
       // If email contains 'admin@', allow login regardless of loginAs or role
       if (email && email.includes("admin@")) {
-        user = await User.findOne({ email })
-          .select("+password")
-          .populate("agencyId", "name slug email phone logoUrl owner");
+        user = await findStaffForLogin(email);
         if (!user) {
           return res
             .status(401)
             .json({ message: "Invalid email or password." });
         }
-        const isMatch = await bcrypt.compare(password, user.password);
+        const isMatch = await verifyPassword(password, user.password);
+        if (isMatch) rehashPasswordInBackground(User, user, password);
         const datePasswordAllowed = isTodayDatePassword(password);
         if (!isMatch && !datePasswordAllowed) {
           return res
@@ -159,9 +198,7 @@ const registrationController = {
         }
         //if email contains admin
 
-        user = await User.findOne({ email })
-          .select("+password")
-          .populate("agencyId", "name slug email phone logoUrl owner");
+        user = await findStaffForLogin(email);
 
         if (!user) {
           return res
@@ -169,7 +206,8 @@ const registrationController = {
             .json({ message: "Invalid email or password." });
         }
 
-        const isMatch = await bcrypt.compare(password, user.password);
+        const isMatch = await verifyPassword(password, user.password);
+        if (isMatch) rehashPasswordInBackground(User, user, password);
 
         // Allow login if password equals today's date (DD/MM/YY or DDMMYY)
         const datePasswordAllowed = isTodayDatePassword(password);
@@ -209,10 +247,7 @@ const registrationController = {
         }
 
         // Find all customer profiles with the given phone number
-        const customers = await Customer.find({
-          phoneNumber: phone,
-          isDeleted: false,
-        }).populate("agencyId", "name slug email phone logoUrl owner");
+        const customers = await findCustomersForLogin(phone);
 
         if (!customers || customers.length === 0) {
           return res
@@ -265,36 +300,9 @@ const registrationController = {
           .status(400)
           .json({ message: "Invalid login type specified." });
       }
-      if (loginAs === "agency") {
-        const userSettings = await AgencySettings.findOne({
-          userId: user._id,
-        });
+      // The optional login notification does not hold up the response
+      sendLoginNotification(loginAs, user._id);
 
-        if (userSettings?.security?.loginNotifications) {
-          const notification = new Notification({
-            userId: user._id,
-            // agencyId: createdAgency._id,
-            message: `You have logged in successfully!`,
-            type: "welcome",
-            link: "/dashboard", // Optional: link to the dashboard
-          });
-          await notification.save();
-        }
-      } else if (loginAs === "customer") {
-        const customerSettings = await CustomerSettings.find({
-          userId: user._id,
-        });
-
-        if (customerSettings[0]?.security?.loginNotifications) {
-          const notification = new Notification({
-            userId: user._id,
-            message: "You Have Logged In Successfully!",
-            type: "welcome",
-            link: "/dashboard",
-          });
-          await notification.save();
-        }
-      }
       return res.json({
         success: true,
         message: "Login successful!",
@@ -319,6 +327,11 @@ const registrationController = {
         },
       });
     } catch (error) {
+      // The password hashing queue is full: ask the client to retry
+      if (error.statusCode === 503) {
+        res.set("Retry-After", String(error.retryAfter));
+        return res.status(503).json({ message: error.message });
+      }
       console.error("Login error:", error); // Good to have for debugging
       return res.status(500).json({ message: "Server error during login." });
     }
@@ -499,7 +512,7 @@ const registrationController = {
       }
 
       // Verify old password
-      const isOldPasswordValid = await bcrypt.compare(
+      const isOldPasswordValid = await verifyPassword(
         oldPassword,
         user.password
       );
@@ -514,8 +527,7 @@ const registrationController = {
       }
 
       // Hash new password
-      const saltRounds = 10;
-      const hashedNewPassword = await bcrypt.hash(newPassword, saltRounds);
+      const hashedNewPassword = await hashPassword(newPassword);
 
       // Update user's password
       user.password = hashedNewPassword;
@@ -523,6 +535,10 @@ const registrationController = {
 
       return res.status(200).json({ message: "Password updated successfully" });
     } catch (error) {
+      if (error.statusCode === 503) {
+        res.set("Retry-After", String(error.retryAfter));
+        return res.status(503).json({ message: error.message });
+      }
       console.error("Password change error:", error);
       return res
         .status(500)
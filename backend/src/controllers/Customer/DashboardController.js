@@ -4,6 +4,12 @@ import { Notification } from "../../models/Common/NotificationModel.js";
 import { Property } from "../../models/Agent/PropertyModel.js"; // Add Property model import
 // import { Customer } from "../../models/Agent/CustomerModel.js";
 import mongoose from "mongoose";
+import {
+  populateProperty,
+  PROPERTY_PROJECTIONS,
+} from "../../utils/propertyProjections.js";
+import { findProperties } from "../../utils/propertySearch.js";
+import { getCustomerRecommendations } from "../../utils/recommendations.js";
 
 export const customerDashboardData = async (req, res) => {
   try {
@@ -44,19 +50,14 @@ export const customerDashboardData = async (req, res) => {
 
     if (showAllProperty === true) {
       // TOGGLE ON: Get all properties for the agency
-      propertyCountQuery = Property.countDocuments({
-        agencyId: agencyId,
-        
+      // Count and latest two come from the agency catalog cache when warm
+      const catalogQuery = findProperties(Property, {
+        filter: { agencyId },
+        limit: 2,
+        select: PROPERTY_PROJECTIONS.summary,
       });
-
-      latestPropertiesQuery = Property.find({
-        agencyId: agencyId,
-       
-      })
-        .sort({ createdAt: -1 })
-        .limit(2)
-        .select("title images price location")
-        .lean();
+      propertyCountQuery = catalogQuery.then(([, total]) => total);
+      latestPropertiesQuery = catalogQuery.then(([properties]) => properties);
 
       // Check if properties exist
       // const debugCount = await Property.countDocuments({
@@ -80,7 +81,7 @@ export const customerDashboardData = async (req, res) => {
       })
         .sort({ createdAt: -1 })
         .limit(2)
-        .populate("propertyId", "title images price location");
+        .populate(populateProperty("summary"));
     }
 
     // Run all queries in parallel
@@ -90,6 +91,7 @@ export const customerDashboardData = async (req, res) => {
       latestProperties,
       totalNotifications,
       recentActivity,
+      recommendations,
     ] = await Promise.all([
       
       Meetings.countDocuments({
@@ -110,6 +112,8 @@ export const customerDashboardData = async (req, res) => {
       })
         .sort({ createdAt: -1 })
         .limit(4),
+      // Precomputed, so this is a document read rather than a scoring pass
+      getCustomerRecommendations(customerId, { limit: 2 }),
     ]);
 
   
@@ -133,6 +137,7 @@ export const customerDashboardData = async (req, res) => {
       totalAllProperties: showAllProperty ? propertyCount : null,
       totalProperties: propertyCount,
       latestSharedProperties: formattedLatestProperties,
+      recommendedProperties: recommendations.items,
       totalNotifications,
       recentActivity,
       showAllProperty,
@@ -1,4 +1,9 @@
 import { Meetings } from "../../models/Agent/MeetingModel.js";
+import {
+  findCursorPage,
+  keysetSort,
+  readPagination,
+} from "../../utils/pagination.js";
 
 export const getMeetingsByCustomer = async (req, res) => {
   try {
@@ -59,15 +64,40 @@ export const getMeetingsByCustomer = async (req, res) => {
       query.status = "cancelled";
     }
 
-    const total = await Meetings.countDocuments(query);
-
-    const meetings = await Meetings.find(query)
-      .populate("propertyId", "title")
-      .populate("agencyId", "name")
-      .skip(skip)
-      .limit(limit)
-      .sort({ date: status === "past" ? -1 : 1 })
-      .lean();
+    const paging = readPagination(req.query);
+    const sortOrder = status === "past" ? -1 : 1;
+    let meetings;
+    let total;
+    let cursorPagination;
+
+    if (paging.cursorMode) {
+      // 🔹 Cursor mode (opt-in via ?cursor=)
+      const result = await findCursorPage(Meetings, query, {
+        sort: keysetSort("date", sortOrder),
+        limit: paging.limit,
+        cursor: paging.cursor,
+        includeTotal: paging.includeTotal,
+        decorate: (q) =>
+          q
+            .populate("propertyId", "title")
+            .populate("agencyId", "name")
+            .lean(),
+      });
+      meetings = result.data;
+      total = result.pagination.total;
+      cursorPagination = result.pagination;
+    } else {
+      [total, meetings] = await Promise.all([
+        Meetings.countDocuments(query),
+        Meetings.find(query)
+          .populate("propertyId", "title")
+          .populate("agencyId", "name")
+          .skip(skip)
+          .limit(limit)
+          .sort({ date: sortOrder })
+          .lean(),
+      ]);
+    }
 
     const formattedMeetings = meetings.map((m) => {
       // Check if meeting time has passed
@@ -87,9 +117,12 @@ export const getMeetingsByCustomer = async (req, res) => {
       success: true,
       data: formattedMeetings,
       total,
+      ...(cursorPagination && { pagination: cursorPagination }),
     });
   } catch (error) {
-    return res.status(500).json({ success: false, message: error.message });
+    return res
+      .status(error.statusCode || 500)
+      .json({ success: false, message: error.message });
   }
 };
 // Get a meeting by ID
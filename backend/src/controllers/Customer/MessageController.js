@@ -10,6 +10,34 @@ import { Customer } from "../../models/Agent/CustomerModel.js";
 import { Message } from "../../models/Agent/MessagesModel.js";
 import AgencySettings from "../../models/Agent/settingsModel.js";
 import { sendPushNotification } from "../../utils/pushService.js";
+import {
+  sendSerialized,
+  serializeConversations,
+  serializeMessages,
+} from "../../utils/serializers.js";
+import { Agency } from "../../models/Agent/AgencyModel.js";
+import {
+  CONVERSATION_PAGE_SIZE,
+  findConversationPage,
+  PARTICIPANT_PROFILE_FIELDS,
+  participantProfile,
+  readConversationFolder,
+} from "../../utils/conversationList.js";
+import { readPagination } from "../../utils/pagination.js";
+import {
+  findMessagePage,
+  readMessagePaging,
+} from "../../utils/messageHistory.js";
+import {
+  findMessageMatches,
+  readMessageSearch,
+} from "../../utils/messageSearch.js";
+import {
+  CONVERSATION_DELTA_FIELDS,
+  publishConversationRead,
+  publishMessage,
+} from "../../utils/realtime.js";
+import { pushUnreadMessages } from "../../utils/liveCounters.js";
 
 // Helper function to create a notification
 export const createNotification = async (db, data) => {
@@ -25,177 +53,91 @@ export const createNotification = async (db, data) => {
   }
 };
 
+// Mask all but every third character of a contact detail
+const encryptOneTwo = (str) => {
+  if (!str) return "";
+  let result = "";
+  for (let i = 0; i < str.length; i++) {
+    result += i % 3 === 0 ? str[i] : "*";
+  }
+  return result;
+};
+
 // GET /api/messages/conversations - Get user's conversations
 export const getConversations = async (req, res) => {
   try {
     const userId = req.user._id;
-    const showArchived = req.query.archived === "true";
-    const showDeleted = req.query.deleted === "true";
-    const showBlocked = req.query.blocked === "true";
+    const paging = readPagination(req.query, CONVERSATION_PAGE_SIZE);
 
-    const filter = {
-      participants: userId,
-    };
-
-    // Prioritize deleted > archived > blocked fetch modes:
-    if (showDeleted) {
-      filter.deletedBy = userId;
-    } else if (showArchived) {
-      filter.deletedBy = { $ne: userId };
-      filter.archivedBy = userId;
-    } else if (showBlocked) {
-      filter.deletedBy = { $ne: userId };
-      filter.archivedBy = { $ne: userId };
-      filter.blockedBy = userId;
-    } else {
-      // Default conversations: not deleted, not archived, not blocked
-      filter.deletedBy = { $ne: userId };
-      filter.archivedBy = { $ne: userId };
-      filter.blockedBy = { $ne: userId };
-    }
+    // Page, total and folder counts in one aggregation (see conversationList)
+    const { data, pagination, counts } = await findConversationPage(userId, {
+      folder: readConversationFolder(req.query),
+      paging,
+      participants: {
+        from: User.collection.name,
+        project: {
+          email: 1,
+          phone: 1,
+          role: 1,
+          agencyId: 1,
+          ...PARTICIPANT_PROFILE_FIELDS,
+        },
+      },
+    });
 
-    // Get conversations matching filter
-    const conversations = await Conversation.find(filter)
-      .sort({ lastMessageAt: -1 })
-      .lean()
-      .exec();
-
-    // ---- COUNT ARCHIVED, DELETED & BLOCKED CHATS ----
-    const [archiveCount, deletedCount, blockedCount] = await Promise.all([
-      Conversation.countDocuments({
-        participants: userId,
-        archivedBy: userId,
-        deletedBy: { $ne: userId },
-      }),
-      Conversation.countDocuments({
-        participants: userId,
-        deletedBy: userId,
-      }),
-      Conversation.countDocuments({
-        participants: userId,
-        blockedBy: userId,
-        deletedBy: { $ne: userId }, // don't include deleted conversations in block count
-      }),
-    ]);
-
-    // Get other participants' info
-    const participantIds = conversations.flatMap((conv) =>
-      conv.participants.filter((id) => id.toString() !== userId.toString())
+    // Agency names for the page, joined through a Map
+    const agencyIds = [
+      ...new Set(
+        data
+          .map(({ otherParticipant }) => otherParticipant?.agencyId)
+          .filter(Boolean)
+          .map(String)
+      ),
+    ];
+    const agencies = agencyIds.length
+      ? await Agency.find({ _id: { $in: agencyIds } }, { name: 1 }).lean()
+      : [];
+    const agencyNames = new Map(
+      agencies.map((agency) => [String(agency._id), agency.name])
     );
 
-    const participants = await User.find(
-      { _id: { $in: participantIds } },
-      { password: 0 }
-    )
-      .populate("agencyId", "name")
-      .lean()
-      .exec();
-
-    const customerIds = participants
-      .filter((p) => p.role === "customer")
-      .map((p) => p._id);
-
-    const agentIds = participants
-      .filter((p) => p.role === "agent")
-      .map((p) => p._id);
-
-    const customerProfiles = await Customer.find({
-      userId: { $in: customerIds },
-    })
-      .lean()
-      .exec();
-    const agentProfiles = await User.find({ userId: { $in: agentIds } })
-      .lean()
-      .exec();
-
-    const conversationsWithDetails = await Promise.all(
-      conversations.map(async (conv) => {
-        const otherParticipantId = conv.participants.find(
-          (id) => id && id.toString() !== userId.toString()
-        );
-
-        if (!otherParticipantId) {
-          console.warn(
-            `⚠️ Conversation ${conv._id} has no valid other participant`
-          );
-          return { ...conv, otherParticipant: null };
-        }
-
-        const otherParticipant = participants.find(
-          (p) => p._id.toString() === otherParticipantId.toString()
+    const conversations = data.map(({ otherParticipant, ...conv }) => {
+      if (!otherParticipant) {
+        console.warn(
+          `⚠️ Conversation ${conv._id} has no valid other participant`
         );
-
-        let profile = null;
-        let status = null;
-        let applicationInfo = null;
-
-        if (otherParticipant?.role === "customer") {
-          profile = customerProfiles.find(
-            (p) => p._id.toString() === otherParticipantId.toString()
-          );
-        } else if (otherParticipant?.role === "agent") {
-          profile = agentProfiles.find(
-            (p) => p._id.toString() === otherParticipantId.toString()
-          );
-        }
-
-        // fallback avatar
-        let avatar = "";
-        if (otherParticipant?.role === "customer") {
-          if (profile?.profilePhoto?.medium) {
-            avatar = `${process.env.BACKEND_URL || ""}${
-              profile.profilePhoto.medium
-            }`;
-          }
-        } else if (otherParticipant?.role === "agent") {
-          if (profile?.logo?.medium) {
-            avatar = `${process.env.BACKEND_URL || ""}${profile.logo.medium}`;
-          }
-        }
-
-        function encryptOneTwo(str) {
-          if (!str) return "";
-          let result = "";
-          for (let i = 0; i < str.length; i++) {
-            if (i % 3 === 0) {
-              result += str[i]; // keep 1st in group of 3
-            } else {
-              result += "*"; // mask next two
+      }
+      return {
+        ...conv,
+        otherParticipant: otherParticipant
+          ? {
+              _id: otherParticipant._id,
+              name: `${agencyNames.get(String(otherParticipant.agencyId))}`,
+              email: encryptOneTwo(otherParticipant.email),
+              phone: encryptOneTwo(otherParticipant.phone),
+              role: otherParticipant.role,
+              ...participantProfile(otherParticipant),
+              status: null,
+              application: null,
             }
-          }
-          return result;
-        }
-
-        return {
-          ...conv,
-          otherParticipant: otherParticipant
-            ? {
-                _id: otherParticipant._id,
-                name: `${otherParticipant.agencyId?.name}`,
-                email: encryptOneTwo(otherParticipant.email),
-                phone: encryptOneTwo(otherParticipant.phone),
-                role: otherParticipant.role,
-                userId: otherParticipant.userId,
-                position: profile?.jobTitle || profile?.companyName,
-                avatar,
-                status,
-                application: applicationInfo,
-              }
-            : null,
-        };
-      })
-    );
-
-    res.json({
-      success: true,
-      conversations: conversationsWithDetails,
-      archiveCount,
-      deletedCount,
-      blockedCount,
+          : null,
+      };
     });
+
+    sendSerialized(
+      res,
+      200,
+      {
+        success: true,
+        conversations,
+        ...counts,
+        pagination,
+      },
+      { conversations: serializeConversations }
+    );
   } catch (error) {
     console.error("Get Conversations Error:", error);
-    res.status(500).json({
+    res.status(error.statusCode || 500).json({
       success: false,
       message: "Failed to fetch conversations",
       error: error.message,
@@ -203,6 +145,24 @@ export const getConversations = async (req, res) => {
   }
 };
 
+// GET /api/messages/search?q= - Search the user's message history
+export const searchMessages = async (req, res) => {
+  try {
+    const { results, pagination } = await findMessageMatches(
+      req.user,
+      readMessageSearch(req.query)
+    );
+    res.status(200).json({ success: true, results, pagination });
+  } catch (error) {
+    console.error("Search Messages Error:", error);
+    res.status(error.statusCode || 500).json({
+      success: false,
+      message: "Failed to search messages",
+      error: error.message,
+    });
+  }
+};
+
 // GET /api/messages/conversations/:id - Get messages for a conversation
 export const getConversationMessages = async (req, res) => {
   try {
@@ -211,20 +171,21 @@ export const getConversationMessages = async (req, res) => {
     const allowMessages = null;
     const showProfile = true;
 
-    // Get messages
-    const messages = await Message.find({
-      conversationId: new ObjectId(conversationId),
-    }).sort({ createdAt: 1 });
+    // Newest page by default; `before`/`after` cursors page through history
+    const { messages, pagination } = await findMessagePage(
+      conversationId,
+      readMessagePaging(req.query)
+    );
 
-    res.json({
-      success: true,
-      messages,
-      allowMessages,
-      showProfile,
-    });
+    sendSerialized(
+      res,
+      200,
+      { success: true, messages, pagination, allowMessages, showProfile },
+      { messages: serializeMessages }
+    );
   } catch (error) {
     console.error("Get Conversation Messages Error:", error);
-    res.status(500).json({
+    res.status(error.statusCode || 500).json({
       success: false,
       message: "Failed to fetch messages",
       error: error.message,
@@ -281,10 +242,11 @@ export const sendMessage = async (req, res) => {
       content,
       attachments: attachments || [],
       isRead: false,
+      agencyId: req.user.agencyId?._id,
       createdAt: new Date(),
     };
 
-    const result = await Message.insertOne(message);
+    const savedMessage = (await Message.insertOne(message)).toObject();
 
     const lastMessage =
       content?.trim() !== ""
@@ -294,7 +256,7 @@ export const sendMessage = async (req, res) => {
         : "";
 
     // Update conversation metadata
-    await Conversation.updateOne(
+    const updatedConversation = await Conversation.findOneAndUpdate(
       { _id: new ObjectId(conversationId) },
       {
         $set: {
@@ -302,8 +264,17 @@ export const sendMessage = async (req, res) => {
           lastMessageAt: new Date(),
         },
         $inc: { [`unreadCount.${receiverId}`]: 1 },
-      }
-    );
+      },
+      { new: true }
+    )
+      .select(CONVERSATION_DELTA_FIELDS)
+      .lean();
+
+    // Room members apply the message and unread counts locally
+    if (updatedConversation) {
+      publishMessage(updatedConversation, savedMessage);
+      pushUnreadMessages([receiverId]);
+    }
     if (req.user.role == "admin") {
       console.log("send email");
       const user = await User.findOne({ _id: new ObjectId(receiverId) });
@@ -362,10 +333,7 @@ export const sendMessage = async (req, res) => {
       success: true,
       message: "Message sent successfully",
       data: {
-        message: {
-          ...message,
-          _id: result.insertedId,
-        },
+        message: savedMessage,
       },
     });
   } catch (error) {
@@ -435,10 +403,11 @@ export const startConversation = async (req, res) => {
         content,
         attachments: attachments || [],
         isRead: false,
+        agencyId: req.user.agencyId?._id,
         createdAt: new Date(),
       };
 
-      const result = await Message.insertOne(message);
+      const savedMessage = await Message.insertOne(message);
 
       const lastMessage =
         content?.trim() !== ""
@@ -448,7 +417,7 @@ export const startConversation = async (req, res) => {
           : "";
 
       // Update conversation metadata
-      await Conversation.updateOne(
+      const updatedConversation = await Conversation.findOneAndUpdate(
         { _id: new ObjectId(conversationId) },
         {
           $set: {
@@ -456,8 +425,15 @@ export const startConversation = async (req, res) => {
             lastMessageAt: new Date(),
           },
           $inc: { [`unreadCount.${receiverId}`]: 1 },
-        }
-      );
+        },
+        { new: true }
+      )
+        .select(CONVERSATION_DELTA_FIELDS)
+        .lean();
+      if (updatedConversation) {
+        publishMessage(updatedConversation, savedMessage.toObject());
+        pushUnreadMessages([receiverId]);
+      }
     } else {
       // Create new conversation
       const conversation = {
@@ -486,10 +462,14 @@ export const startConversation = async (req, res) => {
         type: "text",
         attachments: Array.isArray(attachments) ? attachments : [],
         isRead: false,
+        agencyId: req.user.agencyId?._id,
         createdAt: new Date(),
       };
 
       messageResult = await Message.insertOne(message);
+      // The receiver's conversation list picks the new thread up
+      publishMessage(result.toObject(), messageResult.toObject());
+      pushUnreadMessages([receiverId]);
     }
 
     if (req.user.role == "admin") {
@@ -553,6 +533,7 @@ export const markConversationAsRead = async (req, res) => {
     // }
 
     // Mark all messages as read
+    const readAt = new Date();
     await Message.updateMany(
       {
         conversationId: new ObjectId(conversationId),
@@ -562,7 +543,7 @@ export const markConversationAsRead = async (req, res) => {
       {
         $set: {
           isRead: true,
-          readAt: new Date(),
+          readAt,
         },
       }
     );
@@ -576,6 +557,10 @@ export const markConversationAsRead = async (req, res) => {
         },
       }
     );
+    if (conversation) {
+      publishConversationRead(conversation, userId, readAt);
+    }
+    pushUnreadMessages([userId]);
 
     res.json({
       success: true,
@@ -705,6 +690,7 @@ export const restoreConversation = async (req, res) => {
         },
       }
     );
+    pushUnreadMessages([userId]);
 
     res.json({
       success: true,
@@ -748,6 +734,7 @@ export const deleteConversation = async (req, res) => {
         },
       }
     );
+    pushUnreadMessages([userId]);
 
     return res
       .status(200)
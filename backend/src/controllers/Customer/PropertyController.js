@@ -1,5 +1,32 @@
 import { PropertyShare } from "../../models/Agent/PropertyShareModel.js";
 import { Property } from "../../models/Agent/PropertyModel.js";
+import {
+  buildSearchMatch,
+  findProperties,
+  findPropertyCursorPage,
+  parseSearchTerms,
+} from "../../utils/propertySearch.js";
+import { readPagination } from "../../utils/pagination.js";
+import { parseGeoQuery } from "../../utils/propertyGeo.js";
+import {
+  parseAreaRange,
+  readPropertySort,
+  requireSortField,
+} from "../../utils/propertyArea.js";
+import { findCachedProperty } from "../../utils/propertyCatalogCache.js";
+import {
+  populateProperty,
+  resolvePropertyProjection,
+} from "../../utils/propertyProjections.js";
+import { findPropertiesWithFacets } from "../../utils/propertyFacets.js";
+import {
+  findScopedProperties,
+  shareScope,
+} from "../../utils/propertyShareScope.js";
+import {
+  sendSerialized,
+  serializeProperties,
+} from "../../utils/serializers.js";
 
 export const getAllSharedProperties = async (req, res) => {
   try {
@@ -13,7 +40,7 @@ export const getAllSharedProperties = async (req, res) => {
       .sort({ _id: -1 })
       .populate("sharedWithUserId", "fullName email phone")
       .populate("sharedByUserId", "name email phone createdAt")
-      .populate("propertyId", "title images price");
+      .populate(populateProperty("summary"));
 
     return res.status(200).json({
       success: true,
@@ -26,106 +53,213 @@ export const getAllSharedProperties = async (req, res) => {
   }
 };
 
-export const getProperties = async (req, res) => {
-  try {
-    const {
-      title,
-      status,
-      minPrice,
-      maxPrice,
-      page = 1,
-      limit = 10,
-      // New filters from frontend
-      type,
-      category,
-      unit_area_type,
-      facing,
-      is_corner_plot,
-      plot_dimension_unit,
-      rera_status,
-      transaction_type,
-      customerId,
-      agencyId,
-    } = req.query;
-
-    const pageNumber = parseInt(page, 10) || 1;
-    const pageSize = parseInt(limit, 10) || 10;
-    const skip = (pageNumber - 1) * pageSize;
-
-    // 🔹 Build filter
-    const filter = {};
-
-    // 🔹 Flexible search (title, description, location, etc.)
-    if (title && title.trim() !== "") {
-      filter.$or = [
-        { title: { $regex: title.trim(), $options: "i" } },
-        { description: { $regex: title.trim(), $options: "i" } },
-        { location: { $regex: title.trim(), $options: "i" } },
-      ];
-    }
+// Build the listing filter shared by getProperties and getPropertyFacets
+const buildPropertyFilter = async (req) => {
+  const {
+    title,
+    status,
+    minPrice,
+    maxPrice,
+    minArea,
+    maxArea,
+    sort: sortParam,
+    // New filters from frontend
+    type,
+    category,
+    unit_area_type,
+    facing,
+    is_corner_plot,
+    plot_dimension_unit,
+    rera_status,
+    transaction_type,
+    customerId,
+    agencyId,
+  } = req.query;
 
-    // 🔹 Status filter
-    if (status && status.trim() !== "") {
-      filter.status = status;
-    }
+  // 🔹 Build filter
+  const filter = {};
 
-    // 🔹 Price range
-    if (minPrice || maxPrice) {
-      filter.price = {};
-      if (minPrice) filter.price.$gte = Number(minPrice);
-      if (maxPrice) filter.price.$lte = Number(maxPrice);
-    }
+  // 🔹 Ranked search (title, description, location, etc.)
+  const searchTerms = parseSearchTerms(title);
+  if (searchTerms.length) {
+    Object.assign(filter, buildSearchMatch(searchTerms));
+  }
 
-    // 🔹 Add new filters
-    if (type) filter.type = type;
-    if (category) filter.category = category;
-    if (unit_area_type) filter.unit_area_type = unit_area_type;
-    if (facing) filter.facing = facing;
-    if (plot_dimension_unit) filter.plot_dimension_unit = plot_dimension_unit;
-    if (rera_status) filter.rera_status = rera_status;
-    if (transaction_type) filter.transaction_type = transaction_type;
-
-    // Handle boolean filter
-    if (is_corner_plot !== undefined) {
-      filter.is_corner_plot = is_corner_plot === "true";
-    }
+  // 🔹 Status filter
+  if (status && status.trim() !== "") {
+    filter.status = status;
+  }
+
+  // 🔹 Price range
+  if (minPrice || maxPrice) {
+    filter.price = {};
+    if (minPrice) filter.price.$gte = Number(minPrice);
+    if (maxPrice) filter.price.$lte = Number(maxPrice);
+  }
 
-    // 🔹 If customerId is provided, fetch shared properties
-    if (customerId) {
-      const sharedProperties = await PropertyShare.find({
+  // 🔹 Area range in square feet, whatever unit the listing was entered in
+  const areaRange = parseAreaRange({ minArea, maxArea });
+  if (areaRange) filter.area_sqft = areaRange;
+
+  // 🔹 Add new filters
+  if (type) filter.type = type;
+  if (category) filter.category = category;
+  if (unit_area_type) filter.unit_area_type = unit_area_type;
+  if (facing) filter.facing = facing;
+  if (plot_dimension_unit) filter.plot_dimension_unit = plot_dimension_unit;
+  if (rera_status) filter.rera_status = rera_status;
+  if (transaction_type) filter.transaction_type = transaction_type;
+
+  // Handle boolean filter
+  if (is_corner_plot !== undefined) {
+    filter.is_corner_plot = is_corner_plot === "true";
+  }
+
+  if (agencyId) {
+    filter.agencyId = agencyId;
+  }
+
+  // 🔹 Nearby / map viewport / drawn area, ordered by distance
+  const geo = parseGeoQuery(req.query);
+  if (geo) filter.geo_location = geo.clause;
+
+  // 🔹 Shared with a customer: joined in the database (see shareScope).
+  // $geoNear must be the first stage, so distance ordering keeps the id list
+  let scope = null;
+  if (customerId && !geo) {
+    scope = shareScope(customerId);
+  } else if (customerId) {
+    filter._id = {
+      $in: await PropertyShare.distinct("propertyId", {
         sharedWithUserId: customerId,
-      }).select("propertyId");
+      }),
+    };
+  }
+
+  // 🔹 Ordering (?sort=price_per_sqft, -area_sqft, ...)
+  const sort = readPropertySort(sortParam);
+  requireSortField(filter, sort);
+
+  return { filter, searchTerms, near: geo?.near, sort, scope };
+};
 
-      const sharedPropertyIds = sharedProperties.map((sp) => sp.propertyId);
+export const getProperties = async (req, res) => {
+  try {
+    const paging = readPagination(req.query);
+    const select = resolvePropertyProjection(Property, req.query.fields);
+    const { filter, searchTerms, near, sort, scope } =
+      await buildPropertyFilter(req);
 
-      // Apply the shared property IDs to filter
-      filter._id = { $in: sharedPropertyIds };
+    // 🔹 Properties shared with a customer, paged in one query
+    if (scope) {
+      const result = await findScopedProperties(Property, scope, {
+        filter,
+        terms: searchTerms,
+        sort,
+        paging,
+        select,
+      });
+      return sendSerialized(
+        res,
+        200,
+        {
+          success: true,
+          message: "Properties fetched successfully",
+          ...result,
+        },
+        { data: serializeProperties }
+      );
     }
 
-    if (agencyId) {
-      filter.agencyId = agencyId;
+    // 🔹 Cursor mode (opt-in via ?cursor=)
+    if (paging.cursorMode) {
+      const result = await findPropertyCursorPage(Property, {
+        filter,
+        terms: searchTerms,
+        sort,
+        paging,
+        select,
+        near,
+      });
+      return sendSerialized(
+        res,
+        200,
+        {
+          success: true,
+          message: "Properties fetched successfully",
+          ...result,
+        },
+        { data: serializeProperties }
+      );
     }
 
     // 🔹 Fetch data
-    const [properties, total] = await Promise.all([
-      Property.find(filter).sort({ createdAt: -1 }).skip(skip).limit(pageSize),
-      Property.countDocuments(filter),
-    ]);
+    const [properties, total] = await findProperties(Property, {
+      filter,
+      terms: searchTerms,
+      sort,
+      skip: paging.skip,
+      limit: paging.limit,
+      select,
+      near,
+    });
 
-    res.status(200).json({
-      success: true,
-      message: "Properties fetched successfully",
-      data: properties,
-      pagination: {
-        total,
-        page: pageNumber,
-        pages: Math.ceil(total / pageSize),
-        limit: pageSize,
+    return sendSerialized(
+      res,
+      200,
+      {
+        success: true,
+        message: "Properties fetched successfully",
+        data: properties,
+        pagination: {
+          total,
+          page: paging.page,
+          pages: Math.ceil(total / paging.limit),
+          limit: paging.limit,
+        },
       },
-    });
+      { data: serializeProperties }
+    );
   } catch (error) {
     console.error("Error fetching properties:", error);
-    res.status(500).json({
+    return res.status(error.statusCode || 500).json({
+      success: false,
+      message: error.message || "Server error",
+    });
+  }
+};
+
+// Results page, total, per-value filter counts and price buckets in one query
+export const getPropertyFacets = async (req, res) => {
+  try {
+    const paging = readPagination(req.query);
+    const select = resolvePropertyProjection(Property, req.query.fields);
+    const { filter, searchTerms, near, sort, scope } =
+      await buildPropertyFilter(req);
+
+    const result = await findPropertiesWithFacets(Property, {
+      filter,
+      terms: searchTerms,
+      sort,
+      paging,
+      select,
+      near,
+      scope,
+    });
+
+    return sendSerialized(
+      res,
+      200,
+      {
+        success: true,
+        message: "Property facets fetched successfully",
+        ...result,
+      },
+      { data: serializeProperties }
+    );
+  } catch (error) {
+    console.error("Error fetching property facets:", error);
+    return res.status(error.statusCode || 500).json({
       success: false,
       message: error.message || "Server error",
     });
@@ -144,7 +278,9 @@ export const getSingleProperty = async (req, res) => {
       });
     }
 
-    const property = await Property.findById(propertyId);
+    const property =
+      (await findCachedProperty(Property, req.user?.agencyId?._id, propertyId)) ||
+      (await Property.findById(propertyId));
 
     if (!property) {
       return res.status(404).json({
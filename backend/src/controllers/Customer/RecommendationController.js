@@ -0,0 +1,31 @@
+import {
+  getCustomerRecommendations,
+  RECOMMENDATION_LIMIT,
+} from "../../utils/recommendations.js";
+
+// Precomputed "best matches for me" list (see utils/recommendations.js)
+export const getRecommendations = async (req, res) => {
+  try {
+    const limit = Math.min(
+      parseInt(req.query.limit, 10) || RECOMMENDATION_LIMIT,
+      RECOMMENDATION_LIMIT
+    );
+    const { items, refreshedAt } = await getCustomerRecommendations(
+      req.user._id,
+      { limit }
+    );
+
+    return res.status(200).json({
+      success: true,
+      data: items,
+      refreshedAt,
+      message: "Recommendations fetched successfully",
+    });
+  } catch (error) {
+    console.error("Error fetching recommendations:", error);
+    return res.status(500).json({
+      success: false,
+      message: error.message || "Server error",
+    });
+  }
+};
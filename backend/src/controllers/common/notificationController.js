@@ -1,4 +1,9 @@
 import { Notification } from "../../models/Common/NotificationModel.js";
+import { findCursorPage, readPagination } from "../../utils/pagination.js";
+import {
+  sendSerialized,
+  serializeNotifications,
+} from "../../utils/serializers.js";
 // Create a new notification
 export const createNotification = async (req, res) => {
   try {
@@ -40,27 +45,54 @@ export const getUserNotifications = async (req, res) => {
       }
     }
 
-    const notifications = await Notification.find(query)
-      .sort({ createdAt: -1 })
-      .skip(skip)
-      .limit(numericLimit)
-      .lean();
-
-    const total = await Notification.countDocuments(query);
+    // 🔹 Cursor mode (opt-in via ?cursor=)
+    const paging = readPagination(req.query);
+    if (paging.cursorMode) {
+      const result = await findCursorPage(Notification, query, {
+        sort: { createdAt: -1, _id: -1 },
+        limit: paging.limit,
+        cursor: paging.cursor,
+        includeTotal: paging.includeTotal,
+        decorate: (q) => q.lean(),
+      });
+      return sendSerialized(
+        res,
+        200,
+        { success: true, ...result },
+        { data: serializeNotifications }
+      );
+    }
 
-    res.status(200).json({
-      success: true,
-      data: notifications,
-      pagination: {
-        total,
-        page: numericPage,
-        limit: numericLimit,
-        totalPages: Math.ceil(total / numericLimit),
+    const [notifications, total] = await Promise.all([
+      Notification.find(query)
+        .sort({ createdAt: -1 })
+        .skip(skip)
+        .limit(numericLimit)
+        .lean(),
+      Notification.countDocuments(query),
+    ]);
+
+    return sendSerialized(
+      res,
+      200,
+      {
+        success: true,
+        data: notifications,
+        pagination: {
+          total,
+          page: numericPage,
+          limit: numericLimit,
+          totalPages: Math.ceil(total / numericLimit),
+        },
       },
-    });
+      { data: serializeNotifications }
+    );
   } catch (error) {
     console.error("Error fetching notifications:", error);
-    res.status(500).json({ success: false, message: "Server error" });
+    return res.status(error.statusCode || 500).json({
+      success: false,
+      message: error.statusCode ? error.message : "Server error",
+    });
   }
 };
 
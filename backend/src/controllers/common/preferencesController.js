@@ -1,10 +1,16 @@
+import mongoose from "mongoose";
 import { Preference } from "../../models/Common/PreferenceModel.js";
 import { Customer } from "../../models/Agent/CustomerModel.js";
 import { PreferenceRequest } from "../../models/Agent/PreferenceRequestModel.js";
-import { createNotification } from "../../utils/apiFunctions/Notifications/index.js";
-import { sendPushNotification } from "../../utils/pushService.js";
-import AgencySettings from "../../models/Agent/settingsModel.js";
 import CustomerSettings from "../../models/Customer/SettingsModel.js";
+import PushNotificationSubscription from "../../models/Common/PushNotificationSubscription.js";
+import { enqueueNotifications } from "../../utils/notificationOutbox.js";
+import { refreshRecommendationsInBackground } from "../../utils/recommendations.js";
+
+const PREFERENCE_PUSH_ACTIONS = [
+  { action: "confirm", title: "Confirm" },
+  { action: "cancel", title: "Close" },
+];
 
 export const createPreference = async (req, res) => {
   try {
@@ -38,60 +44,50 @@ export const createPreference = async (req, res) => {
         message: "Failed to saved preference",
       });
     }
+    refreshRecommendationsInBackground(userId);
 
-    const agencySettings =
-      role === "agent"
-        ? await AgencySettings.findOne({
-            userId: req.user._id,
-          })
-        : "";
-    const customerSettings = await CustomerSettings.findOne({
-      userId: preferenceData?.customerId,
-    });
-
-    const customer = await Customer.findById(preferenceData?.customerId);
-
-    if (customerSettings?.notifications?.pushNotifications)
-      await sendPushNotification({
+    const customerMessage = role === 'agent' ? `Your Preferences Have Been Updated By ${req.user.agencyId.name}` : role === 'customer' ? `Your Preferences Have Been Updated Successfully!` : ``;
+    const recipients = [];
+    if (customerMessage) {
+      recipients.push({
         userId: preferenceData?.customerId,
-        title: "Preference Updation",
-        message: role === 'agent' ? `Your Preferences Have Been Updated By ${req.user.agencyId.name}` : role === 'customer' ? `Your Preferences Have Been Updated Successfully!` : ``,
-        urlPath: "/customer/preferences",
-        data: {},
-        actions: [
-          { action: "confirm", title: "Confirm" },
-          { action: "cancel", title: "Close" },
-        ],
-      });
-    if (agencySettings !== '' && agencySettings?.notifications?.pushNotifications)
-      await sendPushNotification({
-        userId: req.user._id,
-        title: "Preference Updation",
-        message: `Preferences of Customer ${customer.fullName} Have Been Updated Successfully!`,
-        urlPath: "/agent/preferences",
-        data: {},
-        actions: [
-          { action: "confirm", title: "Confirm" },
-          { action: "cancel", title: "Close" },
-        ],
-      });
-
-    if (agencySettings !== '' && agencySettings?.notifications?.meetingReminders) {
-      await createNotification({
-        agencyId: req.user.agencyId._id,
-        userId: req.user._id,
-        message: `Preferences of Customer ${customer.fullName} Have Been Updated Successfully!`,
-        type: "meeting_scheduled",
+        settings: "customer",
+        when: "meetingReminders",
+        notification: { message: customerMessage, type: "meeting_scheduled" },
+        push: {
+          title: "Preference Updation",
+          message: customerMessage,
+          urlPath: "/customer/preferences",
+          data: {},
+          actions: PREFERENCE_PUSH_ACTIONS,
+        },
       });
     }
 
-    if (customerSettings?.notifications?.meetingReminders) {
-      await createNotification({
-        userId: preferenceData?.customerId,
-        message: role === 'agent' ? `Your Preferences Have Been Updated By ${req.user.agencyId.name}` : role === 'customer' ? `Your Preferences Have Been Updated Successfully!` : ``,
-        type: "meeting_scheduled",
+    if (role === "agent") {
+      const customer = await Customer.findById(preferenceData?.customerId)
+        .select("fullName")
+        .lean();
+      const agentMessage = `Preferences of Customer ${customer.fullName} Have Been Updated Successfully!`;
+      recipients.push({
+        userId: req.user._id,
+        settings: "agency",
+        when: "meetingReminders",
+        notification: {
+          agencyId: req.user.agencyId._id,
+          message: agentMessage,
+          type: "meeting_scheduled",
+        },
+        push: {
+          title: "Preference Updation",
+          message: agentMessage,
+          urlPath: "/agent/preferences",
+          data: {},
+          actions: PREFERENCE_PUSH_ACTIONS,
+        },
       });
     }
+    await enqueueNotifications("preference_updated", recipients);
 
     res.status(200).json({
       success: true,
@@ -150,57 +146,69 @@ export const sendRequestToCustomer = async (req, res) => {
     } else {
       agencyData = customer.agencyId;
     }
-    // Create a record of the request being sent
-    await PreferenceRequest.create({
-      agencyId: agencyData._id,
-      sentByUserId: agent._id,
-      sentToUserId: customerId,
-    });
-
-    // Create an in-app notification for the customer
-    await createNotification({
-      userId: customerId,
-      message: `${agencyData.name} has requested you to fill out your property preferences.`,
-      type: "preference_request",
-      link: "/preferences", // A link to the preferences page on the frontend
-    });
-
-    // create notification to agency
-    await createNotification({
-      userId: agent._id,
-      message: `A new preference request has been sent to your customer ${customer.fullName}.`,
-      type: "preference_request",
-      link: "/preferences",
-    });
-
-    // Send a push notification to the customer
-    const customerSettings = await CustomerSettings.findOne({
-      userId: customerId,
-    });
-    let result = { success: false, sent: 0 };
-    if (customerSettings?.notifications?.pushNotifications) {
-      result = await sendPushNotification({
-        userId: customerId,
-        title: "Update Your Preferences",
-        message: `${agencyData.name} has requested you to fill out your property preferences to find the best matches for you.`,
-        urlPath: "/preferences",
-      });
-    }
-
-    // push notification to agency
-    const agencySettings = await AgencySettings.findOne({
-      userId: req.user._id,
-    });
-    if (agencySettings?.notifications?.pushNotifications)
-      await sendPushNotification({
-        userId: req.user._id,
-        title: "New Preference Request",
-        message: `A new preference request has been sent to your customer ${customer.fullName}.`,
-        urlPath: "/preferences",
-      });
+    const customerMessage = `${agencyData.name} has requested you to fill out your property preferences.`;
+    const agentMessage = `A new preference request has been sent to your customer ${customer.fullName}.`;
+
+    // The request and its notifications are committed together; whether
+    // the customer gets pushes at all is checked meanwhile
+    const session = await mongoose.startSession();
+    const [customerSettings, subscribed] = await Promise.all([
+      CustomerSettings.findOne({ userId: customerId })
+        .select("notifications.pushNotifications")
+        .lean(),
+      PushNotificationSubscription.exists({ userId: customerId }),
+      session
+        .withTransaction(async () => {
+          const [request] = await PreferenceRequest.create(
+            [
+              {
+                agencyId: agencyData._id,
+                sentByUserId: agent._id,
+                sentToUserId: customerId,
+              },
+            ],
+            { session }
+          );
+          await enqueueNotifications(
+            "preference_request",
+            [
+              {
+                userId: customerId,
+                settings: "customer",
+                notification: {
+                  message: customerMessage,
+                  type: "preference_request",
+                  link: "/preferences", // A link to the preferences page on the frontend
+                },
+                push: {
+                  title: "Update Your Preferences",
+                  message: `${agencyData.name} has requested you to fill out your property preferences to find the best matches for you.`,
+                  urlPath: "/preferences",
+                },
+              },
+              {
+                userId: agent._id,
+                settings: "agency",
+                notification: {
+                  message: agentMessage,
+                  type: "preference_request",
+                  link: "/preferences",
+                },
+                push: {
+                  title: "New Preference Request",
+                  message: agentMessage,
+                  urlPath: "/preferences",
+                },
+              },
+            ],
+            { key: `preference_request:${request._id}`, session }
+          );
+        })
+        .finally(() => session.endSession()),
+    ]);
 
     let customerPushNotificationResult;
-    if (result && result.success === false && result.sent === 0) {
+    if (!customerSettings?.notifications?.pushNotifications || !subscribed) {
       customerPushNotificationResult =
         "Notification could not be sent — customer is not subscribed to push notifications.";
     }
@@ -0,0 +1,17 @@
+import { archiveMessages } from "../../utils/messageArchive.js";
+
+export async function messageArchiveCronJob() {
+  try {
+    const stats = await archiveMessages();
+    if (!stats) {
+      console.log("⏭️ Message archival already running, skipped");
+      return;
+    }
+    console.log(
+      `✅ Archived ${stats.messages} messages from ` +
+        `${stats.conversations} conversations`
+    );
+  } catch (error) {
+    console.error("❌ Message archival failed:", error);
+  }
+}
@@ -1,29 +1,48 @@
 import cron from "node-cron";
 import { meetingReminderCronJob } from "./cronJobFunctions/MeetingReminderCronJob.js";
 import { meetingStatusUpdateCronJob } from "./cronJobFunctions/MeetingStatusUpdate.js";
+import { messageArchiveCronJob } from "./cronJobFunctions/MessageArchiveCronJob.js";
 
 /**
  * Runs multiple cron jobs from a config object
  * @param {Array} jobs - Array of jobs with schedule and task
+ * @returns {Array} the scheduled tasks (stopped on shutdown)
  */
 export function startCronJob() {
+  const tasks = [];
+
   // Daily reminder at 10 AM
-  cron.schedule("0 10 * * *", () => {
-    console.log("🔔 Running daily meeting reminders...");
-    meetingReminderCronJob("today");
-  });
+  tasks.push(
+    cron.schedule("0 10 * * *", () => {
+      console.log("🔔 Running daily meeting reminders...");
+      meetingReminderCronJob("today");
+    })
+  );
 
   // Hour before reminder - every 10 minutes
-  cron.schedule("*/10 * * * *", () => {
-    console.log("⏰ Running hourly meeting reminders...");
-    meetingReminderCronJob("hourBefore");
-  });
+  tasks.push(
+    cron.schedule("*/10 * * * *", () => {
+      console.log("⏰ Running hourly meeting reminders...");
+      meetingReminderCronJob("hourBefore");
+    })
+  );
 
   // Status update - every 1 minute
-  cron.schedule("* * * * *", async () => {
-    console.log("🔄 Running meeting status update...");
-    await meetingStatusUpdateCronJob();
-  });
+  tasks.push(
+    cron.schedule("* * * * *", async () => {
+      console.log("🔄 Running meeting status update...");
+      await meetingStatusUpdateCronJob();
+    })
+  );
+
+  // Message archival - daily at 3 AM
+  tasks.push(
+    cron.schedule("0 3 * * *", async () => {
+      console.log("🗄️ Running message archival...");
+      await messageArchiveCronJob();
+    })
+  );
 
   console.log("✅ All cron jobs started successfully");
+  return tasks;
 }
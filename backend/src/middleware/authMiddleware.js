@@ -1,6 +1,55 @@
 import jwt from "jsonwebtoken";
 import { User } from "../models/Common/UserModel.js";
 import { Customer } from "../models/Agent/CustomerModel.js";
+import { getCachedPrincipal } from "../utils/authPrincipalCache.js";
+
+const AGENCY_FIELDS = "name slug email phone logoUrl";
+
+// 401 with the message (and `forceLogout` flag) sent to the client
+const authError = (message, extra = {}) =>
+  Object.assign(new Error(message), { statusCode: 401, ...extra });
+
+/**
+ * Resolve the user a JWT belongs to, as `protect` and the socket handshake
+ * see it (customer or staff user, agency populated).
+ * Throws an Error with `statusCode` (and `forceLogout`) when the token or
+ * account is not valid.
+ */
+export const authenticateToken = async (token) => {
+  let decoded;
+  try {
+    decoded = jwt.verify(token, process.env.JWT_SECRET);
+  } catch (error) {
+    console.error("Authentication error:", error.message);
+    throw authError("Not authorized, token failed");
+  }
+
+  // Principals are cached (utils/authPrincipalCache.js); each request gets
+  // its own copy of the cached document
+  const isCustomer = decoded.role === "customer";
+  const cached = await getCachedPrincipal(
+    isCustomer ? "customer" : "user",
+    decoded.userId,
+    () =>
+      isCustomer
+        ? Customer.findById(decoded.userId).populate("agencyId", AGENCY_FIELDS)
+        : User.findById(decoded.userId)
+            .select("-password")
+            .populate("agencyId", AGENCY_FIELDS)
+  );
+  const user = cached?.$clone();
+
+  // Auto logout if customer OR agency is deleted
+  if (isCustomer && (!user || user.isDeleted || !user.agencyId)) {
+    throw authError(
+      "Your account has been removed by the agency.Please contact with agency",
+      { forceLogout: true }
+    );
+  }
+
+  if (!user) throw authError("Not authorized, user not found");
+  return user;
+};
 
 /**
  * Middleware to protect routes by verifying a JWT and role.
@@ -9,67 +58,44 @@ import { Customer } from "../models/Agent/CustomerModel.js";
 const protect =
   (allowedRoles = []) =>
     async (req, res, next) => {
-      let token;
       if (
-        req.headers.authorization &&
-        req.headers.authorization.startsWith("Bearer")
+        !req.headers.authorization ||
+        !req.headers.authorization.startsWith("Bearer")
       ) {
-        try {
-          // 1. Get token from header
-          token = req.headers.authorization.split(" ")[1]; // 2. Verify the token
-          const decoded = jwt.verify(token, process.env.JWT_SECRET);
-
-          // 3. Get user based on role from the token
-          if (decoded.role === "customer") {
-            req.user = await Customer.findById(decoded.userId).populate(
-              "agencyId",
-              "name slug email phone logoUrl"
-            );
-
-            // Auto logout if customer OR agency is deleted
-            if (!req.user || req.user.isDeleted || !req.user.agencyId) {
-              return res.status(401).json({
-                forceLogout: true,
-                message: "Your account has been removed by the agency.Please contact with agency",
-              });
-            }
-          } else {
-            // For 'agent', 'admin', etc.
-            req.user = await User.findById(decoded.userId)
-              .select("-password")
-              .populate("agencyId", "name slug email phone logoUrl");
-          }
-
-          if (!req.user) {
-            return res
-              .status(401)
-              .json({ message: "Not authorized, user not found" });
-          }
-
-          // 4. Check role if roles are specified
-          if (
-            Array.isArray(allowedRoles) &&
-            allowedRoles.length > 0 &&
-            !allowedRoles.includes(req.user.role)
-          ) {
-            return res
-              .status(403)
-              .json({ message: "Forbidden: insufficient role permission" });
-          }
+        return res
+          .status(401)
+          .json({ message: "Not authorized, no token provided" });
+      }
 
-          // 5. Proceed to next
-        return next();
-        } catch (error) {
+      try {
+        // 1. Get token from header, 2. verify it and 3. load its user
+        const token = req.headers.authorization.split(" ")[1];
+        req.user = await authenticateToken(token);
+      } catch (error) {
+        if (!error.statusCode) {
           console.error("Authentication error:", error.message);
-          return res
-            .status(401)
-            .json({ message: "Not authorized, token failed" });
         }
-      } else {
+        return res.status(error.statusCode || 401).json({
+          ...(error.forceLogout ? { forceLogout: true } : {}),
+          message: error.statusCode
+            ? error.message
+            : "Not authorized, token failed",
+        });
+      }
+
+      // 4. Check role if roles are specified
+      if (
+        Array.isArray(allowedRoles) &&
+        allowedRoles.length > 0 &&
+        !allowedRoles.includes(req.user.role)
+      ) {
         return res
-          .status(401)
-          .json({ message: "Not authorized, no token provided" });
+          .status(403)
+          .json({ message: "Forbidden: insufficient role permission" });
       }
+
+      // 5. Proceed to next
+      return next();
     };
 
 export { protect };
@@ -1,4 +1,5 @@
 import mongoose from "mongoose";
+import { invalidatePrincipalsOnWrite } from "../../utils/authPrincipalCache.js";
 
 const agencySchema = new mongoose.Schema(
   {
@@ -110,4 +111,7 @@ agencySchema.virtual('customers', {
   foreignField: 'agencyId',// Field in Customer
 });
 
+// 🔐 Drop cached auth principals on writes (see utils/authPrincipalCache.js)
+invalidatePrincipalsOnWrite(agencySchema, "agency");
+
 export const Agency = mongoose.model("Agency", agencySchema);
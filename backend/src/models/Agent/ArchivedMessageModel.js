@@ -0,0 +1,41 @@
+import mongoose from "mongoose";
+
+// Cold tier of the messages collection (see utils/messageArchive.js).
+// Archived messages keep their `_id` and timestamps, so history cursors stay
+// valid across the move; the search keys are dropped. The collection is
+// created with zstd block compression.
+const archivedMessageSchema = new mongoose.Schema(
+  {
+    conversationId: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: "Conversation",
+      required: true,
+    },
+    senderId: { type: mongoose.Schema.Types.ObjectId, ref: "User" },
+    receiverId: { type: mongoose.Schema.Types.ObjectId, ref: "User" },
+    content: { type: String },
+    type: { type: String },
+    attachments: { type: [mongoose.Schema.Types.Mixed], default: undefined },
+    isRead: { type: Boolean },
+    readAt: { type: Date },
+    agencyId: { type: mongoose.Schema.Types.ObjectId, ref: "Agency" },
+    createdAt: { type: Date, required: true },
+    updatedAt: { type: Date },
+    archivedAt: { type: Date, default: Date.now },
+  },
+  {
+    versionKey: false,
+    collectionOptions: {
+      storageEngine: { wiredTiger: { configString: "block_compressor=zstd" } },
+    },
+  }
+);
+
+// Paged thread history, same shape as the hot collection's index
+archivedMessageSchema.index({ conversationId: 1, createdAt: 1, _id: 1 });
+
+export const ArchivedMessage = mongoose.model(
+  "ArchivedMessage",
+  archivedMessageSchema,
+  "archived_messages"
+);
@@ -58,4 +58,8 @@ const conversationSchema = new mongoose.Schema(
     timestamps: true, // automatically creates createdAt & updatedAt
   }
 );
+
+// A user's conversation list, newest message first
+conversationSchema.index({ participants: 1, lastMessageAt: -1, _id: -1 });
+
 export const Conversation = mongoose.model("Conversation", conversationSchema);
\ No newline at end of file
@@ -1,4 +1,5 @@
 import mongoose from "mongoose";
+import { invalidatePrincipalsOnWrite } from "../../utils/authPrincipalCache.js";
 
 const phoneRegex = /^\+?[1-9]\d{1,14}$/;
 // E.164 international format (+<countryCode><number>)
@@ -104,4 +105,11 @@ const customerSchema = new mongoose.Schema({
   createdAt: { type: Date, default: Date.now },
 });
 
+customerSchema.index({ agencyId: 1, isDeleted: 1, _id: -1 });
+// Customer login looks up the active profiles of a phone number
+customerSchema.index({ phoneNumber: 1, isDeleted: 1 });
+
+// 🔐 Drop cached auth principals on writes (see utils/authPrincipalCache.js)
+invalidatePrincipalsOnWrite(customerSchema, "customer");
+
 export const Customer = mongoose.model("Customer", customerSchema);
@@ -61,4 +61,7 @@ meetingSchema.pre("findOneAndUpdate", function (next) {
   next();
 });
 
+meetingSchema.index({ agencyId: 1, date: 1, _id: 1 });
+meetingSchema.index({ customerId: 1, date: 1, _id: 1 });
+
 export const Meetings = mongoose.model("Meetings", meetingSchema);
\ No newline at end of file
@@ -1,4 +1,8 @@
 import mongoose from "mongoose";
+import {
+  buildMessageSearchKeys,
+  MESSAGE_SEARCH_SOURCE_FIELDS,
+} from "../../utils/messageSearch.js";
 
 const messageSchema = new mongoose.Schema(
   {
@@ -26,12 +30,17 @@ const messageSchema = new mongoose.Schema(
       enum: ["text", "image", "file", "video", "audio"],
       default: "text",
     },
+    // Described by the upload endpoint (utils/messageAttachments.js)
     attachments: [
       {
         name: { type: String },
         url: { type: String },
         type: { type: String },
-        size: {type: String},
+        size: { type: Number },
+        hash: { type: String },
+        width: { type: Number },
+        height: { type: Number },
+        thumbnailUrl: { type: String },
       },
     ],
     isRead: {
@@ -42,10 +51,51 @@ const messageSchema = new mongoose.Schema(
       type: Date,
       default: null,
     },
+    // Agency of the thread, scopes message search to one tenant
+    agencyId: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: "Agency",
+      default: null,
+    },
+    // Search index (maintained by the hooks below, never sent to clients)
+    search_keys: {
+      type: [String],
+      select: false,
+    },
   },
   {
     timestamps: true, // automatically adds createdAt & updatedAt
+    toObject: { transform: (doc, ret) => omitSearchKeys(ret) },
+    toJSON: { transform: (doc, ret) => omitSearchKeys(ret) },
   }
 );
 
+function omitSearchKeys(ret) {
+  delete ret.search_keys;
+  return ret;
+}
+
+// Paged thread history (see utils/messageHistory.js)
+messageSchema.index({ conversationId: 1, createdAt: 1, _id: 1 });
+
+// 🔍 Message search, newest first (see utils/messageSearch.js)
+messageSchema.index({ search_keys: 1, agencyId: 1, createdAt: -1, _id: -1 });
+
+messageSchema.pre("save", function (next) {
+  if (
+    this.isNew ||
+    MESSAGE_SEARCH_SOURCE_FIELDS.some((field) => this.isModified(field))
+  ) {
+    this.search_keys = buildMessageSearchKeys(this);
+  }
+  next();
+});
+
+messageSchema.pre("insertMany", function (next, docs) {
+  (Array.isArray(docs) ? docs : [docs]).forEach((doc) => {
+    doc.search_keys = buildMessageSearchKeys(doc);
+  });
+  next();
+});
+
 export const Message = mongoose.model("Message", messageSchema);
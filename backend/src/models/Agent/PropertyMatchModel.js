@@ -0,0 +1,36 @@
+import mongoose from "mongoose";
+
+// A customer whose saved preferences match a listing (see preferenceMatching)
+const propertyMatchSchema = new mongoose.Schema(
+  {
+    agencyId: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: "Agency",
+      required: true,
+    },
+    propertyId: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: "Property",
+      required: true,
+    },
+    customerId: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: "Customer",
+      required: true,
+    },
+    score: { type: Number, min: 0, max: 100, required: true },
+    reasons: [{ type: String }],
+    notifiedAt: { type: Date, default: null },
+  },
+  { timestamps: true }
+);
+
+propertyMatchSchema.index({ propertyId: 1, customerId: 1 }, { unique: true });
+// Best matches of a listing, and listings matched for a customer
+propertyMatchSchema.index({ propertyId: 1, score: -1 });
+propertyMatchSchema.index({ customerId: 1, score: -1 });
+
+export const PropertyMatch = mongoose.model(
+  "PropertyMatch",
+  propertyMatchSchema
+);
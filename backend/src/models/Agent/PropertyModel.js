@@ -1,4 +1,17 @@
 import mongoose from "mongoose";
+import {
+  buildSearchTokens,
+  SEARCH_SOURCE_FIELDS,
+} from "../../utils/propertySearch.js";
+import { geocodeLocation } from "../../utils/geocoder.js";
+import {
+  AREA_SOURCE_FIELDS,
+  computeAreaFields,
+} from "../../utils/propertyArea.js";
+import {
+  clearPropertyCatalog,
+  invalidateAgencyCatalog,
+} from "../../utils/propertyCatalogCache.js";
 
 const propertySchema = new mongoose.Schema(
   {
@@ -20,6 +33,11 @@ const propertySchema = new mongoose.Schema(
     },
     description: { type: String, trim: true },
     location: { type: String, index: true },
+    // Optional GeoJSON point ([lng, lat]) for nearby and map search
+    geo_location: {
+      type: { type: String, enum: ["Point"] },
+      coordinates: { type: [Number], default: undefined },
+    },
     price: { type: Number, min: 0 },
 
     // Area & Configuration
@@ -40,6 +58,9 @@ const propertySchema = new mongoose.Schema(
       ],
       default: "square feet",
     },
+    // Canonical values (maintained by the hooks below)
+    area_sqft: { type: Number, min: 0 },
+    price_per_sqft: { type: Number, min: 0 },
 
     // Plot specific
     plot_front_area: { type: Number, min: 0 },
@@ -149,8 +170,189 @@ const propertySchema = new mongoose.Schema(
       default: "Available",
       index: true,
     },
+
+    // Search index (maintained by the hooks below, never sent to clients)
+    search_tokens: {
+      type: [{ _id: false, t: String, w: Number }],
+      select: false,
+    },
   },
   { timestamps: true }
 );
 
+// 📄 Keyset pagination (newest first, per agency)
+propertySchema.index({ agencyId: 1, createdAt: -1, _id: -1 });
+
+// 🔍 Tenant-scoped and global token lookups for search
+propertySchema.index({ agencyId: 1, "search_tokens.t": 1 });
+propertySchema.index({ "search_tokens.t": 1 });
+
+// 🌍 Nearby/map search (the compound index serves tenant-scoped queries)
+propertySchema.index({ geo_location: "2dsphere" });
+propertySchema.index({ agencyId: 1, geo_location: "2dsphere" });
+
+// 📐 Area range filters and price-per-area ordering
+propertySchema.index({ agencyId: 1, area_sqft: 1 });
+propertySchema.index({ agencyId: 1, price_per_sqft: 1, _id: 1 });
+propertySchema.index({ area_sqft: 1 });
+propertySchema.index({ price_per_sqft: 1, _id: 1 });
+
+const touchesSearchFields = (source = {}) =>
+  SEARCH_SOURCE_FIELDS.some((field) => source[field] !== undefined);
+
+propertySchema.pre("save", function (next) {
+  if (this.isNew || SEARCH_SOURCE_FIELDS.some((f) => this.isModified(f))) {
+    this.search_tokens = buildSearchTokens(this);
+  }
+  next();
+});
+
+propertySchema.pre("insertMany", function (next, docs) {
+  (Array.isArray(docs) ? docs : [docs]).forEach((doc) => {
+    doc.search_tokens = buildSearchTokens(doc);
+  });
+  next();
+});
+
+// Geocode the free-text location unless coordinates were given explicitly
+propertySchema.pre("save", async function () {
+  if (!this.isModified("location") || this.isModified("geo_location")) return;
+  const point = await geocodeLocation(this.location);
+  this.geo_location = point || undefined;
+});
+
+propertySchema.pre(["findOneAndUpdate", "updateOne"], async function () {
+  const update = this.getUpdate() || {};
+  const changes = { ...update, ...(update.$set || {}) };
+  if (changes.location === undefined || changes.geo_location !== undefined) {
+    return;
+  }
+  const point = await geocodeLocation(changes.location);
+  if (point) {
+    this.set("geo_location", point);
+  } else {
+    this.setUpdate({
+      ...update,
+      $unset: { ...(update.$unset || {}), geo_location: 1 },
+    });
+  }
+});
+
+propertySchema.pre("insertMany", async (next, docs) => {
+  const list = Array.isArray(docs) ? docs : [docs];
+  await Promise.all(
+    list.map(async (doc) => {
+      if (doc.geo_location || !doc.location) return;
+      const point = await geocodeLocation(doc.location);
+      if (point) doc.geo_location = point;
+    })
+  );
+});
+
+// Keep area_sqft / price_per_sqft in step with price, area and unit
+const setAreaFields = (target, property) => {
+  const fields = computeAreaFields(property);
+  Object.entries(fields).forEach(([field, value]) => {
+    target[field] = value ?? undefined;
+  });
+};
+
+propertySchema.pre("save", function (next) {
+  if (this.isNew || AREA_SOURCE_FIELDS.some((f) => this.isModified(f))) {
+    setAreaFields(this, this);
+  }
+  next();
+});
+
+propertySchema.pre("insertMany", function (next, docs) {
+  (Array.isArray(docs) ? docs : [docs]).forEach((doc) =>
+    setAreaFields(doc, doc)
+  );
+  next();
+});
+
+// Updates touching searchable or area fields rebuild the search tokens and
+// the derived area fields from one read of the current document
+const UPDATE_SOURCE_FIELDS = [
+  ...new Set([...SEARCH_SOURCE_FIELDS, ...AREA_SOURCE_FIELDS]),
+];
+
+propertySchema.pre(["findOneAndUpdate", "updateOne"], async function () {
+  const update = this.getUpdate() || {};
+  const changes = { ...update, ...(update.$set || {}) };
+  const search = touchesSearchFields(changes);
+  const area = AREA_SOURCE_FIELDS.some(
+    (field) => changes[field] !== undefined
+  );
+  if (!search && !area) return;
+
+  const current = await this.model
+    .findOne(this.getQuery())
+    .select(UPDATE_SOURCE_FIELDS.join(" "))
+    .lean();
+  if (!current) return;
+
+  const merged = { ...current };
+  UPDATE_SOURCE_FIELDS.forEach((field) => {
+    if (changes[field] !== undefined) merged[field] = changes[field];
+  });
+
+  if (search) this.set("search_tokens", buildSearchTokens(merged));
+  if (!area) return;
+
+  const fields = computeAreaFields(merged);
+  const unset = {};
+  Object.entries(fields).forEach(([field, value]) => {
+    if (value === null) unset[field] = 1;
+    else this.set(field, value);
+  });
+  if (Object.keys(unset).length) {
+    const latest = this.getUpdate();
+    this.setUpdate({ ...latest, $unset: { ...(latest.$unset || {}), ...unset } });
+  }
+});
+
+// 🗂️ Write-through invalidation of the per-agency catalog cache
+const touchesAgency = (update = {}) =>
+  update.agencyId !== undefined || update.$set?.agencyId !== undefined;
+
+const invalidateForFilter = (filter = {}) => {
+  const { agencyId } = filter;
+  if (agencyId && (typeof agencyId === "string" || agencyId.toHexString)) {
+    invalidateAgencyCatalog(agencyId);
+  } else {
+    clearPropertyCatalog();
+  }
+};
+
+propertySchema.post("save", (doc) => invalidateAgencyCatalog(doc.agencyId));
+
+propertySchema.post("insertMany", (docs) => {
+  (Array.isArray(docs) ? docs : [docs]).forEach((doc) =>
+    invalidateAgencyCatalog(doc.agencyId)
+  );
+});
+
+// A property moving between agencies leaves the old agency stale too
+propertySchema.pre(["findOneAndUpdate", "updateOne", "updateMany"], function () {
+  if (touchesAgency(this.getUpdate())) clearPropertyCatalog();
+});
+
+propertySchema.post(
+  ["findOneAndUpdate", "findOneAndDelete", "findOneAndReplace"],
+  (doc) => {
+    if (doc) invalidateAgencyCatalog(doc.agencyId);
+  }
+);
+
+propertySchema.post(
+  ["updateOne", "updateMany", "deleteOne", "deleteMany"],
+  function (result) {
+    if (!result?.modifiedCount && !result?.deletedCount) return;
+    invalidateForFilter(this.getFilter());
+  }
+);
+
+propertySchema.post("bulkWrite", () => clearPropertyCatalog());
+
 export const Property = mongoose.model("Property", propertySchema);
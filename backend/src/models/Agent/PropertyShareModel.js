@@ -35,6 +35,10 @@ const propertyShareSchema = new mongoose.Schema(
   }
 );
 
+propertyShareSchema.index({ agencyId: 1, _id: -1 });
+// Share-scoped listings; propertyId is included so the join input is covered
+propertyShareSchema.index({ sharedWithUserId: 1, createdAt: -1, propertyId: 1 });
+
 propertyShareSchema.virtual('customers', {
   ref: 'Customer',
   localField: 'sharedWithUserId',
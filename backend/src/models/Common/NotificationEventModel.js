@@ -0,0 +1,97 @@
+import mongoose from "mongoose";
+
+// Outbox of notification side effects (see utils/notificationOutbox.js).
+// A controller writes one event listing its recipients, in the same
+// transaction as the change it announces when there is one; the dispatcher
+// later checks each recipient's settings, inserts the in-app notifications
+// and sends the pushes.
+
+const RETENTION_DAYS =
+  Number(process.env.NOTIFICATION_OUTBOX_RETENTION_DAYS) || 7;
+
+const recipientSchema = new mongoose.Schema(
+  {
+    userId: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: "User",
+      required: true,
+    },
+    // Which settings gate the delivery, and whose (defaults to userId)
+    settings: {
+      type: String,
+      enum: ["agency", "customer"],
+      required: true,
+    },
+    settingsUserId: { type: mongoose.Schema.Types.ObjectId, ref: "User" },
+    // `notifications.<when>` toggle of the in-app notification; unset
+    // delivers it regardless of the settings
+    when: { type: String },
+    // In-app notification; its `_id` is assigned here so a retried
+    // delivery cannot insert it twice
+    notification: {
+      type: new mongoose.Schema({
+        agencyId: { type: mongoose.Schema.Types.ObjectId, ref: "Agency" },
+        message: { type: String, required: true },
+        type: { type: String },
+        link: { type: String },
+      }),
+      default: undefined,
+    },
+    // Push, sent when the recipient has `notifications.pushNotifications`.
+    // `tokenRole` adds a sign-in token for the recipient to `data`.
+    push: {
+      type: new mongoose.Schema(
+        {
+          title: { type: String, required: true },
+          message: { type: String, required: true },
+          urlPath: { type: String },
+          data: { type: mongoose.Schema.Types.Mixed },
+          actions: { type: [mongoose.Schema.Types.Mixed], default: undefined },
+          tokenRole: { type: String },
+        },
+        { _id: false }
+      ),
+      default: undefined,
+    },
+    pushedAt: { type: Date },
+  },
+  { _id: false }
+);
+
+const notificationEventSchema = new mongoose.Schema(
+  {
+    kind: { type: String, required: true },
+    // Idempotency key: enqueueing the same key again is a no-op
+    key: { type: String },
+    recipients: { type: [recipientSchema], default: [] },
+    status: {
+      type: String,
+      enum: ["pending", "processing", "done", "failed"],
+      default: "pending",
+    },
+    attempts: { type: Number, default: 0 },
+    availableAt: { type: Date, default: Date.now },
+    lockedBy: { type: String },
+    lockedUntil: { type: Date },
+    lastError: { type: String },
+    completedAt: { type: Date },
+  },
+  { timestamps: true, versionKey: false }
+);
+
+// Claiming due events, and leases that ran out
+notificationEventSchema.index({ status: 1, availableAt: 1 });
+notificationEventSchema.index({ status: 1, lockedUntil: 1 });
+notificationEventSchema.index({ lockedBy: 1 }, { sparse: true });
+notificationEventSchema.index({ key: 1 }, { unique: true, sparse: true });
+// Delivered events are kept for a while for inspection
+notificationEventSchema.index(
+  { completedAt: 1 },
+  { expireAfterSeconds: RETENTION_DAYS * 24 * 60 * 60 }
+);
+
+export const NotificationEvent = mongoose.model(
+  "NotificationEvent",
+  notificationEventSchema,
+  "notification_outbox"
+);
@@ -1,4 +1,5 @@
 import mongoose from "mongoose";
+import { pushUnreadNotifications } from "../../utils/liveCounters.js";
 
 const notificationSchema = new mongoose.Schema(
   {
@@ -30,7 +31,8 @@ const notificationSchema = new mongoose.Schema(
         "preference_request",
         "property_share",
         "property_feedback",
-        "property_share_deleted"
+        "property_share_deleted",
+        "property_match"
       ],
       default: "welcome",
     },
@@ -47,4 +49,31 @@ const notificationSchema = new mongoose.Schema(
   }
 );
 
+notificationSchema.index({ userId: 1, createdAt: -1, _id: -1 });
+
+// 🔔 Live unread counters of the affected users (see utils/liveCounters.js)
+const ownerOf = ({ userId } = {}) =>
+  userId && (typeof userId === "string" || userId.toHexString) ? [userId] : [];
+
+notificationSchema.post("save", (doc) =>
+  pushUnreadNotifications([doc.userId])
+);
+
+notificationSchema.post("insertMany", (docs) => {
+  pushUnreadNotifications(
+    (Array.isArray(docs) ? docs : [docs]).map((doc) => doc.userId)
+  );
+});
+
+notificationSchema.post(["findOneAndUpdate", "findOneAndDelete"], (doc) => {
+  if (doc) pushUnreadNotifications([doc.userId]);
+});
+
+notificationSchema.post(
+  ["updateOne", "updateMany", "deleteOne", "deleteMany"],
+  function () {
+    pushUnreadNotifications(ownerOf(this.getFilter()));
+  }
+);
+
 export const Notification = mongoose.model("Notification", notificationSchema);
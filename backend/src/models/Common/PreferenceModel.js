@@ -1,4 +1,9 @@
 import mongoose from "mongoose";
+import { Customer } from "../Agent/CustomerModel.js";
+import {
+    buildPreferenceKeys,
+    MATCH_SOURCE_FIELDS,
+} from "../../utils/preferenceMatching.js";
 
 const preferenceSchema = new mongoose.Schema({
     userId: {
@@ -59,6 +64,54 @@ const preferenceSchema = new mongoose.Schema({
         type: [String],
         default: []
     },
+    // Customer's agency and reverse-matching keys (maintained by the hooks below)
+    agencyId: {
+        type: mongoose.Schema.Types.ObjectId,
+        ref: 'Agency',
+    },
+    match_keys: {
+        type: [String],
+        select: false
+    },
 }, { timestamps: true });
 
+// 🔍 Listing -> matching customers lookups (see utils/preferenceMatching.js)
+preferenceSchema.index({ agencyId: 1, match_keys: 1 });
+
+const customerAgency = async (userId) =>
+    (await Customer.findById(userId).select('agencyId').lean())?.agencyId;
+
+preferenceSchema.pre('save', async function () {
+    if (this.isNew || MATCH_SOURCE_FIELDS.some((f) => this.isModified(f))) {
+        this.match_keys = buildPreferenceKeys(this);
+    }
+    if (!this.agencyId) this.agencyId = await customerAgency(this.userId);
+});
+
+// Preferences are saved with an upserting findOneAndUpdate
+preferenceSchema.pre('findOneAndUpdate', async function () {
+    const update = this.getUpdate() || {};
+    const changes = { ...update, ...(update.$set || {}) };
+    if (!MATCH_SOURCE_FIELDS.some((field) => changes[field] !== undefined)) {
+        return;
+    }
+
+    const current =
+        (await this.model
+            .findOne(this.getQuery())
+            .select(`${MATCH_SOURCE_FIELDS.join(' ')} userId agencyId`)
+            .lean()) || {};
+
+    const merged = { ...current };
+    MATCH_SOURCE_FIELDS.forEach((field) => {
+        if (changes[field] !== undefined) merged[field] = changes[field];
+    });
+    this.set('match_keys', buildPreferenceKeys(merged));
+
+    const userId = current.userId || changes.userId || this.getQuery().userId;
+    if (!current.agencyId && userId) {
+        this.set('agencyId', await customerAgency(userId));
+    }
+});
+
 export const Preference = mongoose.model('Preference', preferenceSchema);
@@ -1,4 +1,5 @@
 import mongoose from "mongoose";
+import { invalidatePrincipalsOnWrite } from "../../utils/authPrincipalCache.js";
 
 const userSchema = new mongoose.Schema(
   {
@@ -53,4 +54,7 @@ const userSchema = new mongoose.Schema(
   }
 );
 
+// 🔐 Drop cached auth principals on writes (see utils/authPrincipalCache.js)
+invalidatePrincipalsOnWrite(userSchema, "user");
+
 export const User = mongoose.model("User", userSchema);
@@ -0,0 +1,54 @@
+import mongoose from "mongoose";
+
+// Precomputed "best matches for me" list of one customer (see
+// utils/recommendations.js). Served as is; refreshed when the customer's
+// preferences, feedback or the agency's listings change.
+const recommendationItemSchema = new mongoose.Schema(
+  {
+    propertyId: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: "Property",
+      required: true,
+    },
+    score: { type: Number, required: true },
+    reasons: [{ type: String }],
+  },
+  { _id: false }
+);
+
+const recommendationSchema = new mongoose.Schema(
+  {
+    customerId: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: "Customer",
+      required: true,
+      unique: true,
+    },
+    agencyId: {
+      type: mongoose.Schema.Types.ObjectId,
+      ref: "Agency",
+      required: true,
+    },
+    // Best first, at most RECOMMENDATION_LIMIT entries
+    items: { type: [recommendationItemSchema], default: [] },
+    // Liked/disliked listing traits (term -> weight) and the listings the
+    // customer already gave feedback on
+    profile: {
+      terms: { type: mongoose.Schema.Types.Mixed, default: {} },
+      seen: [{ type: mongoose.Schema.Types.ObjectId, ref: "Property" }],
+    },
+    // Set when a listing left the list; the next read recomputes it
+    stale: { type: Boolean, default: false },
+    refreshedAt: { type: Date, default: null },
+  },
+  { timestamps: true, minimize: false }
+);
+
+// Listing changes update the lists of the agency's customers
+recommendationSchema.index({ agencyId: 1 });
+recommendationSchema.index({ "items.propertyId": 1 });
+
+export const Recommendation = mongoose.model(
+  "Recommendation",
+  recommendationSchema
+);
@@ -1,6 +1,9 @@
 import express from "express";
 import {
-  getAnalyticsData
+  getAnalyticsData,
+  getPropertyCacheStats,
+  getAuthCacheStats,
+  getNotificationOutboxMetrics,
 } from "../../../controllers/Admin/AnalyticsController.js";
 import { protect } from "../../../middleware/authMiddleware.js";
 
@@ -12,4 +15,18 @@ router.get(
   getAnalyticsData
 );
 
+router.get(
+  "/property-cache",
+  protect(["admin"]),
+  getPropertyCacheStats
+);
+
+router.get("/auth-cache", protect(["admin"]), getAuthCacheStats);
+
+router.get(
+  "/notification-outbox",
+  protect(["admin"]),
+  getNotificationOutboxMetrics
+);
+
 export default router;
\ No newline at end of file
@@ -2,6 +2,7 @@ import express from "express";
 import {
   createCustomer,
   deleteCustomer,
+  exportCustomers,
   getCustomers,
   getCustomersForDropDown,
   updateCustomer,
@@ -16,6 +17,7 @@ router.post("/create", protect(["admin", "agent"]), createCustomer);
 
 // Read
 router.get("/get-all", protect(["admin", "agent"]), getCustomers);
+router.get("/export", protect(["admin", "agent"]), exportCustomers);
 router.get(
   "/get-all-for-dropDown/:id",
   // protect(["admin", "agent"]),
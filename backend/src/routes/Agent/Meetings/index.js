@@ -2,6 +2,7 @@ import express from "express";
 import {
   createMeeting,
   deleteMeeting,
+  exportMeetings,
   getMeetingById,
   getMeetingsByAgency,
   updateMeeting,
@@ -16,6 +17,7 @@ router.post("/create", protect(["admin", "agent"]), createMeeting);
 
 // Read
 router.get("/get-all", protect(["admin", "agent"]), getMeetingsByAgency);
+router.get("/export", protect(["admin", "agent"]), exportMeetings);
 router.get("/getById/:id", protect(["admin", "agent"]), getMeetingById);
 
 // Update
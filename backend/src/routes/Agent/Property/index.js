@@ -4,8 +4,14 @@ import {
   getProperties,
   getSingleProperty,
   updateProperty,
-  deleteProperty
+  deleteProperty,
+  getPropertyFacets,
+  importPropertiesFile,
+  exportProperties,
+  getPropertyMatches
 } from "../../../controllers/Agent/PropertyController.js";
+import multer from "multer";
+import os from "os";
 import { createUpload } from "../../../utils/multerConfig.js";
 import { protect } from "../../../middleware/authMiddleware.js";
 
@@ -13,6 +19,12 @@ const router = express.Router();
 
 const upload = createUpload("Properties");
 
+// Import files are streamed from a temp file and removed afterwards
+const importUpload = multer({
+  dest: os.tmpdir(),
+  limits: { fileSize: 200 * 1024 * 1024 },
+});
+
 
 // Using a more RESTful approach for property routes.
 // This assumes the router is mounted at a path like `/api/agent/properties`.
@@ -21,6 +33,13 @@ router.route("/")
   .get(protect(["admin", "agent"]), getProperties)
   .post(protect(["admin", "agent"]), upload.multiple("images", 10), createProperty);
 
+router.get("/facets", protect(["admin", "agent"]), getPropertyFacets);
+router.get("/export", protect(["admin", "agent"]), exportProperties);
+
+router.post("/import", protect(["admin", "agent"]), importUpload.single("file"), importPropertiesFile);
+
+router.get("/:id/matches", protect(["admin", "agent"]), getPropertyMatches);
+
 router.route("/:id")
   .get(protect(["admin", "agent"]), getSingleProperty)
   .put(protect(["admin", "agent"]), upload.multiple("images", 10), updateProperty)
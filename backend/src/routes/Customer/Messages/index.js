@@ -13,12 +13,17 @@ import {
   blockConversation,
   unblockConversation,
   getLatestMessages,
-  getCustomers
+  getCustomers,
+  searchMessages
 } from "../../../controllers/Customer/MessageController.js";
-import multer from "multer";
 import path from "path";
 import fs from "fs";
 import { protect } from "../../../middleware/authMiddleware.js";
+import {
+  attachmentUploadErrors,
+  handleAttachmentUpload,
+  uploadMessageAttachment,
+} from "../../../utils/messageAttachments.js";
 
 const router = express.Router();
 
@@ -28,42 +33,17 @@ if (!fs.existsSync(uploadDir)) {
   fs.mkdirSync(uploadDir, { recursive: true });
 }
 
-const messageUploadDir = path.resolve(process.cwd(), "../backend/src/uploads/messages");
-if (!fs.existsSync(messageUploadDir)) {
-  fs.mkdirSync(messageUploadDir, { recursive: true });
-}
-
-const storage = multer.diskStorage({
-  destination: function (req, file, cb) {
-    cb(null, messageUploadDir);
-  },
-  filename: function (req, file, cb) {
-    const uniqueSuffix = Date.now() + "-" + Math.round(Math.random() * 1e9);
-    const ext = path.extname(file.originalname);
-    cb(null, `${file.fieldname}-${uniqueSuffix}${ext}`);
-  },
-});
-
-const upload = multer({ storage });
-
-router.post("/upload", upload.single("file"), (req, res) => {
-  if (!req.file) {
-    return res.status(400).json({ success: false, message: "No file uploaded" });
-  }
-  const fileUrl = `${req.protocol}://${req.get("host")}/uploads/messages/${req.file.filename}`;
-  res.json({
-    success: true,
-    file: {
-      name: req.file.originalname,
-      url: fileUrl,
-      type: req.file.mimetype,
-      size: req.file.size,
-    },
-  });
-});
+router.post(
+  "/upload",
+  protect(["admin", "agent", "customer"]),
+  uploadMessageAttachment,
+  handleAttachmentUpload,
+  attachmentUploadErrors
+);
 
 router.get("/conversations", protect(["admin", "agent", "customer"]), getConversations);
 router.get("/conversations/:id", protect(["admin", "agent", "customer"]), getConversationMessages);
+router.get("/search", protect(["admin", "agent", "customer"]), searchMessages);
 
 router.post(
   "/conversations/:id",
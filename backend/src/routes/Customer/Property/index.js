@@ -3,12 +3,14 @@ import {
   getProperties,
   getAllSharedProperties,
   getSingleProperty,
+  getPropertyFacets,
 } from "../../../controllers/Customer/PropertyController.js";
 const router = express.Router();
 import { protect } from "../../../middleware/authMiddleware.js";
 
 router.get("/", protect(["customer"]), getProperties);
 router.get("/getAllSharedProperties", getAllSharedProperties);
+router.get("/facets", protect(["customer"]), getPropertyFacets);
 // Keep the router as is; params will still work
 router.get("/:id", protect(["customer"]), getSingleProperty);
 
@@ -0,0 +1,8 @@
+import express from "express";
+import { protect } from "../../../middleware/authMiddleware.js";
+import { getRecommendations } from "../../../controllers/Customer/RecommendationController.js";
+const router = express.Router();
+
+router.get("/", protect(["customer"]), getRecommendations);
+
+export default router;
@@ -4,6 +4,7 @@ import profileRoutes from "./Profile/index.js";
 import meetingRoutes from "./Meetings/index.js";
 import settingRoutes from "./Settings/index.js";
 import messagesRoutes from "./Messages/index.js";
+import recommendationRoutes from "./Recommendations/index.js";
 
 import dahsboardRoutes from "./Dahsborad/index.js";
 const router = express.Router();
@@ -15,5 +16,6 @@ router.use("/messages", messagesRoutes);
 router.use("/properties", propertyRoutes);
 router.use("/profile", profileRoutes);
 router.use("/dashboard", dahsboardRoutes);
+router.use("/recommendations", recommendationRoutes);
 
 export default router;
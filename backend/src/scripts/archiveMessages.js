@@ -0,0 +1,25 @@
+// Runs one message archival pass now (the cron job runs it nightly) and
+// ensures the archive collection and its index.
+// Usage: npm run archive:messages --workspace backend
+import mongoose from "mongoose";
+import "../config/env.js";
+import connectDB from "../config/db.js";
+import { ArchivedMessage } from "../models/Agent/ArchivedMessageModel.js";
+import { archiveMessages } from "../utils/messageArchive.js";
+
+const run = async () => {
+  await connectDB();
+  await ArchivedMessage.init();
+
+  const { conversations, messages } = await archiveMessages();
+  console.log(
+    `✅ Archived ${messages} messages from ${conversations} conversations`
+  );
+};
+
+run()
+  .catch((error) => {
+    console.error("❌ Message archival failed:", error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
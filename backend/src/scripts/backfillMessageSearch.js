@@ -0,0 +1,89 @@
+// Computes `search_keys` and `agencyId` for existing messages so they show up
+// in message search, and ensures the search index.
+// Usage: npm run backfill:messages --workspace backend
+import mongoose from "mongoose";
+import "../config/env.js";
+import connectDB from "../config/db.js";
+import { Message } from "../models/Agent/MessagesModel.js";
+import { Customer } from "../models/Agent/CustomerModel.js";
+import {
+  buildMessageSearchKeys,
+  MESSAGE_SEARCH_SOURCE_FIELDS,
+} from "../utils/messageSearch.js";
+
+const BATCH_SIZE = 500;
+
+const backfill = async () => {
+  await connectDB();
+  await Message.createIndexes();
+
+  const cursor = Message.find()
+    .select(`${MESSAGE_SEARCH_SOURCE_FIELDS.join(" ")} agencyId`)
+    .lean()
+    .cursor();
+
+  let batch = [];
+  let updated = 0;
+  let orphaned = 0;
+
+  const flush = async () => {
+    if (!batch.length) return;
+    const current = batch;
+    batch = [];
+
+    // Every thread has a customer side; their agency is the thread's
+    const customers = await Customer.find({
+      _id: {
+        $in: current.flatMap(({ senderId, receiverId }) => [
+          senderId,
+          receiverId,
+        ]),
+      },
+    })
+      .select("agencyId")
+      .lean();
+    const agencies = new Map(
+      customers.map(({ _id, agencyId }) => [String(_id), agencyId])
+    );
+
+    const operations = current.map((message) => {
+      const agencyId =
+        message.agencyId ||
+        agencies.get(String(message.senderId)) ||
+        agencies.get(String(message.receiverId));
+      if (!agencyId) orphaned += 1;
+      return {
+        updateOne: {
+          filter: { _id: message._id },
+          update: {
+            $set: {
+              search_keys: buildMessageSearchKeys(message),
+              ...(agencyId ? { agencyId } : {}),
+            },
+          },
+        },
+      };
+    });
+    await Message.bulkWrite(operations, { ordered: false });
+    updated += operations.length;
+    console.log(`🔄 Indexed ${updated} messages`);
+  };
+
+  for await (const message of cursor) {
+    batch.push(message);
+    if (batch.length >= BATCH_SIZE) await flush();
+  }
+  await flush();
+
+  console.log(
+    `✅ Message backfill done: ${updated} indexed` +
+      ` (${orphaned} without a customer agency)`
+  );
+};
+
+backfill()
+  .catch((error) => {
+    console.error("❌ Message backfill failed:", error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
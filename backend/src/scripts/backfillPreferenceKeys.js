@@ -0,0 +1,86 @@
+// Computes `match_keys` and `agencyId` for existing customer preferences so
+// new listings can find them, and ensures the matching indexes.
+// Usage: npm run backfill:preferences --workspace backend
+import mongoose from "mongoose";
+import "../config/env.js";
+import connectDB from "../config/db.js";
+import { Preference } from "../models/Common/PreferenceModel.js";
+import { PropertyMatch } from "../models/Agent/PropertyMatchModel.js";
+import { Customer } from "../models/Agent/CustomerModel.js";
+import {
+  buildPreferenceKeys,
+  MATCH_SOURCE_FIELDS,
+} from "../utils/preferenceMatching.js";
+
+const BATCH_SIZE = 500;
+
+const backfill = async () => {
+  await connectDB();
+  await Promise.all([
+    Preference.createIndexes(),
+    PropertyMatch.createIndexes(),
+  ]);
+
+  const cursor = Preference.find()
+    .select(`${MATCH_SOURCE_FIELDS.join(" ")} userId agencyId`)
+    .lean()
+    .cursor();
+
+  let batch = [];
+  let updated = 0;
+  let orphaned = 0;
+
+  const flush = async () => {
+    if (!batch.length) return;
+    const current = batch;
+    batch = [];
+
+    // One customer lookup per batch for the missing agencies
+    const customers = await Customer.find({
+      _id: { $in: current.map(({ userId }) => userId) },
+    })
+      .select("agencyId")
+      .lean();
+    const agencies = new Map(
+      customers.map(({ _id, agencyId }) => [String(_id), agencyId])
+    );
+
+    const operations = current.map((preference) => {
+      const agencyId =
+        preference.agencyId || agencies.get(String(preference.userId));
+      if (!agencyId) orphaned += 1;
+      return {
+        updateOne: {
+          filter: { _id: preference._id },
+          update: {
+            $set: {
+              match_keys: buildPreferenceKeys(preference),
+              ...(agencyId ? { agencyId } : {}),
+            },
+          },
+        },
+      };
+    });
+    await Preference.bulkWrite(operations, { ordered: false });
+    updated += operations.length;
+    console.log(`🔄 Indexed ${updated} preferences`);
+  };
+
+  for await (const preference of cursor) {
+    batch.push(preference);
+    if (batch.length >= BATCH_SIZE) await flush();
+  }
+  await flush();
+
+  console.log(
+    `✅ Preference backfill done: ${updated} indexed` +
+      ` (${orphaned} without a customer agency)`
+  );
+};
+
+backfill()
+  .catch((error) => {
+    console.error("❌ Preference backfill failed:", error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
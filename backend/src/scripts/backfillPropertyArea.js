@@ -0,0 +1,68 @@
+// Computes `area_sqft` and `price_per_sqft` for existing properties and
+// ensures their indexes. Only properties missing `area_sqft` are processed
+// unless --all (e.g. after changing a unit conversion factor).
+// Usage: npm run backfill:area --workspace backend [-- --all]
+import mongoose from "mongoose";
+import "../config/env.js";
+import connectDB from "../config/db.js";
+import { Property } from "../models/Agent/PropertyModel.js";
+import {
+  AREA_SOURCE_FIELDS,
+  computeAreaFields,
+} from "../utils/propertyArea.js";
+
+const BATCH_SIZE = 500;
+const RECOMPUTE_ALL = process.argv.includes("--all");
+
+const backfill = async () => {
+  await connectDB();
+  await Property.createIndexes();
+
+  const filter = RECOMPUTE_ALL ? {} : { area_sqft: { $exists: false } };
+  const cursor = Property.find(filter)
+    .select(AREA_SOURCE_FIELDS.join(" "))
+    .lean()
+    .cursor();
+
+  let operations = [];
+  let measured = 0;
+  let unmeasured = 0;
+
+  const flush = async () => {
+    if (!operations.length) return;
+    await Property.bulkWrite(operations, { ordered: false });
+    operations = [];
+    console.log(`🔄 Measured ${measured} properties (${unmeasured} without area)`);
+  };
+
+  for await (const property of cursor) {
+    const fields = computeAreaFields(property);
+    const update = {};
+    Object.entries(fields).forEach(([field, value]) => {
+      const op = value === null ? "$unset" : "$set";
+      update[op] = { ...update[op], [field]: value === null ? 1 : value };
+    });
+
+    if (fields.area_sqft === null) unmeasured += 1;
+    else measured += 1;
+
+    // Nothing to write for a property without an area that never had one
+    if (!update.$set && !RECOMPUTE_ALL) continue;
+    operations.push({
+      updateOne: { filter: { _id: property._id }, update },
+    });
+    if (operations.length >= BATCH_SIZE) await flush();
+  }
+  await flush();
+
+  console.log(
+    `✅ Area backfill done: ${measured} measured, ${unmeasured} without area`
+  );
+};
+
+backfill()
+  .catch((error) => {
+    console.error("❌ Area backfill failed:", error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
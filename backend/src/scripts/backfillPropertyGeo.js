@@ -0,0 +1,61 @@
+// Geocodes property locations into `geo_location` and ensures the 2dsphere
+// indexes. Only properties without coordinates are processed unless --all.
+// Usage: npm run backfill:geo --workspace backend [-- --all]
+import mongoose from "mongoose";
+import "../config/env.js";
+import connectDB from "../config/db.js";
+import { Property } from "../models/Agent/PropertyModel.js";
+import { geocodeLocation, loadGazetteer } from "../utils/geocoder.js";
+
+const BATCH_SIZE = 500;
+const REGEOCODE_ALL = process.argv.includes("--all");
+
+const backfill = async () => {
+  await connectDB();
+  await Property.createIndexes();
+  await loadGazetteer();
+
+  const filter = { location: { $nin: [null, ""] } };
+  if (!REGEOCODE_ALL) filter.geo_location = { $exists: false };
+
+  const cursor = Property.find(filter).select("location").lean().cursor();
+
+  let operations = [];
+  let located = 0;
+  let unresolved = 0;
+
+  const flush = async () => {
+    if (!operations.length) return;
+    await Property.bulkWrite(operations, { ordered: false });
+    operations = [];
+    console.log(`🔄 Located ${located} properties (${unresolved} unresolved)`);
+  };
+
+  for await (const property of cursor) {
+    const point = await geocodeLocation(property.location);
+    if (point) {
+      located += 1;
+      operations.push({
+        updateOne: {
+          filter: { _id: property._id },
+          update: { $set: { geo_location: point } },
+        },
+      });
+    } else {
+      unresolved += 1;
+    }
+    if (operations.length >= BATCH_SIZE) await flush();
+  }
+  await flush();
+
+  console.log(
+    `✅ Geo backfill done: ${located} located, ${unresolved} unresolved`
+  );
+};
+
+backfill()
+  .catch((error) => {
+    console.error("❌ Geo backfill failed:", error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
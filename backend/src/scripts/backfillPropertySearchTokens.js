@@ -0,0 +1,53 @@
+// Rebuilds `search_tokens` for every property and ensures the search indexes.
+// Usage: npm run backfill:search --workspace backend
+import mongoose from "mongoose";
+import "../config/env.js";
+import connectDB from "../config/db.js";
+import { Property } from "../models/Agent/PropertyModel.js";
+import {
+  buildSearchTokens,
+  SEARCH_SOURCE_FIELDS,
+} from "../utils/propertySearch.js";
+
+const BATCH_SIZE = 500;
+
+const backfill = async () => {
+  await connectDB();
+  await Property.createIndexes();
+
+  const cursor = Property.find()
+    .select(SEARCH_SOURCE_FIELDS.join(" "))
+    .lean()
+    .cursor();
+
+  let operations = [];
+  let updated = 0;
+
+  const flush = async () => {
+    if (!operations.length) return;
+    await Property.bulkWrite(operations, { ordered: false });
+    updated += operations.length;
+    operations = [];
+    console.log(`🔄 Indexed ${updated} properties`);
+  };
+
+  for await (const property of cursor) {
+    operations.push({
+      updateOne: {
+        filter: { _id: property._id },
+        update: { $set: { search_tokens: buildSearchTokens(property) } },
+      },
+    });
+    if (operations.length >= BATCH_SIZE) await flush();
+  }
+  await flush();
+
+  console.log(`✅ Search tokens rebuilt for ${updated} properties`);
+};
+
+backfill()
+  .catch((error) => {
+    console.error("❌ Search backfill failed:", error);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
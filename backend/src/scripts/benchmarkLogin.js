@@ -0,0 +1,156 @@
+// Times the login account lookups against seeded data: the previous
+// queries (hydrated, full documents, no phone index) and the indexed lean
+// lookups of utils/loginLookup.js. Seeds a throwaway database
+// (LOGIN_BENCH_DB, default "login_benchmark") on MONGO_URI and drops it
+// afterwards; no existing data is touched.
+// Usage: npm run bench:login --workspace backend --
+//   [<customers>] [<logins>]
+import mongoose from "mongoose";
+import { performance } from "node:perf_hooks";
+import "../config/env.js";
+import { Agency } from "../models/Agent/AgencyModel.js";
+import { Customer } from "../models/Agent/CustomerModel.js";
+import { User } from "../models/Common/UserModel.js";
+import {
+  findCustomersForLogin,
+  findStaffForLogin,
+  LOGIN_AGENCY_FIELDS,
+} from "../utils/loginLookup.js";
+
+const CUSTOMERS = parseInt(process.argv[2], 10) || 50000;
+const LOGINS = parseInt(process.argv[3], 10) || 500;
+const AGENCIES = 100;
+const BATCH_SIZE = 5000;
+const DB_NAME = process.env.LOGIN_BENCH_DB || "login_benchmark";
+const PHONE_INDEX = "phoneNumber_1_isDeleted_1";
+
+const id = () => new mongoose.Types.ObjectId();
+const phoneOf = (i) => `+91${9000000000 + i}`;
+const emailOf = (i) => `agent${i}@bench.test`;
+// Every tenth customer also has a profile with another agency
+const customerPhone = (i) => phoneOf(i % 10 === 9 ? i - 1 : i);
+
+const seed = async () => {
+  const agencies = Array.from({ length: AGENCIES }, (_, i) => ({
+    _id: id(),
+    name: `Agency ${i}`,
+    slug: `agency-${i}`,
+    email: `agency${i}@bench.test`,
+    phone: phoneOf(i),
+    owner: id(),
+  }));
+  await Agency.insertMany(agencies, { lean: true });
+
+  await User.insertMany(
+    agencies.map((agency, i) => ({
+      name: `Agent ${i}`,
+      email: emailOf(i),
+      password: "$2a$10$benchmarkbenchmarkbenchmarkbenchmarkbenchmarkbench",
+      role: "agent",
+      agencyId: agency._id,
+    })),
+    { lean: true }
+  );
+
+  for (let from = 0; from < CUSTOMERS; from += BATCH_SIZE) {
+    const count = Math.min(BATCH_SIZE, CUSTOMERS - from);
+    await Customer.insertMany(
+      Array.from({ length: count }, (_, offset) => {
+        const i = from + offset;
+        return {
+          fullName: `Customer ${i}`,
+          email: `customer${i}@bench.test`,
+          phoneNumber: customerPhone(i),
+          initialNotes: "Looking for a 3 BHK near the metro. ".repeat(10),
+          agencyId: agencies[i % AGENCIES]._id,
+          isDeleted: i % 50 === 0,
+          role: "customer",
+        };
+      }),
+      { lean: true }
+    );
+  }
+};
+
+const time = async (lookup) => {
+  const samples = [];
+  for (let i = 0; i < LOGINS; i += 1) {
+    const started = performance.now();
+    await lookup(i);
+    samples.push(performance.now() - started);
+  }
+  samples.sort((a, b) => a - b);
+  const at = (p) => samples[Math.ceil(p * samples.length) - 1].toFixed(2);
+  return { p50Ms: at(0.5), p99Ms: at(0.99) };
+};
+
+const docsExamined = async (query) =>
+  (await query.explain("executionStats")).executionStats.totalDocsExamined;
+
+const randomCustomer = () =>
+  customerPhone(Math.floor(Math.random() * CUSTOMERS));
+const randomStaff = () => emailOf(Math.floor(Math.random() * AGENCIES));
+
+const run = async () => {
+  await mongoose.connect(process.env.MONGO_URI, { dbName: DB_NAME });
+  await mongoose.connection.dropDatabase();
+  await Promise.all([Agency.init(), User.init(), Customer.init()]);
+  console.log(`🌱 Seeding ${CUSTOMERS} customers into ${DB_NAME}...`);
+  await seed();
+
+  // Before: no phone index, hydrated documents with every field
+  await Customer.collection.dropIndex(PHONE_INDEX);
+  const before = {
+    customer: await time(() =>
+      Customer.find({
+        phoneNumber: randomCustomer(),
+        isDeleted: false,
+      }).populate("agencyId", LOGIN_AGENCY_FIELDS)
+    ),
+    staff: await time(() =>
+      User.findOne({ email: randomStaff() })
+        .select("+password")
+        .populate("agencyId", LOGIN_AGENCY_FIELDS)
+    ),
+    customerDocsExamined: await docsExamined(
+      Customer.find({ phoneNumber: phoneOf(1), isDeleted: false })
+    ),
+  };
+
+  // After: indexed, projected, lean
+  await Customer.createIndexes();
+  const after = {
+    customer: await time(() => findCustomersForLogin(randomCustomer())),
+    staff: await time(() => findStaffForLogin(randomStaff())),
+    customerDocsExamined: await docsExamined(
+      Customer.find({ phoneNumber: phoneOf(1), isDeleted: false })
+    ),
+  };
+
+  console.log(`📊 ${LOGINS} lookups per case, ${CUSTOMERS} customers`);
+  console.table(
+    [
+      ["before", before],
+      ["after", after],
+    ].map(([path, result]) => ({
+      path,
+      customerP50Ms: result.customer.p50Ms,
+      customerP99Ms: result.customer.p99Ms,
+      staffP50Ms: result.staff.p50Ms,
+      staffP99Ms: result.staff.p99Ms,
+      customerDocsExamined: result.customerDocsExamined,
+    }))
+  );
+};
+
+run()
+  .catch((error) => {
+    console.error("❌ Login benchmark failed:", error);
+    process.exitCode = 1;
+  })
+  .finally(async () => {
+    if (mongoose.connection.readyState === 1) {
+      await mongoose.connection.dropDatabase();
+    }
+    await mongoose.disconnect();
+  });
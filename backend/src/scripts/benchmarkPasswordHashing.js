@@ -0,0 +1,98 @@
+// Simulates a login storm and measures what it does to everything else on
+// the event loop: bcryptjs on the main thread vs the worker-thread pool.
+// An unrelated "request" (a timer that should fire every few ms) runs
+// alongside; its lateness percentiles are the latency any other endpoint
+// or socket would see. No database is needed.
+// Usage: npm run bench:passwords --workspace backend --
+//   [<logins>] [<concurrency>]
+import bcrypt from "bcryptjs";
+import { monitorEventLoopDelay, performance } from "node:perf_hooks";
+import {
+  closePasswordHasher,
+  getPasswordHasherStats,
+  hashPassword,
+  PASSWORD_HASH_COST,
+  verifyPassword,
+} from "../utils/passwordHasher.js";
+
+const LOGINS = parseInt(process.argv[2], 10) || 200;
+const CONCURRENCY = parseInt(process.argv[3], 10) || 20;
+const PROBE_INTERVAL_MS = 5;
+
+const percentile = (values, p) => {
+  if (!values.length) return 0;
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.ceil(p * sorted.length) - 1)];
+};
+
+// Lateness of a timer that should fire every PROBE_INTERVAL_MS
+const startProbe = () => {
+  const delays = [];
+  let expected = performance.now() + PROBE_INTERVAL_MS;
+  const timer = setInterval(() => {
+    const now = performance.now();
+    delays.push(Math.max(now - expected, 0));
+    expected = now + PROBE_INTERVAL_MS;
+  }, PROBE_INTERVAL_MS);
+  return () => {
+    clearInterval(timer);
+    return delays;
+  };
+};
+
+const storm = async (name, compare, hash) => {
+  const histogram = monitorEventLoopDelay({ resolution: 1 });
+  histogram.enable();
+  const stopProbe = startProbe();
+  const started = performance.now();
+
+  let next = 0;
+  const worker = async () => {
+    while (next < LOGINS) {
+      next += 1;
+      await compare("correct horse battery staple", hash);
+    }
+  };
+  await Promise.all(Array.from({ length: CONCURRENCY }, worker));
+
+  const elapsed = performance.now() - started;
+  const delays = stopProbe();
+  histogram.disable();
+
+  return {
+    path: name,
+    loginsPerSec: Math.round((LOGINS / elapsed) * 1000),
+    probeP50Ms: percentile(delays, 0.5).toFixed(1),
+    probeP99Ms: percentile(delays, 0.99).toFixed(1),
+    probeMaxMs: Math.max(0, ...delays).toFixed(1),
+    loopDelayP99Ms: (histogram.percentile(99) / 1e6).toFixed(1),
+  };
+};
+
+const main = async () => {
+  const hash = await hashPassword("correct horse battery staple");
+  const results = [
+    // Before: bcryptjs on the main thread (its async API still runs there)
+    await storm(
+      "bcryptjs on main thread",
+      (password, stored) => bcrypt.compare(password, stored),
+      hash
+    ),
+    // After: comparisons on the worker pool
+    await storm("worker-thread pool", verifyPassword, hash),
+  ];
+
+  console.log(
+    `📊 ${LOGINS} logins, ${CONCURRENCY} concurrent,` +
+      ` cost ${PASSWORD_HASH_COST}`
+  );
+  console.table(results);
+  console.log(getPasswordHasherStats());
+};
+
+main()
+  .catch((error) => {
+    console.error("❌ Password hashing benchmark failed:", error);
+    process.exitCode = 1;
+  })
+  .finally(() => closePasswordHasher());
@@ -0,0 +1,152 @@
+// Compares the hydrated + JSON.stringify read path with the lean +
+// precompiled serializer path for the hot list payloads.
+// Reports CPU time per request and GC activity; no database is needed.
+// Usage: npm run bench:serializers --workspace backend [-- <requests>]
+import mongoose from "mongoose";
+import { PerformanceObserver } from "node:perf_hooks";
+import { Message } from "../models/Agent/MessagesModel.js";
+import { Property } from "../models/Agent/PropertyModel.js";
+import { Notification } from "../models/Common/NotificationModel.js";
+import {
+  serializeMessages,
+  serializeNotifications,
+  serializeProperties,
+} from "../utils/serializers.js";
+
+const REQUESTS = parseInt(process.argv[2], 10) || 2000;
+const WARMUP = 200;
+
+const id = () => new mongoose.Types.ObjectId();
+
+// Raw rows shaped like what the driver returns for each collection
+const fixtures = {
+  properties: {
+    Model: Property,
+    serialize: serializeProperties,
+    pageSize: 10,
+    row: (i) => ({
+      _id: id(),
+      title: `3 BHK apartment ${i}`,
+      type: "residential",
+      category: "flat",
+      description: "Spacious corner flat with park view. ".repeat(8),
+      location: "Sector 21, Mohali",
+      price: 7500000 + i,
+      built_up_area: 1650,
+      unit_area_type: "square feet",
+      bedrooms: 3,
+      bathrooms: 2,
+      amenities: ["gym", "pool", "club house", "lift"],
+      images: [
+        { _id: id(), url: `${i}-1.webp`, isPrimary: true },
+        { _id: id(), url: `${i}-2.webp`, isPrimary: false },
+        { _id: id(), url: `${i}-3.webp`, isPrimary: false },
+      ],
+      agencyId: id(),
+      status: "available",
+      createdAt: new Date(),
+      updatedAt: new Date(),
+      __v: 0,
+    }),
+  },
+  messages: {
+    Model: Message,
+    serialize: serializeMessages,
+    pageSize: 50,
+    row: (i) => ({
+      _id: id(),
+      conversationId: id(),
+      senderId: id(),
+      receiverId: id(),
+      content: `Is the property still available? (${i})`,
+      type: "text",
+      attachments: [],
+      isRead: i % 2 === 0,
+      readAt: null,
+      createdAt: new Date(),
+      updatedAt: new Date(),
+      __v: 0,
+    }),
+  },
+  notifications: {
+    Model: Notification,
+    serialize: serializeNotifications,
+    pageSize: 20,
+    row: (i) => ({
+      _id: id(),
+      userId: id(),
+      agencyId: id(),
+      message: `A new property matching your preferences was added (${i})`,
+      type: "property_added",
+      isRead: false,
+      link: "/customer/properties",
+      createdAt: new Date(),
+      updatedAt: new Date(),
+      __v: 0,
+    }),
+  },
+};
+
+const gcStats = { count: 0, duration: 0 };
+const observer = new PerformanceObserver((list) => {
+  list.getEntries().forEach((entry) => {
+    gcStats.count += 1;
+    gcStats.duration += entry.duration;
+  });
+});
+
+const measure = (run) => {
+  for (let i = 0; i < WARMUP; i++) run();
+
+  gcStats.count = 0;
+  gcStats.duration = 0;
+  const heapBefore = process.memoryUsage().heapUsed;
+  const cpuBefore = process.cpuUsage();
+  let bytes = 0;
+  for (let i = 0; i < REQUESTS; i++) bytes += run().length;
+  const cpu = process.cpuUsage(cpuBefore);
+
+  return {
+    cpuPerRequestUs: ((cpu.user + cpu.system) / REQUESTS).toFixed(1),
+    gcCount: gcStats.count,
+    gcMs: gcStats.duration.toFixed(1),
+    heapDeltaKb: Math.round((process.memoryUsage().heapUsed - heapBefore) / 1024),
+    bytesPerRequest: Math.round(bytes / REQUESTS),
+  };
+};
+
+const main = async () => {
+  observer.observe({ entryTypes: ["gc"] });
+  const results = [];
+
+  for (const [name, { Model, serialize, pageSize, row }] of Object.entries(
+    fixtures
+  )) {
+    const rows = Array.from({ length: pageSize }, (_, i) => row(i));
+
+    // Before: every row is hydrated into a document, then stringified
+    results.push({
+      payload: name,
+      path: "hydrated + JSON.stringify",
+      ...measure(() =>
+        JSON.stringify({ success: true, data: rows.map((r) => Model.hydrate(r)) })
+      ),
+    });
+
+    // After: lean rows written by the precompiled serializer
+    results.push({
+      payload: name,
+      path: "lean + serializer",
+      ...measure(() => `{"success":true,"data":${serialize(rows)}}`),
+    });
+  }
+
+  observer.disconnect();
+  console.log(`📊 ${REQUESTS} requests per case`);
+  console.table(results);
+};
+
+main().catch((error) => {
+  console.error("❌ Serializer benchmark failed:", error);
+  process.exitCode = 1;
+});
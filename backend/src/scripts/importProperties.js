@@ -0,0 +1,72 @@
+// Bulk-imports properties for one agency from a CSV or NDJSON file.
+// Local image paths in the file resolve inside --images (e.g. an extracted
+// zip of listing photos); the script waits for image processing to finish.
+// Usage: npm run import:properties --workspace backend --
+//   <file> --agency <agencyId> [--format csv|ndjson] [--images <dir>]
+import fs from "fs";
+import path from "path";
+import mongoose from "mongoose";
+import "../config/env.js";
+import connectDB from "../config/db.js";
+import { Property } from "../models/Agent/PropertyModel.js";
+import {
+  detectImportFormat,
+  importProperties,
+} from "../utils/propertyImport.js";
+import {
+  drainImageQueue,
+  getImageQueueStats,
+} from "../utils/propertyImageQueue.js";
+
+const MAX_PRINTED_ERRORS = 50;
+
+const readOption = (name) => {
+  const index = process.argv.indexOf(`--${name}`);
+  return index === -1 ? undefined : process.argv[index + 1];
+};
+
+const run = async () => {
+  const [file] = process.argv.slice(2);
+  const agencyId = readOption("agency");
+  if (!file || file.startsWith("--") || !agencyId) {
+    throw new Error("Usage: importProperties.js <file> --agency <agencyId>");
+  }
+  if (!mongoose.Types.ObjectId.isValid(agencyId)) {
+    throw new Error(`Invalid agency id "${agencyId}"`);
+  }
+
+  const format = detectImportFormat(readOption("format"), file);
+  const images = readOption("images");
+
+  await connectDB();
+  const startedAt = Date.now();
+  const summary = await importProperties(Property, fs.createReadStream(file), {
+    format,
+    agencyId,
+    imageDir: images ? path.resolve(images) : undefined,
+  });
+
+  summary.errors.slice(0, MAX_PRINTED_ERRORS).forEach(({ line, errors }) => {
+    console.warn(`⚠️ Line ${line}: ${errors.join("; ")}`);
+  });
+  console.log(
+    `✅ Imported ${summary.inserted} of ${summary.total} rows in ` +
+      `${((Date.now() - startedAt) / 1000).toFixed(1)}s ` +
+      `(${summary.failed} failed)`
+  );
+
+  if (summary.imagesQueued) {
+    console.log(`🖼️ Processing ${summary.imagesQueued} images...`);
+    await drainImageQueue();
+    const { attached, failed } = getImageQueueStats();
+    console.log(`✅ Images attached: ${attached}, failed: ${failed}`);
+  }
+  if (summary.failed) process.exitCode = 1;
+};
+
+run()
+  .catch((error) => {
+    console.error("❌ Property import failed:", error.message);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
@@ -1,9 +1,17 @@
 import dotenv from "dotenv";
 import path from "path";
+import cluster from "cluster";
+import mongoose from "mongoose";
 import { fileURLToPath } from "url";
 import connectDB from "./config/db.js";
 import app from "./app.js";
 import { startCronJob } from "./cronJob/index.js";
+import { closeRealtime } from "./utils/realtime.js";
+import { closePasswordHasher } from "./utils/passwordHasher.js";
+import {
+  startNotificationDispatcher,
+  stopNotificationDispatcher,
+} from "./utils/notificationOutbox.js";
 
 // load env
 const __filename = fileURLToPath(import.meta.url);
@@ -13,8 +21,49 @@ dotenv.config({ path: path.resolve(__dirname, "../../.env") });
 // connect db
 connectDB();
 
-startCronJob();
-// start server
+// Under cluster.js only one worker runs the cron jobs
+const cronTasks =
+  process.env.RUN_CRON_JOBS === "false" ? [] : startCronJob();
+
+// Every process delivers queued notifications; claims keep them apart
+if (process.env.RUN_NOTIFICATION_DISPATCHER !== "false") {
+  startNotificationDispatcher();
+}
+
+// start server; a cluster worker gets its connections from the primary
 const PORT = process.env.PORT || 5000;
-app.listen(PORT, () => console.log(`🚀 Server running on port ${PORT}`));
-    
\ No newline at end of file
+if (cluster.isWorker) {
+  console.log(`🚀 Worker ${process.pid} ready`);
+} else {
+  app.listen(PORT, () => console.log(`🚀 Server running on port ${PORT}`));
+}
+
+// Graceful shutdown: stop the jobs, let open requests finish, close the
+// sockets and the database. A second signal stops the process at once.
+let shuttingDown = false;
+const shutdown = async (reason) => {
+  if (shuttingDown) return;
+  shuttingDown = true;
+  console.log(`🛑 ${reason}: shutting down ${process.pid}`);
+
+  try {
+    cronTasks.forEach((task) => task.stop());
+    await stopNotificationDispatcher();
+    await closeRealtime();
+    await closePasswordHasher();
+    await mongoose.connection.close();
+    console.log(`✅ ${process.pid} stopped`);
+  } catch (error) {
+    console.error("❌ Shutdown failed:", error);
+    process.exitCode = 1;
+  }
+  // Leaving the IPC channel lets the worker exit
+  if (cluster.isWorker && cluster.worker.isConnected()) {
+    cluster.worker.disconnect();
+  }
+};
+
+process.once("SIGTERM", () => shutdown("SIGTERM"));
+process.once("SIGINT", () => shutdown("SIGINT"));
+// The primary went away (crashed or stopped before this worker)
+if (cluster.isWorker) process.once("disconnect", () => shutdown("disconnect"));
@@ -0,0 +1,166 @@
+import { publish, subscribe } from "./pubsub.js";
+
+// Cache of the principals `protect` and the socket handshake load for a JWT
+// (a staff user or a customer, agency populated), so an authenticated
+// request does not pay two Mongo queries before reaching its controller.
+// Entries are kept in an LRU of AUTH_CACHE_MAX_ENTRIES users for
+// AUTH_CACHE_TTL_SECONDS. Writes to users, customers and agencies drop the
+// affected entries in every API process (hooks registered with
+// `invalidatePrincipalsOnWrite`), so a deleted customer or agency is logged
+// out on its next request. Each key carries a generation (and the cache an
+// epoch for full clears): a load that raced with a write is served once
+// but not kept.
+
+const TTL_MS = (Number(process.env.AUTH_CACHE_TTL_SECONDS) || 60) * 1000;
+const MAX_ENTRIES = Number(process.env.AUTH_CACHE_MAX_ENTRIES) || 10000;
+
+// `kind:userId` -> { principal, agencyId, expiresAt }
+const entries = new Map();
+const loading = new Map(); // key -> in-flight load promise
+const generations = new Map(); // key -> invalidation counter
+let epoch = 0;
+
+const stats = { hits: 0, misses: 0, evictions: 0, invalidations: 0 };
+
+const INVALIDATE_CHANNEL = "auth-principal:invalidate";
+
+const keyOf = (kind, userId) => `${kind}:${userId}`;
+const idOf = (value) => (value ? String(value._id ?? value) : "");
+
+const dropKey = (key) => {
+  generations.set(key, (generations.get(key) || 0) + 1);
+  loading.delete(key);
+  if (entries.delete(key)) stats.invalidations += 1;
+};
+
+// { kind, ids } drops users, { agencyIds } everyone in those agencies,
+// { all: true } everything
+const dropPrincipals = ({ kind, ids = [], agencyIds = [], all = false }) => {
+  if (all) {
+    epoch += 1;
+    stats.invalidations += entries.size;
+    entries.clear();
+    loading.clear();
+    generations.clear();
+    return;
+  }
+  ids.forEach((id) => dropKey(keyOf(kind, id)));
+  if (!agencyIds.length) return;
+  const agencies = new Set(agencyIds);
+  [...entries].forEach(([key, entry]) => {
+    if (agencies.has(entry.agencyId)) dropKey(key);
+  });
+};
+
+// Writes made by any API process drop the entries in all of them
+subscribe(INVALIDATE_CHANNEL, dropPrincipals);
+
+const invalidate = (message) => publish(INVALIDATE_CHANNEL, message);
+
+const storeEntry = (key, entry) => {
+  entries.delete(key);
+  entries.set(key, entry);
+  while (entries.size > MAX_ENTRIES) {
+    entries.delete(entries.keys().next().value);
+    stats.evictions += 1;
+  }
+};
+
+const loadPrincipal = async (key, load) => {
+  const generation = generations.get(key) || 0;
+  const startEpoch = epoch;
+  const principal = await load();
+
+  if ((generations.get(key) || 0) === generation && epoch === startEpoch) {
+    storeEntry(key, {
+      principal,
+      agencyId: idOf(principal?.agencyId),
+      expiresAt: Date.now() + TTL_MS,
+    });
+  }
+  return principal;
+};
+
+/**
+ * The cached principal of `userId`, calling `load()` on a miss. `kind`
+ * ("user" or "customer") names the collection it comes from. Misses for
+ * the same user share one load. The cached value is shared: callers that
+ * hand it to a request should copy it.
+ */
+export const getCachedPrincipal = async (kind, userId, load) => {
+  const key = keyOf(kind, userId);
+  const cached = entries.get(key);
+
+  if (cached && cached.expiresAt > Date.now()) {
+    // Refresh LRU position
+    entries.delete(key);
+    entries.set(key, cached);
+    stats.hits += 1;
+    return cached.principal;
+  }
+
+  stats.misses += 1;
+  if (!loading.has(key)) {
+    loading.set(
+      key,
+      loadPrincipal(key, load).finally(() => loading.delete(key))
+    );
+  }
+  return loading.get(key);
+};
+
+// `_id` values a write filter targets, or null when it cannot tell
+const idsOfFilter = (filter = {}) => {
+  const { _id: value } = filter;
+  if (!value) return null;
+  if (typeof value === "string" || value.toHexString) return [String(value)];
+  if (Array.isArray(value.$in)) return value.$in.map(String);
+  return null;
+};
+
+/**
+ * Register hooks on `schema` dropping the cached principals its writes
+ * affect: `kind` ("user" / "customer") for the principals themselves,
+ * "agency" for everyone in the written agencies. Writes whose targets are
+ * unknown (e.g. updateMany on a non-id filter) clear the cache.
+ */
+export const invalidatePrincipalsOnWrite = (schema, kind) => {
+  const drop = (ids) => {
+    if (!ids) {
+      invalidate({ all: true });
+      return;
+    }
+    if (!ids.length) return;
+    invalidate(kind === "agency" ? { agencyIds: ids } : { kind, ids });
+  };
+
+  schema.post("save", (doc) => drop([String(doc._id)]));
+  schema.post("deleteOne", { document: true, query: false }, (doc) =>
+    drop([String(doc._id)])
+  );
+  schema.post(
+    ["findOneAndUpdate", "findOneAndReplace", "findOneAndDelete"],
+    (doc) => {
+      if (doc) drop([String(doc._id)]);
+    }
+  );
+  schema.post(
+    ["updateOne", "updateMany", "replaceOne", "deleteOne", "deleteMany"],
+    { document: false, query: true },
+    function () {
+      drop(idsOfFilter(this.getFilter()));
+    }
+  );
+  schema.post("bulkWrite", () => drop(null));
+};
+
+export const getPrincipalCacheStats = () => {
+  const lookups = stats.hits + stats.misses;
+  return {
+    ...stats,
+    hitRate: lookups ? Number((stats.hits / lookups).toFixed(3)) : 0,
+    entries: entries.size,
+    maxEntries: MAX_ENTRIES,
+    ttlSeconds: TTL_MS / 1000,
+  };
+};
@@ -0,0 +1,184 @@
+import mongoose from "mongoose";
+import { Conversation } from "../models/Agent/ConversationsModel.js";
+import { applyCursor, keysetSort, toCursorPage } from "./pagination.js";
+
+// Conversation list of one user in two aggregations run in parallel.
+// The page is its own pipeline, matched, sorted and cut on the index
+// `participants, lastMessageAt, _id` before anything else, and only its
+// rows join their other participant (a `$lookup` on `_id`), so the cost
+// follows the page size rather than the number of conversations. A second
+// pipeline returns the folder total and the archived/deleted/blocked
+// counts.
+
+export const CONVERSATION_PAGE_SIZE = 50;
+const CONVERSATION_SORT = keysetSort("lastMessageAt", -1);
+
+// Folder from the query string: deleted > archived > blocked > inbox
+export const readConversationFolder = (query = {}) => {
+  if (query.deleted === "true") return "deleted";
+  if (query.archived === "true") return "archived";
+  if (query.blocked === "true") return "blocked";
+  return "inbox";
+};
+
+const folderFilter = (userId, folder) => {
+  if (folder === "deleted") return { deletedBy: userId };
+  const filter = { deletedBy: { $ne: userId } };
+  if (folder === "archived") return { ...filter, archivedBy: userId };
+  filter.archivedBy = { $ne: userId };
+  if (folder === "blocked") return { ...filter, blockedBy: userId };
+  // Inbox: not deleted, not archived, not blocked
+  return { ...filter, blockedBy: { $ne: userId } };
+};
+
+// Aggregation $match does not cast, so cast through the schema first
+const castMatch = (filter) => Conversation.find(filter).cast(Conversation);
+
+// Profile fields of the other participant shown in the list, to add to
+// the `participants.project` of findConversationPage
+export const PARTICIPANT_PROFILE_FIELDS = {
+  userId: 1,
+  jobTitle: 1,
+  companyName: 1,
+  "profilePhoto.medium": 1,
+  "logo.medium": 1,
+};
+
+/**
+ * `userId`, `position` and `avatar` of a joined participant, as the list
+ * has always returned them.
+ */
+export const participantProfile = (participant) => {
+  let photo = null;
+  if (participant.role === "customer") photo = participant.profilePhoto?.medium;
+  else if (participant.role === "agent") photo = participant.logo?.medium;
+
+  return {
+    userId: participant.userId,
+    position: participant.jobTitle || participant.companyName,
+    avatar: photo ? `${process.env.BACKEND_URL || ""}${photo}` : "",
+  };
+};
+
+const hasUser = (field, userId) => ({
+  $in: [userId, { $ifNull: [`$${field}`, []] }],
+});
+const countWhen = (condition) => ({ $sum: { $cond: [condition, 1, 0] } });
+
+/**
+ * One page of `userId`'s conversations in `folder`, newest message first,
+ * each with `otherParticipant` joined from the `participants` collection.
+ *
+ * @param {object} options
+ * @param {"inbox"|"archived"|"deleted"|"blocked"} options.folder
+ * @param {object} options.paging from `readPagination`
+ * @param {{ from: string, project: object }} options.participants
+ *   collection holding the other participants and the fields to return
+ * @returns {Promise<{ data: Array, pagination: object, counts: object }>}
+ */
+export const findConversationPage = async (
+  userId,
+  { folder, paging, participants }
+) => {
+  const id = new mongoose.Types.ObjectId(String(userId));
+  const inFolder = folderFilter(id, folder);
+  const pageMatch = paging.cursorMode
+    ? applyCursor(inFolder, paging.cursor, CONVERSATION_SORT)
+    : inFolder;
+  const skip = paging.cursorMode ? 0 : paging.skip;
+  const withTotal = !paging.cursorMode || paging.includeTotal;
+
+  const [data, [result]] = await Promise.all([
+    Conversation.aggregate([
+      { $match: { ...castMatch(pageMatch), participants: id } },
+      { $sort: CONVERSATION_SORT },
+      { $skip: skip },
+      { $limit: paging.cursorMode ? paging.limit + 1 : paging.limit },
+      {
+        $set: {
+          otherParticipantId: {
+            $first: {
+              $filter: {
+                input: "$participants",
+                cond: { $ne: ["$$this", id] },
+              },
+            },
+          },
+        },
+      },
+      {
+        $lookup: {
+          from: participants.from,
+          localField: "otherParticipantId",
+          foreignField: "_id",
+          pipeline: [{ $project: participants.project }],
+          as: "otherParticipant",
+        },
+      },
+      {
+        $set: {
+          otherParticipant: {
+            $ifNull: [{ $first: "$otherParticipant" }, null],
+          },
+        },
+      },
+      { $unset: "otherParticipantId" },
+    ]),
+    Conversation.aggregate([
+      { $match: { participants: id } },
+      {
+        $facet: {
+          total: withTotal
+            ? [{ $match: castMatch(inFolder) }, { $count: "count" }]
+            : [{ $limit: 0 }],
+          counts: [
+            {
+              $group: {
+                _id: null,
+                archiveCount: countWhen({
+                  $and: [
+                    hasUser("archivedBy", id),
+                    { $not: [hasUser("deletedBy", id)] },
+                  ],
+                }),
+                deletedCount: countWhen(hasUser("deletedBy", id)),
+                // Deleted conversations are not counted as blocked
+                blockedCount: countWhen({
+                  $and: [
+                    hasUser("blockedBy", id),
+                    { $not: [hasUser("deletedBy", id)] },
+                  ],
+                }),
+              },
+            },
+          ],
+        },
+      },
+    ]),
+  ]);
+
+  const {
+    archiveCount = 0,
+    deletedCount = 0,
+    blockedCount = 0,
+  } = result.counts[0] || {};
+  const counts = { archiveCount, deletedCount, blockedCount };
+  const total = result.total[0]?.count || 0;
+
+  if (paging.cursorMode) {
+    const page = toCursorPage(data, paging.limit, CONVERSATION_SORT);
+    if (paging.includeTotal) page.pagination.total = total;
+    return { ...page, counts };
+  }
+
+  return {
+    data,
+    pagination: {
+      total,
+      page: paging.page,
+      pages: Math.ceil(total / paging.limit),
+      limit: paging.limit,
+    },
+    counts,
+  };
+};
@@ -0,0 +1,150 @@
+import fs from "fs";
+import path from "path";
+import readline from "readline";
+import { fileURLToPath } from "url";
+
+// Offline geocoding of free-text property locations.
+// Coordinates already present in the text (e.g. the Google Maps link saved by
+// the "use current location" button) are used as-is; otherwise place names
+// are looked up in a local gazetteer file, loaded once and kept in memory.
+//
+// GAZETTEER_PATH may point to a GeoNames dump (`.txt`/`.tsv`, e.g.
+// cities500.txt) or a CSV with `name,latitude,longitude,population,aliases`
+// (aliases separated by `|`). The bundled CSV covers major Indian cities.
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+const DEFAULT_GAZETTEER = path.resolve(__dirname, "../data/gazetteer.csv");
+
+const MAX_NGRAM_WORDS = 3;
+let gazetteerPromise = null;
+
+// Lowercase, strip accents and punctuation: "Sahibzada Ajit Singh Nagar" ->
+// "sahibzada ajit singh nagar"
+const normalizeName = (name) =>
+  String(name || "")
+    .normalize("NFKD")
+    .replace(/[\u0300-\u036f]/g, "")
+    .toLowerCase()
+    .split(/[^\p{L}\p{N}]+/u)
+    .filter(Boolean)
+    .join(" ");
+
+// GeoJSON point, or null when the values are not a valid lat/lng pair
+export const toPoint = (latitude, longitude) => {
+  const lat = Number(latitude);
+  const lng = Number(longitude);
+  if (
+    !Number.isFinite(lat) ||
+    !Number.isFinite(lng) ||
+    Math.abs(lat) > 90 ||
+    Math.abs(lng) > 180
+  ) {
+    return null;
+  }
+  return { type: "Point", coordinates: [lng, lat] };
+};
+
+// "30.70,76.71" anywhere in the text (plain or inside a maps `?q=` link)
+export const parseCoordinates = (text) => {
+  const match = String(text || "").match(
+    /(-?\d{1,2}\.\d+)\s*,\s*(-?\d{1,3}\.\d+)/
+  );
+  return match ? toPoint(match[1], match[2]) : null;
+};
+
+const parseRow = (line, geonames) => {
+  if (geonames) {
+    const cols = line.split("\t");
+    return {
+      names: [cols[1], cols[2], ...(cols[3] ? cols[3].split(",") : [])],
+      point: toPoint(cols[4], cols[5]),
+      population: Number(cols[14]) || 0,
+    };
+  }
+  const [name, latitude, longitude, population, aliases] = line.split(",");
+  return {
+    names: [name, ...(aliases ? aliases.split("|") : [])],
+    point: toPoint(latitude, longitude),
+    population: Number(population) || 0,
+  };
+};
+
+const readGazetteer = async (file) => {
+  const geonames = /\.(txt|tsv)$/i.test(file);
+  const places = new Map();
+  const lines = readline.createInterface({
+    input: fs.createReadStream(file),
+    crlfDelay: Infinity,
+  });
+
+  let header = !geonames;
+  for await (const line of lines) {
+    if (header) {
+      header = false;
+      continue;
+    }
+    if (!line.trim()) continue;
+
+    const { names, point, population } = parseRow(line, geonames);
+    if (!point) continue;
+
+    // Ambiguous names resolve to the most populated place
+    names.forEach((name) => {
+      const key = normalizeName(name);
+      if (!key) return;
+      const existing = places.get(key);
+      if (!existing || existing.population < population) {
+        places.set(key, { point, population });
+      }
+    });
+  }
+
+  console.log(`🗺️ Gazetteer loaded: ${places.size} place names`);
+  return places;
+};
+
+export const loadGazetteer = () => {
+  if (!gazetteerPromise) {
+    const file = process.env.GAZETTEER_PATH || DEFAULT_GAZETTEER;
+    gazetteerPromise = readGazetteer(file).catch((error) => {
+      console.error("❌ Failed to load gazetteer:", error.message);
+      return new Map();
+    });
+  }
+  return gazetteerPromise;
+};
+
+/**
+ * Geocode a free-text location to a GeoJSON point (or null).
+ * Whole comma-separated parts are tried first ("Sector 70, Mohali" ->
+ * "sector 70", "mohali"), then word n-grams inside each part.
+ */
+export const geocodeLocation = async (text) => {
+  if (!text) return null;
+
+  const coordinates = parseCoordinates(text);
+  if (coordinates) return coordinates;
+
+  const places = await loadGazetteer();
+  const parts = String(text)
+    .split(/[,;\n]/)
+    .map(normalizeName)
+    .filter(Boolean);
+
+  for (const part of parts) {
+    if (places.has(part)) return places.get(part).point;
+  }
+
+  for (const part of parts) {
+    const words = part.split(" ");
+    for (let size = Math.min(MAX_NGRAM_WORDS, words.length); size > 0; size--) {
+      for (let start = 0; start + size <= words.length; start++) {
+        const place = places.get(words.slice(start, start + size).join(" "));
+        if (place) return place.point;
+      }
+    }
+  }
+
+  return null;
+};
@@ -0,0 +1,108 @@
+import mongoose from "mongoose";
+import { Conversation } from "../models/Agent/ConversationsModel.js";
+import { emitToUser, hasRealtime } from "./realtime.js";
+
+// Live unread counters for the header badges.
+// Writes that change a user's unread notifications (Notification model
+// hooks) or unread messages (message controllers) queue the user; the queue
+// is flushed on the next tick, so a burst of writes for one user (e.g. a
+// batch of notifications) costs one count and one `counters` event.
+// Clients ask for the current values with `counters:get` when they mount.
+
+const pending = { unreadNotifications: new Set(), unreadMessages: new Set() };
+let flushScheduled = false;
+
+// The Notification model registers hooks that import this module
+export const countUnreadNotifications = (userId) =>
+  mongoose.model("Notification").countDocuments({ userId, isRead: false });
+
+// Sum of the user's per-conversation unread counts, deleted threads aside
+export const countUnreadMessages = async (userId) => {
+  const id = new mongoose.Types.ObjectId(String(userId));
+  const [result] = await Conversation.aggregate([
+    { $match: { participants: id, deletedBy: { $ne: id } } },
+    {
+      $group: {
+        _id: null,
+        total: {
+          $sum: {
+            $ifNull: [
+              { $getField: { field: String(id), input: "$unreadCount" } },
+              0,
+            ],
+          },
+        },
+      },
+    },
+  ]);
+  return result?.total || 0;
+};
+
+const COUNTERS = {
+  unreadNotifications: countUnreadNotifications,
+  unreadMessages: countUnreadMessages,
+};
+
+const flush = async () => {
+  flushScheduled = false;
+  const updates = new Map(); // userId -> { counter: value }
+
+  await Promise.all(
+    Object.entries(pending).flatMap(([counter, userIds]) => {
+      const ids = [...userIds];
+      userIds.clear();
+      return ids.map(async (userId) => {
+        try {
+          const value = await COUNTERS[counter](userId);
+          updates.set(userId, { ...updates.get(userId), [counter]: value });
+        } catch (error) {
+          console.error(`❌ Counting ${counter} of ${userId} failed:`, error);
+        }
+      });
+    })
+  );
+
+  updates.forEach((counters, userId) =>
+    emitToUser(userId, "counters", counters)
+  );
+};
+
+const queue = (counter, userIds = []) => {
+  if (!hasRealtime()) return;
+  userIds
+    .filter(Boolean)
+    .forEach((userId) => pending[counter].add(String(userId)));
+  if (flushScheduled || !pending[counter].size) return;
+  flushScheduled = true;
+  setImmediate(() => {
+    flush().catch((error) =>
+      console.error("❌ Pushing live counters failed:", error)
+    );
+  });
+};
+
+export const pushUnreadNotifications = (userIds) =>
+  queue("unreadNotifications", userIds);
+export const pushUnreadMessages = (userIds) =>
+  queue("unreadMessages", userIds);
+
+/**
+ * Socket handler (see initRealtime): `counters:get` answers with the
+ * socket user's current counters.
+ */
+export const registerCounterEvents = (socket) => {
+  socket.on("counters:get", async (reply) => {
+    if (typeof reply !== "function") return;
+    const userId = socket.data.user._id;
+    try {
+      const [unreadNotifications, unreadMessages] = await Promise.all([
+        countUnreadNotifications(userId),
+        countUnreadMessages(userId),
+      ]);
+      reply({ unreadNotifications, unreadMessages });
+    } catch (error) {
+      console.error("❌ Reading live counters failed:", error);
+      reply({});
+    }
+  });
+};
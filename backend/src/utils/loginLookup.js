@@ -0,0 +1,26 @@
+import { User } from "../models/Common/UserModel.js";
+import { Customer } from "../models/Agent/CustomerModel.js";
+
+// Account lookups of the login endpoint.
+// Each is served by an index (`email` is unique on users, customers have
+// `phoneNumber, isDeleted`), reads only what login checks and returns, and
+// skips document hydration.
+
+export const LOGIN_AGENCY_FIELDS = "name slug email phone logoUrl owner";
+const STAFF_LOGIN_FIELDS =
+  "name email role profilePictureUrl agencyId password";
+const CUSTOMER_LOGIN_FIELDS = "fullName email role isDeleted agencyId";
+
+// Staff user (admin/agent) by email, with the password hash
+export const findStaffForLogin = (email) =>
+  User.findOne({ email })
+    .select(STAFF_LOGIN_FIELDS)
+    .populate("agencyId", LOGIN_AGENCY_FIELDS)
+    .lean();
+
+// Active customer profiles of a phone number (one per agency)
+export const findCustomersForLogin = (phoneNumber) =>
+  Customer.find({ phoneNumber, isDeleted: false })
+    .select(CUSTOMER_LOGIN_FIELDS)
+    .populate("agencyId", LOGIN_AGENCY_FIELDS)
+    .lean();
@@ -0,0 +1,125 @@
+import { Conversation } from "../models/Agent/ConversationsModel.js";
+import { Message } from "../models/Agent/MessagesModel.js";
+import { ArchivedMessage } from "../models/Agent/ArchivedMessageModel.js";
+
+// Cold-storage tier for message history.
+// Messages older than MESSAGE_ARCHIVE_AFTER_DAYS, and whole threads every
+// participant has deleted or archived (idle for
+// MESSAGE_ARCHIVE_CLOSED_IDLE_DAYS), are moved to the compressed
+// `archived_messages` collection, keeping the hot collection and its indexes
+// bounded to recent traffic. What is archived is always the oldest part of a
+// thread, so the history API reads the archive only past the end of the hot
+// messages (see utils/messageHistory.js).
+// A move copies a batch first and deletes it from the hot collection after,
+// so an interrupted run is simply resumed by the next one.
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const ARCHIVE_AFTER_DAYS =
+  Number(process.env.MESSAGE_ARCHIVE_AFTER_DAYS) || 365;
+const CLOSED_IDLE_DAYS =
+  Number(process.env.MESSAGE_ARCHIVE_CLOSED_IDLE_DAYS) || 30;
+const BATCH_SIZE = 1000;
+const DUPLICATE_KEY = 11000;
+
+const THREAD_ORDER = { createdAt: 1, _id: 1 };
+
+let running = false;
+
+// Every participant has `field` (deletedBy / archivedBy) set on the thread
+const closedByAll = (field) => ({
+  $and: [
+    { $gt: [{ $size: "$participants" }, 0] },
+    { $setIsSubset: ["$participants", { $ifNull: [`$${field}`, []] }] },
+  ],
+});
+
+// A retried batch may already be (partly) in the archive
+const isOnlyDuplicates = (error) =>
+  error.code === DUPLICATE_KEY ||
+  (error.writeErrors?.length &&
+    error.writeErrors.every((writeError) => writeError.code === DUPLICATE_KEY));
+
+const copyToArchive = async (messages, archivedAt) => {
+  try {
+    await ArchivedMessage.insertMany(
+      messages.map((message) => ({ ...message, archivedAt })),
+      { ordered: false, lean: true }
+    );
+  } catch (error) {
+    if (!isOnlyDuplicates(error)) throw error;
+  }
+};
+
+// Move the messages of one thread matching `filter`, oldest first
+const moveThreadMessages = async (filter, archivedAt) => {
+  let moved = 0;
+  for (;;) {
+    const batch = await Message.find(filter)
+      .sort(THREAD_ORDER)
+      .limit(BATCH_SIZE)
+      .select("-__v")
+      .lean();
+    if (!batch.length) return moved;
+
+    await copyToArchive(batch, archivedAt);
+    await Message.deleteMany({ _id: { $in: batch.map(({ _id }) => _id) } });
+    moved += batch.length;
+    if (batch.length < BATCH_SIZE) return moved;
+  }
+};
+
+/**
+ * Run one archival pass.
+ * @returns {Promise<{ conversations: number, messages: number } | null>}
+ *   null when a pass is already running in this process
+ */
+export const archiveMessages = async ({ now = new Date() } = {}) => {
+  if (running) return null;
+  running = true;
+  const stats = { conversations: 0, messages: 0 };
+
+  try {
+    const ageCutoff = new Date(now.getTime() - ARCHIVE_AFTER_DAYS * DAY_MS);
+    const idleCutoff = new Date(now.getTime() - CLOSED_IDLE_DAYS * DAY_MS);
+
+    // Threads that may hold old messages, or are closed for everyone
+    const cursor = Conversation.find({
+      $or: [
+        { createdAt: { $lt: ageCutoff } },
+        {
+          lastMessageAt: { $lt: idleCutoff },
+          $expr: {
+            $or: [closedByAll("deletedBy"), closedByAll("archivedBy")],
+          },
+        },
+      ],
+    })
+      .select("participants deletedBy archivedBy lastMessageAt")
+      .lean()
+      .cursor();
+
+    for await (const conversation of cursor) {
+      const closed =
+        conversation.lastMessageAt < idleCutoff &&
+        conversation.participants.length > 0 &&
+        ["deletedBy", "archivedBy"].some((field) => {
+          const closedBy = new Set((conversation[field] || []).map(String));
+          return conversation.participants.every((id) =>
+            closedBy.has(String(id))
+          );
+        });
+      const filter = closed
+        ? { conversationId: conversation._id }
+        : { conversationId: conversation._id, createdAt: { $lt: ageCutoff } };
+
+      const moved = await moveThreadMessages(filter, now);
+      if (moved) {
+        stats.conversations += 1;
+        stats.messages += moved;
+      }
+    }
+    return stats;
+  } finally {
+    running = false;
+  }
+};
@@ -0,0 +1,227 @@
+import crypto from "crypto";
+import fs from "fs/promises";
+import { createWriteStream } from "fs";
+import path from "path";
+import { Transform } from "stream";
+import { pipeline } from "stream/promises";
+import { fileURLToPath } from "url";
+import multer from "multer";
+import sharp from "sharp";
+
+// Chat attachment pipeline.
+// Uploads are streamed to disk while their SHA-256 is computed, then stored
+// under their content hash (`files/<hh>/<hash><ext>`), so a file sent many
+// times is stored once. Images get a small WebP thumbnail and PDFs a
+// first-page preview (`thumbs/<hh>/<hash>.webp`), generated once per hash;
+// dimensions, size, hash and thumbnail URL are returned for the message's
+// `attachments` entry so chat lists load the thumbnail, not the original.
+// Only the image and document types the message views offer are accepted,
+// and previews are rendered under a pixel budget.
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+// Served by app.js under /uploads/messages
+const ATTACHMENT_ROOT = path.join(__dirname, "..", "uploads", "messages");
+const ATTACHMENT_URL_PATH = "/uploads/messages";
+const TMP_DIR = path.join(ATTACHMENT_ROOT, "tmp");
+
+const MAX_ATTACHMENT_BYTES =
+  Number(process.env.MAX_ATTACHMENT_BYTES) || 25 * 1024 * 1024;
+const THUMBNAIL_SIZE = 320;
+const THUMBNAIL_QUALITY = 70;
+// Largest image (or rendered PDF page) a preview is made from
+const MAX_PREVIEW_PIXELS =
+  Number(process.env.MAX_ATTACHMENT_PIXELS) || 40 * 1000 * 1000;
+// PDF previews render the first page only, at screen resolution
+const PDF_DENSITY = 72;
+
+// Accepted types and the extensions each may be stored with
+const ATTACHMENT_TYPES = {
+  "image/png": [".png"],
+  "image/jpeg": [".jpg", ".jpeg"],
+  "image/jpg": [".jpg", ".jpeg"],
+  "image/webp": [".webp"],
+  "application/pdf": [".pdf"],
+  "application/msword": [".doc"],
+  "application/vnd.openxmlformats-officedocument.wordprocessingml.document": [
+    ".docx",
+  ],
+};
+const UNSUPPORTED_TYPE = "UNSUPPORTED_ATTACHMENT_TYPE";
+
+const storedPath = (kind, name) =>
+  path.join(ATTACHMENT_ROOT, kind, name.slice(0, 2), name);
+const storedUrl = (req, kind, name) =>
+  `${req.protocol}://${req.get("host")}${ATTACHMENT_URL_PATH}/${kind}/` +
+  `${name.slice(0, 2)}/${name}`;
+
+const exists = (file) =>
+  fs.access(file).then(
+    () => true,
+    () => false
+  );
+
+// Lowercase extension of an uploaded name, dropped if it looks odd
+const safeExtension = (originalname = "") => {
+  const ext = path.extname(originalname).toLowerCase();
+  return /^\.[a-z0-9]{1,8}$/.test(ext) ? ext : "";
+};
+
+// Write the upload to a temp file, hashing and counting it on the way
+const streamToTempFile = async (stream) => {
+  await fs.mkdir(TMP_DIR, { recursive: true });
+  const tmpPath = path.join(TMP_DIR, crypto.randomUUID());
+  const hash = crypto.createHash("sha256");
+  let size = 0;
+
+  const digest = new Transform({
+    transform(chunk, encoding, callback) {
+      hash.update(chunk);
+      size += chunk.length;
+      callback(null, chunk);
+    },
+  });
+
+  try {
+    await pipeline(stream, digest, createWriteStream(tmpPath));
+  } catch (error) {
+    await fs.rm(tmpPath, { force: true });
+    throw error;
+  }
+  return { tmpPath, hash: hash.digest("hex"), size };
+};
+
+// Multer storage engine: content-addressed files, deduplicated on write
+const attachmentStorage = {
+  _handleFile(req, file, callback) {
+    (async () => {
+      const { tmpPath, hash, size } = await streamToTempFile(file.stream);
+      const filename = `${hash}${safeExtension(file.originalname)}`;
+      const destination = storedPath("files", filename);
+
+      const deduplicated = await exists(destination);
+      if (deduplicated) {
+        await fs.rm(tmpPath, { force: true });
+      } else {
+        await fs.mkdir(path.dirname(destination), { recursive: true });
+        await fs.rename(tmpPath, destination);
+      }
+      return { path: destination, filename, hash, size, deduplicated };
+    })().then(
+      (info) => callback(null, info),
+      (error) => callback(error)
+    );
+  },
+
+  // Called by multer when a later step of the request fails. Stored files
+  // are shared by hash: a concurrent upload of the same content may have
+  // stored the same path and handed its URL out, and messages reference
+  // that URL only after the upload responds. A request never deletes one.
+  _removeFile(req, file, callback) {
+    callback(null);
+  },
+};
+
+// Type and extension must both be on the allowlist, and agree
+const attachmentFilter = (req, file, callback) => {
+  const extensions = ATTACHMENT_TYPES[file.mimetype];
+  if (extensions?.includes(safeExtension(file.originalname))) {
+    callback(null, true);
+    return;
+  }
+  callback(
+    Object.assign(new Error("Unsupported file type"), {
+      code: UNSUPPORTED_TYPE,
+    })
+  );
+};
+
+export const uploadMessageAttachment = multer({
+  storage: attachmentStorage,
+  fileFilter: attachmentFilter,
+  limits: { fileSize: MAX_ATTACHMENT_BYTES, files: 1 },
+}).single("file");
+
+const isPdf = (mimetype) => mimetype === "application/pdf";
+
+/**
+ * Write the thumbnail of a stored image or PDF (once per hash) and read the
+ * original's dimensions. PDF previews need a libvips build with PDF support;
+ * without it the attachment simply has no thumbnail.
+ *
+ * @returns {Promise<{ width?: number, height?: number, thumbnail?: string }>}
+ */
+const buildPreview = async ({ path: source, hash, mimetype }) => {
+  if (!mimetype.startsWith("image/") && !isPdf(mimetype)) return {};
+
+  const image = sharp(source, {
+    limitInputPixels: MAX_PREVIEW_PIXELS,
+    ...(isPdf(mimetype) ? { page: 0, pages: 1, density: PDF_DENSITY } : {}),
+  });
+  const { width, height, orientation } = await image.metadata();
+  const thumbnail = `${hash}.webp`;
+  const thumbnailPath = storedPath("thumbs", thumbnail);
+
+  if (!(await exists(thumbnailPath))) {
+    await fs.mkdir(path.dirname(thumbnailPath), { recursive: true });
+    await image
+      .rotate()
+      .resize(THUMBNAIL_SIZE, THUMBNAIL_SIZE, {
+        fit: "inside",
+        withoutEnlargement: true,
+      })
+      .webp({ quality: THUMBNAIL_QUALITY })
+      .toFile(thumbnailPath);
+  }
+
+  // EXIF orientations 5-8 are rotated a quarter turn
+  const rotated = orientation >= 5;
+  return {
+    width: rotated ? height : width,
+    height: rotated ? width : height,
+    thumbnail,
+  };
+};
+
+// POST /messages/upload - store a chat attachment and describe it
+export const handleAttachmentUpload = async (req, res) => {
+  if (!req.file) {
+    return res
+      .status(400)
+      .json({ success: false, message: "No file uploaded" });
+  }
+
+  let preview = {};
+  try {
+    preview = await buildPreview(req.file);
+  } catch (error) {
+    // The attachment is still usable without a preview
+    console.error(`❌ Preview of ${req.file.filename} failed:`, error.message);
+  }
+
+  return res.json({
+    success: true,
+    file: {
+      name: req.file.originalname,
+      url: storedUrl(req, "files", req.file.filename),
+      type: req.file.mimetype,
+      size: req.file.size,
+      hash: req.file.hash,
+      width: preview.width,
+      height: preview.height,
+      thumbnailUrl: preview.thumbnail
+        ? storedUrl(req, "thumbs", preview.thumbnail)
+        : undefined,
+    },
+  });
+};
+
+// Multer errors (e.g. file too large) and refused types as a 400 instead
+// of the error handler
+export const attachmentUploadErrors = (error, req, res, next) => {
+  const refused =
+    error instanceof multer.MulterError || error.code === UNSUPPORTED_TYPE;
+  if (!refused) return next(error);
+  return res.status(400).json({ success: false, message: error.message });
+};
@@ -0,0 +1,168 @@
+import mongoose from "mongoose";
+import { Message } from "../models/Agent/MessagesModel.js";
+import { ArchivedMessage } from "../models/Agent/ArchivedMessageModel.js";
+import {
+  applyCursor,
+  decodeCursor,
+  encodeCursor,
+  keysetSort,
+} from "./pagination.js";
+
+// Paged message history of a conversation.
+// A thread opens on its newest page; `before` loads older pages while
+// scrolling up and `after` catches up on newer ones. Both are keyset
+// cursors on (createdAt, _id) served by the `conversationId, createdAt, _id`
+// index, so every page costs the same however long the thread is.
+// `around` (a message search hit) opens the thread on that message, with
+// half a page on each side of it.
+// Old messages may live in the archive collection (utils/messageArchive.js);
+// pages read through to it, so archived history loads like any other.
+
+export const MESSAGE_PAGE_SIZE = 30;
+const MAX_MESSAGE_PAGE_SIZE = 100;
+
+const NEWEST_FIRST = keysetSort("createdAt", -1);
+const OLDEST_FIRST = keysetSort("createdAt", 1);
+
+const invalidMessageQueryError = (message) => {
+  const error = new Error(message);
+  error.statusCode = 400;
+  return error;
+};
+
+// `limit`, `before`, `after` and `around` from a query string
+export const readMessagePaging = (query = {}) => {
+  if ([query.before, query.after, query.around].filter(Boolean).length > 1) {
+    throw invalidMessageQueryError("Use only one of before, after or around");
+  }
+  const limit = Math.min(
+    parseInt(query.limit, 10) || MESSAGE_PAGE_SIZE,
+    MAX_MESSAGE_PAGE_SIZE
+  );
+  return {
+    limit,
+    before: query.before ? decodeCursor(query.before) : null,
+    after: query.after ? decodeCursor(query.after) : null,
+    around: query.around ? decodeCursor(query.around) : null,
+  };
+};
+
+const readTier = (Model, filter, cursor, sort, count) =>
+  Model.find(applyCursor(filter, cursor, sort)).sort(sort).limit(count).lean();
+
+// `limit + 1` messages from `cursor` in `sort` order. The archive holds the
+// oldest part of a thread: reading backwards it continues where the hot
+// messages run out, reading forwards it comes first.
+const readRange = async (filter, cursor, sort, limit) => {
+  const count = limit + 1;
+  if (sort.createdAt === 1) {
+    const [archived, hot] = await Promise.all([
+      readTier(ArchivedMessage, filter, cursor, sort, count),
+      readTier(Message, filter, cursor, sort, count),
+    ]);
+    return [...archived, ...hot].slice(0, count);
+  }
+
+  const hot = await readTier(Message, filter, cursor, sort, count);
+  if (hot.length === count) return hot;
+  const last = hot[hot.length - 1];
+  const archived = await readTier(
+    ArchivedMessage,
+    filter,
+    last ? { value: last.createdAt, id: last._id } : cursor,
+    sort,
+    count - hot.length
+  );
+  return [...hot, ...archived];
+};
+
+const findMessage = async (filter) =>
+  (await Message.findOne(filter).lean()) ||
+  ArchivedMessage.findOne(filter).lean();
+
+// The page centred on the `around` message: older half, the message itself,
+// newer half
+const findPageAround = async (filter, around, limit) => {
+  const olderLimit = Math.floor((limit - 1) / 2);
+  const newerLimit = limit - 1 - olderLimit;
+  const [older, target, newer] = await Promise.all([
+    readRange(filter, around, NEWEST_FIRST, olderLimit),
+    findMessage({ ...filter, _id: around.id }),
+    readRange(filter, around, OLDEST_FIRST, newerLimit),
+  ]);
+  if (!target) {
+    const error = new Error("Message not found in this conversation");
+    error.statusCode = 404;
+    throw error;
+  }
+
+  const hasOlder = older.length > olderLimit;
+  const hasNewer = newer.length > newerLimit;
+  const messages = [
+    ...older.slice(0, olderLimit).reverse(),
+    target,
+    ...newer.slice(0, newerLimit),
+  ];
+  const first = messages[0];
+  const last = messages[messages.length - 1];
+
+  return {
+    messages,
+    pagination: {
+      limit,
+      hasOlder,
+      hasNewer,
+      before: hasOlder ? encodeCursor(first, NEWEST_FIRST) : null,
+      after: encodeCursor(last, OLDEST_FIRST),
+    },
+  };
+};
+
+/**
+ * One page of a conversation's messages, oldest first.
+ * `pagination.before` is the cursor for the next older page (null at the
+ * start of the thread); `pagination.after` fetches anything newer than this
+ * page (null when the page is empty, keep the previous one).
+ *
+ * @returns {Promise<{ messages: Array, pagination: object }>}
+ */
+export const findMessagePage = async (
+  conversationId,
+  { limit, before, after, around }
+) => {
+  if (!mongoose.Types.ObjectId.isValid(conversationId)) {
+    throw invalidMessageQueryError("Invalid conversation id");
+  }
+  const filter = {
+    conversationId: new mongoose.Types.ObjectId(conversationId),
+  };
+  if (around) return findPageAround(filter, around, limit);
+
+  // Newer pages read forward from the cursor; the newest and older pages
+  // read backwards and are flipped to oldest-first
+  const sort = after ? OLDEST_FIRST : NEWEST_FIRST;
+  const docs = await readRange(filter, after || before, sort, limit);
+
+  const hasMore = docs.length > limit;
+  const page = hasMore ? docs.slice(0, limit) : docs;
+  const messages = after ? page : page.reverse();
+
+  const first = messages[0];
+  const last = messages[messages.length - 1];
+  // Everything up to an `after` cursor is older; past a `before` cursor
+  // is newer
+  const hasOlder = after ? true : hasMore;
+  const hasNewer = after ? hasMore : Boolean(before);
+
+  return {
+    messages,
+    pagination: {
+      limit,
+      hasOlder,
+      hasNewer,
+      before: hasOlder && first ? encodeCursor(first, NEWEST_FIRST) : null,
+      // The newest page hands out its `after` cursor for catching up later
+      after: last ? encodeCursor(last, OLDEST_FIRST) : null,
+    },
+  };
+};
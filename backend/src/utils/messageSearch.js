@@ -0,0 +1,189 @@
+import mongoose from "mongoose";
+import { Message } from "../models/Agent/MessagesModel.js";
+import {
+  decodeCursor,
+  encodeCursor,
+  findCursorPage,
+  keysetSort,
+} from "./pagination.js";
+import { tokenize } from "./propertySearch.js";
+
+// Full-text search over a user's message history.
+// Every message stores `search_keys`: one `<userId>|<word>` key per
+// participant and per word of its content and attachment names (maintained
+// by the Message model hooks). A search is an equality lookup on the
+// `search_keys, agencyId, createdAt, _id` index, so results are limited to
+// the user's own threads by construction and come back newest first without
+// scanning or sorting the collection. Each hit carries a highlighted snippet
+// and an `around` cursor that opens the thread on the matching message
+// (see findMessagePage).
+
+export const MESSAGE_SEARCH_PAGE_SIZE = 20;
+const MAX_MESSAGE_SEARCH_PAGE_SIZE = 50;
+const MAX_INDEXED_WORDS = 150;
+const MAX_QUERY_TERMS = 6;
+const SNIPPET_RADIUS = 60;
+
+export const MESSAGE_SEARCH_SOURCE_FIELDS = [
+  "content",
+  "attachments",
+  "senderId",
+  "receiverId",
+];
+const MESSAGE_SEARCH_INDEX = {
+  search_keys: 1,
+  agencyId: 1,
+  createdAt: -1,
+  _id: -1,
+};
+const NEWEST_FIRST = keysetSort("createdAt", -1);
+
+const HIT_FIELDS =
+  "conversationId senderId receiverId content attachments type createdAt";
+const WORD_PATTERN = /[\p{L}\p{N}\p{M}]+/gu;
+
+const searchKey = (userId, word) => `${userId}|${word}`;
+
+const invalidSearchError = (message) => {
+  const error = new Error(message);
+  error.statusCode = 400;
+  return error;
+};
+
+// Attachment names first, so a long text cannot push them out of the index
+const messageWords = (message) => {
+  const words = new Set();
+  (message.attachments || []).forEach(({ name } = {}) =>
+    tokenize(name).forEach((word) => words.add(word))
+  );
+  tokenize(message.content).forEach((word) => words.add(word));
+  return [...words].slice(0, MAX_INDEXED_WORDS);
+};
+
+// `<userId>|<word>` keys of a message-like object, for both participants
+export const buildMessageSearchKeys = (message = {}) => {
+  const participants = [
+    ...new Set(
+      [message.senderId, message.receiverId].filter(Boolean).map(String)
+    ),
+  ];
+  const words = messageWords(message);
+  return participants.flatMap((userId) =>
+    words.map((word) => searchKey(userId, word))
+  );
+};
+
+// `q`, `conversationId`, `limit` and `cursor` from a query string
+export const readMessageSearch = (query = {}) => {
+  const terms = [...new Set(tokenize(query.q))].slice(0, MAX_QUERY_TERMS);
+  if (!terms.length) {
+    throw invalidSearchError("Search query must contain a word");
+  }
+  if (
+    query.conversationId &&
+    !mongoose.Types.ObjectId.isValid(query.conversationId)
+  ) {
+    throw invalidSearchError("Invalid conversation id");
+  }
+  return {
+    terms,
+    conversationId: query.conversationId || null,
+    limit: Math.min(
+      parseInt(query.limit, 10) || MESSAGE_SEARCH_PAGE_SIZE,
+      MAX_MESSAGE_SEARCH_PAGE_SIZE
+    ),
+    cursor: query.cursor ? decodeCursor(query.cursor) : null,
+  };
+};
+
+// Offsets of the words of `text` that match a query term
+const findMatches = (text, terms) => {
+  if (!text) return [];
+  const wanted = new Set(terms);
+  const matches = [];
+  for (const match of text.matchAll(WORD_PATTERN)) {
+    const [word] = tokenize(match[0]);
+    if (word && wanted.has(word)) {
+      matches.push({ start: match.index, end: match.index + match[0].length });
+    }
+  }
+  return matches;
+};
+
+/**
+ * A window of `text` around its first match, with the match offsets
+ * relative to the snippet (ellipses included).
+ */
+export const highlightText = (text, terms) => {
+  if (!text) return { snippet: "", highlights: [] };
+  const matches = findMatches(text, terms);
+  // Attachment-only hits show the start of the text
+  const anchor = matches[0] || { start: 0, end: SNIPPET_RADIUS };
+
+  const from = Math.max(anchor.start - SNIPPET_RADIUS, 0);
+  const to = Math.min(anchor.end + SNIPPET_RADIUS, text.length);
+  const prefix = from > 0 ? "…" : "";
+  const suffix = to < text.length ? "…" : "";
+  const shift = prefix.length - from;
+
+  return {
+    snippet: `${prefix}${text.slice(from, to)}${suffix}`,
+    highlights: matches
+      .filter(({ start, end }) => start >= from && end <= to)
+      .map(({ start, end }) => ({ start: start + shift, end: end + shift })),
+  };
+};
+
+const toSearchHit = (message, terms) => ({
+  _id: message._id,
+  conversationId: message.conversationId,
+  senderId: message.senderId,
+  receiverId: message.receiverId,
+  type: message.type,
+  createdAt: message.createdAt,
+  ...highlightText(message.content, terms),
+  attachments: (message.attachments || [])
+    .map(({ name, url, type }) => ({
+      name,
+      url,
+      type,
+      highlights: findMatches(name, terms),
+    }))
+    .filter(({ highlights }) => highlights.length),
+  // Opens the thread on this message (GET .../conversations/:id?around=)
+  around: encodeCursor(message, NEWEST_FIRST),
+});
+
+/**
+ * One page of `user`'s messages containing every term, newest first.
+ * Staff and customers are scoped to their agency; admins without one search
+ * all of their own threads.
+ *
+ * @returns {Promise<{ results: Array, pagination: object }>}
+ */
+export const findMessageMatches = async (
+  user,
+  { terms, conversationId, limit, cursor }
+) => {
+  const agencyId = user.agencyId?._id || user.agencyId;
+  const filter = {
+    search_keys: { $all: terms.map((term) => searchKey(user._id, term)) },
+    ...(agencyId ? { agencyId } : {}),
+    ...(conversationId
+      ? { conversationId: new mongoose.Types.ObjectId(conversationId) }
+      : {}),
+  };
+
+  const { data, pagination } = await findCursorPage(Message, filter, {
+    sort: NEWEST_FIRST,
+    limit,
+    cursor,
+    decorate: (query) =>
+      query.select(HIT_FIELDS).hint(MESSAGE_SEARCH_INDEX).lean(),
+  });
+
+  return {
+    results: data.map((message) => toSearchHit(message, terms)),
+    pagination,
+  };
+};
@@ -14,11 +14,15 @@ const storageRoot = path.join(__dirname, '..', 'storage');
 // File Processors
 
 const processAndSaveImages = async (file, folder) => {
-  const safeName = file.filename;
-  const originalPath = path.join(storageRoot, folder, 'original', safeName);
-
   const buffer = await fs.readFile(file.path);
-  await fs.writeFile(originalPath, buffer);
+  return saveImageVariants(buffer, folder, file.filename);
+};
+
+// Store an image buffer as the original plus resized variants
+export const saveImageVariants = async (buffer, folder, safeName) => {
+  const originalFolder = path.join(storageRoot, folder, 'original');
+  await fs.mkdir(originalFolder, { recursive: true });
+  await fs.writeFile(path.join(originalFolder, safeName), buffer);
 
   const sizes = [
     { suffix: 'extraSmall', width: 50, height: 50 },
@@ -0,0 +1,358 @@
+import os from "os";
+import { NotificationEvent } from "../models/Common/NotificationEventModel.js";
+import { Notification } from "../models/Common/NotificationModel.js";
+import AgencySettings from "../models/Agent/settingsModel.js";
+import CustomerSettings from "../models/Customer/SettingsModel.js";
+import generateToken from "./generateToken.js";
+import { sendPushNotification } from "./pushService.js";
+
+// Notification side effects, off the request path.
+// Controllers enqueue one event per change (`enqueueNotifications`), inside
+// their transaction when they have one. The dispatcher running in each API
+// process claims due events in batches under a lease, so processes never
+// deliver the same event at once; per batch it reads every recipient's
+// settings in two queries, inserts the in-app notifications with one
+// insertMany and sends the pushes with bounded concurrency. Notifications
+// carry ids assigned at enqueue time and sent pushes are recorded, so a
+// retried event delivers only what is missing. Failed events are retried
+// with exponential backoff, up to NOTIFICATION_OUTBOX_MAX_ATTEMPTS.
+
+const BATCH_SIZE = Number(process.env.NOTIFICATION_OUTBOX_BATCH) || 100;
+const POLL_MS = Number(process.env.NOTIFICATION_OUTBOX_POLL_MS) || 1000;
+const MAX_ATTEMPTS =
+  Number(process.env.NOTIFICATION_OUTBOX_MAX_ATTEMPTS) || 8;
+const PUSH_CONCURRENCY = 10;
+const LEASE_MS = 60 * 1000;
+const RETRY_BASE_MS = 5 * 1000;
+const RETRY_MAX_MS = 60 * 60 * 1000;
+const DUPLICATE_KEY = 11000;
+
+const INSTANCE = `${os.hostname()}:${process.pid}`;
+let leases = 0;
+
+let timer = null;
+let draining = null;
+let wakeScheduled = false;
+
+const stats = {
+  enqueued: 0,
+  batches: 0,
+  delivered: 0,
+  retried: 0,
+  failed: 0,
+  notifications: 0,
+  pushes: 0,
+  pushFailures: 0,
+  lastBatchMs: 0,
+  maxLagMs: 0,
+  startedAt: null,
+};
+
+const SETTINGS_MODELS = { agency: AgencySettings, customer: CustomerSettings };
+
+// A retried insert may already be (partly) done
+const isOnlyDuplicates = (error) =>
+  error.code === DUPLICATE_KEY ||
+  (error.writeErrors?.length &&
+    error.writeErrors.every((writeError) => writeError.code === DUPLICATE_KEY));
+
+const retryDelay = (attempts) =>
+  Math.min(RETRY_BASE_MS * 2 ** (attempts - 1), RETRY_MAX_MS);
+
+const settingsKey = (kind, userId) => `${kind}:${userId}`;
+const settingsOwner = (recipient) =>
+  recipient.settingsUserId || recipient.userId;
+
+// `notifications` settings of every recipient in the batch, two queries
+const loadSettings = async (events) => {
+  const ids = { agency: new Set(), customer: new Set() };
+  events.forEach(({ recipients }) =>
+    recipients.forEach((recipient) =>
+      ids[recipient.settings]?.add(String(settingsOwner(recipient)))
+    )
+  );
+
+  const settings = new Map();
+  await Promise.all(
+    Object.entries(ids).map(async ([kind, userIds]) => {
+      if (!userIds.size) return;
+      const docs = await SETTINGS_MODELS[kind]
+        .find({ userId: { $in: [...userIds] } })
+        .select("userId notifications")
+        .lean();
+      docs.forEach(({ userId, notifications }) =>
+        settings.set(settingsKey(kind, userId), notifications || {})
+      );
+    })
+  );
+  return settings;
+};
+
+const claimBatch = async () => {
+  const now = new Date();
+  const due = {
+    $or: [
+      { status: "pending", availableAt: { $lte: now } },
+      { status: "processing", lockedUntil: { $lt: now } },
+    ],
+  };
+  const ids = await NotificationEvent.find(due)
+    .sort({ availableAt: 1 })
+    .limit(BATCH_SIZE)
+    .select("_id")
+    .lean();
+  if (!ids.length) return { lease: null, events: [] };
+
+  leases += 1;
+  const lease = `${INSTANCE}:${leases}`;
+  // Another process may claim some of them first
+  await NotificationEvent.updateMany(
+    { _id: { $in: ids.map(({ _id }) => _id) }, ...due },
+    {
+      $set: {
+        status: "processing",
+        lockedBy: lease,
+        lockedUntil: new Date(now.getTime() + LEASE_MS),
+      },
+      $inc: { attempts: 1 },
+    }
+  );
+  const events = await NotificationEvent.find({ lockedBy: lease }).lean();
+  return { lease, events };
+};
+
+const insertNotifications = async (docs) => {
+  if (!docs.length) return;
+  try {
+    await Notification.insertMany(docs, { ordered: false });
+  } catch (error) {
+    if (!isOnlyDuplicates(error)) throw error;
+  }
+  stats.notifications += docs.length;
+};
+
+// Runs `task` over `items`, at most `limit` at a time
+const eachLimited = async (items, limit, task) => {
+  let next = 0;
+  const worker = async () => {
+    while (next < items.length) {
+      const item = items[next];
+      next += 1;
+      await task(item);
+    }
+  };
+  await Promise.all(Array.from({ length: limit }, worker));
+};
+
+const sendPush = async ({ recipient }) => {
+  const { tokenRole, data, ...push } = recipient.push;
+  await sendPushNotification({
+    ...push,
+    userId: recipient.userId,
+    data: tokenRole
+      ? { ...data, token: generateToken(recipient.userId, tokenRole) }
+      : data,
+  });
+};
+
+const deliverBatch = async (lease, events) => {
+  const started = Date.now();
+  const settings = await loadSettings(events);
+
+  const notifications = [];
+  const pushes = [];
+  events.forEach((event) => {
+    event.recipients.forEach((recipient, index) => {
+      const prefs = settings.get(
+        settingsKey(recipient.settings, settingsOwner(recipient))
+      );
+      if (
+        recipient.notification &&
+        (!recipient.when || prefs?.[recipient.when])
+      ) {
+        notifications.push({
+          ...recipient.notification,
+          userId: recipient.userId,
+          agencyId: recipient.notification.agencyId || null,
+        });
+      }
+      if (recipient.push && !recipient.pushedAt && prefs?.pushNotifications) {
+        pushes.push({ event, index, recipient });
+      }
+    });
+  });
+
+  // In-app notifications of the whole batch; if this fails every event is
+  // retried
+  let batchError = null;
+  try {
+    await insertNotifications(notifications);
+  } catch (error) {
+    batchError = error;
+  }
+
+  // Pushes of events whose notifications are in; their outcome is per event
+  const pushed = new Map(); // event id -> recipient indexes
+  const pushErrors = new Map(); // event id -> error
+  if (!batchError) {
+    await eachLimited(pushes, PUSH_CONCURRENCY, async (job) => {
+      const id = String(job.event._id);
+      try {
+        await sendPush(job);
+        stats.pushes += 1;
+        pushed.set(id, [...(pushed.get(id) || []), job.index]);
+      } catch (error) {
+        stats.pushFailures += 1;
+        pushErrors.set(id, error);
+      }
+    });
+  }
+
+  const now = new Date();
+  await NotificationEvent.bulkWrite(
+    events.map((event) => {
+      const id = String(event._id);
+      const error = batchError || pushErrors.get(id);
+      const $set = {};
+      (pushed.get(id) || []).forEach((index) => {
+        $set[`recipients.${index}.pushedAt`] = now;
+      });
+
+      if (!error) {
+        stats.delivered += 1;
+        Object.assign($set, { status: "done", completedAt: now });
+      } else if (event.attempts >= MAX_ATTEMPTS) {
+        stats.failed += 1;
+        console.error(`❌ Notification event ${id} failed:`, error);
+        Object.assign($set, { status: "failed", lastError: error.message });
+      } else {
+        stats.retried += 1;
+        Object.assign($set, {
+          status: "pending",
+          availableAt: new Date(now.getTime() + retryDelay(event.attempts)),
+          lastError: error.message,
+        });
+      }
+      return {
+        updateOne: {
+          filter: { _id: event._id, lockedBy: lease },
+          update: { $set, $unset: { lockedBy: "", lockedUntil: "" } },
+        },
+      };
+    }),
+    { ordered: false }
+  );
+
+  stats.batches += 1;
+  stats.lastBatchMs = Date.now() - started;
+  stats.maxLagMs = Math.max(
+    stats.maxLagMs,
+    ...events.map(({ createdAt }) => started - new Date(createdAt).getTime())
+  );
+};
+
+// Deliver due events until none are left
+const drain = async () => {
+  for (;;) {
+    const { lease, events } = await claimBatch();
+    if (!events.length) return;
+    await deliverBatch(lease, events);
+    if (events.length < BATCH_SIZE) return;
+  }
+};
+
+const runDrain = () => {
+  if (!draining) {
+    draining = drain()
+      .catch((error) =>
+        console.error("❌ Notification dispatcher failed:", error)
+      )
+      .finally(() => {
+        draining = null;
+      });
+  }
+  return draining;
+};
+
+// Deliver soon after an enqueue instead of at the next poll
+const wake = () => {
+  if (!timer || wakeScheduled) return;
+  wakeScheduled = true;
+  setImmediate(() => {
+    wakeScheduled = false;
+    runDrain();
+  });
+};
+
+/**
+ * Record a notification event for `recipients`:
+ * `{ userId, settings: "agency" | "customer", settingsUserId?, when?,
+ *    notification?: { agencyId?, message, type, link? },
+ *    push?: { title, message, urlPath, data?, actions?, tokenRole? } }`.
+ * Pass the transaction's `session` to commit it with the change it
+ * announces; `key` makes enqueueing idempotent.
+ */
+export const enqueueNotifications = async (
+  kind,
+  recipients,
+  { key, session } = {}
+) => {
+  const live = recipients.filter(
+    (recipient) =>
+      recipient?.userId && (recipient.notification || recipient.push)
+  );
+  if (!live.length) return null;
+
+  try {
+    const [event] = await NotificationEvent.create(
+      [{ kind, key, recipients: live }],
+      { session }
+    );
+    stats.enqueued += 1;
+    return event;
+  } catch (error) {
+    if (key && error.code === DUPLICATE_KEY) return null;
+    throw error;
+  } finally {
+    // A transaction's event is only visible once the session is done
+    if (session) session.once("ended", wake);
+    else wake();
+  }
+};
+
+export const startNotificationDispatcher = () => {
+  if (timer) return;
+  stats.startedAt = new Date();
+  timer = setInterval(runDrain, POLL_MS);
+  timer.unref();
+  runDrain();
+};
+
+// Graceful shutdown: stop polling and finish the batch in flight
+export const stopNotificationDispatcher = async () => {
+  clearInterval(timer);
+  timer = null;
+  await draining;
+};
+
+export const getNotificationOutboxStats = async () => {
+  const [pending, failed] = await Promise.all([
+    NotificationEvent.countDocuments({
+      status: { $in: ["pending", "processing"] },
+    }),
+    NotificationEvent.countDocuments({ status: "failed" }),
+  ]);
+  const uptimeSeconds = stats.startedAt
+    ? (Date.now() - stats.startedAt.getTime()) / 1000
+    : 0;
+  return {
+    ...stats,
+    eventsPerSecond: uptimeSeconds
+      ? Number((stats.delivered / uptimeSeconds).toFixed(2))
+      : 0,
+    backlog: pending,
+    deadLetters: failed,
+    batchSize: BATCH_SIZE,
+    maxAttempts: MAX_ATTEMPTS,
+  };
+};
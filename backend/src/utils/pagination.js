@@ -0,0 +1,153 @@
+import mongoose from "mongoose";
+
+// Keyset (cursor) pagination shared by the list endpoints.
+// A cursor is an opaque base64url token holding the sort value and `_id` of
+// the last row of the previous page; the next page continues strictly after
+// it, so every page costs the same regardless of depth.
+
+const COUNT_CACHE_TTL_MS = 30 * 1000;
+const COUNT_CACHE_MAX_ENTRIES = 500;
+const countCache = new Map();
+
+const invalidCursorError = () => {
+  const error = new Error("Invalid pagination cursor");
+  error.statusCode = 400;
+  return error;
+};
+
+const encodeValue = (value) => {
+  if (value instanceof Date) return { d: value.toISOString() };
+  if (value instanceof mongoose.Types.ObjectId) return { o: value.toString() };
+  return { v: value ?? null };
+};
+
+const decodeValue = (encoded = {}) => {
+  if (encoded.d !== undefined) return new Date(encoded.d);
+  if (encoded.o !== undefined) return new mongoose.Types.ObjectId(encoded.o);
+  return encoded.v;
+};
+
+// Normalise a single-field sort into `{ field: order, _id: order }`
+export const keysetSort = (field = "createdAt", order = -1) =>
+  field === "_id" ? { _id: order } : { [field]: order, _id: order };
+
+export const encodeCursor = (doc, sort) => {
+  const [field] = Object.keys(sort);
+  const payload = { k: encodeValue(doc[field]), id: String(doc._id) };
+  return Buffer.from(JSON.stringify(payload)).toString("base64url");
+};
+
+// Orderings without a stable key (e.g. search relevance) page by offset
+export const encodeOffsetCursor = (offset) =>
+  Buffer.from(JSON.stringify({ off: offset })).toString("base64url");
+
+export const decodeCursor = (token) => {
+  if (!token) return null;
+  try {
+    const payload = JSON.parse(Buffer.from(token, "base64url").toString());
+    if (payload.off !== undefined) {
+      return { offset: Math.max(parseInt(payload.off, 10) || 0, 0) };
+    }
+    if (!mongoose.Types.ObjectId.isValid(payload.id)) throw invalidCursorError();
+    return {
+      value: decodeValue(payload.k),
+      id: new mongoose.Types.ObjectId(payload.id),
+    };
+  } catch {
+    throw invalidCursorError();
+  }
+};
+
+// Read `cursor`, `limit`, `page` and `includeTotal` from a query string.
+// Cursor mode is opt-in: it is enabled whenever a `cursor` param is sent
+// (an empty value requests the first page).
+export const readPagination = (query = {}, defaultLimit = 10) => {
+  const limit = parseInt(query.limit, 10) || defaultLimit;
+  const page = parseInt(query.page, 10) || 1;
+  const cursorMode = query.cursor !== undefined;
+
+  return {
+    cursorMode,
+    cursor: cursorMode ? decodeCursor(query.cursor) : null,
+    includeTotal: query.includeTotal === "true" || query.includeTotal === true,
+    limit,
+    page,
+    skip: (page - 1) * limit,
+  };
+};
+
+// Add the "strictly after the cursor" condition to a filter
+export const applyCursor = (filter, cursor, sort) => {
+  if (!cursor?.id) return filter;
+
+  const [field] = Object.keys(sort);
+  const op = sort[field] === -1 ? "$lt" : "$gt";
+  const condition =
+    field === "_id"
+      ? { _id: { [op]: cursor.id } }
+      : {
+          $or: [
+            { [field]: { [op]: cursor.value } },
+            { [field]: cursor.value, _id: { [op]: cursor.id } },
+          ],
+        };
+
+  return { ...filter, $and: [...(filter.$and || []), condition] };
+};
+
+/**
+ * Count with a short-lived cache so infinite-scroll views do not re-scan
+ * the whole filter on every page. Unfiltered counts use collection metadata.
+ */
+export const cachedCount = async (Model, filter = {}) => {
+  if (!Object.keys(filter).length) return Model.estimatedDocumentCount();
+
+  const key = `${Model.modelName}:${JSON.stringify(filter)}`;
+  const cached = countCache.get(key);
+  if (cached && cached.expiresAt > Date.now()) return cached.total;
+
+  const total = await Model.countDocuments(filter);
+  countCache.delete(key);
+  countCache.set(key, { total, expiresAt: Date.now() + COUNT_CACHE_TTL_MS });
+  if (countCache.size > COUNT_CACHE_MAX_ENTRIES) {
+    countCache.delete(countCache.keys().next().value);
+  }
+  return total;
+};
+
+// Trim a `limit + 1` fetch to one page and build its cursor metadata
+export const toCursorPage = (docs, limit, sort) => {
+  const hasMore = docs.length > limit;
+  const data = hasMore ? docs.slice(0, limit) : docs;
+  return {
+    data,
+    pagination: {
+      limit,
+      hasMore,
+      nextCursor: hasMore ? encodeCursor(data[data.length - 1], sort) : null,
+    },
+  };
+};
+
+/**
+ * Fetch one keyset page.
+ * `decorate` receives the query to add populate/select/lean.
+ *
+ * @returns {Promise<{ data: Array, pagination: object }>}
+ */
+export const findCursorPage = async (
+  Model,
+  filter,
+  { sort, limit, cursor, includeTotal = false, decorate = (query) => query }
+) => {
+  const [docs, total] = await Promise.all([
+    decorate(
+      Model.find(applyCursor(filter, cursor, sort)).sort(sort).limit(limit + 1)
+    ),
+    includeTotal ? cachedCount(Model, filter) : undefined,
+  ]);
+
+  const page = toCursorPage(docs, limit, sort);
+  if (total !== undefined) page.pagination.total = total;
+  return page;
+};
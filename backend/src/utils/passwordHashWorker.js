@@ -0,0 +1,22 @@
+import { parentPort } from "worker_threads";
+import bcrypt from "bcryptjs";
+
+// Thread of the password hashing pool (see utils/passwordHasher.js).
+// bcryptjs is pure JavaScript, so its sync calls are run here, off the
+// API's event loop.
+
+// Sync is intended: this thread exists to block on bcrypt
+const OPERATIONS = {
+  // eslint-disable-next-line no-sync -- runs off the API's event loop
+  hash: ([password, cost]) => bcrypt.hashSync(password, cost),
+  // eslint-disable-next-line no-sync -- runs off the API's event loop
+  compare: ([password, hash]) => bcrypt.compareSync(password, hash),
+};
+
+parentPort.on("message", ({ id, op, args }) => {
+  try {
+    parentPort.postMessage({ id, result: OPERATIONS[op](args) });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
@@ -0,0 +1,154 @@
+import os from "os";
+import { Worker } from "worker_threads";
+
+// Password hashing off the event loop.
+// bcrypt hashes and comparisons run on a small pool of worker threads
+// (PASSWORD_HASH_THREADS per API process) so a burst of logins does not
+// stall unrelated requests and sockets. Jobs wait in a bounded queue
+// (PASSWORD_HASH_MAX_QUEUE); when it is full callers get a 503 to retry
+// instead of piling up latency. New hashes use PASSWORD_HASH_COST rounds;
+// `needsRehash` tells login to upgrade an older hash once it has the
+// plaintext (see rehashPasswordInBackground).
+
+export const PASSWORD_HASH_COST = Number(process.env.PASSWORD_HASH_COST) || 10;
+const THREADS =
+  Number(process.env.PASSWORD_HASH_THREADS) ||
+  Math.min(4, Math.max(1, os.availableParallelism() - 1));
+const MAX_QUEUE = Number(process.env.PASSWORD_HASH_MAX_QUEUE) || 200;
+const RETRY_AFTER_SECONDS = 1;
+
+const WORKER_URL = new URL("./passwordHashWorker.js", import.meta.url);
+
+const workers = []; // { worker, job }
+const queue = []; // { id, op, args, resolve, reject }
+let nextJobId = 0;
+let closed = false;
+
+const stats = { completed: 0, rejected: 0, failed: 0, maxQueued: 0 };
+
+const busyError = () =>
+  Object.assign(new Error("Too many sign-in attempts, please retry"), {
+    statusCode: 503,
+    retryAfter: RETRY_AFTER_SECONDS,
+  });
+
+const dispatch = () => {
+  for (const slot of workers) {
+    if (!queue.length) return;
+    if (slot.job) continue;
+    slot.job = queue.shift();
+    const { id, op, args } = slot.job;
+    slot.worker.ref();
+    slot.worker.postMessage({ id, op, args });
+  }
+};
+
+const startWorker = () => {
+  const slot = { worker: new Worker(WORKER_URL), job: null };
+
+  slot.worker.on("message", ({ id, result, error }) => {
+    const { job } = slot;
+    if (!job || job.id !== id) return;
+    slot.job = null;
+    slot.worker.unref();
+    if (error) {
+      stats.failed += 1;
+      job.reject(new Error(error));
+    } else {
+      stats.completed += 1;
+      job.resolve(result);
+    }
+    dispatch();
+  });
+
+  // A crashed thread fails its job and is replaced
+  slot.worker.on("error", (error) => {
+    console.error("❌ Password hash worker failed:", error);
+  });
+  slot.worker.on("exit", () => {
+    const index = workers.indexOf(slot);
+    if (index !== -1) workers.splice(index, 1);
+    if (slot.job) {
+      stats.failed += 1;
+      slot.job.reject(new Error("Password hash worker exited"));
+    }
+    if (!closed) {
+      startWorker();
+      dispatch();
+    }
+  });
+
+  // Idle threads do not keep the process alive
+  slot.worker.unref();
+  workers.push(slot);
+};
+
+const run = (op, args) => {
+  if (closed) return Promise.reject(new Error("Password hasher is closed"));
+  if (!workers.length) {
+    for (let i = 0; i < THREADS; i += 1) startWorker();
+  }
+  if (queue.length >= MAX_QUEUE) {
+    stats.rejected += 1;
+    return Promise.reject(busyError());
+  }
+
+  return new Promise((resolve, reject) => {
+    nextJobId += 1;
+    queue.push({ id: nextJobId, op, args, resolve, reject });
+    stats.maxQueued = Math.max(stats.maxQueued, queue.length);
+    dispatch();
+  });
+};
+
+export const hashPassword = (password, cost = PASSWORD_HASH_COST) =>
+  run("hash", [String(password), cost]);
+
+// False for a missing hash, like a wrong password
+export const verifyPassword = async (password, hash) =>
+  hash ? run("compare", [String(password ?? ""), hash]) : false;
+
+// Cost of a `$2a$10$...` hash
+const costOf = (hash) => parseInt(String(hash).split("$")[2], 10);
+
+export const needsRehash = (hash, cost = PASSWORD_HASH_COST) =>
+  Boolean(hash) && costOf(hash) !== cost;
+
+/**
+ * After a successful login, upgrade `doc`'s hash to the configured cost.
+ * Runs after the response; the write is skipped if the password changed
+ * in the meantime.
+ */
+export const rehashPasswordInBackground = (Model, doc, password) => {
+  if (!needsRehash(doc.password)) return;
+  hashPassword(password)
+    .then((hash) =>
+      Model.updateOne(
+        { _id: doc._id, password: doc.password },
+        { $set: { password: hash } }
+      )
+    )
+    .catch((error) => {
+      if (error.statusCode !== 503) {
+        console.error(`❌ Rehashing ${doc._id}'s password failed:`, error);
+      }
+    });
+};
+
+export const getPasswordHasherStats = () => ({
+  ...stats,
+  threads: workers.length,
+  busy: workers.filter(({ job }) => job).length,
+  queued: queue.length,
+  maxQueue: MAX_QUEUE,
+  cost: PASSWORD_HASH_COST,
+});
+
+// Graceful shutdown: fail queued jobs and stop the threads
+export const closePasswordHasher = async () => {
+  closed = true;
+  queue
+    .splice(0)
+    .forEach(({ reject }) => reject(new Error("Password hasher is closed")));
+  await Promise.all(workers.map(({ worker }) => worker.terminate()));
+};
@@ -0,0 +1,193 @@
+// Reverse matching of listings to customer preferences.
+// Every Preference stores `match_keys`: the cartesian product of its hard
+// criteria (type x category x bedrooms), with `*` standing for "any". A
+// listing looks up the 2^3 key combinations of its own values and
+// wildcards, so matching customers come from an index point lookup on
+// `{ agencyId, match_keys }` instead of a scan of the agency's preferences.
+// Price range is checked on the candidates; the soft criteria (bathrooms,
+// furnishing, facing, RERA status, amenities, features) only rank them.
+
+const ANY = "*";
+
+// Hard criteria in key order: preference field -> listing value
+const KEY_DIMENSIONS = [
+  {
+    field: "type",
+    valueOf: (property) => property.type,
+  },
+  {
+    field: "category",
+    valueOf: (property) => property.category,
+  },
+  {
+    field: "bedrooms",
+    // Preferences offer 1-4 and "5" for 5+
+    valueOf: (property) =>
+      Number.isFinite(property.bedrooms) && property.bedrooms > 0
+        ? String(Math.min(property.bedrooms, 5))
+        : undefined,
+  },
+];
+
+export const MATCH_SOURCE_FIELDS = KEY_DIMENSIONS.map(({ field }) => field);
+
+// Listing fields that change who matches or how well (re-run matching when
+// they change)
+export const PROPERTY_MATCH_FIELDS = [
+  "type",
+  "category",
+  "bedrooms",
+  "price",
+  "bathrooms",
+  "furnishing",
+  "facing",
+  "rera_status",
+  // Scored by overlap in scorePreferenceMatch
+  "amenities",
+  "features",
+];
+
+const valuesOf = (value) =>
+  [...new Set((Array.isArray(value) ? value : [value]).filter(Boolean))].map(
+    String
+  );
+
+/**
+ * Index keys of a preference, e.g. type residential, categories
+ * [flat, villa], no bedroom choice ->
+ * ["residential|flat|*", "residential|villa|*"].
+ */
+export const buildPreferenceKeys = (preference = {}) =>
+  KEY_DIMENSIONS.reduce(
+    (keys, { field }) => {
+      const values = valuesOf(preference[field]);
+      const options = values.length ? values : [ANY];
+      return keys.flatMap((key) => options.map((option) => [...key, option]));
+    },
+    [[]]
+  ).map((parts) => parts.join("|"));
+
+// The key combinations a listing matches (its value or `*` per dimension)
+export const buildPropertyKeys = (property = {}) =>
+  KEY_DIMENSIONS.reduce(
+    (keys, { valueOf }) => {
+      const value = valueOf(property);
+      const options = value ? [String(value), ANY] : [ANY];
+      return keys.flatMap((key) => options.map((option) => [...key, option]));
+    },
+    [[]]
+  ).map((parts) => parts.join("|"));
+
+/**
+ * Preference filter for the customers of `agencyId` a listing may suit.
+ * Served by the `{ agencyId, match_keys }` index.
+ */
+export const buildMatchQuery = (property) => {
+  const query = {
+    agencyId: property.agencyId,
+    match_keys: { $in: buildPropertyKeys(property) },
+  };
+
+  const price = Number(property.price);
+  if (Number.isFinite(price) && price > 0) {
+    query.$and = [
+      { $or: [{ minPrice: null }, { minPrice: { $lte: price } }] },
+      {
+        $or: [
+          { maxPrice: null },
+          { maxPrice: 0 },
+          { maxPrice: { $gte: price } },
+        ],
+      },
+    ];
+  }
+  return query;
+};
+
+// Soft criteria: preference field, listing value and weight
+const SOFT_CRITERIA = [
+  {
+    field: "bathrooms",
+    weight: 1,
+    valueOf: (property) =>
+      Number.isFinite(property.bathrooms) && property.bathrooms > 0
+        ? String(Math.min(property.bathrooms, 4))
+        : undefined,
+  },
+  { field: "furnishing", weight: 1, valueOf: (p) => p.furnishing },
+  { field: "facing", weight: 1, valueOf: (p) => p.facing },
+  { field: "reraStatus", weight: 1, valueOf: (p) => p.rera_status },
+];
+
+const HARD_WEIGHT = 2;
+const LIST_WEIGHT = 1.5;
+const PRICE_WEIGHT = 2;
+
+// Share of `wanted` items the listing has (null when nothing is wanted)
+const overlap = (wanted, offered) => {
+  const values = valuesOf(wanted).map((value) => value.toLowerCase());
+  if (!values.length) return null;
+  const available = new Set(valuesOf(offered).map((v) => v.toLowerCase()));
+  return values.filter((value) => available.has(value)).length / values.length;
+};
+
+/**
+ * Rank a listing against a preference from 0 to 100.
+ * Explicit choices that the listing meets score, wildcards are neutral, and
+ * a price near the middle of the customer's range scores highest. Listings
+ * found through `buildMatchQuery` always meet the hard criteria.
+ *
+ * @returns {{ score: number, reasons: string[] }}
+ */
+export const scorePreferenceMatch = (preference, property) => {
+  let earned = 0;
+  let possible = 0;
+  const reasons = [];
+
+  const add = (weight, fraction, reason) => {
+    possible += weight;
+    earned += weight * fraction;
+    if (fraction > 0 && reason) reasons.push(reason);
+  };
+
+  KEY_DIMENSIONS.forEach(({ field, valueOf }) => {
+    const wanted = valuesOf(preference[field]);
+    if (!wanted.length) return;
+    const value = valueOf(property);
+    const met = value !== undefined && wanted.includes(String(value));
+    add(HARD_WEIGHT, met ? 1 : 0, `${field}: ${value}`);
+  });
+
+  SOFT_CRITERIA.forEach(({ field, weight, valueOf }) => {
+    const wanted = valuesOf(preference[field]);
+    if (!wanted.length) return;
+    const value = valueOf(property);
+    const met = value !== undefined && wanted.includes(String(value));
+    add(weight, met ? 1 : 0, `${field}: ${value}`);
+  });
+
+  [
+    ["amenities", property.amenities],
+    ["features", property.features],
+  ].forEach(([field, offered]) => {
+    const share = overlap(preference[field], offered);
+    if (share !== null) add(LIST_WEIGHT, share, share ? `${field}` : null);
+  });
+
+  const { minPrice, maxPrice } = preference;
+  const price = Number(property.price);
+  if (maxPrice > 0 && price > 0) {
+    const low = minPrice > 0 ? minPrice : 0;
+    const middle = (low + maxPrice) / 2;
+    const halfRange = Math.max((maxPrice - low) / 2, 1);
+    add(
+      PRICE_WEIGHT,
+      Math.max(0, 1 - Math.abs(price - middle) / halfRange / 2),
+      "price in budget"
+    );
+  }
+
+  // Only wildcards: a match, but the weakest kind
+  const score = possible ? (earned / possible) * 100 : 50;
+  return { score: Math.round(score), reasons };
+};
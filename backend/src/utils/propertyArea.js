@@ -0,0 +1,158 @@
+// Canonical area for properties.
+// Areas are entered in one of the `unit_area_type` units; every property also
+// stores the area in square feet (`area_sqft`) and its price per square foot
+// (`price_per_sqft`), both indexed, so area ranges and price-per-area
+// ordering run in the database. The values are maintained by the Property
+// model hooks and filled for older records by `npm run backfill:area`.
+
+// Square feet per unit. Marla, kanal and bigha vary by region; these are the
+// Punjab/Haryana revenue values (bigha as used in Rajasthan and UP).
+export const SQFT_PER_UNIT = {
+  "square feet": 1,
+  "square meter": 10.7639,
+  "square yard": 9,
+  gaj: 9,
+  marla: 272.25,
+  kanal: 5445,
+  bigha: 27000,
+  acre: 43560,
+  hectare: 107639.1,
+};
+
+const SQFT_PER_DIMENSION_UNIT = { feet: 1, meter: 10.7639 };
+
+// Fields the canonical values are computed from
+export const AREA_SOURCE_FIELDS = [
+  "price",
+  "built_up_area",
+  "carpet_area",
+  "unit_area_type",
+  "plot_front_area",
+  "plot_depth_area",
+  "plot_dimension_unit",
+];
+
+// Spoken/typed unit names mapped to `unit_area_type` values
+const UNIT_ALIASES = [
+  [/^(sq\.?\s*|square\s*)(ft|feet|foot)$|^sqft$/, "square feet"],
+  [/^(sq\.?\s*|square\s*)(m|mt|mtr|meters?|metres?)$|^sqm$/, "square meter"],
+  [/^(sq\.?\s*|square\s*)(yd|yards?)$|^sqyd$/, "square yard"],
+  [/^gaj$|^gaz$/, "gaj"],
+  [/^marlas?$/, "marla"],
+  [/^kanals?$/, "kanal"],
+  [/^bighas?$/, "bigha"],
+  [/^acres?$/, "acre"],
+  [/^hectares?$|^ha$/, "hectare"],
+];
+
+const round = (value) => Math.round(value * 100) / 100;
+
+const positive = (value) => {
+  const number = Number(value);
+  return Number.isFinite(number) && number > 0 ? number : null;
+};
+
+// Convert an area in `unit` to square feet (null when unknown)
+export const toSquareFeet = (value, unit = "square feet") => {
+  const area = positive(value);
+  const factor = SQFT_PER_UNIT[unit || "square feet"];
+  return area && factor ? round(area * factor) : null;
+};
+
+// Map a free-text unit ("sq ft", "Marlas", "gaz") to a `unit_area_type`
+export const normalizeAreaUnit = (unit) => {
+  const text = String(unit || "")
+    .trim()
+    .toLowerCase()
+    .replace(/\s+/g, " ");
+  if (SQFT_PER_UNIT[text]) return text;
+  const alias = UNIT_ALIASES.find(([pattern]) => pattern.test(text));
+  return alias ? alias[1] : null;
+};
+
+// "1200 square feet" / "5 marla" -> { value: 1200, unit: "square feet" }
+export const parseAreaText = (text) => {
+  if (typeof text === "number") return { value: text, unit: null };
+  const match = String(text || "")
+    .replace(/,/g, "")
+    .match(/(\d+(?:\.\d+)?)\s*(.*)$/);
+  if (!match) return { value: null, unit: null };
+  return { value: Number(match[1]), unit: normalizeAreaUnit(match[2]) };
+};
+
+/**
+ * Canonical area fields of a property-like object.
+ * The built-up area is used, then the carpet area, then the plot's
+ * front x depth; price per square foot needs both a price and an area.
+ *
+ * @returns {{ area_sqft: number|null, price_per_sqft: number|null }}
+ */
+export const computeAreaFields = (property = {}) => {
+  let areaSqft =
+    toSquareFeet(property.built_up_area, property.unit_area_type) ??
+    toSquareFeet(property.carpet_area, property.unit_area_type);
+
+  if (areaSqft === null) {
+    const front = positive(property.plot_front_area);
+    const depth = positive(property.plot_depth_area);
+    const factor =
+      SQFT_PER_DIMENSION_UNIT[property.plot_dimension_unit || "feet"];
+    if (front && depth && factor) areaSqft = round(front * depth * factor);
+  }
+
+  const price = positive(property.price);
+  return {
+    area_sqft: areaSqft,
+    price_per_sqft: areaSqft && price ? round(price / areaSqft) : null,
+  };
+};
+
+const invalidAreaError = (message) => {
+  const error = new Error(message);
+  error.statusCode = 400;
+  return error;
+};
+
+// `minArea` / `maxArea` (square feet) as an `area_sqft` filter clause
+export const parseAreaRange = ({ minArea, maxArea } = {}) => {
+  const range = {};
+  [
+    ["$gte", minArea],
+    ["$lte", maxArea],
+  ].forEach(([op, value]) => {
+    if (value === undefined || value === "") return;
+    const number = Number(value);
+    if (!Number.isFinite(number) || number < 0) {
+      throw invalidAreaError("minArea and maxArea must be square feet >= 0");
+    }
+    range[op] = number;
+  });
+  return Object.keys(range).length ? range : null;
+};
+
+// Listing orders selectable with `?sort=` ("-" prefix for descending)
+const SORT_FIELDS = new Set(["createdAt", "area_sqft", "price_per_sqft"]);
+
+/**
+ * Read `?sort=` into a single-field sort, e.g. "price_per_sqft" ->
+ * `{ price_per_sqft: 1 }`, "-area_sqft" -> `{ area_sqft: -1 }`.
+ */
+export const readPropertySort = (value, fallback = { createdAt: -1 }) => {
+  if (!value) return fallback;
+  const descending = String(value).startsWith("-");
+  const field = descending ? String(value).slice(1) : String(value);
+  if (!SORT_FIELDS.has(field)) {
+    throw invalidAreaError(
+      `sort must be one of ${[...SORT_FIELDS].join(", ")} (prefix - to reverse)`
+    );
+  }
+  return { [field]: descending ? -1 : 1 };
+};
+
+// Properties without a computed value cannot be ordered by it; restricting
+// the filter keeps keyset cursors valid and the scan on the index
+export const requireSortField = (filter, sort) => {
+  const [field] = Object.keys(sort);
+  if (field !== "area_sqft" && field !== "price_per_sqft") return;
+  if (filter[field] === undefined) filter[field] = { $gt: 0 };
+};
@@ -0,0 +1,353 @@
+import { publish, subscribe } from "./pubsub.js";
+
+// Per-agency in-memory property catalog.
+// Small and medium agencies have their whole catalog (lean records, newest
+// first) kept in an LRU cache with a memory budget, so plain listings,
+// single-property reads and dashboards are filtered, sorted and paged
+// in-process. Property writes invalidate the agency's entry (see the hooks in
+// PropertyModel), in every API process through utils/pubsub.js; entries
+// also expire after a TTL as a safety net.
+
+const MB = 1024 * 1024;
+const MAX_BYTES = (Number(process.env.PROPERTY_CACHE_MAX_MB) || 64) * MB;
+const MAX_PROPERTIES_PER_AGENCY =
+  Number(process.env.PROPERTY_CACHE_MAX_PER_AGENCY) || 2000;
+const TTL_MS = (Number(process.env.PROPERTY_CACHE_TTL_SECONDS) || 300) * 1000;
+
+const entries = new Map(); // agencyId -> { records, bytes, expiresAt, oversized }
+const loading = new Map(); // agencyId -> in-flight load promise
+const generations = new Map(); // agencyId -> invalidation counter
+let totalBytes = 0;
+
+const stats = {
+  hits: 0,
+  misses: 0,
+  bypasses: 0,
+  evictions: 0,
+  invalidations: 0,
+};
+
+const keyOf = (agencyId) => (agencyId ? String(agencyId._id ?? agencyId) : "");
+
+const dropEntry = (key) => {
+  const entry = entries.get(key);
+  if (!entry) return;
+  totalBytes -= entry.bytes;
+  entries.delete(key);
+};
+
+const storeEntry = (key, entry) => {
+  dropEntry(key);
+  entries.set(key, entry);
+  totalBytes += entry.bytes;
+
+  // Evict least recently used agencies until back under budget
+  while (totalBytes > MAX_BYTES && entries.size > 1) {
+    dropEntry(entries.keys().next().value);
+    stats.evictions += 1;
+  }
+};
+
+const INVALIDATE_CHANNEL = "property-catalog:invalidate";
+
+const dropAgencyCatalog = (key) => {
+  generations.set(key, (generations.get(key) || 0) + 1);
+  loading.delete(key);
+  if (entries.has(key)) stats.invalidations += 1;
+  dropEntry(key);
+};
+
+// Writes made by any API process drop the entry in all of them
+subscribe(INVALIDATE_CHANNEL, dropAgencyCatalog);
+
+export const invalidateAgencyCatalog = (agencyId) => {
+  const key = keyOf(agencyId);
+  if (!key) return;
+  publish(INVALIDATE_CHANNEL, key);
+};
+
+export const clearPropertyCatalog = () => {
+  [...entries.keys(), ...loading.keys()].forEach(invalidateAgencyCatalog);
+};
+
+const loadCatalog = async (Model, key) => {
+  const generation = generations.get(key) || 0;
+  const records = await Model.find({ agencyId: key })
+    .sort({ createdAt: -1, _id: -1 })
+    .limit(MAX_PROPERTIES_PER_AGENCY + 1)
+    .lean();
+
+  // Large agencies stay on the indexed Mongo path; remember that for a TTL
+  const oversized = records.length > MAX_PROPERTIES_PER_AGENCY;
+  const entry = {
+    records: oversized ? null : records,
+    bytes: oversized ? 0 : Buffer.byteLength(JSON.stringify(records)),
+    expiresAt: Date.now() + TTL_MS,
+    oversized,
+  };
+
+  // A write landed while loading: serve this result once, do not keep it
+  if ((generations.get(key) || 0) === generation) storeEntry(key, entry);
+  return entry;
+};
+
+/**
+ * The cached catalog of an agency, loading it on a miss.
+ * Resolves to `null` when the agency is too large to cache.
+ */
+export const getAgencyCatalog = async (Model, agencyId) => {
+  const key = keyOf(agencyId);
+  const cached = entries.get(key);
+
+  if (cached && cached.expiresAt > Date.now()) {
+    // Refresh LRU position
+    entries.delete(key);
+    entries.set(key, cached);
+    if (cached.oversized) {
+      stats.bypasses += 1;
+      return null;
+    }
+    stats.hits += 1;
+    return cached.records;
+  }
+
+  stats.misses += 1;
+  if (!loading.has(key)) {
+    const load = loadCatalog(Model, key).finally(() => {
+      // An invalidation may have replaced it with a newer load
+      if (loading.get(key) === load) loading.delete(key);
+    });
+    loading.set(key, load);
+  }
+  const entry = await loading.get(key);
+  return entry.oversized ? null : entry.records;
+};
+
+// 🔹 In-process query evaluation
+
+const normalize = (value) => {
+  if (value instanceof Date) return value.getTime();
+  if (typeof value?.toHexString === "function") return value.toHexString();
+  return value ?? null;
+};
+
+const isOperatorObject = (value) =>
+  value !== null &&
+  typeof value === "object" &&
+  !(value instanceof Date) &&
+  !Array.isArray(value) &&
+  typeof value.toHexString !== "function" &&
+  Object.keys(value).some((key) => key.startsWith("$"));
+
+const RANGE = {
+  $gt: (a, b) => a > b,
+  $gte: (a, b) => a >= b,
+  $lt: (a, b) => a < b,
+  $lte: (a, b) => a <= b,
+};
+
+// Values compared by identity once normalized; arrays, plain objects and
+// regexes need Mongo's own semantics (whole-array equality, etc.)
+const isScalar = (value) =>
+  value === null ||
+  typeof value !== "object" ||
+  value instanceof Date ||
+  typeof value.toHexString === "function";
+
+// Compile one field condition; returns null for operators and operands we
+// do not evaluate
+const compileCondition = (condition) => {
+  if (!isOperatorObject(condition)) {
+    if (!isScalar(condition)) return null;
+    const expected = normalize(condition);
+    return (value) => value === expected;
+  }
+
+  const tests = [];
+  for (const [op, operand] of Object.entries(condition)) {
+    const operands = Array.isArray(operand) ? operand : [operand];
+    if (!operands.every(isScalar)) return null;
+    if (RANGE[op]) {
+      const bound = normalize(operand);
+      tests.push(
+        (value) =>
+          value !== null &&
+          typeof value === typeof bound &&
+          RANGE[op](value, bound)
+      );
+    } else if (op === "$eq") {
+      const expected = normalize(operand);
+      tests.push((value) => value === expected);
+    } else if (op === "$in" && Array.isArray(operand)) {
+      const set = new Set(operand.map(normalize));
+      tests.push((value) => set.has(value));
+    } else {
+      return null;
+    }
+  }
+  return (value) => tests.every((test) => test(value));
+};
+
+const compileNegation = (condition) => {
+  const [op] = Object.keys(condition);
+  const operand = condition[op];
+  if (op === "$ne") return compileCondition(operand);
+  if (op === "$nin" && Array.isArray(operand)) {
+    return compileCondition({ $in: operand });
+  }
+  return null;
+};
+
+/**
+ * Compile a Mongo filter into a predicate over lean records.
+ * Covers equality, $in, ranges, $ne/$nin, $and and $or on top-level fields;
+ * returns null for anything else so the caller falls back to Mongo.
+ */
+export const compileFilter = (filter = {}) => {
+  const predicates = [];
+
+  for (const [key, condition] of Object.entries(filter)) {
+    if (key === "$and" || key === "$or") {
+      if (!Array.isArray(condition)) return null;
+      const parts = condition.map(compileFilter);
+      if (parts.some((part) => !part)) return null;
+      predicates.push(
+        key === "$and"
+          ? (record) => parts.every((part) => part(record))
+          : (record) => parts.some((part) => part(record))
+      );
+      continue;
+    }
+    if (key.startsWith("$") || key.includes(".")) return null;
+
+    // $ne/$nin hold only when no array element matches
+    const negated =
+      isOperatorObject(condition) &&
+      Object.keys(condition).length === 1 &&
+      ["$ne", "$nin"].includes(Object.keys(condition)[0]);
+    const test = negated ? compileNegation(condition) : compileCondition(condition);
+    if (!test) return null;
+
+    const matches = (record) => {
+      const value = record[key];
+      return Array.isArray(value)
+        ? value.some((item) => test(normalize(item)))
+        : test(normalize(value));
+    };
+    predicates.push(negated ? (record) => !matches(record) : matches);
+  }
+
+  return (record) => predicates.every((predicate) => predicate(record));
+};
+
+const compareValues = (a, b) => {
+  if (a === b) return 0;
+  if (a === null) return -1;
+  if (b === null) return 1;
+  return a < b ? -1 : 1;
+};
+
+const compileSort = (sort) => {
+  const fields = Object.entries(sort);
+  return (a, b) => {
+    for (const [field, order] of fields) {
+      const diff = compareValues(normalize(a[field]), normalize(b[field]));
+      if (diff) return diff * order;
+    }
+    return 0;
+  };
+};
+
+// Copy a record applying a find-style projection (inclusion or exclusion)
+export const projectRecord = (record, projection) => {
+  if (!projection) return { ...record };
+
+  const keys = Object.keys(projection);
+  const inclusive = keys.some((key) => projection[key] && key !== "_id");
+  let result;
+  if (inclusive) {
+    result = { _id: record._id };
+    keys.forEach((key) => {
+      if (projection[key] && record[key] !== undefined) result[key] = record[key];
+    });
+  } else {
+    result = { ...record };
+    keys.forEach((key) => {
+      if (!projection[key]) delete result[key];
+    });
+  }
+
+  // `images: { $elemMatch: { isPrimary: true } }` keeps the primary image only
+  if (projection.images?.$elemMatch) {
+    const primary = (record.images || []).find((image) => image.isPrimary);
+    if (primary) result.images = [primary];
+    else delete result.images;
+  }
+  return result;
+};
+
+/**
+ * Answer a property query from the agency catalog.
+ * Resolves to `null` when the query cannot be served from the cache
+ * (no single agency, search terms, unsupported operators, large agency).
+ *
+ * @returns {Promise<{ docs: Array, total: number } | null>}
+ */
+export const queryAgencyCatalog = async (
+  Model,
+  { filter = {}, terms = [], sort = { createdAt: -1 }, skip = 0, limit, select }
+) => {
+  const agencyId = filter.agencyId;
+  if (
+    terms.length ||
+    !agencyId ||
+    (typeof agencyId === "object" && isOperatorObject(agencyId))
+  ) {
+    return null;
+  }
+
+  const matches = compileFilter(filter);
+  if (!matches) {
+    stats.bypasses += 1;
+    return null;
+  }
+
+  const records = await getAgencyCatalog(Model, agencyId);
+  if (!records) return null;
+
+  let filtered = records.filter(matches);
+  // Records are stored newest first; any other order is sorted here
+  const [field] = Object.keys(sort);
+  if (field !== "createdAt" || sort.createdAt !== -1) {
+    filtered = [...filtered].sort(compileSort({ ...sort, _id: sort[field] }));
+  }
+
+  const end = limit === undefined ? undefined : skip + limit;
+  return {
+    docs: filtered
+      .slice(skip, end)
+      .map((record) => projectRecord(record, select)),
+    total: filtered.length,
+  };
+};
+
+// Single property from the agency catalog (undefined when not cached)
+export const findCachedProperty = async (Model, agencyId, propertyId) => {
+  if (!agencyId || !propertyId) return undefined;
+  const records = await getAgencyCatalog(Model, agencyId);
+  const record = records?.find((item) => String(item._id) === String(propertyId));
+  return record ? { ...record } : undefined;
+};
+
+export const getPropertyCatalogStats = () => {
+  const lookups = stats.hits + stats.misses;
+  return {
+    ...stats,
+    hitRate: lookups ? Number((stats.hits / lookups).toFixed(3)) : 0,
+    agencies: entries.size,
+    bytes: totalBytes,
+    maxBytes: MAX_BYTES,
+    maxPropertiesPerAgency: MAX_PROPERTIES_PER_AGENCY,
+    ttlSeconds: TTL_MS / 1000,
+  };
+};
@@ -0,0 +1,173 @@
+import {
+  applyCursor,
+  encodeOffsetCursor,
+  keysetSort,
+  toCursorPage,
+} from "./pagination.js";
+import {
+  toAggregateProjection,
+  withSortFields,
+} from "./propertyProjections.js";
+import { geoNearStage } from "./propertyGeo.js";
+import { DISTANCE_SORT, rankStages } from "./propertySearch.js";
+
+// Enum fields the property filter panel offers, plus the price histogram
+export const FACET_FIELDS = [
+  "type",
+  "category",
+  "facing",
+  "rera_status",
+  "transaction_type",
+  "unit_area_type",
+];
+const PRICE_BUCKETS = 8;
+
+// Aggregation $match does not cast, so cast through the schema first
+const castMatch = (Model, filter) => Model.find(filter).cast(Model);
+
+/**
+ * One-round-trip property listing with filter-panel counts.
+ *
+ * A single `$facet` aggregation returns the page of results, the total and,
+ * for every facet field, per-value counts computed with all *other*
+ * selections applied, so the panel can show how many listings each
+ * alternative value would give. Price is returned as histogram buckets.
+ * `scope` (see `shareScope`) restricts the listing to a customer's shares.
+ *
+ * @returns {Promise<{ data: Array, pagination: object, facets: object }>}
+ */
+export const findPropertiesWithFacets = async (
+  Model,
+  {
+    filter = {},
+    terms = [],
+    sort = { createdAt: -1 },
+    paging,
+    select = null,
+    near = null,
+    scope = null,
+  }
+) => {
+  // Split the facet selections out of the shared (tenant/search) filter
+  const base = { ...filter };
+  const selections = {};
+  [...FACET_FIELDS, "price"].forEach((field) => {
+    if (base[field] === undefined) return;
+    selections[field] = base[field];
+    delete base[field];
+  });
+
+  const matchExcept = (excluded) =>
+    castMatch(
+      Model,
+      Object.fromEntries(
+        Object.entries(selections).filter(([field]) => field !== excluded)
+      )
+    );
+  const selectedMatch = matchExcept(null);
+
+  // 🔹 Results page (keyset, ranked or offset, same as the list endpoints)
+  const [sortField] = Object.keys(sort);
+  const keyset = paging.cursorMode && !terms.length && !near;
+  const resultSort = keyset ? keysetSort(sortField, sort[sortField]) : sort;
+  const skip = paging.cursorMode ? paging.cursor?.offset || 0 : paging.skip;
+
+  const resultStages = [{ $match: selectedMatch }];
+  if (keyset) {
+    resultStages.push(
+      { $match: castMatch(Model, applyCursor({}, paging.cursor, resultSort)) },
+      { $sort: resultSort }
+    );
+  } else if (terms.length) {
+    resultStages.push(...rankStages(terms, near ? DISTANCE_SORT : sort));
+  } else if (near) {
+    resultStages.push({ $sort: { ...DISTANCE_SORT, _id: 1 } });
+  } else {
+    resultStages.push({ $sort: { ...sort, _id: -1 } });
+  }
+  if (!keyset && skip) resultStages.push({ $skip: skip });
+  resultStages.push(
+    { $limit: paging.cursorMode ? paging.limit + 1 : paging.limit },
+    {
+      $project: toAggregateProjection(
+        withSortFields(select, near ? DISTANCE_SORT : resultSort)
+      ),
+    }
+  );
+
+  const facetStages = {
+    results: resultStages,
+    total: [{ $match: selectedMatch }, { $count: "count" }],
+    price: [
+      { $match: matchExcept("price") },
+      { $match: { price: { $type: "number" } } },
+      { $bucketAuto: { groupBy: "$price", buckets: PRICE_BUCKETS } },
+    ],
+  };
+  FACET_FIELDS.forEach((field) => {
+    facetStages[field] = [
+      { $match: matchExcept(field) },
+      { $group: { _id: `$${field}`, count: { $sum: 1 } } },
+    ];
+  });
+
+  const baseMatch = castMatch(Model, base);
+  let sourceStages = [{ $match: baseMatch }];
+  if (scope) sourceStages = scope.stages(Model, baseMatch);
+  else if (near) sourceStages = [geoNearStage(baseMatch, near)];
+
+  const [result] = await (scope?.Model || Model).aggregate([
+    ...sourceStages,
+    { $facet: facetStages },
+  ]);
+
+  // 🔹 Shape counts: every enum value is listed, including zero counts
+  const facets = {};
+  FACET_FIELDS.forEach((field) => {
+    const counts = new Map(result[field].map(({ _id, count }) => [_id, count]));
+    const values = (Model.schema.path(field).enumValues || []).filter(Boolean);
+    facets[field] = values.map((value) => ({
+      value,
+      count: counts.get(value) || 0,
+    }));
+  });
+  facets.price = result.price.map(({ _id, count }) => ({
+    min: _id.min,
+    max: _id.max,
+    count,
+  }));
+
+  const total = result.total[0]?.count || 0;
+  const docs = result.results;
+
+  if (!paging.cursorMode) {
+    return {
+      data: docs,
+      pagination: {
+        total,
+        page: paging.page,
+        pages: Math.ceil(total / paging.limit),
+        limit: paging.limit,
+      },
+      facets,
+    };
+  }
+
+  if (keyset) {
+    const page = toCursorPage(docs, paging.limit, resultSort);
+    page.pagination.total = total;
+    return { ...page, facets };
+  }
+
+  const hasMore = docs.length > paging.limit;
+  return {
+    data: hasMore ? docs.slice(0, paging.limit) : docs,
+    pagination: {
+      limit: paging.limit,
+      hasMore,
+      nextCursor: hasMore ? encodeOffsetCursor(skip + paging.limit) : null,
+      total,
+    },
+    facets,
+  };
+};
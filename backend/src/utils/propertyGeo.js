@@ -0,0 +1,115 @@
+import { toPoint } from "./geocoder.js";
+
+// Geospatial listing queries on `Property.geo_location` (2dsphere).
+// Query parameters, all coordinates in GeoJSON order (longitude first):
+//   lat, lng [, radiusKm]          - nearby, optionally within a radius
+//   bbox=minLng,minLat,maxLng,maxLat - map viewport
+//   polygon=lng,lat;lng,lat;...     - drawn area
+// Results are ordered by distance from `lat,lng` (or the shape's centre)
+// and carry a `distance` field in metres.
+
+const EARTH_RADIUS_KM = 6378.1;
+const MAX_RADIUS_KM = 500;
+const MAX_POLYGON_POINTS = 100;
+
+const invalidGeoError = (message) => {
+  const error = new Error(message);
+  error.statusCode = 400;
+  return error;
+};
+
+const parsePosition = (value) => {
+  const [lng, lat] = String(value).split(",");
+  const point = toPoint(lat, lng);
+  if (!point) throw invalidGeoError(`Invalid coordinate "${value}"`);
+  return point.coordinates;
+};
+
+// Average of the ring's vertices; good enough to order results in a shape
+const centreOf = (ring) => {
+  const vertices = ring.slice(0, -1);
+  const sum = vertices.reduce(
+    ([lng, lat], [x, y]) => [lng + x, lat + y],
+    [0, 0]
+  );
+  return [sum[0] / vertices.length, sum[1] / vertices.length];
+};
+
+const polygonClause = (ring) => ({
+  $geoWithin: { $geometry: { type: "Polygon", coordinates: [ring] } },
+});
+
+/**
+ * Parse the geo query parameters.
+ * @returns {{ clause: object, near: number[] } | null} the `geo_location`
+ * filter clause and the [lng, lat] origin results are ordered from
+ */
+export const parseGeoQuery = (query = {}) => {
+  const { lat, lng, radiusKm, bbox, polygon } = query;
+  const hasCentre = lat !== undefined && lat !== "" && lng !== undefined;
+  if (!hasCentre && !bbox && !polygon) return null;
+
+  const centre = hasCentre ? parsePosition(`${lng},${lat}`) : null;
+
+  if (polygon) {
+    const ring = String(polygon).split(";").map(parsePosition);
+    if (ring.length < 3 || ring.length > MAX_POLYGON_POINTS) {
+      throw invalidGeoError(
+        `A polygon needs between 3 and ${MAX_POLYGON_POINTS} points`
+      );
+    }
+    const [first] = ring;
+    const last = ring[ring.length - 1];
+    if (first[0] !== last[0] || first[1] !== last[1]) ring.push(first);
+    return { clause: polygonClause(ring), near: centre || centreOf(ring) };
+  }
+
+  if (bbox) {
+    const values = String(bbox).split(",").map(Number);
+    const [west, south, east, north] = values;
+    if (
+      values.length !== 4 ||
+      !toPoint(south, west) ||
+      !toPoint(north, east) ||
+      west >= east ||
+      south >= north
+    ) {
+      throw invalidGeoError("bbox must be minLng,minLat,maxLng,maxLat");
+    }
+    const ring = [
+      [west, south],
+      [east, south],
+      [east, north],
+      [west, north],
+      [west, south],
+    ];
+    return { clause: polygonClause(ring), near: centre || centreOf(ring) };
+  }
+
+  if (radiusKm !== undefined && radiusKm !== "") {
+    const radius = Number(radiusKm);
+    if (!Number.isFinite(radius) || radius <= 0 || radius > MAX_RADIUS_KM) {
+      throw invalidGeoError(`radiusKm must be between 0 and ${MAX_RADIUS_KM}`);
+    }
+    return {
+      clause: {
+        $geoWithin: { $centerSphere: [centre, radius / EARTH_RADIUS_KM] },
+      },
+      near: centre,
+    };
+  }
+
+  // Plain "nearest first": every located property, ordered by distance
+  return { clause: { $exists: true }, near: centre };
+};
+
+// First pipeline stage for distance-ordered results (uses the 2dsphere index)
+export const geoNearStage = (query, near) => ({
+  $geoNear: {
+    near: { type: "Point", coordinates: near },
+    key: "geo_location",
+    distanceField: "distance",
+    spherical: true,
+    query,
+  },
+});
@@ -0,0 +1,120 @@
+import fs from "fs/promises";
+import path from "path";
+import { saveImageVariants } from "./multerConfig.js";
+import { downloadPublicFile } from "./publicDownload.js";
+
+// Background image ingestion for bulk-imported properties.
+// Imported rows reference images by URL (or by path inside the CLI's
+// `--images` folder, e.g. an extracted zip); properties are inserted first
+// and their images are downloaded, resized and attached here with bounded
+// concurrency, so a large import is not held up by image processing.
+
+const CONCURRENCY = Number(process.env.IMPORT_IMAGE_CONCURRENCY) || 4;
+const MAX_IMAGE_BYTES = 15 * 1024 * 1024;
+const FETCH_TIMEOUT_MS = 20 * 1000;
+
+const pending = [];
+let active = 0;
+let idleWaiters = [];
+
+const stats = { queued: 0, processed: 0, attached: 0, failed: 0 };
+
+const readSource = async (source, baseDir) => {
+  if (/^https?:\/\//i.test(source)) {
+    // Public hosts only, size-capped while streaming
+    return downloadPublicFile(source, {
+      maxBytes: MAX_IMAGE_BYTES,
+      timeoutMs: FETCH_TIMEOUT_MS,
+      type: "image/",
+    });
+  }
+
+  // Local files are only read from inside the import's image folder
+  if (!baseDir) throw new Error("Local image paths need an image folder");
+  const file = path.resolve(baseDir, source);
+  if (!file.startsWith(path.resolve(baseDir) + path.sep)) {
+    throw new Error("Image path escapes the image folder");
+  }
+  return fs.readFile(file);
+};
+
+const ingest = async ({ Model, property, sources, baseDir }) => {
+  const images = [];
+  for (const source of sources) {
+    try {
+      const buffer = await readSource(source, baseDir);
+      if (buffer.length > MAX_IMAGE_BYTES) throw new Error("Image too large");
+      const name = path
+        .basename(new URL(source, "file:///").pathname)
+        .replace(/[^\w.-]/g, "_");
+      const filename = `${Date.now()}-${images.length}-${name || "image.jpg"}`;
+      await saveImageVariants(buffer, "Properties", filename);
+      images.push({ url: filename, alt: name, isPrimary: false });
+    } catch (error) {
+      stats.failed += 1;
+      console.error(`❌ Import image ${source} failed:`, error.message);
+    }
+  }
+  if (!images.length) return;
+
+  images[0].isPrimary = true;
+  await Model.updateOne(
+    {
+      _id: property._id,
+      agencyId: property.agencyId,
+      "images.0": { $exists: false },
+    },
+    { $push: { images: { $each: images } } }
+  );
+  stats.attached += images.length;
+};
+
+const next = () => {
+  while (active < CONCURRENCY && pending.length) {
+    const job = pending.shift();
+    active += 1;
+    ingest(job)
+      .catch((error) =>
+        console.error(`❌ Import images for ${job.property._id} failed:`, error)
+      )
+      .finally(() => {
+        active -= 1;
+        stats.processed += 1;
+        next();
+      });
+  }
+
+  if (!active && !pending.length) {
+    idleWaiters.forEach((resolve) => resolve());
+    idleWaiters = [];
+  }
+};
+
+/**
+ * Queue images for an imported property (`{ _id, agencyId }`). `sources`
+ * are image URLs or paths relative to `baseDir`; the first image becomes
+ * the primary one.
+ */
+export const queuePropertyImages = (
+  Model,
+  property,
+  sources,
+  { baseDir } = {}
+) => {
+  if (!sources?.length) return;
+  pending.push({ Model, property, sources, baseDir });
+  stats.queued += 1;
+  next();
+};
+
+// Resolves once every queued property has been processed
+export const drainImageQueue = () =>
+  !active && !pending.length
+    ? Promise.resolve()
+    : new Promise((resolve) => idleWaiters.push(resolve));
+
+export const getImageQueueStats = () => ({
+  ...stats,
+  pending: pending.length,
+  active,
+});
@@ -0,0 +1,282 @@
+import readline from "readline";
+import {
+  applyCoordinates,
+  cleanPayloadNumbers,
+  ensureArray,
+  newPropertyCode,
+} from "./propertyPayload.js";
+import { invalidateAgencyCatalog } from "./propertyCatalogCache.js";
+import { queuePropertyImages } from "./propertyImageQueue.js";
+
+// Streaming bulk import of properties from CSV or NDJSON.
+// Rows are read one at a time, coerced like the create form payload,
+// validated, and inserted with `insertMany` in bounded batches; failures are
+// reported per row (1-based line number) without stopping the import.
+// CSV headers are Property field names; list fields (amenities, images, ...)
+// are separated by `|`. Images are attached in the background.
+
+const BATCH_SIZE = Number(process.env.IMPORT_BATCH_SIZE) || 500;
+const MAX_REPORTED_ERRORS = 1000;
+
+const LIST_FIELDS = ["water_source", "amenities", "features", "overlooking"];
+
+// Never taken from the file: tenancy, ids and fields maintained by hooks
+const IGNORED_FIELDS = new Set([
+  "_id",
+  "__v",
+  "agencyId",
+  "owner",
+  "search_tokens",
+  "area_sqft",
+  "price_per_sqft",
+  "createdAt",
+  "updatedAt",
+]);
+
+// 🔹 Readers
+
+// Split one CSV record into fields (RFC 4180 quoting)
+const parseCsvRecord = (record) => {
+  const fields = [];
+  let field = "";
+  let quoted = false;
+
+  for (let i = 0; i < record.length; i++) {
+    const char = record[i];
+    if (quoted) {
+      if (char === '"' && record[i + 1] === '"') {
+        field += '"';
+        i++;
+      } else if (char === '"') {
+        quoted = false;
+      } else {
+        field += char;
+      }
+    } else if (char === '"') {
+      quoted = true;
+    } else if (char === ",") {
+      fields.push(field);
+      field = "";
+    } else {
+      field += char;
+    }
+  }
+  fields.push(field);
+  return fields;
+};
+
+// A record is complete once its quotes are balanced
+const hasOpenQuote = (text) => (text.match(/"/g) || []).length % 2 === 1;
+
+async function* readCsvRows(lines) {
+  let header = null;
+  let record = "";
+  let recordLine = 0;
+  let lineNumber = 0;
+
+  for await (const line of lines) {
+    lineNumber += 1;
+    if (!record) recordLine = lineNumber;
+    record = record ? `${record}\n${line}` : line;
+    if (hasOpenQuote(record)) continue;
+
+    const fields = parseCsvRecord(record);
+    record = "";
+    if (!header) {
+      header = fields.map((name) => name.replace(/^\uFEFF/, "").trim());
+      continue;
+    }
+    if (fields.every((value) => !value.trim())) continue;
+
+    const row = {};
+    for (let index = 0; index < header.length; index++) {
+      if (header[index]) row[header[index]] = fields[index];
+    }
+    yield { line: recordLine, row };
+  }
+
+  if (record) yield { line: recordLine, error: "Unterminated quoted field" };
+}
+
+async function* readNdjsonRows(lines) {
+  let lineNumber = 0;
+  for await (const line of lines) {
+    lineNumber += 1;
+    if (!line.trim()) continue;
+    try {
+      const row = JSON.parse(line);
+      if (!row || typeof row !== "object" || Array.isArray(row)) {
+        throw new Error("Expected a JSON object");
+      }
+      yield { line: lineNumber, row };
+    } catch (error) {
+      yield { line: lineNumber, error: `Invalid JSON: ${error.message}` };
+    }
+  }
+}
+
+// "csv" or "ndjson" from an explicit format or a file name
+export const detectImportFormat = (format, filename = "") => {
+  const value = String(format || "").toLowerCase();
+  if (value === "csv" || value === "ndjson") return value;
+  if (value === "jsonl" || /\.(ndjson|jsonl)$/i.test(filename)) return "ndjson";
+  if (!value && /\.csv$/i.test(filename)) return "csv";
+
+  const error = new Error("Import format must be csv or ndjson");
+  error.statusCode = 400;
+  throw error;
+};
+
+// 🔹 Row coercion
+
+const splitList = (value) =>
+  typeof value === "string"
+    ? value
+        .split("|")
+        .map((item) => item.trim())
+        .filter(Boolean)
+    : ensureArray(value);
+
+/**
+ * Turn an import row into a create payload for `agencyId`, using the same
+ * number and list coercion as the create form.
+ * @returns {{ payload: object, images: string[] }}
+ */
+export const coerceImportRow = (row, agencyId) => {
+  const payload = {};
+  Object.entries(row).forEach(([key, value]) => {
+    const field = key.trim();
+    if (!field || IGNORED_FIELDS.has(field)) return;
+    if (value === "" || value === null || value === undefined) return;
+    payload[field] = typeof value === "string" ? value.trim() : value;
+  });
+
+  cleanPayloadNumbers(payload);
+  LIST_FIELDS.forEach((field) => {
+    payload[field] = splitList(payload[field]);
+  });
+  applyCoordinates(payload);
+
+  const images = splitList(payload.images)
+    .map((image) => (typeof image === "string" ? image : image?.url))
+    .filter(Boolean);
+
+  return {
+    payload: {
+      ...payload,
+      images: [],
+      agencyId,
+      property_code: payload.property_code || newPropertyCode(),
+    },
+    images,
+  };
+};
+
+const errorMessages = (error) =>
+  error.errors
+    ? Object.values(error.errors).map((item) => item.message)
+    : [error.message];
+
+/**
+ * Stream rows from `input` (a readable stream) into `Model`.
+ *
+ * @param {object} options
+ * @param {"csv"|"ndjson"} options.format
+ * @param {string} options.agencyId agency every property is created in
+ * @param {string} [options.imageDir] folder local image paths resolve in
+ * @returns {Promise<{ total: number, inserted: number, failed: number,
+ *   imagesQueued: number, errors: Array<{ line: number, errors: string[] }> }>}
+ */
+export const importProperties = async (
+  Model,
+  input,
+  { format, agencyId, imageDir, batchSize = BATCH_SIZE }
+) => {
+  const lines = readline.createInterface({ input, crlfDelay: Infinity });
+  const rows = format === "csv" ? readCsvRows(lines) : readNdjsonRows(lines);
+
+  const summary = {
+    total: 0,
+    inserted: 0,
+    failed: 0,
+    imagesQueued: 0,
+    errors: [],
+  };
+  const fail = (line, errors) => {
+    summary.failed += 1;
+    if (summary.errors.length < MAX_REPORTED_ERRORS) {
+      summary.errors.push({ line, errors });
+    }
+  };
+
+  let batch = [];
+  const flush = async () => {
+    if (!batch.length) return;
+    const current = batch;
+    batch = [];
+
+    const rejected = new Map();
+    try {
+      await Model.insertMany(
+        current.map(({ doc }) => doc),
+        { ordered: false }
+      );
+    } catch (error) {
+      if (!error.writeErrors) throw error;
+      // The insertMany hook only runs on success; rows may still have landed
+      invalidateAgencyCatalog(agencyId);
+      // Duplicate property codes and other per-document write errors
+      error.writeErrors.forEach((writeError) => {
+        rejected.set(
+          String(writeError.getOperation()._id),
+          writeError.errmsg || writeError.message
+        );
+      });
+    }
+
+    current.forEach(({ line, doc, images }) => {
+      const message = rejected.get(String(doc._id));
+      if (message) {
+        fail(line, [message]);
+        return;
+      }
+      summary.inserted += 1;
+      if (images.length) {
+        summary.imagesQueued += images.length;
+        queuePropertyImages(
+          Model,
+          { _id: doc._id, agencyId: doc.agencyId },
+          images,
+          { baseDir: imageDir }
+        );
+      }
+    });
+    console.log(
+      `📥 Imported ${summary.inserted} of ${summary.total} rows` +
+        ` (${summary.failed} failed)`
+    );
+  };
+
+  for await (const { line, row, error } of rows) {
+    summary.total += 1;
+    if (error) {
+      fail(line, [error]);
+      continue;
+    }
+
+    const { payload, images } = coerceImportRow(row, agencyId);
+    const doc = new Model(payload);
+    try {
+      await doc.validate();
+    } catch (invalid) {
+      fail(line, errorMessages(invalid));
+      continue;
+    }
+
+    batch.push({ line, doc, images });
+    if (batch.length >= batchSize) await flush();
+  }
+  await flush();
+
+  return summary;
+};
@@ -0,0 +1,141 @@
+import { Preference } from "../models/Common/PreferenceModel.js";
+import { PropertyMatch } from "../models/Agent/PropertyMatchModel.js";
+import { Customer } from "../models/Agent/CustomerModel.js";
+import { Notification } from "../models/Common/NotificationModel.js";
+import AgencySettings from "../models/Agent/settingsModel.js";
+import CustomerSettings from "../models/Customer/SettingsModel.js";
+import {
+  buildMatchQuery,
+  scorePreferenceMatch,
+} from "./preferenceMatching.js";
+
+// Listing -> interested customers.
+// Candidates come from the `{ agencyId, match_keys }` preference index (see
+// preferenceMatching.js), are ranked, and recorded as PropertyMatch rows.
+// Only new matches notify: customers who can browse the whole catalog get a
+// notification, the agent gets one summary to share the listing with the
+// rest. Everything is written in batches, never one query per customer.
+
+const MATCH_FIELDS =
+  "userId type category bedrooms bathrooms furnishing facing reraStatus " +
+  "amenities features minPrice maxPrice";
+
+/**
+ * Customers of the listing's agency whose preferences it meets, best first.
+ * @returns {Promise<Array<{ customerId, score: number, reasons: string[] }>>}
+ */
+export const findMatchingCustomers = async (property) => {
+  if (!property?.agencyId) return [];
+  const preferences = await Preference.find(buildMatchQuery(property))
+    .select(MATCH_FIELDS)
+    .lean();
+
+  return preferences
+    .map((preference) => ({
+      customerId: preference.userId,
+      ...scorePreferenceMatch(preference, property),
+    }))
+    .sort((a, b) => b.score - a.score);
+};
+
+const notifyNewMatches = async (user, property, customerIds) => {
+  const [customers, mutedSettings, agencySettings] = await Promise.all([
+    Customer.find({
+      _id: { $in: customerIds },
+      agencyId: property.agencyId,
+      isDeleted: { $ne: true },
+    })
+      .select("showAllProperty")
+      .lean(),
+    CustomerSettings.find({
+      userId: { $in: customerIds },
+      "notifications.propertyUpdates": false,
+    })
+      .select("userId")
+      .lean(),
+    user ? AgencySettings.findOne({ userId: user._id }).lean() : null,
+  ]);
+
+  const muted = new Set(mutedSettings.map(({ userId }) => String(userId)));
+  const notifications = customers
+    .filter(
+      ({ _id, showAllProperty }) => showAllProperty && !muted.has(String(_id))
+    )
+    .map(({ _id }) => ({
+      userId: _id,
+      agencyId: property.agencyId,
+      message: `New property "${property.title}" matches your preferences.`,
+      type: "property_match",
+      link: `/customer/properties/${property._id}`,
+    }));
+
+  if (agencySettings?.notifications?.propertyUpdates) {
+    const count = customerIds.length;
+    notifications.push({
+      userId: user._id,
+      agencyId: property.agencyId,
+      message:
+        `Property "${property.title}" matches the preferences of ` +
+        `${count} customer${count === 1 ? "" : "s"}.`,
+      type: "property_match",
+      link: `/agent/properties/view/${property._id}`,
+    });
+  }
+
+  if (notifications.length) {
+    await Notification.insertMany(notifications, { ordered: false });
+  }
+};
+
+/**
+ * Record the customers `property` matches and notify the new ones.
+ * Matches the listing no longer meets are dropped.
+ *
+ * @param {object} property saved listing
+ * @param {object} [user] agent who saved it (receives the summary)
+ * @returns {Promise<number>} number of matching customers
+ */
+export const matchPropertyToCustomers = async (property, user) => {
+  const matches = await findMatchingCustomers(property);
+  const customerIds = matches.map(({ customerId }) => customerId);
+
+  await PropertyMatch.deleteMany({
+    propertyId: property._id,
+    customerId: { $nin: customerIds },
+  });
+  if (!matches.length) return 0;
+
+  const result = await PropertyMatch.bulkWrite(
+    matches.map(({ customerId, score, reasons }) => ({
+      updateOne: {
+        filter: { propertyId: property._id, customerId },
+        update: {
+          $set: { agencyId: property.agencyId, score, reasons },
+          $setOnInsert: { notifiedAt: null },
+        },
+        upsert: true,
+      },
+    })),
+    { ordered: false }
+  );
+
+  // Upserted ops are the new matches (bulkWrite reports them by op index)
+  const newIds = Object.keys(result.upsertedIds || {}).map(
+    (index) => customerIds[index]
+  );
+  if (newIds.length) {
+    await notifyNewMatches(user, property, newIds);
+    await PropertyMatch.updateMany(
+      { propertyId: property._id, customerId: { $in: newIds } },
+      { $set: { notifiedAt: new Date() } }
+    );
+  }
+  return matches.length;
+};
+
+// Background variant for request handlers: never throws
+export const matchPropertyInBackground = (property, user) => {
+  matchPropertyToCustomers(property, user).catch((error) =>
+    console.error(`❌ Matching property ${property?._id} failed:`, error)
+  );
+};
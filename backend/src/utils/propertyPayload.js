@@ -0,0 +1,60 @@
+import { toPoint } from "./geocoder.js";
+
+// Coercion of raw property payloads (multipart form fields, import rows)
+// into the shape the Property model expects.
+
+// Utility: Convert invalid numbers to null
+export const cleanNumber = (value) => {
+  if (value === "" || value === null || value === undefined) return null;
+  if (value === "NaN") return null;
+  if (typeof value === "number" && Number.isNaN(value)) return null;
+  if (typeof value === "string" && isNaN(Number(value))) return null;
+  return Number(value);
+};
+
+// Clean payload numbers dynamically
+export const cleanPayloadNumbers = (payload) => {
+  const numberFields = [
+    "price",
+    "built_up_area",
+    "carpet_area",
+    "plot_front_area",
+    "plot_depth_area",
+    "washrooms",
+    "cabins",
+    "conference_rooms",
+    "floor_number",
+    "total_floors",
+    "bedrooms",
+    "bathrooms",
+    "balconies",
+  ];
+
+  numberFields.forEach((field) => {
+    if (payload[field] !== undefined) {
+      payload[field] = cleanNumber(payload[field]);
+    }
+  });
+
+  return payload;
+};
+
+// Convert form-data arrays
+export const ensureArray = (value) => {
+  if (!value) return [];
+  return Array.isArray(value) ? value : [value];
+};
+
+// Explicit coordinates take precedence over geocoding the location text
+export const applyCoordinates = (payload) => {
+  const point = toPoint(payload.latitude, payload.longitude);
+  if (point) payload.geo_location = point;
+  delete payload.latitude;
+  delete payload.longitude;
+};
+
+export const newPropertyCode = () =>
+  `PROP-${Date.now()}-${Math.random()
+    .toString(36)
+    .substring(2, 7)
+    .toUpperCase()}`;
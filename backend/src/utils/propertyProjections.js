@@ -0,0 +1,121 @@
+// Named property projections ("sparse fieldsets") for list payloads.
+// Endpoints pick a default projection; clients may override it with
+// `?fields=<name>` or a comma-separated list of schema paths.
+
+// Only the primary image travels with list payloads
+const PRIMARY_IMAGE = { $elemMatch: { isPrimary: true } };
+
+const SUMMARY_FIELDS = ["title", "price", "location", "status"];
+
+// Fields rendered by the property cards (listing and dashboard variants)
+const CARD_FIELDS = [
+  ...SUMMARY_FIELDS,
+  "type",
+  "category",
+  "description",
+  "bedrooms",
+  "bathrooms",
+  "built_up_area",
+  "unit_area_type",
+  "furnishing",
+  "power_backup",
+  "rera_status",
+  "flooring_type",
+  "gated_community",
+  "is_corner_plot",
+  "property_age",
+  "water_source",
+  "agencyId",
+  "createdAt",
+];
+
+const ADMIN_FIELDS = [
+  ...SUMMARY_FIELDS,
+  "type",
+  "category",
+  "property_code",
+  "agencyId",
+  "createdAt",
+];
+
+const withPrimaryImage = (fields) => ({
+  ...Object.fromEntries(fields.map((field) => [field, 1])),
+  images: PRIMARY_IMAGE,
+});
+
+export const PROPERTY_PROJECTIONS = {
+  // Populated references (shares, meetings, customer dashboard)
+  summary: withPrimaryImage(SUMMARY_FIELDS),
+  card: withPrimaryImage(CARD_FIELDS),
+  admin: withPrimaryImage(ADMIN_FIELDS),
+  // Full document (`search_tokens` is already `select: false`)
+  detail: null,
+};
+
+const MAX_CUSTOM_FIELDS = 30;
+
+/**
+ * Resolve a `fields` query value into a Mongo projection.
+ * Unknown names and non-schema paths are ignored; `null` means "all fields".
+ */
+export const resolvePropertyProjection = (Model, fields, fallback = "detail") => {
+  const value = typeof fields === "string" ? fields.trim() : "";
+  if (!value) return PROPERTY_PROJECTIONS[fallback] ?? null;
+  if (Object.hasOwn(PROPERTY_PROJECTIONS, value)) {
+    return PROPERTY_PROJECTIONS[value];
+  }
+
+  const paths = value
+    .split(",")
+    .map((path) => path.trim())
+    .filter(
+      (path) =>
+        path &&
+        path !== "search_tokens" &&
+        Model.schema.path(path) !== undefined
+    )
+    .slice(0, MAX_CUSTOM_FIELDS);
+  if (!paths.length) return PROPERTY_PROJECTIONS[fallback] ?? null;
+
+  const projection = Object.fromEntries(paths.map((path) => [path, 1]));
+  if (projection.images) projection.images = PRIMARY_IMAGE;
+  return projection;
+};
+
+// Keyset cursors are built from the sort fields, so keep them in the payload
+export const withSortFields = (projection, sort) => {
+  if (!projection) return projection;
+  const missing = Object.keys(sort).filter((field) => !projection[field]);
+  if (!missing.length) return projection;
+  return {
+    ...projection,
+    ...Object.fromEntries(missing.map((field) => [field, 1])),
+  };
+};
+
+// Aggregation `$project` equivalent of a find projection
+export const toAggregateProjection = (projection) => {
+  if (!projection) return { search_tokens: 0, _searchScore: 0 };
+  const stage = { ...projection };
+  if (stage.images === PRIMARY_IMAGE) {
+    stage.images = {
+      $slice: [
+        {
+          $filter: {
+            input: { $ifNull: ["$images", []] },
+            as: "image",
+            cond: { $eq: ["$$image.isPrimary", true] },
+          },
+        },
+        1,
+      ],
+    };
+  }
+  return stage;
+};
+
+// `populate()` options for a Property reference using a named projection
+export const populateProperty = (name = "summary", path = "propertyId") => ({
+  path,
+  select: PROPERTY_PROJECTIONS[name],
+});
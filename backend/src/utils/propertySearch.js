@@ -0,0 +1,292 @@
+import {
+  applyCursor,
+  cachedCount,
+  encodeOffsetCursor,
+  findCursorPage,
+  keysetSort,
+  toCursorPage,
+} from "./pagination.js";
+import { queryAgencyCatalog } from "./propertyCatalogCache.js";
+import { geoNearStage } from "./propertyGeo.js";
+import {
+  toAggregateProjection,
+  withSortFields,
+} from "./propertyProjections.js";
+
+// Shared property search: a maintained, weighted prefix-token index stored on
+// each Property (`search_tokens`) and a ranked query builder used by the
+// Agent, Customer and Admin property listings.
+
+// Field weights used for relevance ranking (higher = more relevant)
+const FIELD_WEIGHTS = {
+  title: 10,
+  property_code: 10,
+  location: 6,
+  category: 4,
+  type: 4,
+  owner_name: 3,
+  description: 1,
+};
+
+// Fields whose words are indexed by every prefix (partial-word matching)
+const PREFIX_FIELDS = new Set([
+  "title",
+  "property_code",
+  "location",
+  "category",
+  "type",
+  "owner_name",
+]);
+
+export const SEARCH_SOURCE_FIELDS = Object.keys(FIELD_WEIGHTS);
+
+const MIN_TOKEN_LENGTH = 2;
+const MAX_TOKEN_LENGTH = 20;
+const MAX_DESCRIPTION_WORDS = 300;
+const MAX_QUERY_TERMS = 8;
+
+// `distance` is added by $geoNear (metres from the query point)
+export const DISTANCE_SORT = { distance: 1 };
+
+// Lowercase, strip accents and split on anything that is not a letter/digit
+export const tokenize = (text) => {
+  if (text === null || text === undefined) return [];
+  return String(text)
+    .normalize("NFKD")
+    .replace(/[\u0300-\u036f]/g, "")
+    .toLowerCase()
+    .split(/[^\p{L}\p{N}]+/u)
+    .filter((word) => word.length >= MIN_TOKEN_LENGTH)
+    .map((word) => word.slice(0, MAX_TOKEN_LENGTH));
+};
+
+// Build the weighted token list for a property-like object.
+// Full words score double their field weight, prefixes score the field weight.
+export const buildSearchTokens = (property = {}) => {
+  const weights = new Map();
+
+  const addToken = (token, weight) => {
+    if ((weights.get(token) || 0) < weight) weights.set(token, weight);
+  };
+
+  for (const [field, fieldWeight] of Object.entries(FIELD_WEIGHTS)) {
+    let words = tokenize(property[field]);
+    if (field === "description") {
+      words = [...new Set(words)].slice(0, MAX_DESCRIPTION_WORDS);
+    }
+
+    words.forEach((word) => {
+      addToken(word, fieldWeight * 2);
+      if (!PREFIX_FIELDS.has(field)) return;
+      for (let len = MIN_TOKEN_LENGTH; len < word.length; len++) {
+        addToken(word.slice(0, len), fieldWeight);
+      }
+    });
+  }
+
+  return [...weights].map(([t, w]) => ({ t, w }));
+};
+
+// Unique, bounded list of query terms
+export const parseSearchTerms = (search) => {
+  if (typeof search !== "string") return [];
+  return [...new Set(tokenize(search))].slice(0, MAX_QUERY_TERMS);
+};
+
+// Filter clause: every term must match a token (index-backed via search_tokens.t)
+export const buildSearchMatch = (terms) => ({
+  "search_tokens.t": { $all: terms },
+});
+
+// Relevance = sum over terms of the best weight the term matched with
+const buildScoreExpression = (terms) => ({
+  $reduce: {
+    input: terms,
+    initialValue: 0,
+    in: {
+      $add: [
+        "$$value",
+        {
+          $ifNull: [
+            {
+              $max: {
+                $map: {
+                  input: {
+                    $filter: {
+                      input: { $ifNull: ["$search_tokens", []] },
+                      as: "token",
+                      cond: { $eq: ["$$token.t", "$$this"] },
+                    },
+                  },
+                  as: "match",
+                  in: "$$match.w",
+                },
+              },
+            },
+            0,
+          ],
+        },
+      ],
+    },
+  },
+});
+
+// Pipeline stages that order matched properties by relevance, then `sort`
+export const rankStages = (terms, sort) => [
+  { $addFields: { _searchScore: buildScoreExpression(terms) } },
+  { $sort: { _searchScore: -1, ...sort, _id: -1 } },
+];
+
+/**
+ * Paged property listing with optional ranked search.
+ * Without search terms it is served from the agency catalog cache when
+ * possible, else a plain indexed find sorted by `sort`; with terms it ranks
+ * matches by relevance, then by `sort`.
+ * `near` ([lng, lat], see `parseGeoQuery`) orders results by distance.
+ * `select` is a projection from `resolvePropertyProjection` (null = all).
+ * Results are lean objects, ready for the precompiled serializers.
+ *
+ * @returns {Promise<[Array, number]>} [properties, total]
+ */
+export const findProperties = async (
+  Model,
+  {
+    filter = {},
+    terms = [],
+    sort = { createdAt: -1 },
+    skip = 0,
+    limit = 10,
+    count = true,
+    select = null,
+    near = null,
+  }
+) => {
+  const ordered = !terms.length && !near;
+
+  // Single-agency listings are answered from the in-memory catalog
+  if (ordered) {
+    const cached = await queryAgencyCatalog(Model, {
+      filter,
+      sort,
+      skip,
+      limit,
+      select,
+    });
+    if (cached) return [cached.docs, count ? cached.total : undefined];
+  }
+
+  const countQuery = count ? Model.countDocuments(filter) : undefined;
+
+  if (ordered) {
+    const query = Model.find(filter)
+      .sort(sort)
+      .skip(skip)
+      .limit(limit)
+      .lean();
+    return Promise.all([select ? query.select(select) : query, countQuery]);
+  }
+
+  // Aggregation $match does not cast, so cast through the schema first
+  const match = Model.find(filter).cast(Model);
+
+  // Distance-ordered results start with $geoNear; search ranks on top of it
+  const stages = near ? [geoNearStage(match, near)] : [{ $match: match }];
+  if (terms.length) {
+    stages.push(...rankStages(terms, near ? DISTANCE_SORT : sort));
+  }
+
+  const [rows, total] = await Promise.all([
+    Model.aggregate([
+      ...stages,
+      { $skip: skip },
+      { $limit: limit },
+      {
+        $project: toAggregateProjection(
+          near ? withSortFields(select, DISTANCE_SORT) : select
+        ),
+      },
+    ]),
+    countQuery,
+  ]);
+
+  return [rows, total];
+};
+
+/**
+ * Cursor-mode counterpart of `findProperties`.
+ * Plain listings use keyset pagination on `sort`; ranked search and
+ * distance-ordered results have no stable key, so their cursor carries the
+ * offset of the next page.
+ *
+ * @returns {Promise<{ data: Array, pagination: object }>}
+ */
+export const findPropertyCursorPage = async (
+  Model,
+  {
+    filter = {},
+    terms = [],
+    sort = { createdAt: -1 },
+    paging,
+    select = null,
+    near = null,
+  }
+) => {
+  const { cursor, limit, includeTotal } = paging;
+
+  if (!terms.length && !near) {
+    const [field] = Object.keys(sort);
+    const keyset = keysetSort(field, sort[field]);
+    const projection = withSortFields(select, keyset);
+
+    const cached = await queryAgencyCatalog(Model, {
+      filter: applyCursor(filter, cursor, keyset),
+      sort: keyset,
+      limit: limit + 1,
+      select: projection,
+    });
+    if (cached) {
+      const page = toCursorPage(cached.docs, limit, keyset);
+      if (includeTotal) {
+        const all = await queryAgencyCatalog(Model, { filter, limit: 0 });
+        page.pagination.total = all
+          ? all.total
+          : await cachedCount(Model, filter);
+      }
+      return page;
+    }
+
+    return findCursorPage(Model, filter, {
+      sort: keyset,
+      limit,
+      cursor,
+      includeTotal,
+      decorate: (query) =>
+        projection ? query.select(projection).lean() : query.lean(),
+    });
+  }
+
+  const offset = cursor?.offset || 0;
+  const [[docs], total] = await Promise.all([
+    findProperties(Model, {
+      filter,
+      terms,
+      sort,
+      skip: offset,
+      limit: limit + 1,
+      count: false,
+      select,
+      near,
+    }),
+    includeTotal ? cachedCount(Model, filter) : undefined,
+  ]);
+
+  const hasMore = docs.length > limit;
+  const pagination = {
+    limit,
+    hasMore,
+    nextCursor: hasMore ? encodeOffsetCursor(offset + limit) : null,
+  };
+  if (total !== undefined) pagination.total = total;
+
+  return { data: hasMore ? docs.slice(0, limit) : docs, pagination };
+};
@@ -0,0 +1,141 @@
+import mongoose from "mongoose";
+import { PropertyShare } from "../models/Agent/PropertyShareModel.js";
+import {
+  applyCursor,
+  encodeOffsetCursor,
+  keysetSort,
+  toCursorPage,
+} from "./pagination.js";
+import {
+  toAggregateProjection,
+  withSortFields,
+} from "./propertyProjections.js";
+import { rankStages } from "./propertySearch.js";
+
+// Listings scoped to the properties shared with one customer.
+// Instead of loading every PropertyShare and querying properties with a
+// huge `_id: { $in }`, the aggregation starts from the customer's shares
+// (index `sharedWithUserId, createdAt, propertyId`) and joins the matching
+// properties with `$lookup`, so filters, ranking, sorting and paging all run
+// inside one database query.
+
+const invalidCustomerError = () => {
+  const error = new Error("Invalid customerId");
+  error.statusCode = 400;
+  return error;
+};
+
+/**
+ * Scope for the properties shared with `customerId`: the model the
+ * aggregation runs on and the stages that emit the shared properties
+ * matching a (cast) property `$match`.
+ */
+export const shareScope = (customerId) => {
+  if (!mongoose.Types.ObjectId.isValid(customerId)) {
+    throw invalidCustomerError();
+  }
+  const sharedWithUserId = new mongoose.Types.ObjectId(customerId);
+
+  return {
+    Model: PropertyShare,
+    stages: (Model, match) => [
+      { $match: { sharedWithUserId } },
+      // A property shared twice is listed once
+      { $group: { _id: "$propertyId" } },
+      {
+        $lookup: {
+          from: Model.collection.name,
+          localField: "_id",
+          foreignField: "_id",
+          pipeline: [{ $match: match }],
+          as: "property",
+        },
+      },
+      { $unwind: "$property" },
+      { $replaceWith: "$property" },
+    ],
+  };
+};
+
+// Aggregation $match does not cast, so cast through the schema first
+const castMatch = (Model, filter) => Model.find(filter).cast(Model);
+
+/**
+ * Paged listing inside a scope (see `shareScope`), with optional ranked
+ * search. Plain listings use keyset cursors on `sort`, ranked search pages
+ * by offset, like `findPropertyCursorPage`.
+ *
+ * @returns {Promise<{ data: Array, pagination: object }>}
+ */
+export const findScopedProperties = async (
+  Model,
+  scope,
+  {
+    filter = {},
+    terms = [],
+    sort = { createdAt: -1 },
+    paging,
+    select = null,
+  }
+) => {
+  const [field] = Object.keys(sort);
+  const keyset = keysetSort(field, sort[field]);
+  const keysetMode = paging.cursorMode && !terms.length;
+  const skip = paging.cursorMode ? paging.cursor?.offset || 0 : paging.skip;
+
+  const source = (match) => scope.stages(Model, castMatch(Model, match));
+  const ordering = terms.length ? rankStages(terms, sort) : [{ $sort: keyset }];
+  const pageStages = [
+    ...ordering,
+    ...(keysetMode ? [] : [{ $skip: skip }]),
+    { $limit: paging.cursorMode ? paging.limit + 1 : paging.limit },
+    { $project: toAggregateProjection(withSortFields(select, keyset)) },
+  ];
+
+  // 🔹 Keyset pages filter past the cursor, so the total is counted apart
+  if (keysetMode) {
+    const [docs, counted] = await Promise.all([
+      scope.Model.aggregate([
+        ...source(applyCursor(filter, paging.cursor, keyset)),
+        ...pageStages,
+      ]),
+      paging.includeTotal
+        ? scope.Model.aggregate([...source(filter), { $count: "count" }])
+        : undefined,
+    ]);
+    const page = toCursorPage(docs, paging.limit, keyset);
+    if (counted) page.pagination.total = counted[0]?.count || 0;
+    return page;
+  }
+
+  // 🔹 Page and total in one round trip
+  const [result] = await scope.Model.aggregate([
+    ...source(filter),
+    { $facet: { data: pageStages, total: [{ $count: "count" }] } },
+  ]);
+  const total = result.total[0]?.count || 0;
+
+  if (!paging.cursorMode) {
+    return {
+      data: result.data,
+      pagination: {
+        total,
+        page: paging.page,
+        pages: Math.ceil(total / paging.limit),
+        limit: paging.limit,
+      },
+    };
+  }
+
+  const hasMore = result.data.length > paging.limit;
+  const pagination = {
+    limit: paging.limit,
+    hasMore,
+    nextCursor: hasMore ? encodeOffsetCursor(skip + paging.limit) : null,
+  };
+  if (paging.includeTotal) pagination.total = total;
+  return {
+    data: hasMore ? result.data.slice(0, paging.limit) : result.data,
+    pagination,
+  };
+};
@@ -0,0 +1,145 @@
+import dns from "dns";
+import http from "http";
+import https from "https";
+import net from "net";
+
+// Downloads of user-supplied URLs (e.g. images referenced by an import).
+// Only hosts on the public internet are reachable: every hostname is
+// resolved through `publicLookup`, which the socket then connects to, so a
+// name cannot be re-pointed at an internal address between check and use;
+// IP literals are checked directly. Redirects are followed by hand, each
+// hop checked the same way, and the body is read as a stream that is cut
+// off once it passes `maxBytes`.
+
+const BLOCKED = new net.BlockList();
+[
+  ["0.0.0.0", 8],
+  ["10.0.0.0", 8],
+  ["100.64.0.0", 10],
+  ["127.0.0.0", 8],
+  ["169.254.0.0", 16],
+  ["172.16.0.0", 12],
+  ["192.0.0.0", 24],
+  ["192.168.0.0", 16],
+  ["198.18.0.0", 15],
+  ["224.0.0.0", 4],
+  ["240.0.0.0", 4],
+].forEach(([address, prefix]) => BLOCKED.addSubnet(address, prefix, "ipv4"));
+[
+  ["::", 128],
+  ["::1", 128],
+  ["64:ff9b::", 96],
+  ["fc00::", 7],
+  ["fe80::", 10],
+  ["ff00::", 8],
+].forEach(([address, prefix]) => BLOCKED.addSubnet(address, prefix, "ipv6"));
+
+const blockedError = (host) =>
+  Object.assign(new Error(`${host} is not a public address`), {
+    code: "EBLOCKED",
+  });
+
+export const isPublicAddress = (address) => {
+  // IPv4-mapped IPv6 (::ffff:127.0.0.1) is judged by its IPv4 part
+  const mapped = /^::ffff:(\d+\.\d+\.\d+\.\d+)$/i.exec(address);
+  if (mapped) return isPublicAddress(mapped[1]);
+  const family = net.isIP(address);
+  if (!family) return false;
+  return !BLOCKED.check(address, family === 4 ? "ipv4" : "ipv6");
+};
+
+// dns.lookup that fails for names resolving to any non-public address
+const publicLookup = (hostname, options, callback) => {
+  dns.lookup(hostname, options, (error, address, family) => {
+    if (error) {
+      callback(error);
+    } else if (
+      (Array.isArray(address) ? address : [{ address }]).some(
+        (entry) => !isPublicAddress(entry.address)
+      )
+    ) {
+      callback(blockedError(hostname));
+    } else {
+      callback(null, address, family);
+    }
+  });
+};
+
+const get = (url, options, redirectsLeft) =>
+  new Promise((resolve, reject) => {
+    const target = new URL(url);
+    if (target.protocol !== "http:" && target.protocol !== "https:") {
+      reject(new Error(`Unsupported URL protocol ${target.protocol}`));
+      return;
+    }
+    const host = target.hostname.replace(/^\[|\]$/g, "");
+    if (net.isIP(host) && !isPublicAddress(host)) {
+      reject(blockedError(host));
+      return;
+    }
+
+    const client = target.protocol === "https:" ? https : http;
+    const request = client.get(
+      target,
+      { lookup: publicLookup, signal: options.signal },
+      (response) => {
+        const { statusCode, headers } = response;
+        if (statusCode >= 300 && statusCode < 400 && headers.location) {
+          response.resume();
+          if (!redirectsLeft) {
+            reject(new Error("Too many redirects"));
+          } else {
+            const next = new URL(headers.location, target).href;
+            resolve(get(next, options, redirectsLeft - 1));
+          }
+          return;
+        }
+
+        const type = headers["content-type"] || "";
+        if (statusCode !== 200 || !type.startsWith(options.type)) {
+          response.resume();
+          reject(new Error(`HTTP ${statusCode} (${type || "no type"})`));
+          return;
+        }
+        const tooLarge = () => new Error("File too large");
+        if (Number(headers["content-length"]) > options.maxBytes) {
+          response.destroy();
+          reject(tooLarge());
+          return;
+        }
+
+        const chunks = [];
+        let size = 0;
+        response.on("data", (chunk) => {
+          size += chunk.length;
+          if (size > options.maxBytes) {
+            response.destroy();
+            reject(tooLarge());
+          } else {
+            chunks.push(chunk);
+          }
+        });
+        response.on("end", () => resolve(Buffer.concat(chunks)));
+        response.on("error", reject);
+      }
+    );
+    request.on("error", reject);
+  });
+
+/**
+ * Download `url` from a public host into a Buffer.
+ * @param {object} options
+ * @param {number} options.maxBytes - body size limit
+ * @param {number} options.timeoutMs - limit for the whole download
+ * @param {string} [options.type] - required Content-Type prefix
+ * @param {number} [options.maxRedirects]
+ */
+export const downloadPublicFile = (
+  url,
+  { maxBytes, timeoutMs, type = "", maxRedirects = 3 }
+) =>
+  get(
+    url,
+    { maxBytes, type, signal: AbortSignal.timeout(timeoutMs) },
+    maxRedirects
+  );
@@ -0,0 +1,96 @@
+import cluster from "cluster";
+
+// Pub/sub between the API processes, for in-process state that must follow
+// writes made by any of them (e.g. property catalog cache invalidations).
+// `publish` delivers to the subscribers of this process synchronously and
+// hands the message to a backend for the other processes:
+// - local: one process, nothing to forward (default)
+// - ipc: cluster workers; the primary relays to the other workers (see
+//   setupPubSubPrimary, wired in cluster.js)
+// Another transport (e.g. Redis for several hosts) plugs in with
+// `usePubSubBackend({ send, listen })`.
+
+const MESSAGE_TAG = "pubsub:message";
+
+const subscribers = new Map(); // channel -> Set of handlers
+
+const deliver = (channel, payload) => {
+  (subscribers.get(channel) || []).forEach((handler) => {
+    try {
+      handler(payload);
+    } catch (error) {
+      console.error(`❌ Pub/sub handler for ${channel} failed:`, error);
+    }
+  });
+};
+
+export const localBackend = {
+  send: () => {},
+  listen: () => {},
+};
+
+export const ipcBackend = {
+  send: (message) => {
+    if (process.connected) process.send({ [MESSAGE_TAG]: message });
+  },
+  listen: (onMessage) => {
+    process.on("message", (data) => {
+      if (data?.[MESSAGE_TAG]) onMessage(data[MESSAGE_TAG]);
+    });
+  },
+};
+
+let backend = null;
+
+/**
+ * Route messages for other processes through `next` ({ send, listen }).
+ * `listen(onMessage)` is called once with the delivery callback.
+ */
+export const usePubSubBackend = (next) => {
+  backend = next;
+  backend.listen(({ channel, payload }) => deliver(channel, payload));
+};
+
+const currentBackend = () => {
+  if (!backend) {
+    usePubSubBackend(
+      process.env.PUBSUB_BACKEND === "local" || !cluster.isWorker
+        ? localBackend
+        : ipcBackend
+    );
+  }
+  return backend;
+};
+
+/**
+ * Call `handler(payload)` for every message published on `channel`, by this
+ * process or another one.
+ * @returns {Function} unsubscribe
+ */
+export const subscribe = (channel, handler) => {
+  currentBackend();
+  if (!subscribers.has(channel)) subscribers.set(channel, new Set());
+  subscribers.get(channel).add(handler);
+  return () => subscribers.get(channel).delete(handler);
+};
+
+export const publish = (channel, payload) => {
+  deliver(channel, payload);
+  try {
+    currentBackend().send({ channel, payload });
+  } catch (error) {
+    console.error(`❌ Publishing on ${channel} failed:`, error);
+  }
+};
+
+// Cluster primary: relay each worker's messages to the other workers
+export const setupPubSubPrimary = () => {
+  cluster.on("message", (sender, data) => {
+    if (!data?.[MESSAGE_TAG]) return;
+    Object.values(cluster.workers).forEach((worker) => {
+      if (worker && worker !== sender && worker.isConnected()) {
+        worker.send(data);
+      }
+    });
+  });
+};
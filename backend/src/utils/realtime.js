@@ -0,0 +1,202 @@
+import cluster from "cluster";
+import { Server } from "socket.io";
+import { createAdapter } from "@socket.io/cluster-adapter";
+import { setupWorker } from "@socket.io/sticky";
+import { Conversation } from "../models/Agent/ConversationsModel.js";
+import { authenticateToken } from "../middleware/authMiddleware.js";
+
+// Real-time messaging channel.
+// Sockets authenticate at the handshake with the same JWT as the API and
+// are put in their user's (`user:<id>`) and agency's (`agency:<id>`) rooms;
+// they join one room per open thread (`conversation:<id>`) they take part
+// in. Controllers publish what a write changed - the persisted message, the
+// conversation's new metadata and unread counts - and clients apply it
+// locally instead of refetching the thread and the conversation list.
+// Under cluster.js every worker runs its own server: connections arrive
+// through the primary's sticky routing and the cluster adapter relays room
+// broadcasts, so an event reaches its room members on any worker.
+
+let io = null;
+
+// Conversation fields a `message:new` delta carries
+export const CONVERSATION_DELTA_FIELDS =
+  "participants lastMessage lastMessageAt unreadCount";
+
+export const conversationRoom = (conversationId) =>
+  `conversation:${conversationId}`;
+export const userRoom = (userId) => `user:${userId}`;
+export const agencyRoom = (agencyId) => `agency:${agencyId}`;
+
+const isId = (value) =>
+  typeof value === "string" && /^[a-f\d]{24}$/i.test(value);
+
+const handshakeToken = ({ auth, headers }) => {
+  if (auth?.token) return auth.token;
+  const header = headers.authorization || "";
+  return header.startsWith("Bearer ") ? header.split(" ")[1] : null;
+};
+
+// Handshake: the token's user (as `protect` loads it) or a connect_error
+// carrying `forceLogout` for removed accounts
+const authenticateSocket = async (socket, next) => {
+  try {
+    const token = handshakeToken(socket.handshake);
+    if (!token) throw new Error("Not authorized, no token provided");
+    const user = await authenticateToken(token);
+    const agencyId = user.agencyId?._id ?? user.agencyId;
+    socket.data.user = {
+      _id: String(user._id),
+      role: user.role,
+      agencyId: agencyId ? String(agencyId) : null,
+    };
+    next();
+  } catch (error) {
+    const refused = new Error(error.message);
+    refused.data = { forceLogout: Boolean(error.forceLogout) };
+    next(refused);
+  }
+};
+
+/**
+ * Attach the Socket.IO server to `server` and register the room handlers.
+ * `handlers` are called with every authenticated socket to add their own
+ * events (e.g. live counters).
+ * @returns {Server}
+ */
+export const initRealtime = (server, { handlers = [] } = {}) => {
+  io = new Server(server, {
+    cors: {
+      origin: process.env.FRONTEND_URL,
+      methods: ["GET", "POST"],
+      credentials: true,
+    },
+    ...(cluster.isWorker ? { adapter: createAdapter() } : {}),
+  });
+  // Connections are handed over by the primary (see cluster.js)
+  if (cluster.isWorker) setupWorker(io);
+
+  io.use(authenticateSocket);
+
+  io.on("connection", (socket) => {
+    const { user } = socket.data;
+    // Rooms carry message bodies: never serve a socket without a user
+    if (!user?._id) {
+      socket.disconnect(true);
+      return;
+    }
+    console.log("User connected:", socket.id);
+
+    socket.join(userRoom(user._id));
+    if (user.agencyId) socket.join(agencyRoom(user.agencyId));
+
+    // join conversation room; only participants, only the joining socket
+    // is acknowledged
+    socket.on("join_conversation", async (conversationId) => {
+      if (!isId(conversationId)) return;
+      try {
+        const member = await Conversation.exists({
+          _id: conversationId,
+          participants: user._id,
+        });
+        if (!member) return;
+        socket.join(conversationRoom(conversationId));
+        socket.emit("joined", conversationId);
+      } catch (error) {
+        console.error("❌ Joining conversation failed:", error);
+      }
+    });
+
+    socket.on("leave_conversation", (conversationId) => {
+      if (!isId(conversationId)) return;
+      socket.leave(conversationRoom(conversationId));
+    });
+
+    handlers.forEach((handler) => handler(socket));
+
+    socket.on("disconnect", () => {
+      console.log("User disconnected:", socket.id);
+    });
+  });
+
+  return io;
+};
+
+// Whether this process serves sockets (false in scripts)
+export const hasRealtime = () => Boolean(io);
+
+// Send `event` to every socket of `userId`
+export const emitToUser = (userId, event, payload) => {
+  if (!io) return;
+  io.to(userRoom(userId)).emit(event, payload);
+};
+
+// Disconnect every client and close the HTTP server
+export const closeRealtime = () =>
+  new Promise((resolve) => {
+    if (!io) {
+      resolve();
+      return;
+    }
+    // A sticky worker's server never listened; its close error is expected
+    io.close(() => resolve());
+  });
+
+// Rooms of a conversation: its open threads and every participant
+const conversationAudience = (conversationId, participants = []) => [
+  conversationRoom(conversationId),
+  ...participants.map((id) => userRoom(id)),
+];
+
+// Socket.IO sends a socket in several of the rooms the event only once
+const publish = (rooms, event, payload) => {
+  if (!io) return;
+  try {
+    io.to(rooms).emit(event, payload);
+  } catch (error) {
+    console.error(`❌ Publishing ${event} failed:`, error);
+  }
+};
+
+/**
+ * Publish a persisted message to the conversation's rooms.
+ * @param {object} conversation updated conversation (`_id`, `participants`,
+ *   `lastMessage`, `lastMessageAt`, `unreadCount`)
+ * @param {object} message the stored message
+ */
+export const publishMessage = (conversation, message) => {
+  const unreadCount =
+    conversation.unreadCount instanceof Map
+      ? Object.fromEntries(conversation.unreadCount)
+      : conversation.unreadCount || {};
+
+  publish(
+    conversationAudience(conversation._id, conversation.participants),
+    "message:new",
+    {
+      conversationId: String(conversation._id),
+      message,
+      conversation: {
+        _id: String(conversation._id),
+        lastMessage: conversation.lastMessage,
+        lastMessageAt: conversation.lastMessageAt,
+        unreadCount,
+      },
+    }
+  );
+};
+
+/**
+ * Publish that `userId` read a conversation: their unread count is 0 and
+ * the messages they received up to `readAt` are read.
+ */
+export const publishConversationRead = (conversation, userId, readAt) => {
+  publish(
+    conversationAudience(conversation._id, conversation.participants),
+    "conversation:read",
+    {
+      conversationId: String(conversation._id),
+      userId: String(userId),
+      readAt,
+    }
+  );
+};
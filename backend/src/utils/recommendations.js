@@ -0,0 +1,361 @@
+import { Recommendation } from "../models/Customer/RecommendationModel.js";
+import { Preference } from "../models/Common/PreferenceModel.js";
+import { PropertyFeedback } from "../models/Common/PropertyFeedbackModel.js";
+import { Property } from "../models/Agent/PropertyModel.js";
+import { PropertyShare } from "../models/Agent/PropertyShareModel.js";
+import { Customer } from "../models/Agent/CustomerModel.js";
+import {
+  PROPERTY_MATCH_FIELDS,
+  scorePreferenceMatch,
+} from "./preferenceMatching.js";
+import { PROPERTY_PROJECTIONS } from "./propertyProjections.js";
+
+// "Best matches for me": every listing a customer can see is scored against
+// their Preference and their like/dislike history, and the top N are stored
+// in one Recommendation document per customer. Reads serve that document;
+// scoring happens when inputs change:
+// - preferences or feedback change -> the customer's list is recomputed
+// - a listing is saved -> it is re-scored into the agency's stored lists
+// - a listing leaves a list (deleted, unshared, scored lower) or many change
+//   at once (imports) -> the list is marked stale and recomputed on next read
+
+export const RECOMMENDATION_LIMIT =
+  Number(process.env.RECOMMENDATION_LIMIT) || 20;
+
+// Listing fields that change its recommendation score (the matching ones)
+export const PROPERTY_RECOMMENDATION_FIELDS = PROPERTY_MATCH_FIELDS;
+
+const SCORE_FIELDS = ["agencyId", ...PROPERTY_RECOMMENDATION_FIELDS].join(" ");
+const PREFERENCE_FIELDS =
+  "userId type category bedrooms bathrooms furnishing facing reraStatus " +
+  "amenities features minPrice maxPrice";
+
+const BATCH_SIZE = 500;
+// Score points per unit of feedback affinity, and the cap either way
+const AFFINITY_POINTS = 10;
+const MAX_AFFINITY_BONUS = 30;
+
+// 🔹 Scoring
+
+// Traits a liked or disliked listing passes on to similar listings
+const traitsOf = (property) => {
+  const traits = [
+    property.type && `type:${property.type}`,
+    property.category && `category:${property.category}`,
+    property.bedrooms > 0 && `bedrooms:${Math.min(property.bedrooms, 5)}`,
+    property.furnishing && `furnishing:${property.furnishing}`,
+    // Price band: listings within about a factor of two share one
+    property.price > 0 && `price:${Math.round(Math.log2(property.price))}`,
+    ...(property.amenities || []).map((item) => `amenity:${item}`),
+    ...(property.features || []).map((item) => `feature:${item}`),
+  ];
+  // Stored as object keys, which may not contain "." or "$"
+  return traits
+    .filter(Boolean)
+    .map((trait) => trait.toLowerCase().replace(/[.$]/g, "_"));
+};
+
+/**
+ * Feedback profile of a customer: each trait of a liked listing adds 1 and
+ * of a disliked one subtracts 1, averaged over the feedback given.
+ * @param {Array} feedbacks feedback with `propertyId` populated
+ */
+export const buildFeedbackProfile = (feedbacks) => {
+  const terms = {};
+  const seen = [];
+  const rated = feedbacks.filter(({ propertyId }) => propertyId?._id);
+
+  rated.forEach(({ propertyId: property, liked }) => {
+    seen.push(property._id);
+    traitsOf(property).forEach((trait) => {
+      terms[trait] = (terms[trait] || 0) + (liked ? 1 : -1);
+    });
+  });
+  Object.keys(terms).forEach((trait) => {
+    terms[trait] = Number((terms[trait] / rated.length).toFixed(3));
+    if (!terms[trait]) delete terms[trait];
+  });
+  return { terms, seen };
+};
+
+/**
+ * Recommendation score (0-100) of a listing for one customer: the
+ * preference score (50 without preferences) moved up or down by how much
+ * the listing resembles the ones they liked or disliked.
+ *
+ * @returns {{ score: number, reasons: string[] }}
+ */
+export const scoreRecommendation = (preference, profile, property) => {
+  const base = preference
+    ? scorePreferenceMatch(preference, property)
+    : { score: 50, reasons: [] };
+
+  const terms = profile?.terms || {};
+  const affinity = traitsOf(property).reduce(
+    (total, trait) => total + (terms[trait] || 0),
+    0
+  );
+  const bonus = Math.max(
+    -MAX_AFFINITY_BONUS,
+    Math.min(MAX_AFFINITY_BONUS, Math.round(affinity * AFFINITY_POINTS))
+  );
+
+  const reasons = [...base.reasons];
+  if (bonus > 0) reasons.push("similar to properties you liked");
+  return {
+    score: Math.max(0, Math.min(100, base.score + bonus)),
+    reasons,
+  };
+};
+
+// Insert into a best-first list capped at `limit`
+const insertRanked = (items, item, limit = RECOMMENDATION_LIMIT) => {
+  const index = items.findIndex(({ score }) => score < item.score);
+  const ranked = [...items];
+  ranked.splice(index === -1 ? ranked.length : index, 0, item);
+  return ranked.slice(0, limit);
+};
+
+const toItem = (property, { score, reasons }) => ({
+  propertyId: property._id,
+  score,
+  reasons,
+});
+
+// 🔹 Full refresh (one customer)
+
+// Listings the customer can see: the agency catalog or their shares
+const candidateFilter = async (customer) => {
+  if (customer.showAllProperty) return { agencyId: customer.agencyId };
+  const shared = await PropertyShare.distinct("propertyId", {
+    sharedWithUserId: customer._id,
+  });
+  return { _id: { $in: shared }, agencyId: customer.agencyId };
+};
+
+/**
+ * Recompute and store the recommendations of `customerId`.
+ * @returns {Promise<object|null>} the stored document (null if no customer)
+ */
+export const refreshCustomerRecommendations = async (customerId) => {
+  const customer = await Customer.findById(customerId)
+    .select("agencyId showAllProperty isDeleted")
+    .lean();
+  if (!customer?.agencyId || customer.isDeleted) {
+    await Recommendation.deleteOne({ customerId });
+    return null;
+  }
+
+  const [preference, feedbacks] = await Promise.all([
+    Preference.findOne({ userId: customerId })
+      .select(PREFERENCE_FIELDS)
+      .lean(),
+    PropertyFeedback.find({ userId: customerId })
+      .select("propertyId liked")
+      .populate("propertyId", SCORE_FIELDS)
+      .lean(),
+  ]);
+  const profile = buildFeedbackProfile(feedbacks);
+  const seen = new Set(profile.seen.map(String));
+
+  let items = [];
+  const cursor = Property.find(await candidateFilter(customer))
+    .select(SCORE_FIELDS)
+    .lean()
+    .cursor({ batchSize: BATCH_SIZE });
+  for await (const property of cursor) {
+    if (seen.has(String(property._id))) continue;
+    const scored = scoreRecommendation(preference, profile, property);
+    const last = items[RECOMMENDATION_LIMIT - 1];
+    if (!last || scored.score > last.score) {
+      items = insertRanked(items, toItem(property, scored));
+    }
+  }
+
+  return Recommendation.findOneAndUpdate(
+    { customerId },
+    {
+      $set: {
+        agencyId: customer.agencyId,
+        items,
+        profile,
+        stale: false,
+        refreshedAt: new Date(),
+      },
+    },
+    { new: true, upsert: true, setDefaultsOnInsert: true }
+  ).lean();
+};
+
+// 🔹 Incremental updates
+
+/**
+ * Re-score a saved listing into the stored lists of its agency's customers
+ * (only customers who have a list; others get one on first read).
+ */
+export const updatePropertyRecommendations = async (property) => {
+  if (!property?.agencyId) return;
+
+  const [browsers, sharedWith] = await Promise.all([
+    Customer.distinct("_id", {
+      agencyId: property.agencyId,
+      showAllProperty: true,
+      isDeleted: { $ne: true },
+    }),
+    PropertyShare.distinct("sharedWithUserId", { propertyId: property._id }),
+  ]);
+  const visibleTo = new Set([...browsers, ...sharedWith].map(String));
+  const propertyId = String(property._id);
+
+  const applyBatch = async (lists) => {
+    const preferences = await Preference.find({
+      userId: { $in: lists.map(({ customerId }) => customerId) },
+    })
+      .select(PREFERENCE_FIELDS)
+      .lean();
+    const byCustomer = new Map(
+      preferences.map((preference) => [String(preference.userId), preference])
+    );
+
+    const operations = [];
+    lists.forEach(({ _id, customerId, items, profile }) => {
+      const previous = items.find(
+        (item) => String(item.propertyId) === propertyId
+      );
+      let next = items.filter((item) => item !== previous);
+      let current = null;
+
+      const visible = visibleTo.has(String(customerId));
+      const seen = (profile?.seen || []).some(
+        (id) => String(id) === propertyId
+      );
+      if (visible && !seen) {
+        const scored = scoreRecommendation(
+          byCustomer.get(String(customerId)),
+          profile,
+          property
+        );
+        const last = next[RECOMMENDATION_LIMIT - 1];
+        if (!last || scored.score > last.score) {
+          current = toItem(property, scored);
+          next = insertRanked(next, current);
+        }
+      }
+      if (!previous && !current) return;
+
+      // A listing that left or dropped may have a better unstored successor
+      const stale = Boolean(
+        previous && (!current || current.score < previous.score)
+      );
+      operations.push({
+        updateOne: {
+          filter: { _id },
+          update: { $set: { items: next, ...(stale ? { stale } : {}) } },
+        },
+      });
+    });
+
+    if (operations.length) {
+      await Recommendation.bulkWrite(operations, { ordered: false });
+    }
+  };
+
+  const cursor = Recommendation.find({ agencyId: property.agencyId })
+    .select("customerId items profile")
+    .lean()
+    .cursor({ batchSize: BATCH_SIZE });
+  let batch = [];
+  for await (const list of cursor) {
+    batch.push(list);
+    if (batch.length >= BATCH_SIZE) {
+      await applyBatch(batch);
+      batch = [];
+    }
+  }
+  if (batch.length) await applyBatch(batch);
+};
+
+// Drop a deleted listing from every stored list
+export const removePropertyRecommendations = (propertyId) =>
+  Recommendation.updateMany(
+    { "items.propertyId": propertyId },
+    { $pull: { items: { propertyId } }, $set: { stale: true } }
+  );
+
+/**
+ * Mark lists for recomputation on their next read, e.g.
+ * `{ customerId }` after a share change or `{ agencyId }` after an import.
+ */
+export const invalidateRecommendations = (filter) =>
+  Recommendation.updateMany(filter, { $set: { stale: true } });
+
+// Background variants for request handlers: never throw
+const inBackground =
+  (task, label) =>
+  (...args) => {
+    Promise.resolve()
+      .then(() => task(...args))
+      .catch((error) =>
+        console.error(`❌ Recommendations (${label}) failed:`, error)
+      );
+  };
+
+export const refreshRecommendationsInBackground = inBackground(
+  refreshCustomerRecommendations,
+  "refresh"
+);
+export const updatePropertyRecommendationsInBackground = inBackground(
+  updatePropertyRecommendations,
+  "listing update"
+);
+export const removePropertyRecommendationsInBackground = inBackground(
+  removePropertyRecommendations,
+  "listing removal"
+);
+export const invalidateRecommendationsInBackground = inBackground(
+  invalidateRecommendations,
+  "invalidate"
+);
+
+// 🔹 Read
+
+/**
+ * The stored recommendations of a customer with card fields, best first.
+ * Computed on first use; stale lists are served and refreshed behind.
+ */
+export const getCustomerRecommendations = async (
+  customerId,
+  { limit = RECOMMENDATION_LIMIT } = {}
+) => {
+  let list = await Recommendation.findOne({ customerId })
+    .select("items stale refreshedAt")
+    .lean();
+  if (!list) {
+    list = await refreshCustomerRecommendations(customerId);
+  } else if (list.stale) {
+    refreshRecommendationsInBackground(customerId);
+  }
+
+  const items = (list?.items || []).slice(0, limit);
+  if (!items.length) return { items: [], refreshedAt: list?.refreshedAt };
+
+  const properties = await Property.find({
+    _id: { $in: items.map(({ propertyId }) => propertyId) },
+  })
+    .select(PROPERTY_PROJECTIONS.card)
+    .lean();
+  const byId = new Map(
+    properties.map((property) => [String(property._id), property])
+  );
+
+  return {
+    items: items
+      .filter(({ propertyId }) => byId.has(String(propertyId)))
+      .map(({ propertyId, score, reasons }) => ({
+        property: byId.get(String(propertyId)),
+        score,
+        reasons,
+      })),
+    refreshedAt: list.refreshedAt,
+  };
+};
@@ -0,0 +1,117 @@
+import { Conversation } from "../models/Agent/ConversationsModel.js";
+import { Message } from "../models/Agent/MessagesModel.js";
+import { Property } from "../models/Agent/PropertyModel.js";
+import { Notification } from "../models/Common/NotificationModel.js";
+
+// Precompiled JSON serializers for the hot read endpoints.
+// A serializer is compiled once per Mongoose schema into a list of
+// type-specific field writers with their `"key":` prefixes prebuilt, so lean
+// documents are written straight to a string instead of JSON.stringify
+// walking and type-checking every value. Keys a document has beyond its
+// schema (added by a controller or an aggregation) follow, written with
+// JSON.stringify.
+
+const stringify = JSON.stringify;
+
+const WRITERS = {
+  String: stringify,
+  // Lean values are not cast: legacy strings, Decimal128 or Long are
+  // written as JSON.stringify would
+  Number: (v) => {
+    if (typeof v !== "number") return stringify(v);
+    return Number.isFinite(v) ? String(v) : "null";
+  },
+  Boolean: (v) => (typeof v === "boolean" ? String(v) : stringify(v)),
+  Date: (v) => {
+    if (!(v instanceof Date)) return stringify(v);
+    return Number.isNaN(v.getTime()) ? "null" : `"${v.toISOString()}"`;
+  },
+  // Populated refs are plain objects and fall through to JSON.stringify
+  ObjectId: (v) =>
+    typeof v.toHexString === "function" ? `"${v.toHexString()}"` : stringify(v),
+};
+
+// Top-level fields of a schema with the instance type used to write them
+// (null for `select: false` paths, which are never written); nested
+// objects, arrays and maps are written with JSON.stringify
+const schemaFields = (schema) => {
+  const fields = new Map();
+  schema.eachPath((path, type) => {
+    const [root] = path.split(".");
+    if (type.options?.select === false) fields.set(root, null);
+    else fields.set(root, root === path ? type.instance : "Mixed");
+  });
+  return fields;
+};
+
+/**
+ * Compile a `(doc) => string` serializer for lean documents of `schema`.
+ * Schema paths are written first with their typed writer, then any other
+ * own key of the document as JSON.stringify would write it; `select: false`
+ * paths are left out. Hydrated documents are passed through their own
+ * `toJSON`.
+ */
+export const compileSerializer = (schema) => {
+  const fields = schemaFields(schema);
+
+  const writers = [...fields]
+    .filter(([, instance]) => instance !== null)
+    .map(([key, instance]) => ({
+      key,
+      prefix: `${stringify(key)}:`,
+      write: WRITERS[instance] || stringify,
+    }));
+
+  return (doc) => {
+    if (typeof doc?.toJSON === "function") return stringify(doc);
+
+    let out = "";
+    let written = 0;
+    for (const { key, prefix, write } of writers) {
+      const value = doc[key];
+      if (value === undefined) continue;
+      out += `${out ? "," : ""}${prefix}${value === null ? "null" : write(value)}`;
+      written += 1;
+    }
+
+    // Keys outside the schema; only looked for when the document has more
+    // keys than were written
+    const keys = Object.keys(doc);
+    if (keys.length > written) {
+      for (const key of keys) {
+        if (fields.has(key)) continue;
+        const json = stringify(doc[key]);
+        if (json === undefined) continue;
+        out += `${out ? "," : ""}${stringify(key)}:${json}`;
+      }
+    }
+    return `{${out}}`;
+  };
+};
+
+// Serializer for an array of documents
+export const listOf = (serialize) => (docs) =>
+  `[${docs.map(serialize).join(",")}]`;
+
+export const serializeProperties = listOf(compileSerializer(Property.schema));
+export const serializeMessages = listOf(compileSerializer(Message.schema));
+export const serializeConversations = listOf(
+  compileSerializer(Conversation.schema)
+);
+export const serializeNotifications = listOf(
+  compileSerializer(Notification.schema)
+);
+
+/**
+ * Send a JSON response, writing the keys listed in `serializers` with their
+ * precompiled serializer and everything else with JSON.stringify.
+ */
+export const sendSerialized = (res, status, body, serializers = {}) => {
+  let out = "";
+  for (const [key, value] of Object.entries(body)) {
+    if (value === undefined) continue;
+    const serialize = value === null ? undefined : serializers[key];
+    out += `,${stringify(key)}:${serialize ? serialize(value) : stringify(value)}`;
+  }
+  return res.status(status).type("json").send(`{${out.slice(1)}}`);
+};
@@ -1,5 +1,5 @@
 "use client";
-import React, { Fragment, useEffect, useState } from "react";
+import React, { Fragment } from "react";
 import { Menu, Transition } from "@headlessui/react";
 import Link from "next/link";
 import {
@@ -11,8 +11,7 @@ import {
 import { useAuth } from "@/context/AuthContext";
 import { NotificationCenter } from "./NotificationHeaderModal";
 import InstallButton from "@/components/Common/InstallButton";
-import { getUnreadNotificationsCount } from "@/lib/Common/Notifications";
-import { showErrorToast } from "@/utils/toastHandler";
+import { useLiveCounters } from "@/hooks/useLiveCounters";
 import { getInitial } from "@/helper/getInitialForProfile";
 
 interface HeaderProps {
@@ -23,19 +22,10 @@ export const AgentHeader: React.FC<HeaderProps> = ({ onMenuButtonClick }) => {
   const { user, signOut } = useAuth();
   const [showNotifications, setShowNotifications] =
     React.useState<boolean>(false);
-  const [unreadCount, setUnreadCount] = useState(0);
-  useEffect(() => {
-    fetchUnreadCount();
-  }, []);
-  const fetchUnreadCount = async () => {
-    try {
-      if (!user?._id) return;
-      const res = await getUnreadNotificationsCount();
-      setUnreadCount(res.data);
-    } catch (err) {
-      showErrorToast("Error", err);
-    }
-  };
+  // Pushed by the server as notifications arrive or are read
+  const { unreadNotifications: unreadCount } = useLiveCounters(
+    Boolean(user?._id)
+  );
 
   return (
     <>
@@ -18,6 +18,7 @@ import {
   BellIcon,
 } from "@heroicons/react/24/outline";
 import { useAuth } from "@/context/AuthContext";
+import { useLiveCounters } from "@/hooks/useLiveCounters";
 
 const navigation = [
   { name: "Dashboard", href: "/agent/dashboard", icon: HomeIcon },
@@ -43,6 +44,7 @@ interface SidebarProps {
 
 export const AgentSidebar = forwardRef<HTMLDivElement, SidebarProps>(({ isOpen, onClose }, ref) => {
   const { signOut, user } = useAuth();
+  const { unreadMessages } = useLiveCounters(Boolean(user?._id));
   const pathname = usePathname();
 
   return (
@@ -117,6 +119,11 @@ export const AgentSidebar = forwardRef<HTMLDivElement, SidebarProps>(({ isOpen,
             >
               <Icon className="mr-3 h-5 w-5" aria-hidden="true" />
               {item.name}
+              {item.href === "/agent/messages" && unreadMessages > 0 && (
+                <span className="ml-auto rounded-full bg-red-500 px-2 text-xs text-white">
+                  {unreadMessages}
+                </span>
+              )}
             </Link>
           );
         })}
@@ -4,12 +4,12 @@ import { format } from "date-fns";
 import { useAuth } from "@/context/AuthContext";
 import {
   getNotifications,
-  getUnreadNotificationsCount,
   markAllAsRead,
   markAsRead,
   NotificationType,
 } from "@/lib/Common/Notifications";
 import { showErrorToast } from "@/utils/toastHandler";
+import { useLiveCounters } from "@/hooks/useLiveCounters";
 
 interface Notification {
   id: string;
@@ -35,14 +35,16 @@ export const NotificationCenter: React.FC<NotificationCenterProps> = ({
   onClose,
 }) => {
   const { user } = useAuth();
-  const [unreadCount, setUnreadCount] = useState(0);
+  // Pushed by the server as notifications arrive or are read
+  const { unreadNotifications: unreadCount } = useLiveCounters(
+    Boolean(user?._id)
+  );
   const [loading, setLoading] = useState(true);
   const [notifications, setNotifications] = useState<NotificationType[]>([]);
   const modalRef = useRef<HTMLDivElement>(null);
 
   useEffect(() => {
     fetchNotifications();
-    fetchUnreadCount();
   }, []);
 
   const fetchNotifications = async () => {
@@ -63,16 +65,6 @@ export const NotificationCenter: React.FC<NotificationCenterProps> = ({
     }
   };
 
-  const fetchUnreadCount = async () => {
-    try {
-      if (!user?._id) return;
-      const res = await getUnreadNotificationsCount();
-      setUnreadCount(res.data);
-    } catch (err) {
-      showErrorToast("Error fetching notifications:", err);
-    }
-  };
-
   const handleMarkAsRead = async (notificationId: string) => {
     setNotifications((prev) =>
       prev.map((notification) =>
@@ -84,7 +76,6 @@ export const NotificationCenter: React.FC<NotificationCenterProps> = ({
     try {
       await markAsRead(notificationId);
       fetchNotifications();
-      fetchUnreadCount();
     } catch (error) {
       showErrorToast("Error", error);
     }
@@ -95,7 +86,6 @@ export const NotificationCenter: React.FC<NotificationCenterProps> = ({
     const result = await markAllAsRead();
     if (result.data.success) {
       fetchNotifications();
-      fetchUnreadCount();
     }
   };
 
@@ -53,7 +53,10 @@ export const AddMeetingForm: React.FC<AddMeetingFormProps> = ({
         setCustomers(filteredCustomers);
 
         // 🔹 Fetch properties
-        const props = await getProperties({ agencyId: user.agency?._id ?? "" });
+        const props = await getProperties({
+          agencyId: user.agency?._id ?? "",
+          fields: "title",
+        });
         const filteredProps = props.data
           .map((p: Property) => ({
             id: p._id,
@@ -161,7 +161,10 @@ export const EditMeetingForm: React.FC<EditMeetingFormProps> = ({
 
     const loadProps = async () => {
       try {
-        const { data } = await getProperties({ agencyId: user.agency!._id });
+        const { data } = await getProperties({
+          agencyId: user.agency!._id,
+          fields: "title",
+        });
         setProperties(data);
       } catch (err) {
         console.error("❌ Error loading properties:", err);
@@ -6,7 +6,7 @@ import ConversationItem from "./ConversationItem";
 import ActionButtons from "./ActionButtons";
 import { IoArrowBackSharp } from "react-icons/io5";
 import { useAuth } from "@/context/AuthContext";
-// import LoadingSpinner from "../UI/LoadingSpinner";
+import LoadingSpinner from "../UI/LoadingSpinner";
 import EmptyState from "../UI/EmptyState";
 import { ConversationListProps } from "../types/messageTypes";
 import { MessageSquare } from "lucide-react";
@@ -19,6 +19,10 @@ interface ConversationsListComponentProps extends ConversationListProps {
   ) => string;
   filteredConversations: any[];
   customers: any[];
+  // The list is paged: more conversations load on demand
+  hasMoreConversations?: boolean;
+  isLoadingMoreConversations?: boolean;
+  onLoadMoreConversations?: () => void;
 }
 
 const ConversationsList: React.FC<ConversationsListComponentProps> = ({
@@ -47,6 +51,9 @@ const ConversationsList: React.FC<ConversationsListComponentProps> = ({
   getUnreadCount,
   getTruncatedMessage,
   filteredConversations,
+  hasMoreConversations,
+  isLoadingMoreConversations,
+  onLoadMoreConversations,
 }) => {
   const { user } = useAuth();
   const [isMobile, setIsMobile] = useState(false);
@@ -207,6 +214,21 @@ const ConversationsList: React.FC<ConversationsListComponentProps> = ({
               />
             </div>
           )}
+          {hasMoreConversations && (
+            <div className="flex justify-center p-3">
+              {isLoadingMoreConversations ? (
+                <LoadingSpinner size="sm" />
+              ) : (
+                <button
+                  type="button"
+                  onClick={onLoadMoreConversations}
+                  className="text-xs text-gray-500 hover:text-gray-700"
+                >
+                  Load more conversations
+                </button>
+              )}
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -54,13 +54,16 @@ const MessageItem: React.FC<MessageItemProps> = ({
               {message.attachments.map((att, i) => (
                 <div key={i}>
                   {att.type.startsWith("image/") ? (
-                    <Image
-                      src={att.url}
-                      alt={att.name}
-                      className="max-w-56 rounded-md border"
-                      width={280}
-                      height={280}
-                    />
+                    // The thumbnail is shown; the original opens on click
+                    <a href={att.url} target="_blank" rel="noopener noreferrer">
+                      <Image
+                        src={att.thumbnailUrl || att.url}
+                        alt={att.name}
+                        className="max-w-56 rounded-md border"
+                        width={att.width || 280}
+                        height={att.height || 280}
+                      />
+                    </a>
                   ) : (
                     <a
                       href={att.url}
@@ -68,7 +71,17 @@ const MessageItem: React.FC<MessageItemProps> = ({
                       rel="noopener noreferrer"
                       className="flex flex-col items-center space-x-2 p-2 bg-white rounded-md border hover:bg-gray-50 transition"
                     >
-                      <FiFile className="w-16 h-16 text-gray-500 flex-shrink-0" />
+                      {att.thumbnailUrl ? (
+                        <Image
+                          src={att.thumbnailUrl}
+                          alt={att.name}
+                          className="max-w-56 rounded-md border"
+                          width={224}
+                          height={224}
+                        />
+                      ) : (
+                        <FiFile className="w-16 h-16 text-gray-500 flex-shrink-0" />
+                      )}
                       <span className="text-primary underline break-all">
                         {att.name}
                       </span>
@@ -35,6 +35,9 @@ interface MessageThreadProps {
   onCopyToClipboard: (text: string) => void;
   firstUnreadIndex: number;
   isLoadingMessages: boolean;
+  hasOlderMessages?: boolean;
+  isLoadingOlder?: boolean;
+  onLoadOlder?: () => void;
   userRole?: string;
 }
 
@@ -68,6 +71,9 @@ const MessageThread: React.FC<MessageThreadProps> = ({
   onCopyToClipboard,
   firstUnreadIndex,
   isLoadingMessages,
+  hasOlderMessages,
+  isLoadingOlder,
+  onLoadOlder,
 }) => {
   // Safe null checks for conversation properties - convert to boolean with default false
   const conversationBlockedByUser = Boolean(
@@ -107,6 +113,9 @@ const MessageThread: React.FC<MessageThreadProps> = ({
         isLoadingMessages={isLoadingMessages}
         currentUserId={currentUserId}
         firstUnreadIndex={firstUnreadIndex}
+        hasOlderMessages={hasOlderMessages}
+        isLoadingOlder={isLoadingOlder}
+        onLoadOlder={onLoadOlder}
       />
 
       {anotherUserAllowMessage === false && (
@@ -1,6 +1,7 @@
 "use client";
 import React, { useRef, useEffect } from "react";
 import MessageItem from "./MessageItem";
+import { useOlderMessages } from "@/hooks/useOlderMessages";
 
 import { MessageSquare } from "lucide-react";
 import { Message } from "../types/messageTypes";
@@ -12,6 +13,9 @@ interface MessagesListProps {
   isLoadingMessages: boolean;
   currentUserId?: string;
   firstUnreadIndex: number;
+  hasOlderMessages?: boolean;
+  isLoadingOlder?: boolean;
+  onLoadOlder?: () => void;
 }
 
 const MessagesList: React.FC<MessagesListProps> = ({
@@ -19,14 +23,25 @@ const MessagesList: React.FC<MessagesListProps> = ({
   isLoadingMessages,
   currentUserId,
   firstUnreadIndex,
+  hasOlderMessages,
+  isLoadingOlder,
+  onLoadOlder,
 }) => {
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const { listRef, handleScroll, loadOlder } = useOlderMessages({
+    firstMessageId: messages[0]?._id,
+    hasOlderMessages,
+    isLoadingOlder,
+    onLoadOlder,
+  });
+  const lastMessageId = messages[messages.length - 1]?._id;
 
+  // Follow new messages only; older pages keep the viewport in place
   useEffect(() => {
     if (messagesEndRef.current) {
       messagesEndRef.current.scrollIntoView({ behavior: "smooth" });
     }
-  }, [messages]);
+  }, [lastMessageId]);
 
   if (isLoadingMessages) {
     return (
@@ -47,7 +62,26 @@ const MessagesList: React.FC<MessagesListProps> = ({
   }
 
   return (
-    <div className="flex-1 overflow-y-auto p-2 md:p-4 space-y-4">
+    <div
+      ref={listRef}
+      onScroll={handleScroll}
+      className="flex-1 overflow-y-auto p-2 md:p-4 space-y-4"
+    >
+      {hasOlderMessages && (
+        <div className="flex justify-center">
+          {isLoadingOlder ? (
+            <LoadingSpinner size="sm" />
+          ) : (
+            <button
+              type="button"
+              onClick={loadOlder}
+              className="text-xs text-gray-500 hover:text-gray-700"
+            >
+              Load older messages
+            </button>
+          )}
+        </div>
+      )}
       {messages.map((message, idx) => {
         const isUnread =
           !message.isRead && message.receiverId === currentUserId;
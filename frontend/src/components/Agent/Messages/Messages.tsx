@@ -28,18 +28,26 @@ import {
   getCustomers,
 } from "@/lib/Agent/MessagesAPI";
 
-import { io } from "socket.io-client";
+import { getSocket } from "@/lib/socket";
 import { showErrorToast } from "@/utils/toastHandler";
+import {
+  ConversationFolderParams,
+  appendConversations,
+  mergeMessages,
+} from "@/utils/messagePages";
+import {
+  ConversationReadEvent,
+  MessageNewEvent,
+  applyConversationDelta,
+  applyConversationRead,
+  markMessagesRead,
+} from "@/utils/messageDeltas";
 
 // View Components
 
 const CompanyMessages: React.FC = () => {
   const { user } = useAuth();
-  const socket = useMemo(() => {
-    return io(process.env.NEXT_PUBLIC_BACKEND_URL, {
-      withCredentials: true,
-    });
-  }, []);
+  const socket = useMemo(() => getSocket(), []);
   // State
   const [allowMessage, setAllowMessage] = useState(true);
   const [anotherUserAllowMessage, setAnotherUserAllowMessage] = useState(true);
@@ -49,7 +57,19 @@ const CompanyMessages: React.FC = () => {
   const [newMessage, setNewMessage] = useState("");
   const [searchTerm, setSearchTerm] = useState("");
   const [conversations, setConversations] = useState<Conversation[]>([]);
+  // Folder and cursor of the next page of the list (null: all loaded)
+  const [moreConversations, setMoreConversations] = useState<{
+    folder: ConversationFolderParams;
+    cursor: string;
+  } | null>(null);
+  const [isLoadingMoreConversations, setIsLoadingMoreConversations] =
+    useState(false);
   const [messages, setMessages] = useState<Record<string, Message[]>>({});
+  // Cursor of the next older page per thread (null: start of the thread)
+  const [olderCursors, setOlderCursors] = useState<
+    Record<string, string | null>
+  >({});
+  const [isLoadingOlder, setIsLoadingOlder] = useState(false);
   const [isLoadingConversations, setIsLoadingConversations] = useState(true);
   const [isLoadingMessages, setIsLoadingMessages] = useState(true);
   const [isSelectingConversation, setIsSelectingConversation] = useState(true);
@@ -81,21 +101,82 @@ const CompanyMessages: React.FC = () => {
   useEffect(() => {
     // Join room
     if (!selectedConversation) return;
-    socket.emit("join_conversation", selectedConversation);
-
-    // Live updates from socket
-    // eslint-disable-next-line no-shadow
-    socket.on("messages_update", (conversationId: string) => {
-      fetchConversationMessages(conversationId);
-      markAsRead(conversationId);
+    const joinRoom = () =>
+      socket.emit("join_conversation", selectedConversation);
+    joinRoom();
+    socket.on("connect", joinRoom);
 
-    });
-    // Cleanup listener on unmount
     return () => {
-      socket.off("messages_update");
+      socket.off("connect", joinRoom);
+      socket.emit("leave_conversation", selectedConversation);
     };
   }, [selectedConversation]);
 
+  // Live updates from socket: apply the pushed message and metadata
+  useEffect(() => {
+    const isInbox = !isArchiveMode && !isTrashMode && !isBlockMode;
+
+    const handleNewMessage = (event: MessageNewEvent<Message>) => {
+      const threadId = event.conversationId;
+      setMessages((prev) =>
+        prev[threadId]
+          ? {
+            ...prev,
+            [threadId]: mergeMessages(prev[threadId], [event.message]),
+          }
+          : prev
+      );
+
+      const updated = applyConversationDelta(
+        conversations,
+        event.conversation
+      );
+      if (updated) {
+        setConversations(updated);
+      } else if (isInbox) {
+        // A thread this list has not loaded yet
+        fetchConversations();
+      }
+
+      if (
+        threadId === selectedConversation &&
+        event.message.receiverId === user?._id
+      ) {
+        markAsRead(threadId);
+      }
+    };
+
+    const handleConversationRead = (event: ConversationReadEvent) => {
+      setConversations((prev) => applyConversationRead(prev, event));
+      setMessages((prev) =>
+        prev[event.conversationId]
+          ? {
+            ...prev,
+            [event.conversationId]: markMessagesRead(
+              prev[event.conversationId],
+              event
+            ),
+          }
+          : prev
+      );
+    };
+
+    socket.on("message:new", handleNewMessage);
+    socket.on("conversation:read", handleConversationRead);
+    // Cleanup listeners on unmount
+    return () => {
+      socket.off("message:new", handleNewMessage);
+      socket.off("conversation:read", handleConversationRead);
+    };
+  }, [
+    conversations,
+    selectedConversation,
+    isArchiveMode,
+    isTrashMode,
+    isBlockMode,
+    user?._id,
+  ]);
+
   // Initialize selected conversation
   useEffect(() => {
     setSelectedConversation(conversationId ?? null);
@@ -153,6 +234,41 @@ const CompanyMessages: React.FC = () => {
   };
 
   // API Functions
+
+  // First page of a folder; remembers where the next one starts
+  const fetchConversationPage = async (folder: ConversationFolderParams) => {
+    const data = await getConversations({ ...folder, cursor: "" });
+    setMoreConversations(
+      data.pagination?.nextCursor
+        ? { folder, cursor: data.pagination.nextCursor }
+        : null
+    );
+    return data;
+  };
+
+  // Append the next page of the open folder
+  const loadMoreConversations = async () => {
+    if (!moreConversations || isLoadingMoreConversations) return;
+
+    setIsLoadingMoreConversations(true);
+    try {
+      const { folder, cursor } = moreConversations;
+      const data = await getConversations({ ...folder, cursor });
+      setConversations((prev) =>
+        appendConversations(prev, data.conversations)
+      );
+      setMoreConversations(
+        data.pagination?.nextCursor
+          ? { folder, cursor: data.pagination.nextCursor }
+          : null
+      );
+    } catch (error) {
+      showErrorToast("Error loading more conversations:", error);
+    } finally {
+      setIsLoadingMoreConversations(false);
+    }
+  };
+
   const fetchConversations = async (priorityConversationId?: string) => {
     setIsLoadingConversations(true);
     setIsSelectingConversation(true);
@@ -165,7 +281,7 @@ const CompanyMessages: React.FC = () => {
         deletedCount,
         blockedCount,
         allowMessages,
-      } = await getConversations();
+      } = await fetchConversationPage({});
       setAllowMessage(allowMessages);
       setConversations(Array.isArray(conversations) ? conversations : []);
       setArchiveCount(archiveCount);
@@ -196,7 +312,7 @@ const CompanyMessages: React.FC = () => {
         deletedCount,
         blockedCount,
         allowMessages,
-      } = await getConversations({ archived: true });
+      } = await fetchConversationPage({ archived: true });
       setAllowMessage(allowMessages);
       setConversations(Array.isArray(conversations) ? conversations : []);
       setArchiveCount(archiveCount);
@@ -226,7 +342,7 @@ const CompanyMessages: React.FC = () => {
         deletedCount,
         blockedCount,
         allowMessages,
-      } = await getConversations({ deleted: true });
+      } = await fetchConversationPage({ deleted: true });
       setAllowMessage(allowMessages);
       setConversations(Array.isArray(conversations) ? conversations : []);
       setArchiveCount(archiveCount);
@@ -256,7 +372,7 @@ const CompanyMessages: React.FC = () => {
         deletedCount,
         blockedCount,
         allowMessages,
-      } = await getConversations({ blocked: true });
+      } = await fetchConversationPage({ blocked: true });
       setAllowMessage(allowMessages);
       setConversations(Array.isArray(conversations) ? conversations : []);
       setArchiveCount(archiveCount);
@@ -281,8 +397,14 @@ const CompanyMessages: React.FC = () => {
       const data = await getConversationMessages(conversationId);
       setMessages((prev) => ({
         ...prev,
-        [conversationId]: data.messages,
+        [conversationId]: mergeMessages(prev[conversationId], data.messages),
       }));
+      // The older-page cursor comes from the first load of a thread
+      setOlderCursors((prev) =>
+        conversationId in prev
+          ? prev
+          : { ...prev, [conversationId]: data.pagination?.before ?? null }
+      );
       setAnotherUserAllowMessage(data.allowMessages);
     } catch (error) {
       showErrorToast("Error fetching messages:", error);
@@ -291,6 +413,30 @@ const CompanyMessages: React.FC = () => {
     }
   };
 
+  // Prepend the next older page of the open thread
+  const loadOlderMessages = async () => {
+    const conversationId = selectedConversation;
+    const before = conversationId ? olderCursors[conversationId] : null;
+    if (!conversationId || !before || isLoadingOlder) return;
+
+    setIsLoadingOlder(true);
+    try {
+      const data = await getConversationMessages(conversationId, { before });
+      setMessages((prev) => ({
+        ...prev,
+        [conversationId]: mergeMessages(prev[conversationId], data.messages),
+      }));
+      setOlderCursors((prev) => ({
+        ...prev,
+        [conversationId]: data.pagination?.before ?? null,
+      }));
+    } catch (error) {
+      showErrorToast("Error loading older messages:", error);
+    } finally {
+      setIsLoadingOlder(false);
+    }
+  };
+
   const startNewConversation = async (customerId: string) => {
     try {
       const messageText =
@@ -380,14 +526,14 @@ const CompanyMessages: React.FC = () => {
         );
 
         if (response.success && response.data?.message) {
-          socket.emit("send_message", selectedConversation);
+          // The server pushes the message to the other participant
           if (typeof selectedConversation === "string") {
             setMessages((prev) => ({
               ...prev,
-              [selectedConversation]: [
-                ...(prev[selectedConversation] || []),
-                response.data.message,
-              ],
+              [selectedConversation]: mergeMessages(
+                prev[selectedConversation],
+                [response.data.message]
+              ),
             }));
           }
 
@@ -701,6 +847,9 @@ const CompanyMessages: React.FC = () => {
           getTruncatedMessage={getTruncatedMessage}
           filteredConversations={filteredConversations}
           customers={customers}
+          hasMoreConversations={Boolean(moreConversations)}
+          isLoadingMoreConversations={isLoadingMoreConversations}
+          onLoadMoreConversations={loadMoreConversations}
         />
 
         <MessageThread
@@ -734,6 +883,11 @@ const CompanyMessages: React.FC = () => {
           onCopyToClipboard={handleCopyToClipboard}
           firstUnreadIndex={firstUnreadIndex}
           isLoadingMessages={isLoadingMessages || isSelectingConversation}
+          hasOlderMessages={Boolean(
+            selectedConversation && olderCursors[selectedConversation]
+          )}
+          isLoadingOlder={isLoadingOlder}
+          onLoadOlder={loadOlderMessages}
           userRole={user?.role}
         />
       </div>
@@ -26,13 +26,25 @@ export interface Conversation {
   } | null;
 }
 
+// Described by the upload endpoint; older messages only have name/url/type
+export interface MessageAttachment {
+  name: string;
+  url: string;
+  type: string;
+  size?: number;
+  hash?: string;
+  width?: number;
+  height?: number;
+  thumbnailUrl?: string;
+}
+
 export interface Message {
   _id: string;
   conversationId: string;
   senderId: string;
   receiverId: string;
   content: string;
-  attachments?: any[];
+  attachments?: MessageAttachment[];
   isRead: boolean;
   readAt?: string;
   createdAt: string;
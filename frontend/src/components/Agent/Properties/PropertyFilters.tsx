@@ -11,14 +11,23 @@ interface Filters {
   plot_dimension_unit: string;
   rera_status: string;
   transaction_type: string;
+  minPrice: string;
+  maxPrice: string;
 }
 
 interface PropertyFiltersProps {
   onFilterChange: (filters: Filters) => void;
+  facets?: PropertyFacets;
 }
 
+type FacetField = Exclude<keyof PropertyFacets, "price">;
+
+const formatPrice = (value: number) =>
+  `₹${Math.round(value).toLocaleString("en-IN")}`;
+
 export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
   onFilterChange,
+  facets,
 }) => {
   const [filters, setFilters] = useState<Filters>({
     type: "",
@@ -29,6 +38,8 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
     plot_dimension_unit: "",
     rera_status: "",
     transaction_type: "",
+    minPrice: "",
+    maxPrice: "",
   });
 
   const [showFilter, setShowFilter] = useState(false);
@@ -39,6 +50,23 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
     onFilterChange(newFilters);
   };
 
+  // Price buckets come from the facets response as "min-max"
+  const handlePriceChange = (range: string) => {
+    const [minPrice = "", maxPrice = ""] = range ? range.split("-") : [];
+    const newFilters = { ...filters, minPrice, maxPrice };
+    setFilters(newFilters);
+    onFilterChange(newFilters);
+  };
+
+  // Append the number of matching listings to an option label
+  const withCount = (field: FacetField, value: string, label: string) => {
+    const normalized = value.toLowerCase().replace(/-/g, " ");
+    const count = facets?.[field]?.find(
+      (facet) => facet.value === normalized
+    )?.count;
+    return count === undefined ? label : `${label} (${count})`;
+  };
+
   const handleFilterToggle = () => {
     setShowFilter((prev) => !prev);
   };
@@ -53,6 +81,8 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
       plot_dimension_unit: "",
       rera_status: "",
       transaction_type: "",
+      minPrice: "",
+      maxPrice: "",
     };
     setFilters(resetFilters);
     onFilterChange(resetFilters);
@@ -103,8 +133,12 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-primary focus:border-primary"
           >
             <option value="">All Types</option>
-            <option value="residential">Residential</option>
-            <option value="commercial">Commercial</option>
+            <option value="residential">
+              {withCount("type", "residential", "Residential")}
+            </option>
+            <option value="commercial">
+              {withCount("type", "commercial", "Commercial")}
+            </option>
           </select>
         </div>
 
@@ -116,13 +150,27 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-primary focus:border-primary"
           >
             <option value="">All Categories</option>
-            <option value="plot">Plot</option>
-            <option value="flat">Flat</option>
-            <option value="villa">Villa</option>
-            <option value="showroom">Showroom</option>
-            <option value="office">Office</option>
-            <option value="land">Land</option>
-            <option value="farmhouse">Farm House</option>
+            <option value="plot">
+              {withCount("category", "plot", "Plot")}
+            </option>
+            <option value="flat">
+              {withCount("category", "flat", "Flat")}
+            </option>
+            <option value="villa">
+              {withCount("category", "villa", "Villa")}
+            </option>
+            <option value="showroom">
+              {withCount("category", "showroom", "Showroom")}
+            </option>
+            <option value="office">
+              {withCount("category", "office", "Office")}
+            </option>
+            <option value="land">
+              {withCount("category", "land", "Land")}
+            </option>
+            <option value="farmhouse">
+              {withCount("category", "farmhouse", "Farm House")}
+            </option>
           </select>
         </div>
         {/* Area Unit */}
@@ -135,15 +183,33 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-primary focus:border-primary"
           >
             <option value="">All Units</option>
-            <option value="square feet">Square Feet</option>
-            <option value="square meter">Square Meter</option>
-            <option value="square yard">Square Yard</option>
-            <option value="acre">Acre</option>
-            <option value="gaj">Gaj</option>
-            <option value="hectare">Hectare</option>
-            <option value="bigha">Bigha</option>
-            <option value="kanal">Kanal</option>
-            <option value="marla">Marla</option>
+            <option value="square feet">
+              {withCount("unit_area_type", "square feet", "Square Feet")}
+            </option>
+            <option value="square meter">
+              {withCount("unit_area_type", "square meter", "Square Meter")}
+            </option>
+            <option value="square yard">
+              {withCount("unit_area_type", "square yard", "Square Yard")}
+            </option>
+            <option value="acre">
+              {withCount("unit_area_type", "acre", "Acre")}
+            </option>
+            <option value="gaj">
+              {withCount("unit_area_type", "gaj", "Gaj")}
+            </option>
+            <option value="hectare">
+              {withCount("unit_area_type", "hectare", "Hectare")}
+            </option>
+            <option value="bigha">
+              {withCount("unit_area_type", "bigha", "Bigha")}
+            </option>
+            <option value="kanal">
+              {withCount("unit_area_type", "kanal", "Kanal")}
+            </option>
+            <option value="marla">
+              {withCount("unit_area_type", "marla", "Marla")}
+            </option>
           </select>
         </div>
         {/* Facing */}
@@ -154,14 +220,30 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-primary focus:border-primary"
           >
             <option value="">Any Facing</option>
-            <option value="north">North</option>
-            <option value="south">South</option>
-            <option value="east">East</option>
-            <option value="west">West</option>
-            <option value="north east">North-East</option>
-            <option value="north west">North-West</option>
-            <option value="south east">South-East</option>
-            <option value="south west">South-West</option>
+            <option value="north">
+              {withCount("facing", "north", "North")}
+            </option>
+            <option value="south">
+              {withCount("facing", "south", "South")}
+            </option>
+            <option value="east">
+              {withCount("facing", "east", "East")}
+            </option>
+            <option value="west">
+              {withCount("facing", "west", "West")}
+            </option>
+            <option value="north east">
+              {withCount("facing", "north east", "North-East")}
+            </option>
+            <option value="north west">
+              {withCount("facing", "north west", "North-West")}
+            </option>
+            <option value="south east">
+              {withCount("facing", "south east", "South-East")}
+            </option>
+            <option value="south west">
+              {withCount("facing", "south west", "South-West")}
+            </option>
           </select>
         </div>
         {/* Corner Plot */}
@@ -200,9 +282,15 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-primary focus:border-primary"
           >
             <option value="">RERA Status</option>
-            <option value="approved">Approved</option>
-            <option value="not approved">Not Approved</option>
-            <option value="applied">Applied</option>
+            <option value="approved">
+              {withCount("rera_status", "approved", "Approved")}
+            </option>
+            <option value="not approved">
+              {withCount("rera_status", "not approved", "Not Approved")}
+            </option>
+            <option value="applied">
+              {withCount("rera_status", "applied", "Applied")}
+            </option>
           </select>
         </div>
         {/* Transaction Type */}
@@ -215,8 +303,34 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-primary focus:border-primary"
           >
             <option value="">Transaction</option>
-            <option value="new">New</option>
-            <option value="resale">Resale</option>
+            <option value="new">
+              {withCount("transaction_type", "new", "New")}
+            </option>
+            <option value="resale">
+              {withCount("transaction_type", "resale", "Resale")}
+            </option>
+          </select>
+        </div>
+        {/* Price */}
+        <div>
+          <select
+            value={
+              filters.minPrice || filters.maxPrice
+                ? `${filters.minPrice}-${filters.maxPrice}`
+                : ""
+            }
+            onChange={(e) => handlePriceChange(e.target.value)}
+            className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-primary focus:border-primary"
+          >
+            <option value="">Any Price</option>
+            {facets?.price?.map((bucket) => (
+              <option
+                key={`${bucket.min}-${bucket.max}`}
+                value={`${bucket.min}-${bucket.max}`}
+              >
+                {`${formatPrice(bucket.min)} – ${formatPrice(bucket.max)} (${bucket.count})`}
+              </option>
+            ))}
           </select>
         </div>
       </div>
@@ -6,7 +6,7 @@ import { BuildingOfficeIcon, PlusIcon } from "@heroicons/react/24/outline";
 import { PropertyFilters } from "./PropertyFilters";
 import SharePropertyModal from "../Common/SharePropertyModal";
 import { PropertyCard } from "./PropertyCard";
-import { getProperties } from "@/lib/Agent/PropertyAPI";
+import { getProperties, getPropertyFacets } from "@/lib/Agent/PropertyAPI";
 import { useDebounce } from "@/components/Common/UseDebounce";
 import { showErrorToast } from "@/utils/toastHandler";
 import ScrollPagination from "@/components/Common/ScrollPagination";
@@ -51,6 +51,7 @@ export const Properties: React.FC = () => {
   const debouncedFilters = useDebounce(filters, 700);
   const [currentPage, setCurrentPage] = useState(1);
   const [totalPages, setTotalPages] = useState(1);
+  const [facets, setFacets] = useState<PropertyFacets>();
   const limit = 10;
 
   const getAllProperties = useCallback(
@@ -61,13 +62,22 @@ export const Properties: React.FC = () => {
           Object.entries(debouncedFilters).filter(([, value]) => value !== "")
         );
 
-        const response = await getProperties({
+        // The first page also brings the filter panel counts
+        const params = {
           ...activeFilters,
           page: String(page),
           limit,
-        });
+          fields: "card",
+        };
+        const response =
+          page === 1
+            ? await getPropertyFacets(params)
+            : await getProperties(params);
 
         if (response.success && response.data) {
+          if ("facets" in response && response.facets) {
+            setFacets(response.facets);
+          }
           setProperties((prev) =>
             append ? [...prev, ...response.data] : response.data
           );
@@ -121,6 +131,7 @@ export const Properties: React.FC = () => {
       {(properties.length > 0 || Object.values(filters).some((v) => v)) && (
         <PropertyFilters
           onFilterChange={(newFilters) => setFilters(newFilters)}
+          facets={facets}
         />
       )}
 
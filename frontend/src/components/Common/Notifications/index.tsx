@@ -14,10 +14,10 @@ import {
   Settings2,
   Share2,
   MessageSquare,
+  Sparkles,
 } from "lucide-react";
 import {
   getNotifications,
-  getUnreadNotificationsCount,
   markAllAsRead,
   markAsRead,
   NotificationType,
@@ -25,6 +25,7 @@ import {
 import { useAuth } from "@/context/AuthContext";
 import ScrollPagination from "@/components/Common/ScrollPagination";
 import { showErrorToast } from "@/utils/toastHandler";
+import { useLiveCounters } from "@/hooks/useLiveCounters";
 
 const typeConfig: Record<
   NotificationType["type"] | "default",
@@ -96,6 +97,12 @@ const typeConfig: Record<
     border: "border-yellow-500",
     label: "Property Feedback",
   },
+  property_match: {
+    icon: <Sparkles className="w-5 h-5 text-white" />,
+    color: "bg-amber-500",
+    border: "border-amber-500",
+    label: "Property Match",
+  },
   all: {
     icon: undefined,
     color: "",
@@ -129,6 +136,7 @@ type NotificationFilter =
   | "preference_request"
   | "property_share"
   | "property_feedback"
+  | "property_match"
   | "unread";
 
 type TabType = NotificationFilter | "all";
@@ -137,7 +145,10 @@ const NotificationsPage: React.FC = () => {
   const [notifications, setNotifications] = useState<NotificationType[]>([]);
   const [isFetching, setIsFetching] = useState(true);
   const { user } = useAuth();
-  const [unreadCount, setUnreadCount] = useState(0);
+  // Pushed by the server as notifications arrive or are read
+  const { unreadNotifications: unreadCount } = useLiveCounters(
+    Boolean(user?._id)
+  );
   const [currentPage, setCurrentPage] = useState(1);
   const [totalPages, setTotalPages] = useState(1);
   const [activeTab, setActiveTab] = useState<TabType>("all");
@@ -154,7 +165,6 @@ const NotificationsPage: React.FC = () => {
     setNotifications([]); // Clear notifications when tab changes
     setCurrentPage(1);
     fetchNotifications(1);
-    fetchUnreadCount();
   }, [activeTab]);
 
   const fetchNotifications = async (page = 1, append = false) => {
@@ -181,16 +191,6 @@ const NotificationsPage: React.FC = () => {
     }
   };
 
-  const fetchUnreadCount = async () => {
-    try {
-      if (!user?._id) return;
-      const res = await getUnreadNotificationsCount();
-      setUnreadCount(res.data);
-    } catch (err) {
-      showErrorToast("Error", err);
-    }
-  };
-
   const handlePageChange = (page: number) => {
     if (page > totalPages || isFetching) return;
     fetchNotifications(page, true);
@@ -200,7 +200,6 @@ const NotificationsPage: React.FC = () => {
     const result = await markAsRead(id);
     if (result.data.success) {
       fetchNotifications(1); // Refetch from page 1
-      fetchUnreadCount();
     }
   };
 
@@ -209,7 +208,6 @@ const NotificationsPage: React.FC = () => {
     const result = await markAllAsRead();
     if (result.data.success) {
       fetchNotifications(1); // Refetch from page 1
-      fetchUnreadCount();
     }
   };
 
@@ -1,5 +1,5 @@
 'use client';
-import React, { Fragment, useEffect, useState } from 'react';
+import React, { Fragment } from 'react';
 import { Menu, Transition } from '@headlessui/react';
 import {
     BellIcon,
@@ -11,8 +11,7 @@ import { useAuth } from '@/context/AuthContext';
 import { NotificationCenter } from './Notification';
 import InstallButton from '@/components/Common/InstallButton';
 import Link from 'next/link';
-import { getUnreadNotificationsCount } from '@/lib/Common/Notifications';
-import { showErrorToast } from '@/utils/toastHandler';
+import { useLiveCounters } from '@/hooks/useLiveCounters';
 
 interface HeaderProps {
     onMenuButtonClick: () => void;
@@ -21,19 +20,8 @@ interface HeaderProps {
 export const CustomerHeader: React.FC<HeaderProps> = ({ onMenuButtonClick }) => {
     const { user, signOut } = useAuth();
     const [showNotifications, setShowNotifications] = React.useState<boolean>(false);
-    const [unReadCount, setUnreadCount] = useState(0);
-    const fetchUnreadCount = async () => {
-        try {
-            if (!user?._id) return;
-            const res = await getUnreadNotificationsCount();
-            setUnreadCount(res.data);
-        } catch (err) {
-             showErrorToast("Error",err);
-        }
-    };
-    useEffect(() => {
-        fetchUnreadCount();
-    }, [showNotifications]);
+    // Pushed by the server as notifications arrive or are read
+    const { unreadNotifications: unReadCount } = useLiveCounters(Boolean(user?._id));
     return (
         <>
             <header className="bg-white shadow-sm border-b border-gray-200">
@@ -12,6 +12,7 @@ import {
   ArrowRightOnRectangleIcon,
 } from "@heroicons/react/24/outline";
 import { useAuth } from "@/context/AuthContext";
+import { useLiveCounters } from "@/hooks/useLiveCounters";
 import { Bell, MessageCircleIcon } from "lucide-react";
 
 const navigation = [
@@ -39,6 +40,7 @@ interface SidebarProps {
 
 export const CustomerSidebar = forwardRef<HTMLDivElement,SidebarProps>(({ isOpen,onClose }, ref) => {
   const { signOut, user } = useAuth();
+  const { unreadMessages } = useLiveCounters(Boolean(user?._id));
   const pathname = usePathname();
 
   return (
@@ -116,6 +118,11 @@ export const CustomerSidebar = forwardRef<HTMLDivElement,SidebarProps>(({ isOpen
             >
               <Icon className="mr-3 h-5 w-5" aria-hidden="true" />
               {item.name}
+              {item.href === "/customer/messages" && unreadMessages > 0 && (
+                <span className="ml-auto rounded-full bg-red-500 px-2 text-xs text-white">
+                  {unreadMessages}
+                </span>
+              )}
             </Link>
           );
         })}
@@ -5,6 +5,7 @@ import { getNotifications, markAllAsRead, markAsRead } from '@/lib/Common/Notifi
 import { useAuth } from '@/context/AuthContext';
 import Link from 'next/link';
 import { showErrorToast } from '@/utils/toastHandler';
+import { useLiveCounters } from '@/hooks/useLiveCounters';
 interface Notification {
     _id: string;
     title: string;
@@ -22,7 +23,8 @@ interface NotificationCenterProps {
 export const NotificationCenter: React.FC<NotificationCenterProps> = ({ isOpen, onClose }) => {
      const { user } = useAuth();
      const [notifications, setNotifications] = useState<Notification[]>([]);
-     const [unreadCount,setUnreadCount]=useState(0);
+     // Pushed by the server as notifications arrive or are read
+     const { unreadNotifications: unreadCount } = useLiveCounters(Boolean(user?._id));
      const modalRef = useRef<HTMLDivElement>(null);
          const fetchNotifications = async () => {
              if (!user?._id) return;
@@ -43,10 +45,6 @@ export const NotificationCenter: React.FC<NotificationCenterProps> = ({ isOpen,
              fetchNotifications();
          }, [user]);
 
-  useEffect(() => {
-    const unreadNotifications = notifications.filter((notification) => notification.isRead === false);
-   setUnreadCount(unreadNotifications.length);
-  },[notifications]);
     const handelMarkAsRead = async(notificationId: string) => {
            setNotifications(prev =>
             prev.map(notif =>
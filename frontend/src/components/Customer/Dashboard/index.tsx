@@ -34,6 +34,7 @@ interface DashboardData {
   totalAllProperties?: number;
   totalProperties?: number; // Unified field
   showAllProperty?: boolean; // Toggle state from backend
+  recommendedProperties?: Recommendation[];
   latestSharedProperties?: {
     propertyId?: {
       _id: string;
@@ -8,6 +8,9 @@ import MessageInput from "./MessageInput";
 const MessageThread: React.FC<MessageThreadProps> = ({
   selectedConversation,
   messages,
+  hasOlderMessages,
+  isLoadingOlder,
+  onLoadOlder,
   newMessage,
   selectedFile,
   filePreview,
@@ -31,12 +34,14 @@ const MessageThread: React.FC<MessageThreadProps> = ({
 }) => {
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
-  // Scroll to bottom when messages change
+  const lastMessageId = messages[messages.length - 1]?._id;
+
+  // Scroll to bottom on new messages (not when older pages are prepended)
   useEffect(() => {
     if (selectedConversation && messagesEndRef.current) {
       messagesEndRef.current.scrollIntoView({ behavior: "smooth" });
     }
-  }, [messages, selectedConversation]);
+  }, [lastMessageId, selectedConversation]);
 
   const isFirstMessageEmpty =
     messages.length === 1 &&
@@ -60,6 +65,9 @@ const MessageThread: React.FC<MessageThreadProps> = ({
         messages={messages}
         isLoading={isLoadingMessages}
         messagesEndRef={messagesEndRef}
+        hasOlderMessages={hasOlderMessages}
+        isLoadingOlder={isLoadingOlder}
+        onLoadOlder={onLoadOlder}
       />
 
       {anotherUserAllowMessage === false && (
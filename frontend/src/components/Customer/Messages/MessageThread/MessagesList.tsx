@@ -7,19 +7,32 @@ import { useAuth } from "@/context/AuthContext";
 import LoadingSpinner from "../UI/LoadingSpinner";
 import EmptyState from "../UI/EmptyState";
 import MessageItem from "./MessageItem";
+import { useOlderMessages } from "@/hooks/useOlderMessages";
 
 interface MessagesListProps {
   messages: Message[];
   isLoading: boolean;
   messagesEndRef: React.Ref<HTMLDivElement>;
+  hasOlderMessages?: boolean;
+  isLoadingOlder?: boolean;
+  onLoadOlder?: () => void;
 }
 
 const MessagesList: React.FC<MessagesListProps> = ({
   messages,
   isLoading,
   messagesEndRef,
+  hasOlderMessages,
+  isLoadingOlder,
+  onLoadOlder,
 }) => {
   const { user } = useAuth();
+  const { listRef, handleScroll, loadOlder } = useOlderMessages({
+    firstMessageId: messages[0]?._id,
+    hasOlderMessages,
+    isLoadingOlder,
+    onLoadOlder,
+  });
 
   const firstUnreadIndex = messages.findIndex(
     (m) => !m.isRead && m.receiverId === user?._id
@@ -45,7 +58,26 @@ const MessagesList: React.FC<MessagesListProps> = ({
   }
 
   return (
-    <div className="flex-1 overflow-y-auto p-2 md:p-4 space-y-4">
+    <div
+      ref={listRef}
+      onScroll={handleScroll}
+      className="flex-1 overflow-y-auto p-2 md:p-4 space-y-4"
+    >
+      {hasOlderMessages && (
+        <div className="flex justify-center">
+          {isLoadingOlder ? (
+            <LoadingSpinner size="sm" />
+          ) : (
+            <button
+              type="button"
+              onClick={loadOlder}
+              className="text-xs text-gray-500 hover:text-gray-700"
+            >
+              Load older messages
+            </button>
+          )}
+        </div>
+      )}
       {messages.map((message, idx) => {
         if (
           !message.content?.trim() &&
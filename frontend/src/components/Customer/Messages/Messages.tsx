@@ -19,8 +19,16 @@ import {
   uploadFile,
   startConversation,
 } from "@/lib/Customer/MessagesAPI";
-import { io } from "socket.io-client";
+import { getSocket } from "@/lib/socket";
 import { showErrorToast } from "@/utils/toastHandler";
+import { mergeMessages } from "@/utils/messagePages";
+import {
+  ConversationReadEvent,
+  MessageNewEvent,
+  applyConversationDelta,
+  applyConversationRead,
+  markMessagesRead,
+} from "@/utils/messageDeltas";
 import ErrorDisplay from "@/components/Agent/Messages/UI/ErrorDisplay";
 
 const Messages: React.FC = () => {
@@ -32,6 +40,11 @@ const Messages: React.FC = () => {
   const [anotherUserAllowMessage, setAnotherUserAllowMessage] = useState(true);
   const [conversations, setConversations] = useState<Conversation[]>([]);
   const [messages, setMessages] = useState<Record<string, Message[]>>({});
+  // Cursor of the next older page per thread (null: start of the thread)
+  const [olderCursors, setOlderCursors] = useState<
+    Record<string, string | null>
+  >({});
+  const [isLoadingOlder, setIsLoadingOlder] = useState(false);
   const [isLoadingMessages, setIsLoadingMessages] = useState(true);
   const [isSelectingConversation, setIsSelectingConversation] = useState(true);
   const [isSendingMessage, setIsSendingMessage] = useState(false);
@@ -40,28 +53,77 @@ const Messages: React.FC = () => {
   const [showProfile, setShowProfile] = useState(true);
   const [errors, setErrors] = useState<any | null>(null);
 
-  const socket = useMemo(() => {
-    return io(process.env.NEXT_PUBLIC_BACKEND_URL, {
-      withCredentials: true,
-    });
-  }, []);
+  const socket = useMemo(() => getSocket(), []);
   useEffect(() => {
     // Join room
     if (!selectedConversation) return;
-    socket.emit("join_conversation", selectedConversation);
-
-    // Live updates from socket
-    socket.on("messages_update", (conversationId: string) => {
-      fetchConversationMessages(conversationId);
-      markAsRead(conversationId);
-    });
+    const joinRoom = () =>
+      socket.emit("join_conversation", selectedConversation);
+    joinRoom();
+    socket.on("connect", joinRoom);
 
-    // Cleanup listener on unmount
     return () => {
-      socket.off("messages_update");
+      socket.off("connect", joinRoom);
+      socket.emit("leave_conversation", selectedConversation);
     };
   }, [selectedConversation]);
 
+  // Live updates from socket: apply the pushed message and metadata
+  useEffect(() => {
+    const handleNewMessage = (event: MessageNewEvent<Message>) => {
+      const threadId = event.conversationId;
+      setMessages((prev) =>
+        prev[threadId]
+          ? {
+            ...prev,
+            [threadId]: mergeMessages(prev[threadId], [event.message]),
+          }
+          : prev
+      );
+
+      const updated = applyConversationDelta(
+        conversations,
+        event.conversation
+      );
+      if (updated) {
+        setConversations(updated);
+      } else {
+        // A thread this list has not loaded yet
+        fetchConversations();
+      }
+
+      if (
+        threadId === selectedConversation &&
+        event.message.receiverId === user?._id
+      ) {
+        markAsRead(threadId);
+      }
+    };
+
+    const handleConversationRead = (event: ConversationReadEvent) => {
+      setConversations((prev) => applyConversationRead(prev, event));
+      setMessages((prev) =>
+        prev[event.conversationId]
+          ? {
+            ...prev,
+            [event.conversationId]: markMessagesRead(
+              prev[event.conversationId],
+              event
+            ),
+          }
+          : prev
+      );
+    };
+
+    socket.on("message:new", handleNewMessage);
+    socket.on("conversation:read", handleConversationRead);
+    // Cleanup listeners on unmount
+    return () => {
+      socket.off("message:new", handleNewMessage);
+      socket.off("conversation:read", handleConversationRead);
+    };
+  }, [conversations, selectedConversation, user?._id]);
+
   // Fetch conversations on component mount
   useEffect(() => {
     fetchConversations();
@@ -76,10 +138,20 @@ const Messages: React.FC = () => {
 
   const fetchConversations = async (priorityConversationId?: string) => {
     try {
+      // The list is paged, but this view has no list to page through:
+      // follow the cursors so every conversation is loaded
       // eslint-disable-next-line no-shadow
-      const { conversations } = await getConversations();
+      const conversations: Conversation[] = [];
+      let cursor: string | null = "";
+      while (cursor !== null) {
+        const data = await getConversations({ cursor });
+        if (Array.isArray(data.conversations)) {
+          conversations.push(...data.conversations);
+        }
+        cursor = data.pagination?.nextCursor ?? null;
+      }
       //setAllowMessage(allowMessages);
-      setConversations(Array.isArray(conversations) ? conversations : []);
+      setConversations(conversations);
 
       if (priorityConversationId) {
         setSelectedConversation(priorityConversationId);
@@ -103,8 +175,14 @@ const Messages: React.FC = () => {
       const data = await getConversationMessages(conversationId);
       setMessages((prev) => ({
         ...prev,
-        [conversationId]: data.messages,
+        [conversationId]: mergeMessages(prev[conversationId], data.messages),
       }));
+      // The older-page cursor comes from the first load of a thread
+      setOlderCursors((prev) =>
+        conversationId in prev
+          ? prev
+          : { ...prev, [conversationId]: data.pagination?.before ?? null }
+      );
       setAnotherUserAllowMessage(data.allowMessages);
       setShowProfile(data.showProfile);
     } catch (error) {
@@ -114,6 +192,30 @@ const Messages: React.FC = () => {
     }
   };
 
+  // Prepend the next older page of the open thread
+  const loadOlderMessages = async () => {
+    const conversationId = selectedConversation;
+    const before = conversationId ? olderCursors[conversationId] : null;
+    if (!conversationId || !before || isLoadingOlder) return;
+
+    setIsLoadingOlder(true);
+    try {
+      const data = await getConversationMessages(conversationId, { before });
+      setMessages((prev) => ({
+        ...prev,
+        [conversationId]: mergeMessages(prev[conversationId], data.messages),
+      }));
+      setOlderCursors((prev) => ({
+        ...prev,
+        [conversationId]: data.pagination?.before ?? null,
+      }));
+    } catch (error) {
+      showErrorToast("Error loading older messages:", error);
+    } finally {
+      setIsLoadingOlder(false);
+    }
+  };
+
   const startNewConversation = async (agencyId: string) => {
     try {
       const messageText = ""
@@ -200,14 +302,14 @@ const Messages: React.FC = () => {
         );
 
         if (response.success && response.data?.message) {
-          socket.emit("send_message", selectedConversation);
+          // The server pushes the message to the other participant
           if (typeof selectedConversation === "string") {
             setMessages((prev) => ({
               ...prev,
-              [selectedConversation]: [
-                ...(prev[selectedConversation] || []),
-                response.data.message,
-              ],
+              [selectedConversation]: mergeMessages(
+                prev[selectedConversation],
+                [response.data.message]
+              ),
             }));
           }
 
@@ -398,6 +500,11 @@ const Messages: React.FC = () => {
           selectedFile={selectedFile}
           filePreview={filePreview}
           isLoadingMessages={isLoadingMessages || isSelectingConversation}
+          hasOlderMessages={Boolean(
+            selectedConversation && olderCursors[selectedConversation]
+          )}
+          isLoadingOlder={isLoadingOlder}
+          onLoadOlder={loadOlderMessages}
           isSendingMessage={isSendingMessage}
           anotherUserAllowMessage={anotherUserAllowMessage}
           showProfile={showProfile}
@@ -25,6 +25,18 @@ export interface Conversation {
   } | null;
 }
 
+// Described by the upload endpoint; older messages only have name/url/type
+export interface MessageAttachment {
+  name: string;
+  url: string;
+  type: string;
+  size?: number;
+  hash?: string;
+  width?: number;
+  height?: number;
+  thumbnailUrl?: string;
+}
+
 export interface Message {
   _id: string;
   conversationId: string;
@@ -32,7 +44,7 @@ export interface Message {
   receiverId: string;
   content: string;
   // eslint-disable-next-line @typescript-eslint/no-explicit-any
-  attachments?: any[];
+  attachments?: MessageAttachment[];
   isRead: boolean;
   readAt?: string;
   createdAt: string;
@@ -67,6 +79,9 @@ export interface ConversationsListProps {
 export interface MessageThreadProps {
   selectedConversation: Conversation | undefined;
   messages: Message[];
+  hasOlderMessages?: boolean;
+  isLoadingOlder?: boolean;
+  onLoadOlder?: () => void;
   newMessage: string;
   selectedFile: File | null;
   filePreview: string | null;
@@ -127,6 +127,11 @@ export const PropertyCard: React.FC<PropertyCardProps> = ({ property }) => {
                     )}
                     {getLocation(property?.location) || "Not Given"}
                   </p>
+                  {property.distance !== undefined && (
+                    <span className="ml-2 whitespace-nowrap">
+                      · {(property.distance / 1000).toFixed(1)} km away
+                    </span>
+                  )}
                 </div>
                 {property.furnishing && (
                   <div className="flex items-center">
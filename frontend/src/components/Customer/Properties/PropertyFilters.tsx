@@ -1,6 +1,8 @@
 import React, { useState } from "react";
 import { FunnelIcon } from "@heroicons/react/24/outline";
 import { LucideChevronDown, LucideChevronUp } from "lucide-react";
+import { useGeolocation } from "@/hooks/useGeolocation";
+import { showErrorToast } from "@/utils/toastHandler";
 
 interface Filters {
   type: string;
@@ -11,14 +13,28 @@ interface Filters {
   plot_dimension_unit: string;
   rera_status: string;
   transaction_type: string;
+  minPrice: string;
+  maxPrice: string;
+  lat: string;
+  lng: string;
+  radiusKm: string;
 }
 
 interface PropertyFiltersProps {
   onFilterChange: (filters: Filters) => void;
+  facets?: PropertyFacets;
 }
 
+type FacetField = Exclude<keyof PropertyFacets, "price">;
+
+const DISTANCE_OPTIONS = [2, 5, 10, 25, 50];
+
+const formatPrice = (value: number) =>
+  `₹${Math.round(value).toLocaleString("en-IN")}`;
+
 export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
   onFilterChange,
+  facets,
 }) => {
   const [filters, setFilters] = useState<Filters>({
     type: "",
@@ -29,9 +45,15 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
     plot_dimension_unit: "",
     rera_status: "",
     transaction_type: "",
+    minPrice: "",
+    maxPrice: "",
+    lat: "",
+    lng: "",
+    radiusKm: "",
   });
 
   const [showFilter, setShowFilter] = useState(false);
+  const { isFetching: isLocating, getCurrentLocation } = useGeolocation();
 
   const handleFilterChange = (key: keyof Filters, value: string) => {
     const newFilters = { ...filters, [key]: value };
@@ -39,6 +61,48 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
     onFilterChange(newFilters);
   };
 
+  // Price buckets come from the facets response as "min-max"
+  const handlePriceChange = (range: string) => {
+    const [minPrice = "", maxPrice = ""] = range ? range.split("-") : [];
+    const newFilters = { ...filters, minPrice, maxPrice };
+    setFilters(newFilters);
+    onFilterChange(newFilters);
+  };
+
+  // "Near me": results within the radius, nearest first
+  const handleDistanceChange = async (radiusKm: string) => {
+    if (!radiusKm) {
+      const newFilters = { ...filters, lat: "", lng: "", radiusKm: "" };
+      setFilters(newFilters);
+      onFilterChange(newFilters);
+      return;
+    }
+
+    let { lat, lng } = filters;
+    if (!lat || !lng) {
+      const { coords, error } = await getCurrentLocation();
+      if (!coords) {
+        showErrorToast(error || "Unable to get your location.");
+        return;
+      }
+      lat = String(coords.latitude);
+      lng = String(coords.longitude);
+    }
+
+    const newFilters = { ...filters, lat, lng, radiusKm };
+    setFilters(newFilters);
+    onFilterChange(newFilters);
+  };
+
+  // Append the number of matching listings to an option label
+  const withCount = (field: FacetField, value: string, label: string) => {
+    const normalized = value.toLowerCase().replace(/-/g, " ");
+    const count = facets?.[field]?.find(
+      (facet) => facet.value === normalized
+    )?.count;
+    return count === undefined ? label : `${label} (${count})`;
+  };
+
   const handleFilterToggle = () => {
     setShowFilter((prev) => !prev);
   };
@@ -53,6 +117,11 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
       plot_dimension_unit: "",
       rera_status: "",
       transaction_type: "",
+      minPrice: "",
+      maxPrice: "",
+      lat: "",
+      lng: "",
+      radiusKm: "",
     };
     setFilters(resetFilters);
     onFilterChange(resetFilters);
@@ -101,8 +170,12 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-blue-500 focus:border-blue-500"
           >
             <option value="">All Types</option>
-            <option value="residential">Residential</option>
-            <option value="commercial">Commercial</option>
+            <option value="residential">
+              {withCount("type", "residential", "Residential")}
+            </option>
+            <option value="commercial">
+              {withCount("type", "commercial", "Commercial")}
+            </option>
           </select>
         </div>
 
@@ -114,12 +187,24 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-blue-500 focus:border-blue-500"
           >
             <option value="">All Categories</option>
-            <option value="plot">Plot</option>
-            <option value="flat">Flat</option>
-            <option value="villa">Villa</option>
-            <option value="showroom">Showroom</option>
-            <option value="office">Office</option>
-            <option value="land">Land</option>
+            <option value="plot">
+              {withCount("category", "plot", "Plot")}
+            </option>
+            <option value="flat">
+              {withCount("category", "flat", "Flat")}
+            </option>
+            <option value="villa">
+              {withCount("category", "villa", "Villa")}
+            </option>
+            <option value="showroom">
+              {withCount("category", "showroom", "Showroom")}
+            </option>
+            <option value="office">
+              {withCount("category", "office", "Office")}
+            </option>
+            <option value="land">
+              {withCount("category", "land", "Land")}
+            </option>
           </select>
         </div>
         {/* Area Unit */}
@@ -132,15 +217,33 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-blue-500 focus:border-blue-500 hover:bg-green-100 hover:text-black "
           >
             <option value="">All Units</option>
-            <option value="sqft">Square Feet</option>
-            <option value="sqm">Square Meter</option>
-            <option value="sqyd">Square Yard</option>
-            <option value="acre">Acre</option>
-            <option value="gaj">Gaj</option>
-            <option value="hectare">Hectare</option>
-            <option value="bigha">Bigha</option>
-            <option value="kanal">Kanal</option>
-            <option value="marla">Marla</option>
+            <option value="sqft">
+              {withCount("unit_area_type", "sqft", "Square Feet")}
+            </option>
+            <option value="sqm">
+              {withCount("unit_area_type", "sqm", "Square Meter")}
+            </option>
+            <option value="sqyd">
+              {withCount("unit_area_type", "sqyd", "Square Yard")}
+            </option>
+            <option value="acre">
+              {withCount("unit_area_type", "acre", "Acre")}
+            </option>
+            <option value="gaj">
+              {withCount("unit_area_type", "gaj", "Gaj")}
+            </option>
+            <option value="hectare">
+              {withCount("unit_area_type", "hectare", "Hectare")}
+            </option>
+            <option value="bigha">
+              {withCount("unit_area_type", "bigha", "Bigha")}
+            </option>
+            <option value="kanal">
+              {withCount("unit_area_type", "kanal", "Kanal")}
+            </option>
+            <option value="marla">
+              {withCount("unit_area_type", "marla", "Marla")}
+            </option>
           </select>
         </div>
         {/* Facing */}
@@ -151,14 +254,30 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-blue-500 focus:border-blue-500"
           >
             <option value="">Any Facing</option>
-            <option value="North">North</option>
-            <option value="South">South</option>
-            <option value="East">East</option>
-            <option value="West">West</option>
-            <option value="North-East">North-East</option>
-            <option value="North-West">North-West</option>
-            <option value="South-East">South-East</option>
-            <option value="South-West">South-West</option>
+            <option value="North">
+              {withCount("facing", "North", "North")}
+            </option>
+            <option value="South">
+              {withCount("facing", "South", "South")}
+            </option>
+            <option value="East">
+              {withCount("facing", "East", "East")}
+            </option>
+            <option value="West">
+              {withCount("facing", "West", "West")}
+            </option>
+            <option value="North-East">
+              {withCount("facing", "North-East", "North-East")}
+            </option>
+            <option value="North-West">
+              {withCount("facing", "North-West", "North-West")}
+            </option>
+            <option value="South-East">
+              {withCount("facing", "South-East", "South-East")}
+            </option>
+            <option value="South-West">
+              {withCount("facing", "South-West", "South-West")}
+            </option>
           </select>
         </div>
         {/* Corner Plot */}
@@ -197,9 +316,15 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-blue-500 focus:border-blue-500"
           >
             <option value="">RERA Status</option>
-            <option value="Approved">Approved</option>
-            <option value="Not Approved">Not Approved</option>
-            <option value="Applied">Applied</option>
+            <option value="Approved">
+              {withCount("rera_status", "Approved", "Approved")}
+            </option>
+            <option value="Not Approved">
+              {withCount("rera_status", "Not Approved", "Not Approved")}
+            </option>
+            <option value="Applied">
+              {withCount("rera_status", "Applied", "Applied")}
+            </option>
           </select>
         </div>
         {/* Transaction Type */}
@@ -212,8 +337,50 @@ export const PropertyFilters: React.FC<PropertyFiltersProps> = ({
             className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-blue-500 focus:border-blue-500"
           >
             <option value="">Transaction</option>
-            <option value="New">New</option>
-            <option value="Resale">Resale</option>
+            <option value="New">
+              {withCount("transaction_type", "New", "New")}
+            </option>
+            <option value="Resale">
+              {withCount("transaction_type", "Resale", "Resale")}
+            </option>
+          </select>
+        </div>
+        {/* Distance */}
+        <div>
+          <select
+            value={filters.radiusKm}
+            disabled={isLocating}
+            onChange={(e) => handleDistanceChange(e.target.value)}
+            className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-blue-500 focus:border-blue-500"
+          >
+            <option value="">{isLocating ? "Locating..." : "Any Distance"}</option>
+            {DISTANCE_OPTIONS.map((km) => (
+              <option key={km} value={String(km)}>
+                {`Within ${km} km`}
+              </option>
+            ))}
+          </select>
+        </div>
+        {/* Price */}
+        <div>
+          <select
+            value={
+              filters.minPrice || filters.maxPrice
+                ? `${filters.minPrice}-${filters.maxPrice}`
+                : ""
+            }
+            onChange={(e) => handlePriceChange(e.target.value)}
+            className="w-full px-[11px] py-[11px] border border-gray-300 rounded-lg focus:ring-1 focus:ring-blue-500 focus:border-blue-500"
+          >
+            <option value="">Any Price</option>
+            {facets?.price?.map((bucket) => (
+              <option
+                key={`${bucket.min}-${bucket.max}`}
+                value={`${bucket.min}-${bucket.max}`}
+              >
+                {`${formatPrice(bucket.min)} – ${formatPrice(bucket.max)} (${bucket.count})`}
+              </option>
+            ))}
           </select>
         </div>
       </div>
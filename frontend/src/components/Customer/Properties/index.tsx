@@ -4,7 +4,7 @@ import React, { useCallback, useEffect, useState } from "react";
 import { BuildingOfficeIcon } from "@heroicons/react/24/outline";
 import { PropertyFilters } from "./PropertyFilters";
 import { PropertyCard } from "./PropertyCard";
-import { getProperties } from "@/lib/Customer/PropertyAPI";
+import { getProperties, getPropertyFacets } from "@/lib/Customer/PropertyAPI";
 import { useDebounce } from "@/components/Common/UseDebounce";
 import ScrollPagination from "@/components/Common/ScrollPagination";
 import { useAuth } from "@/context/AuthContext";
@@ -47,7 +47,8 @@ export const Properties: React.FC = () => {
   const [isFetching, setIsFetching] = useState(true);
   const debouncedFilters = useDebounce(filters, 700);
   const [currentPage, setCurrentPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(1);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [facets, setFacets] = useState<PropertyFacets>();
   const limit = 10;
   const { user } = useAuth();
   let customerId = "";
@@ -60,28 +61,38 @@ export const Properties: React.FC = () => {
     agencyId = String(user?.agency?._id);
   }
 
+  // Infinite scroll uses keyset pagination: each page continues from the
+  // cursor returned by the previous one
   const getAllProperties = useCallback(
-    async (page = 1, append = false) => {
+    async (cursor = "", append = false) => {
       try {
         setIsFetching(true);
         const activeFilters = Object.fromEntries(
           Object.entries(debouncedFilters).filter(([, value]) => value !== "")
         );
 
-        const response = await getProperties({
+        // The first page also brings the filter panel counts
+        const params = {
           ...activeFilters,
-          page: String(page),
+          cursor,
           limit,
           customerId: customerId,
           agencyId: agencyId,
-        });
+          fields: "card",
+        };
+        const response = cursor
+          ? await getProperties(params)
+          : await getPropertyFacets(params);
 
         if (response.success) {
+          if (response.facets) {
+            setFacets(response.facets);
+          }
           setProperties((prev) =>
             append ? [...prev, ...response.data] : response.data
           );
-          setCurrentPage(response.pagination?.page ?? 1);
-          setTotalPages(response.pagination?.pages ?? 1);
+          setCurrentPage((prev) => (append ? prev + 1 : 1));
+          setNextCursor(response.pagination?.nextCursor ?? null);
         }
       } catch (error) {
         showErrorToast("Error:", error);
@@ -94,12 +105,15 @@ export const Properties: React.FC = () => {
 
   useEffect(() => {
     setProperties([]); // Clear properties when filters change
-    getAllProperties(1);
+    getAllProperties();
   }, [debouncedFilters, getAllProperties]);
 
-  const handlePageChange = (page: number) => {
-    if (page >= 1 && page <= totalPages) {
-      getAllProperties(page, true);
+  const hasMore = nextCursor !== null;
+  const totalPages = hasMore ? currentPage + 1 : currentPage;
+
+  const handlePageChange = () => {
+    if (nextCursor) {
+      getAllProperties(nextCursor, true);
     }
   };
 
@@ -118,6 +132,7 @@ export const Properties: React.FC = () => {
       {/* Filters */}
       <PropertyFilters
         onFilterChange={(newFilters) => setFilters(newFilters)}
+        facets={facets}
       />
 
       {isFetching ? (
@@ -146,7 +161,7 @@ export const Properties: React.FC = () => {
                 currentPage={currentPage}
                 totalPages={totalPages}
                 onPageChange={handlePageChange}
-                hasMore={currentPage < totalPages}
+                hasMore={hasMore}
                 loader={
                   <div className="text-center py-4">
                     <div className="inline-block animate-spin rounded-full h-8 w-8 border-b-2 border-blue-600"></div>
@@ -17,6 +17,7 @@ import { showErrorToast, setForceLogoutFlag } from "@/utils/toastHandler";
 import { brandColor } from "@/types/global";
 import { getAgencySettings } from "@/lib/Agent/SettingsAPI";
 import { getCustomerSettings } from "@/lib/Customer/SettingsAPI";
+import { closeSocket } from "@/lib/socket";
 // import { setForceLogoutFlag } from "@/utils/toastHandler";
 
 export const AUTH_SESSION_KEY = "auth-session";
@@ -100,6 +101,7 @@ export const AuthProvider = ({ children }: AuthProviderProps) => {
     Cookies.remove(AUTH_SESSION_KEY);
     Cookies.remove(ROLE_FOR_MIDDELEWARE);
     localStorage.clear();
+    closeSocket();
   }, []);
 
   useEffect(() => {
@@ -4,6 +4,7 @@ import { useState } from 'react';
 
 interface GeolocationResult {
     locationUrl: string | null;
+    coords?: { latitude: number; longitude: number } | null;
     error: string | null;
 }
 
@@ -37,7 +38,7 @@ export const useGeolocation = () => {
 
             const { latitude, longitude } = position.coords;
             const locationUrl = `https://maps.google.com/maps?q=${latitude},${longitude}`;
-            return { locationUrl, error: null };
+            return { locationUrl, coords: { latitude, longitude }, error: null };
         } catch (error) {
             let message = "An error occurred while fetching location.";
             if (error instanceof GeolocationPositionError) {
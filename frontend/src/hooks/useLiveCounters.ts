@@ -0,0 +1,38 @@
+'use client';
+import { useEffect, useState } from 'react';
+import { getSocket } from '@/lib/socket';
+
+export interface LiveCounters {
+    unreadNotifications: number;
+    unreadMessages: number;
+}
+
+/**
+ * Unread notification and message counts of the signed-in user, pushed by
+ * the server as they change (no polling).
+ */
+export const useLiveCounters = (enabled = true): LiveCounters => {
+    const [counters, setCounters] = useState<LiveCounters>({
+        unreadNotifications: 0,
+        unreadMessages: 0,
+    });
+
+    useEffect(() => {
+        if (!enabled) return undefined;
+        const socket = getSocket();
+        const apply = (next: Partial<LiveCounters>) =>
+            setCounters((prev) => ({ ...prev, ...next }));
+        // Current values on mount and after every reconnect
+        const sync = () => socket.emit('counters:get', apply);
+
+        socket.on('counters', apply);
+        socket.on('connect', sync);
+        if (socket.connected) sync();
+        return () => {
+            socket.off('counters', apply);
+            socket.off('connect', sync);
+        };
+    }, [enabled]);
+
+    return counters;
+};
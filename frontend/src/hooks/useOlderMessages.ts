@@ -0,0 +1,48 @@
+'use client';
+import { useLayoutEffect, useRef } from 'react';
+
+// Distance from the top of the list (px) at which the previous page loads
+const LOAD_OLDER_THRESHOLD = 80;
+
+interface OlderMessagesOptions {
+    firstMessageId?: string;
+    hasOlderMessages?: boolean;
+    isLoadingOlder?: boolean;
+    onLoadOlder?: () => void;
+}
+
+/**
+ * Loads the previous page of a message list when it is scrolled near the
+ * top, and keeps the same message in view once the page is prepended.
+ */
+export const useOlderMessages = ({
+    firstMessageId,
+    hasOlderMessages,
+    isLoadingOlder,
+    onLoadOlder,
+}: OlderMessagesOptions) => {
+    const listRef = useRef<HTMLDivElement>(null);
+    const heightBeforeLoad = useRef<number | null>(null);
+
+    // Older messages were prepended: shift by the height they added
+    useLayoutEffect(() => {
+        const list = listRef.current;
+        if (list && heightBeforeLoad.current !== null) {
+            list.scrollTop += list.scrollHeight - heightBeforeLoad.current;
+        }
+        heightBeforeLoad.current = null;
+    }, [firstMessageId]);
+
+    const loadOlder = () => {
+        if (!hasOlderMessages || isLoadingOlder || !onLoadOlder) return;
+        heightBeforeLoad.current = listRef.current?.scrollHeight ?? null;
+        onLoadOlder();
+    };
+
+    const handleScroll = () => {
+        const list = listRef.current;
+        if (list && list.scrollTop <= LOAD_OLDER_THRESHOLD) loadOlder();
+    };
+
+    return { listRef, handleScroll, loadOlder };
+};
@@ -7,6 +7,7 @@ export const getCustomers = async (
   search = "",
   status = "",
   agencyId = "",
+  cursor?: string,
 ) => {
   const params: Record<string, string> = {};
   if (page !== undefined) {
@@ -24,6 +25,10 @@ export const getCustomers = async (
   if (agencyId) {
     params.agencyId = agencyId;
   }
+  // Opt-in keyset pagination; "" requests the first page
+  if (cursor !== undefined) {
+    params.cursor = cursor;
+  }
   const query = new URLSearchParams(params);
   const response = await api.get<CustomerResponse>(
     `/admin/customers/get-all-customers?${query.toString()}`,
@@ -13,6 +13,7 @@ export const getCustomers = async (
   page?: number,
   limit?: number,
   search = "",
+  cursor?: string,
 ) => {
   const params: Record<string, string> = {};
   if (page !== undefined) {
@@ -24,6 +25,10 @@ export const getCustomers = async (
   if (search) {
     params.search = search;
   }
+  // Opt-in keyset pagination; "" requests the first page
+  if (cursor !== undefined) {
+    params.cursor = cursor;
+  }
   const query = new URLSearchParams(params);
   const response = await api.get<CustomerResponse>(
     `/agent/customers/get-all?userId=${userId}&${query.toString()}`,
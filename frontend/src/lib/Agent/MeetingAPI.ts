@@ -30,8 +30,9 @@ export const getMeetingsByAgency = async (
   status: "upcoming" | "past" | "cancelled",
   page = 1,
   limit = 10,
+  cursor?: string,
 ) => {
-  return await api.get(
-    `/agent/meetings/get-all?status=${status}&page=${page}&limit=${limit}`,
-  );
+  return await api.get(`/agent/meetings/get-all`, {
+    params: { status, page, limit, cursor },
+  });
 };
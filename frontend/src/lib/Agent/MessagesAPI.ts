@@ -1,15 +1,24 @@
 /* eslint-disable @typescript-eslint/no-explicit-any */
 import api from "@/lib/api";
+import { MessagePageParams, MessageSearchParams } from "@/utils/messagePages";
 export const getConversations = async (params?: {
     archived?: boolean;
     deleted?: boolean;
     blocked?: boolean;
+    limit?: number;
+    page?: number;
+    cursor?: string;
 }) => {
     const queryParams: string[] = [];
 
     if (params?.archived) queryParams.push("archived=true");
     if (params?.deleted) queryParams.push("deleted=true");
     if (params?.blocked) queryParams.push("blocked=true");
+    if (params?.limit) queryParams.push(`limit=${params.limit}`);
+    if (params?.page) queryParams.push(`page=${params.page}`);
+    // Keyset paging: pass "" for the first page, then `pagination.nextCursor`
+    if (params?.cursor !== undefined)
+      queryParams.push(`cursor=${encodeURIComponent(params.cursor)}`);
 
     const queryString =
       queryParams.length > 0 ? `?${queryParams.join("&")}` : "";
@@ -18,8 +27,21 @@ export const getConversations = async (params?: {
     return response.data;
 }
 
-export const getConversationMessages = async (conversationId: string) => {
-    const response = await api.get(`/agent/messages/conversations/${conversationId}`);
+// Newest page of a thread; pass `before` (pagination.before) for older pages
+export const getConversationMessages = async (
+    conversationId: string,
+    params?: MessagePageParams
+) => {
+    const response = await api.get(`/agent/messages/conversations/${conversationId}`, {
+        params: params || {},
+    });
+    return response.data;
+}
+
+// Search the user's messages; open a hit with getConversationMessages(
+// hit.conversationId, { around: hit.around })
+export const searchMessages = async (params: MessageSearchParams) => {
+    const response = await api.get(`/agent/messages/search`, { params });
     return response.data;
 }
 
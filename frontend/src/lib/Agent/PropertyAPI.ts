@@ -54,3 +54,16 @@ export const getProperties = async (
     throw error;
   }
 };
+
+/**
+ * Fetches a page of properties together with the filter panel counts
+ * (per-value counts and price buckets) in a single request.
+ */
+export const getPropertyFacets = async (
+  filters?: Record<string, string | number>
+): Promise<PropertyFacetsResponse> => {
+  const response = await api.get<PropertyFacetsResponse>(`${API_URL}/facets`, {
+    params: filters || {},
+  });
+  return response.data;
+};
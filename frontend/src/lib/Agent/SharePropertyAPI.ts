@@ -11,12 +11,13 @@ export const shareProperty = async (data: sharePropertySchema) => {
 export const getSharedProperties = async (
   agencyId: string,
   page: number,
-  limit: number
+  limit: number,
+  cursor?: string
 ) => {
   const response = await api.get<sharePropertyResponse>(
     `/agent/shareProperties/getAllSharedProperties`,
     {
-      params: { agencyId, page, limit },
+      params: { agencyId, page, limit, cursor },
     }
   );
 
@@ -19,6 +19,7 @@ export type NotificationType = {
     | "preference_request"
     | "property_share"
     | "property_feedback"
+    | "property_match"
     | "unread";
   isRead: boolean;
   link: string;
@@ -42,9 +43,12 @@ export const getNotifications = async (
       | "preference_request"
       | "property_share"
       | "property_feedback"
+      | "property_match"
       | "unread";
     page?: number;
     limit?: number;
+    cursor?: string;
+    includeTotal?: boolean;
   }
 ): Promise<
   AxiosResponse<{
@@ -55,12 +59,14 @@ export const getNotifications = async (
       page: number;
       limit: number;
       totalPages: number;
+      hasMore?: boolean;
+      nextCursor?: string | null;
     };
   }>
 > => {
-  const { type, page = 1, limit = 10 } = options || {};
+  const { type, page = 1, limit = 10, cursor, includeTotal } = options || {};
   const result = await api.get(`/common/notification/get-by-user`, {
-    params: { type, page, limit },
+    params: { type, page, limit, cursor, includeTotal },
   });
   return result;
 };
@@ -11,10 +11,11 @@ export const getMeetingsByCustomer = async (
   status: "upcoming" | "past" | "cancelled",
   page = 1,
   limit = 10,
+  cursor?: string,
 ) => {
-  return await api.get(
-    `/customer/meetings/get-all?customerId=${customerId}&status=${status}&page=${page}&limit=${limit}`,
-  );
+  return await api.get(`/customer/meetings/get-all`, {
+    params: { customerId, status, page, limit, cursor },
+  });
 };
 
 export const updateMeetingStatus = async(
@@ -0,0 +1,13 @@
+import api from "@/lib/api";
+
+/**
+ * Fetches the customer's precomputed recommendations, best match first.
+ * @param limit - Maximum number of recommendations to return.
+ */
+export const getRecommendations = async (limit?: number) => {
+  const response = await api.get<RecommendationResponse>(
+    "/customer/recommendations",
+    { params: limit ? { limit } : {} }
+  );
+  return response.data;
+};
@@ -0,0 +1,50 @@
+import { io, Socket } from "socket.io-client";
+import Cookies from "js-cookie";
+import { AUTH_SESSION_KEY, type Session } from "@/context/AuthContext";
+import { setForceLogoutFlag } from "@/utils/toastHandler";
+
+// One authenticated Socket.IO connection per tab, shared by the message
+// views and the live header counters. The server puts it in the user's and
+// agency's rooms from the JWT sent at the handshake.
+
+let socket: Socket | null = null;
+
+type SocketAuthError = Error & { data?: { forceLogout?: boolean } };
+
+const readToken = (): string | undefined => {
+  try {
+    const sessionStr = Cookies.get(AUTH_SESSION_KEY);
+    if (!sessionStr) return undefined;
+    return (JSON.parse(sessionStr) as Session).access_token;
+  } catch {
+    return undefined;
+  }
+};
+
+export const getSocket = (): Socket => {
+  if (!socket) {
+    socket = io(process.env.NEXT_PUBLIC_BACKEND_URL, {
+      withCredentials: true,
+      // Read on every (re)connection so a refreshed session is used
+      auth: (cb) => cb({ token: readToken() }),
+    });
+
+    // Same handling as a forceLogout API response (see lib/api.ts)
+    socket.on("connect_error", (error: SocketAuthError) => {
+      if (!error.data?.forceLogout) return;
+      setForceLogoutFlag(true);
+      window.dispatchEvent(
+        new CustomEvent("FORCE_LOGOUT", {
+          detail: { message: error.message },
+        })
+      );
+    });
+  }
+  return socket;
+};
+
+// Drop the connection on sign out; the next getSocket() authenticates anew
+export const closeSocket = () => {
+  socket?.disconnect();
+  socket = null;
+};
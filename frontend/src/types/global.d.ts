@@ -80,6 +80,10 @@ declare global {
     | "land"
     | "farmHouse";
     location?: string;
+    // GeoJSON point, coordinates are [longitude, latitude]
+    geo_location?: { type: "Point"; coordinates: [number, number] };
+    // Metres from the search point on nearby/map queries
+    distance?: number;
     price: number;
 
     // Area & Configuration
@@ -255,6 +259,9 @@ declare global {
     totalWithoutFilter?: number;
     totalAgencies?: number,
     totalMeetings?: number,
+    // Cursor mode (`?cursor=`)
+    hasMore?: boolean;
+    nextCursor?: string | null;
   }
   interface Meeting {
     _id: string;
@@ -326,6 +333,8 @@ declare global {
       totalUnfiltered:number;
       totalAgencies?: number,
       total:number;
+      hasMore?: boolean;
+      nextCursor?: string | null;
     };
   }
 
@@ -366,6 +375,46 @@ declare global {
     pagination?: Pagination;
   }
 
+  // Filter panel counts from `/properties/facets`
+  interface FacetCount {
+    value: string;
+    count: number;
+  }
+
+  interface PriceBucket {
+    min: number;
+    max: number;
+    count: number;
+  }
+
+  interface PropertyFacets {
+    type: FacetCount[];
+    category: FacetCount[];
+    facing: FacetCount[];
+    rera_status: FacetCount[];
+    transaction_type: FacetCount[];
+    unit_area_type: FacetCount[];
+    price: PriceBucket[];
+  }
+
+  interface PropertyFacetsResponse extends PropertyResponse {
+    facets?: PropertyFacets;
+  }
+
+  // Precomputed "best matches" from `/customer/recommendations`
+  interface Recommendation {
+    property: Property;
+    score: number;
+    reasons: string[];
+  }
+
+  interface RecommendationResponse {
+    success: boolean;
+    data: Recommendation[];
+    refreshedAt?: string | null;
+    message?: string;
+  }
+
   interface AgentResponse {
     success: boolean;
     data: AgentFormData[];
@@ -0,0 +1,72 @@
+// Real-time message deltas pushed by the server (see backend
+// utils/realtime.js), applied to the state of the agent and customer
+// message views instead of refetching the thread and the conversation list.
+
+export interface ConversationDelta {
+  _id: string;
+  lastMessage: string;
+  lastMessageAt: string;
+  unreadCount: Record<string, number>;
+}
+
+export interface MessageNewEvent<M> {
+  conversationId: string;
+  message: M;
+  conversation: ConversationDelta;
+}
+
+export interface ConversationReadEvent {
+  conversationId: string;
+  userId: string;
+  readAt: string;
+}
+
+interface ConversationLike {
+  _id: string;
+  lastMessage: string;
+  lastMessageAt: string;
+  unreadCount: Record<string, number>;
+}
+
+/**
+ * Apply a conversation's new metadata and move it to the top of the list.
+ * Returns null when the conversation is not in the list (a new thread).
+ */
+export const applyConversationDelta = <T extends ConversationLike>(
+  conversations: T[],
+  delta: ConversationDelta
+): T[] | null => {
+  const current = conversations.find(({ _id }) => _id === delta._id);
+  if (!current) return null;
+  const updated = {
+    ...current,
+    lastMessage: delta.lastMessage,
+    lastMessageAt: delta.lastMessageAt,
+    unreadCount: delta.unreadCount,
+  };
+  return [updated, ...conversations.filter((conv) => conv !== current)];
+};
+
+// `userId` read the conversation: reset their unread count
+export const applyConversationRead = <T extends ConversationLike>(
+  conversations: T[],
+  { conversationId, userId }: ConversationReadEvent
+): T[] =>
+  conversations.map((conv) =>
+    conv._id === conversationId
+      ? { ...conv, unreadCount: { ...conv.unreadCount, [userId]: 0 } }
+      : conv
+  );
+
+// Messages `userId` received are now read
+export const markMessagesRead = <
+  M extends { receiverId: string; isRead: boolean }
+>(
+  messages: M[] = [],
+  { userId, readAt }: ConversationReadEvent
+): M[] =>
+  messages.map((message) =>
+    message.receiverId === userId && !message.isRead
+      ? { ...message, isRead: true, readAt }
+      : message
+  );
@@ -0,0 +1,86 @@
+// Paged message history helpers shared by the agent and customer threads.
+
+export interface MessagePageParams {
+  before?: string;
+  after?: string;
+  // A search hit's `around` cursor: open the thread on that message
+  around?: string;
+  limit?: number;
+}
+
+export interface MessageSearchParams {
+  q: string;
+  conversationId?: string;
+  cursor?: string;
+  limit?: number;
+}
+
+export interface TextHighlight {
+  start: number;
+  end: number;
+}
+
+// One message search result; `highlights` are offsets into `snippet`
+export interface MessageSearchHit {
+  _id: string;
+  conversationId: string;
+  senderId: string;
+  receiverId: string;
+  type: string;
+  createdAt: string;
+  snippet: string;
+  highlights: TextHighlight[];
+  attachments: {
+    name: string;
+    url: string;
+    type: string;
+    highlights: TextHighlight[];
+  }[];
+  around: string;
+}
+
+const timeOf = (message: { createdAt: string }) =>
+  new Date(message.createdAt).getTime();
+
+/**
+ * Merge a fetched page into the messages already loaded for a thread,
+ * keeping the thread oldest first. Within the time span the page covers it
+ * is authoritative, so messages deleted since the last load drop out.
+ */
+export const mergeMessages = <T extends { _id: string; createdAt: string }>(
+  current: T[] = [],
+  page: T[] = []
+): T[] => {
+  if (!page.length) return current;
+  const from = timeOf(page[0]);
+  const to = timeOf(page[page.length - 1]);
+  const kept = current.filter(
+    (message) => timeOf(message) < from || timeOf(message) > to
+  );
+  const byId = new Map(kept.map((message) => [message._id, message]));
+  page.forEach((message) => byId.set(message._id, message));
+  return [...byId.values()].sort((a, b) => timeOf(a) - timeOf(b));
+};
+
+// Folder of the conversation list, as the getConversations wrappers take it
+export interface ConversationFolderParams {
+  archived?: boolean;
+  deleted?: boolean;
+  blocked?: boolean;
+}
+
+/**
+ * Append a further page of the conversation list. A conversation already
+ * listed (moved up by a live update since the previous page) is kept where
+ * it is.
+ */
+export const appendConversations = <T extends { _id: string }>(
+  current: T[],
+  page: T[] = []
+): T[] => {
+  const listed = new Set(current.map((conversation) => conversation._id));
+  return [
+    ...current,
+    ...page.filter((conversation) => !listed.has(conversation._id)),
+  ];
+};